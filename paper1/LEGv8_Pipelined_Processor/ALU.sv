@@ -0,0 +1,32 @@
+module ALU #(
+    parameter DATA_WIDTH    = 64,
+    parameter ALU_OP_ADD    = 3'b000,
+    parameter ALU_OP_SUB    = 3'b001,
+    parameter ALU_OP_AND    = 3'b010,
+    parameter ALU_OP_OR     = 3'b011,
+    parameter ALU_OP_PASS_A = 3'b100,
+    parameter ALU_OP_PASS_B = 3'b101
+) (
+    input  logic [DATA_WIDTH-1:0] operand_a,
+    input  logic [DATA_WIDTH-1:0] operand_b,
+    input  logic [2:0]            alu_op_code,
+    output logic [DATA_WIDTH-1:0] result,
+    output logic                  zero_flag
+);
+
+    always_comb begin
+        case (alu_op_code)
+            ALU_OP_ADD:    result = operand_a + operand_b;
+            ALU_OP_SUB:    result = operand_a - operand_b;
+            ALU_OP_AND:    result = operand_a & operand_b;
+            ALU_OP_OR:     result = operand_a | operand_b;
+            ALU_OP_PASS_A: result = operand_a;
+            ALU_OP_PASS_B: result = operand_b;
+            default:       result = '0;
+        endcase
+    end
+
+    // CBZ passes Rt through and branches on zero_flag
+    assign zero_flag = (result == '0);
+
+endmodule
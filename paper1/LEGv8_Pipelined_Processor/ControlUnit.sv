@@ -0,0 +1,103 @@
+module ControlUnit #(
+    parameter logic [10:0] OP_R_TYPE_ARITH      = 11'b10001011000,
+    parameter logic [10:0] OP_ADDI              = 11'b10010001000,
+    parameter logic [10:0] OP_LDUR              = 11'b11111000010,
+    parameter logic [10:0] OP_STUR              = 11'b11111000000,
+    parameter logic [10:0] OP_CBZ               = 11'b10110100000, // 8-bit CB opcode, left aligned
+    parameter logic [10:0] OP_B                 = 11'b00010100000, // 6-bit B opcode, left aligned
+    parameter logic [10:0] OP_HALT              = 11'b11111111111, // same word as the multicycle core's HALT
+    parameter logic [5:0]  ALU_FUNC_ADD         = 6'b100000,
+    parameter logic [5:0]  ALU_FUNC_SUB         = 6'b100010,
+    parameter logic [5:0]  ALU_FUNC_AND         = 6'b100100,
+    parameter logic [5:0]  ALU_FUNC_ORR         = 6'b100101,
+    parameter logic [2:0]  ALU_OP_ADD           = 3'b000,
+    parameter logic [2:0]  ALU_OP_SUB           = 3'b001,
+    parameter logic [2:0]  ALU_OP_AND           = 3'b010,
+    parameter logic [2:0]  ALU_OP_OR            = 3'b011,
+    parameter logic [2:0]  ALU_OP_PASS_A        = 3'b100,
+    parameter logic [2:0]  ALU_OP_PASS_B        = 3'b101,
+    parameter logic        ALU_SRC_REG          = 1'b0,
+    parameter logic        ALU_SRC_IMM          = 1'b1,
+    parameter logic        MEM_TO_REG_ALU_RES   = 1'b0,
+    parameter logic        MEM_TO_REG_MEM_DATA  = 1'b1,
+    parameter logic [1:0]  BRANCH_TYPE_NONE     = 2'b00,
+    parameter logic [1:0]  BRANCH_TYPE_UNCOND   = 2'b01,
+    parameter logic [1:0]  BRANCH_TYPE_COND     = 2'b10,
+    parameter logic [1:0]  PC_SRC_PC_PLUS_4     = 2'b00,
+    parameter logic [1:0]  PC_SRC_BRANCH_TARGET = 2'b01,
+    parameter logic [1:0]  PC_SRC_JUMP_TARGET   = 2'b10
+) (
+    input  logic [10:0] instr_opcode, // instr[31:21]
+    input  logic [5:0]  instr_funct6, // instr[15:10] (shamt field): ALU_FUNC_* of R-type instructions
+    output logic        reg_write_enable,
+    output logic        mem_read_enable,
+    output logic        mem_write_enable,
+    output logic        mem_to_reg_select,
+    output logic        alu_src_select,
+    output logic [2:0]  alu_op_select,
+    output logic [1:0]  branch_type,
+    output logic [1:0]  pc_src_select,
+    output logic        pc_write_enable,  // low for HALT: fetch stops behind it
+    output logic [1:0]  imm_type_select,  // SignExtend IMM_*
+    output logic        reg2loc_select    // read port 2 reads Rt (instr[4:0]) instead of Rm
+);
+
+    localparam logic [1:0] IMM_I  = 2'b00;
+    localparam logic [1:0] IMM_D  = 2'b01;
+    localparam logic [1:0] IMM_CB = 2'b10;
+    localparam logic [1:0] IMM_B  = 2'b11;
+
+    always_comb begin
+        // Defaults: a NOP (NOP_INSTR and every undefined opcode)
+        reg_write_enable  = 1'b0;
+        mem_read_enable   = 1'b0;
+        mem_write_enable  = 1'b0;
+        mem_to_reg_select = MEM_TO_REG_ALU_RES;
+        alu_src_select    = ALU_SRC_REG;
+        alu_op_select     = ALU_OP_ADD;
+        branch_type       = BRANCH_TYPE_NONE;
+        pc_src_select     = PC_SRC_PC_PLUS_4;
+        pc_write_enable   = 1'b1;
+        imm_type_select   = IMM_I;
+        reg2loc_select    = 1'b0;
+
+        if (instr_opcode == OP_R_TYPE_ARITH) begin
+            reg_write_enable = 1'b1;
+            case (instr_funct6)
+                ALU_FUNC_ADD: alu_op_select = ALU_OP_ADD;
+                ALU_FUNC_SUB: alu_op_select = ALU_OP_SUB;
+                ALU_FUNC_AND: alu_op_select = ALU_OP_AND;
+                ALU_FUNC_ORR: alu_op_select = ALU_OP_OR;
+                default:      reg_write_enable = 1'b0;
+            endcase
+        end else if (instr_opcode == OP_ADDI) begin
+            reg_write_enable = 1'b1;
+            alu_src_select   = ALU_SRC_IMM;
+            imm_type_select  = IMM_I;
+        end else if (instr_opcode == OP_LDUR) begin
+            reg_write_enable  = 1'b1;
+            mem_read_enable   = 1'b1;
+            mem_to_reg_select = MEM_TO_REG_MEM_DATA;
+            alu_src_select    = ALU_SRC_IMM;
+            imm_type_select   = IMM_D;
+        end else if (instr_opcode == OP_STUR) begin
+            mem_write_enable = 1'b1;
+            alu_src_select   = ALU_SRC_IMM;
+            imm_type_select  = IMM_D;
+            reg2loc_select   = 1'b1;
+        end else if (instr_opcode == OP_HALT) begin
+            pc_write_enable = 1'b0;
+        end else if (instr_opcode[10:3] == OP_CBZ[10:3]) begin
+            alu_op_select   = ALU_OP_PASS_B;
+            branch_type     = BRANCH_TYPE_COND;
+            pc_src_select   = PC_SRC_BRANCH_TARGET;
+            imm_type_select = IMM_CB;
+            reg2loc_select  = 1'b1;
+        end else if (instr_opcode[10:5] == OP_B[10:5]) begin
+            branch_type     = BRANCH_TYPE_UNCOND;
+            pc_src_select   = PC_SRC_JUMP_TARGET;
+            imm_type_select = IMM_B;
+        end
+    end
+
+endmodule
@@ -0,0 +1,35 @@
+module DataMemory #(
+    parameter DATA_WIDTH     = 64,
+    parameter MEM_ADDR_WIDTH = 12, // byte address
+    parameter DMEM_DEPTH     = 512 // doublewords
+) (
+    input  logic                      clk,
+    input  logic [MEM_ADDR_WIDTH-1:0] addr,
+    input  logic [DATA_WIDTH-1:0]     write_data,
+    input  logic                      read_enable,
+    input  logic                      write_enable,
+    output logic [DATA_WIDTH-1:0]     read_data
+);
+
+    localparam WORD_ADDR_WIDTH = $clog2(DMEM_DEPTH);
+    localparam BYTE_OFFSET     = $clog2(DATA_WIDTH / 8);
+
+    logic [DATA_WIDTH-1:0] mem [0:DMEM_DEPTH-1];
+    logic [WORD_ADDR_WIDTH-1:0] word_addr;
+
+    initial begin
+        for (int i = 0; i < DMEM_DEPTH; i++) mem[i] = '0;
+    end
+
+    // Doubleword addressed; the low address bits are ignored
+    assign word_addr = addr[WORD_ADDR_WIDTH+BYTE_OFFSET-1:BYTE_OFFSET];
+
+    // Synchronous write, combinational read within the MEM stage
+    always_ff @(posedge clk) begin
+        if (write_enable)
+            mem[word_addr] <= write_data;
+    end
+
+    assign read_data = read_enable ? mem[word_addr] : '0;
+
+endmodule
@@ -0,0 +1,37 @@
+module ForwardingUnit #(
+    parameter REG_ADDR_WIDTH = 5
+) (
+    input  logic [REG_ADDR_WIDTH-1:0] EX_RS1_addr,
+    input  logic [REG_ADDR_WIDTH-1:0] EX_RS2_addr,
+    input  logic [REG_ADDR_WIDTH-1:0] MEM_RD_addr,
+    input  logic [REG_ADDR_WIDTH-1:0] WB_RD_addr,
+    input  logic                      MEM_RegWrite,
+    input  logic                      WB_RegWrite,
+    output logic [1:0]                forward_A_select,
+    output logic [1:0]                forward_B_select
+);
+
+    // Operand sources in EX
+    localparam logic [1:0] FWD_ID_EX  = 2'b00; // value read in ID
+    localparam logic [1:0] FWD_MEM_WB = 2'b01; // result being written back
+    localparam logic [1:0] FWD_EX_MEM = 2'b10; // ALU result one stage ahead
+
+    // XZR is never forwarded: it reads as zero whatever was "written" to it
+    localparam [REG_ADDR_WIDTH-1:0] XZR_ADDR = '1;
+
+    logic mem_valid, wb_valid;
+    assign mem_valid = MEM_RegWrite && MEM_RD_addr != XZR_ADDR;
+    assign wb_valid  = WB_RegWrite && WB_RD_addr != XZR_ADDR;
+
+    // The younger instruction (EX/MEM) wins when both write the register
+    always_comb begin
+        if (mem_valid && MEM_RD_addr == EX_RS1_addr) forward_A_select = FWD_EX_MEM;
+        else if (wb_valid && WB_RD_addr == EX_RS1_addr) forward_A_select = FWD_MEM_WB;
+        else forward_A_select = FWD_ID_EX;
+
+        if (mem_valid && MEM_RD_addr == EX_RS2_addr) forward_B_select = FWD_EX_MEM;
+        else if (wb_valid && WB_RD_addr == EX_RS2_addr) forward_B_select = FWD_MEM_WB;
+        else forward_B_select = FWD_ID_EX;
+    end
+
+endmodule
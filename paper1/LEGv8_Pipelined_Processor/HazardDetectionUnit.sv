@@ -0,0 +1,43 @@
+module HazardDetectionUnit #(
+    parameter REG_ADDR_WIDTH               = 5,
+    parameter logic [10:0] OP_R_TYPE_ARITH = 11'b10001011000,
+    parameter logic [10:0] OP_ADDI         = 11'b10010001000,
+    parameter logic [10:0] OP_LDUR         = 11'b11111000010,
+    parameter logic [10:0] OP_STUR         = 11'b11111000000,
+    parameter logic [10:0] OP_CBZ          = 11'b10110100000
+) (
+    input  logic                      ID_EX_MemRead,
+    input  logic [REG_ADDR_WIDTH-1:0] ID_EX_RD_addr,
+    input  logic [REG_ADDR_WIDTH-1:0] IF_ID_RS1_addr,
+    input  logic [REG_ADDR_WIDTH-1:0] IF_ID_RS2_addr, // Rm, or Rt for STUR/CBZ
+    input  logic                      EX_branch_taken,
+    input  logic [10:0]               IF_ID_instr_opcode,
+    output logic                      pc_stall,
+    output logic                      if_id_stall,
+    output logic                      id_ex_flush,
+    output logic                      if_id_flush
+);
+
+    localparam [REG_ADDR_WIDTH-1:0] XZR_ADDR = '1;
+
+    // Only registers the instruction in ID actually reads can stall it
+    logic uses_rs1, uses_rs2, load_use;
+    assign uses_rs1 = IF_ID_instr_opcode == OP_R_TYPE_ARITH || IF_ID_instr_opcode == OP_ADDI ||
+                      IF_ID_instr_opcode == OP_LDUR || IF_ID_instr_opcode == OP_STUR;
+    assign uses_rs2 = IF_ID_instr_opcode == OP_R_TYPE_ARITH || IF_ID_instr_opcode == OP_STUR ||
+                      IF_ID_instr_opcode[10:3] == OP_CBZ[10:3];
+
+    // Load-use: the loaded value exists only after MEM, one cycle too late to
+    // forward into the EX stage of the next instruction
+    assign load_use = ID_EX_MemRead && ID_EX_RD_addr != XZR_ADDR &&
+                      ((uses_rs1 && IF_ID_RS1_addr == ID_EX_RD_addr) ||
+                       (uses_rs2 && IF_ID_RS2_addr == ID_EX_RD_addr));
+
+    // Hold PC and IF/ID and send a bubble down the pipe;
+    // a branch taken in EX flushes the two instructions fetched behind it
+    assign pc_stall    = load_use;
+    assign if_id_stall = load_use;
+    assign id_ex_flush = load_use || EX_branch_taken;
+    assign if_id_flush = EX_branch_taken;
+
+endmodule
@@ -0,0 +1,100 @@
+module ID_EX_PipelineRegister #(
+    parameter PC_WIDTH       = 64,
+    parameter INSTR_WIDTH    = 32,
+    parameter DATA_WIDTH     = 64,
+    parameter REG_ADDR_WIDTH = 5
+) (
+    input  logic                      clk,
+    input  logic                      rst_n,
+    input  logic                      stall,
+    input  logic                      flush, // bubble: every control signal cleared; wins over stall
+    input  logic [PC_WIDTH-1:0]       pc_in,
+    input  logic [INSTR_WIDTH-1:0]    instr_in,
+    input  logic [DATA_WIDTH-1:0]     read_data1_in,
+    input  logic [DATA_WIDTH-1:0]     read_data2_in,
+    input  logic [DATA_WIDTH-1:0]     extended_imm_in,
+    input  logic                      reg_write_enable_in,
+    input  logic                      mem_read_enable_in,
+    input  logic                      mem_write_enable_in,
+    input  logic                      mem_to_reg_select_in,
+    input  logic                      alu_src_select_in,
+    input  logic [2:0]                alu_op_select_in,
+    input  logic [1:0]                branch_type_in,
+    input  logic [1:0]                pc_src_select_in,
+    input  logic                      pc_write_enable_in,
+    input  logic [REG_ADDR_WIDTH-1:0] reg_rd_addr_in,
+    input  logic [REG_ADDR_WIDTH-1:0] reg_rt_addr_in,  // address read port 2 used (Rm, or Rt for STUR/CBZ)
+    output logic [PC_WIDTH-1:0]       pc_out,
+    output logic [INSTR_WIDTH-1:0]    instr_out,
+    output logic [DATA_WIDTH-1:0]     read_data1_out,
+    output logic [DATA_WIDTH-1:0]     read_data2_out,
+    output logic [DATA_WIDTH-1:0]     extended_imm_out,
+    output logic                      reg_write_enable_out,
+    output logic                      mem_read_enable_out,
+    output logic                      mem_write_enable_out,
+    output logic                      mem_to_reg_select_out,
+    output logic                      alu_src_select_out,
+    output logic [2:0]                alu_op_select_out,
+    output logic [1:0]                branch_type_out,
+    output logic [1:0]                pc_src_select_out,
+    output logic                      pc_write_enable_out,
+    output logic [REG_ADDR_WIDTH-1:0] reg_rd_addr_out,
+    output logic [REG_ADDR_WIDTH-1:0] reg_rt_addr_out
+);
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            pc_out                <= '0;
+            instr_out             <= '0;
+            read_data1_out        <= '0;
+            read_data2_out        <= '0;
+            extended_imm_out      <= '0;
+            reg_write_enable_out  <= 1'b0;
+            mem_read_enable_out   <= 1'b0;
+            mem_write_enable_out  <= 1'b0;
+            mem_to_reg_select_out <= 1'b0;
+            alu_src_select_out    <= 1'b0;
+            alu_op_select_out     <= '0;
+            branch_type_out       <= '0;
+            pc_src_select_out     <= '0;
+            pc_write_enable_out   <= 1'b0;
+            reg_rd_addr_out       <= '0;
+            reg_rt_addr_out       <= '0;
+        end else if (flush) begin
+            pc_out                <= '0;
+            instr_out             <= '0;
+            read_data1_out        <= '0;
+            read_data2_out        <= '0;
+            extended_imm_out      <= '0;
+            reg_write_enable_out  <= 1'b0;
+            mem_read_enable_out   <= 1'b0;
+            mem_write_enable_out  <= 1'b0;
+            mem_to_reg_select_out <= 1'b0;
+            alu_src_select_out    <= 1'b0;
+            alu_op_select_out     <= '0;
+            branch_type_out       <= '0;
+            pc_src_select_out     <= '0;
+            pc_write_enable_out   <= 1'b0;
+            reg_rd_addr_out       <= '0;
+            reg_rt_addr_out       <= '0;
+        end else if (!stall) begin
+            pc_out                <= pc_in;
+            instr_out             <= instr_in;
+            read_data1_out        <= read_data1_in;
+            read_data2_out        <= read_data2_in;
+            extended_imm_out      <= extended_imm_in;
+            reg_write_enable_out  <= reg_write_enable_in;
+            mem_read_enable_out   <= mem_read_enable_in;
+            mem_write_enable_out  <= mem_write_enable_in;
+            mem_to_reg_select_out <= mem_to_reg_select_in;
+            alu_src_select_out    <= alu_src_select_in;
+            alu_op_select_out     <= alu_op_select_in;
+            branch_type_out       <= branch_type_in;
+            pc_src_select_out     <= pc_src_select_in;
+            pc_write_enable_out   <= pc_write_enable_in;
+            reg_rd_addr_out       <= reg_rd_addr_in;
+            reg_rt_addr_out       <= reg_rt_addr_in;
+        end
+    end
+
+endmodule
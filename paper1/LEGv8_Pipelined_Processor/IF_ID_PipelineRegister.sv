@@ -0,0 +1,29 @@
+module IF_ID_PipelineRegister #(
+    parameter PC_WIDTH                = 64,
+    parameter INSTR_WIDTH             = 32,
+    parameter logic [31:0] NOP_INSTR  = 32'h00000000
+) (
+    input  logic                   clk,
+    input  logic                   rst_n,
+    input  logic                   stall, // hold (load-use, HALT)
+    input  logic                   flush, // NOP_INSTR (taken branch); wins over stall
+    input  logic [PC_WIDTH-1:0]    pc_in,
+    input  logic [INSTR_WIDTH-1:0] instr_in,
+    output logic [PC_WIDTH-1:0]    pc_out,
+    output logic [INSTR_WIDTH-1:0] instr_out
+);
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            pc_out    <= '0;
+            instr_out <= NOP_INSTR;
+        end else if (flush) begin
+            pc_out    <= '0;
+            instr_out <= NOP_INSTR;
+        end else if (!stall) begin
+            pc_out    <= pc_in;
+            instr_out <= instr_in;
+        end
+    end
+
+endmodule
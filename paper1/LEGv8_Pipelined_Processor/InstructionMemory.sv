@@ -0,0 +1,25 @@
+module InstructionMemory #(
+    parameter INSTR_WIDTH    = 32,
+    parameter MEM_ADDR_WIDTH = 12,   // byte address
+    parameter IMEM_DEPTH     = 1024, // words
+    parameter INIT_FILE      = ""    // $readmemh image; the testbenches load `mem` directly
+) (
+    input  logic                      clk,
+    input  logic [MEM_ADDR_WIDTH-1:0] addr,
+    output logic [INSTR_WIDTH-1:0]    instr_out
+);
+
+    localparam WORD_ADDR_WIDTH = $clog2(IMEM_DEPTH);
+
+    logic [INSTR_WIDTH-1:0] mem [0:IMEM_DEPTH-1];
+
+    initial begin
+        for (int i = 0; i < IMEM_DEPTH; i++) mem[i] = '0;
+        if (INIT_FILE != "") $readmemh(INIT_FILE, mem);
+    end
+
+    // Combinational read: the IF stage fetches in the cycle the PC is valid.
+    // `clk` is unused until the ROM gets a registered read port.
+    assign instr_out = mem[addr[WORD_ADDR_WIDTH+1:2]];
+
+endmodule
@@ -0,0 +1,284 @@
+// 5-stage pipelined 64-bit LEGv8 (IF, ID, EX, MEM, WB) as specified in
+// LEGv8_Pipelined_Processor.json.
+//
+// - EX/MEM and MEM/WB results are forwarded into EX (ForwardingUnit); the
+//   register file passes WB's write through to ID.
+// - A load followed by an instruction that reads the loaded register stalls
+//   one cycle (HazardDetectionUnit).
+// - CBZ and B resolve in EX; a taken branch flushes the two instructions
+//   fetched behind it.
+// - HALT (OP_HALT) stops fetching when it reaches ID; halt_out rises once the
+//   three older instructions have written back, and stays high until reset.
+module LEGv8_Processor #(
+    parameter INSTR_WIDTH             = 32,
+    parameter DATA_WIDTH              = 64,
+    parameter PC_WIDTH                = 64,
+    parameter REG_COUNT               = 32,
+    parameter REG_ADDR_WIDTH          = 5,
+    parameter MEM_ADDR_WIDTH          = 12,
+    parameter IMEM_DEPTH              = 1024,
+    parameter DMEM_DEPTH              = 512,
+    parameter IMMEDIATE_WIDTH_I_TYPE  = 9,
+    parameter IMMEDIATE_WIDTH_D_TYPE  = 9,
+    parameter IMMEDIATE_WIDTH_CB_TYPE = 19,
+    parameter IMMEDIATE_WIDTH_B_TYPE  = 26,
+    parameter logic [10:0] OP_R_TYPE_ARITH      = 11'b10001011000,
+    parameter logic [10:0] OP_ADDI              = 11'b10010001000,
+    parameter logic [10:0] OP_LDUR              = 11'b11111000010,
+    parameter logic [10:0] OP_STUR              = 11'b11111000000,
+    parameter logic [10:0] OP_CBZ               = 11'b10110100000,
+    parameter logic [10:0] OP_B                 = 11'b00010100000,
+    parameter logic [10:0] OP_HALT              = 11'b11111111111,
+    parameter logic [5:0]  ALU_FUNC_ADD         = 6'b100000,
+    parameter logic [5:0]  ALU_FUNC_SUB         = 6'b100010,
+    parameter logic [5:0]  ALU_FUNC_AND         = 6'b100100,
+    parameter logic [5:0]  ALU_FUNC_ORR         = 6'b100101,
+    parameter logic [2:0]  ALU_OP_ADD           = 3'b000,
+    parameter logic [2:0]  ALU_OP_SUB           = 3'b001,
+    parameter logic [2:0]  ALU_OP_AND           = 3'b010,
+    parameter logic [2:0]  ALU_OP_OR            = 3'b011,
+    parameter logic [2:0]  ALU_OP_PASS_A        = 3'b100,
+    parameter logic [2:0]  ALU_OP_PASS_B        = 3'b101,
+    parameter logic        ALU_SRC_REG          = 1'b0,
+    parameter logic        ALU_SRC_IMM          = 1'b1,
+    parameter logic        MEM_TO_REG_ALU_RES   = 1'b0,
+    parameter logic        MEM_TO_REG_MEM_DATA  = 1'b1,
+    parameter logic [1:0]  BRANCH_TYPE_NONE     = 2'b00,
+    parameter logic [1:0]  BRANCH_TYPE_UNCOND   = 2'b01,
+    parameter logic [1:0]  BRANCH_TYPE_COND     = 2'b10,
+    parameter logic [1:0]  PC_SRC_PC_PLUS_4     = 2'b00,
+    parameter logic [1:0]  PC_SRC_BRANCH_TARGET = 2'b01,
+    parameter logic [1:0]  PC_SRC_JUMP_TARGET   = 2'b10,
+    parameter logic [31:0] NOP_INSTR            = 32'h00000000
+) (
+    input  logic                            clk,
+    input  logic                            rst_n,
+    output logic [REG_COUNT*DATA_WIDTH-1:0] debug_reg_file_out, // X0 in the low bits
+    output logic [PC_WIDTH-1:0]             debug_pc_out,
+    output logic                            halt_out
+);
+
+    // ForwardingUnit operand sources
+    localparam logic [1:0] FWD_MEM_WB = 2'b01;
+    localparam logic [1:0] FWD_EX_MEM = 2'b10;
+
+    // --- IF ---
+    logic [PC_WIDTH-1:0]    pc, pc_next, pc_plus4;
+    logic                   pc_write;
+    logic [INSTR_WIDTH-1:0] if_instr;
+
+    // --- ID ---
+    logic [PC_WIDTH-1:0]       id_pc;
+    logic [INSTR_WIDTH-1:0]    id_instr;
+    logic [REG_ADDR_WIDTH-1:0] id_rn, id_rm, id_rt, id_read_addr2;
+    logic [DATA_WIDTH-1:0]     id_read_data1, id_read_data2, id_imm;
+    logic                      id_reg_write, id_mem_read, id_mem_write, id_mem_to_reg, id_alu_src;
+    logic [2:0]                id_alu_op;
+    logic [1:0]                id_branch_type, id_pc_src, id_imm_type;
+    logic                      id_pc_write, id_reg2loc;
+    logic                      pc_stall, if_id_stall, if_id_flush, id_ex_flush;
+
+    // --- EX ---
+    logic [PC_WIDTH-1:0]       ex_pc, ex_target;
+    logic [INSTR_WIDTH-1:0]    ex_instr;
+    logic [DATA_WIDTH-1:0]     ex_read_data1, ex_read_data2, ex_imm;
+    logic                      ex_reg_write, ex_mem_read, ex_mem_write, ex_mem_to_reg, ex_alu_src;
+    logic [2:0]                ex_alu_op;
+    logic [1:0]                ex_branch_type, ex_pc_src;
+    logic                      ex_pc_write;
+    logic [REG_ADDR_WIDTH-1:0] ex_rd, ex_rs2;
+    logic [1:0]                forward_a, forward_b;
+    logic [DATA_WIDTH-1:0]     ex_operand_a, ex_operand_b, ex_alu_b, ex_alu_result;
+    logic                      ex_zero, ex_branch_taken;
+
+    // --- MEM ---
+    logic [PC_WIDTH-1:0]       mem_pc;
+    logic [DATA_WIDTH-1:0]     mem_alu_result, mem_store_data, mem_read_data;
+    logic                      mem_reg_write, mem_mem_read, mem_mem_write, mem_mem_to_reg;
+    logic [REG_ADDR_WIDTH-1:0] mem_rd;
+
+    // --- WB ---
+    logic [DATA_WIDTH-1:0]     wb_alu_result, wb_mem_data, wb_write_data;
+    logic                      wb_reg_write, wb_mem_to_reg;
+    logic [REG_ADDR_WIDTH-1:0] wb_rd;
+
+    logic [1:0] halt_count;
+
+    // ---------------------------------------------------------------- IF
+    assign pc_plus4 = pc + PC_WIDTH'(4);
+    assign pc_next  = ex_branch_taken ? ex_target : pc_plus4;
+    // A taken branch always redirects; otherwise hold on a load-use stall or HALT in ID
+    assign pc_write = ex_branch_taken || (!pc_stall && id_pc_write);
+
+    ProgramCounter #(.PC_WIDTH(PC_WIDTH)) pc_inst (
+        .clk(clk), .rst_n(rst_n), .pc_write_enable(pc_write), .pc_next_val(pc_next), .pc_out(pc)
+    );
+
+    InstructionMemory #(.INSTR_WIDTH(INSTR_WIDTH), .MEM_ADDR_WIDTH(MEM_ADDR_WIDTH), .IMEM_DEPTH(IMEM_DEPTH))
+    instruction_memory_inst (
+        .clk(clk), .addr(pc[MEM_ADDR_WIDTH-1:0]), .instr_out(if_instr)
+    );
+
+    IF_ID_PipelineRegister #(.PC_WIDTH(PC_WIDTH), .INSTR_WIDTH(INSTR_WIDTH), .NOP_INSTR(NOP_INSTR)) if_id_inst (
+        .clk(clk), .rst_n(rst_n), .stall(if_id_stall || !id_pc_write), .flush(if_id_flush),
+        .pc_in(pc), .instr_in(if_instr), .pc_out(id_pc), .instr_out(id_instr)
+    );
+
+    // ---------------------------------------------------------------- ID
+    assign id_rn = id_instr[9:5];
+    assign id_rm = id_instr[20:16];
+    assign id_rt = id_instr[4:0];
+    assign id_read_addr2 = id_reg2loc ? id_rt : id_rm;
+
+    ControlUnit #(
+        .OP_R_TYPE_ARITH(OP_R_TYPE_ARITH), .OP_ADDI(OP_ADDI), .OP_LDUR(OP_LDUR), .OP_STUR(OP_STUR),
+        .OP_CBZ(OP_CBZ), .OP_B(OP_B), .OP_HALT(OP_HALT),
+        .ALU_FUNC_ADD(ALU_FUNC_ADD), .ALU_FUNC_SUB(ALU_FUNC_SUB), .ALU_FUNC_AND(ALU_FUNC_AND),
+        .ALU_FUNC_ORR(ALU_FUNC_ORR),
+        .ALU_OP_ADD(ALU_OP_ADD), .ALU_OP_SUB(ALU_OP_SUB), .ALU_OP_AND(ALU_OP_AND), .ALU_OP_OR(ALU_OP_OR),
+        .ALU_OP_PASS_A(ALU_OP_PASS_A), .ALU_OP_PASS_B(ALU_OP_PASS_B),
+        .ALU_SRC_REG(ALU_SRC_REG), .ALU_SRC_IMM(ALU_SRC_IMM),
+        .MEM_TO_REG_ALU_RES(MEM_TO_REG_ALU_RES), .MEM_TO_REG_MEM_DATA(MEM_TO_REG_MEM_DATA),
+        .BRANCH_TYPE_NONE(BRANCH_TYPE_NONE), .BRANCH_TYPE_UNCOND(BRANCH_TYPE_UNCOND),
+        .BRANCH_TYPE_COND(BRANCH_TYPE_COND),
+        .PC_SRC_PC_PLUS_4(PC_SRC_PC_PLUS_4), .PC_SRC_BRANCH_TARGET(PC_SRC_BRANCH_TARGET),
+        .PC_SRC_JUMP_TARGET(PC_SRC_JUMP_TARGET)
+    ) control_unit_inst (
+        .instr_opcode(id_instr[31:21]), .instr_funct6(id_instr[15:10]),
+        .reg_write_enable(id_reg_write), .mem_read_enable(id_mem_read), .mem_write_enable(id_mem_write),
+        .mem_to_reg_select(id_mem_to_reg), .alu_src_select(id_alu_src), .alu_op_select(id_alu_op),
+        .branch_type(id_branch_type), .pc_src_select(id_pc_src), .pc_write_enable(id_pc_write),
+        .imm_type_select(id_imm_type), .reg2loc_select(id_reg2loc)
+    );
+
+    RegisterFile #(.DATA_WIDTH(DATA_WIDTH), .REG_COUNT(REG_COUNT), .REG_ADDR_WIDTH(REG_ADDR_WIDTH))
+    register_file_inst (
+        .clk(clk), .rst_n(rst_n), .read_addr1(id_rn), .read_addr2(id_read_addr2),
+        .write_enable(wb_reg_write), .write_addr(wb_rd), .write_data(wb_write_data),
+        .read_data1(id_read_data1), .read_data2(id_read_data2)
+    );
+
+    SignExtend #(
+        .INSTR_WIDTH(INSTR_WIDTH), .DATA_WIDTH(DATA_WIDTH),
+        .IMMEDIATE_WIDTH_I_TYPE(IMMEDIATE_WIDTH_I_TYPE), .IMMEDIATE_WIDTH_D_TYPE(IMMEDIATE_WIDTH_D_TYPE),
+        .IMMEDIATE_WIDTH_CB_TYPE(IMMEDIATE_WIDTH_CB_TYPE), .IMMEDIATE_WIDTH_B_TYPE(IMMEDIATE_WIDTH_B_TYPE)
+    ) sign_extend_inst (
+        .instr_in(id_instr), .imm_type_select(id_imm_type), .extended_imm_out(id_imm)
+    );
+
+    HazardDetectionUnit #(
+        .REG_ADDR_WIDTH(REG_ADDR_WIDTH), .OP_R_TYPE_ARITH(OP_R_TYPE_ARITH), .OP_ADDI(OP_ADDI),
+        .OP_LDUR(OP_LDUR), .OP_STUR(OP_STUR), .OP_CBZ(OP_CBZ)
+    ) hazard_unit_inst (
+        .ID_EX_MemRead(ex_mem_read), .ID_EX_RD_addr(ex_rd),
+        .IF_ID_RS1_addr(id_rn), .IF_ID_RS2_addr(id_read_addr2),
+        .EX_branch_taken(ex_branch_taken), .IF_ID_instr_opcode(id_instr[31:21]),
+        .pc_stall(pc_stall), .if_id_stall(if_id_stall), .id_ex_flush(id_ex_flush), .if_id_flush(if_id_flush)
+    );
+
+    ID_EX_PipelineRegister #(
+        .PC_WIDTH(PC_WIDTH), .INSTR_WIDTH(INSTR_WIDTH), .DATA_WIDTH(DATA_WIDTH), .REG_ADDR_WIDTH(REG_ADDR_WIDTH)
+    ) id_ex_inst (
+        .clk(clk), .rst_n(rst_n), .stall(1'b0), .flush(id_ex_flush),
+        .pc_in(id_pc), .instr_in(id_instr), .read_data1_in(id_read_data1), .read_data2_in(id_read_data2),
+        .extended_imm_in(id_imm), .reg_write_enable_in(id_reg_write), .mem_read_enable_in(id_mem_read),
+        .mem_write_enable_in(id_mem_write), .mem_to_reg_select_in(id_mem_to_reg),
+        .alu_src_select_in(id_alu_src), .alu_op_select_in(id_alu_op), .branch_type_in(id_branch_type),
+        .pc_src_select_in(id_pc_src), .pc_write_enable_in(id_pc_write),
+        .reg_rd_addr_in(id_rt), .reg_rt_addr_in(id_read_addr2),
+        .pc_out(ex_pc), .instr_out(ex_instr), .read_data1_out(ex_read_data1), .read_data2_out(ex_read_data2),
+        .extended_imm_out(ex_imm), .reg_write_enable_out(ex_reg_write), .mem_read_enable_out(ex_mem_read),
+        .mem_write_enable_out(ex_mem_write), .mem_to_reg_select_out(ex_mem_to_reg),
+        .alu_src_select_out(ex_alu_src), .alu_op_select_out(ex_alu_op), .branch_type_out(ex_branch_type),
+        .pc_src_select_out(ex_pc_src), .pc_write_enable_out(ex_pc_write),
+        .reg_rd_addr_out(ex_rd), .reg_rt_addr_out(ex_rs2)
+    );
+
+    // ---------------------------------------------------------------- EX
+    ForwardingUnit #(.REG_ADDR_WIDTH(REG_ADDR_WIDTH)) forwarding_unit_inst (
+        .EX_RS1_addr(ex_instr[9:5]), .EX_RS2_addr(ex_rs2), .MEM_RD_addr(mem_rd), .WB_RD_addr(wb_rd),
+        .MEM_RegWrite(mem_reg_write), .WB_RegWrite(wb_reg_write),
+        .forward_A_select(forward_a), .forward_B_select(forward_b)
+    );
+
+    always_comb begin
+        case (forward_a)
+            FWD_EX_MEM: ex_operand_a = mem_alu_result;
+            FWD_MEM_WB: ex_operand_a = wb_write_data;
+            default:    ex_operand_a = ex_read_data1;
+        endcase
+        case (forward_b)
+            FWD_EX_MEM: ex_operand_b = mem_alu_result;
+            FWD_MEM_WB: ex_operand_b = wb_write_data;
+            default:    ex_operand_b = ex_read_data2;
+        endcase
+    end
+
+    assign ex_alu_b = (ex_alu_src == ALU_SRC_IMM) ? ex_imm : ex_operand_b;
+
+    ALU #(
+        .DATA_WIDTH(DATA_WIDTH), .ALU_OP_ADD(ALU_OP_ADD), .ALU_OP_SUB(ALU_OP_SUB), .ALU_OP_AND(ALU_OP_AND),
+        .ALU_OP_OR(ALU_OP_OR), .ALU_OP_PASS_A(ALU_OP_PASS_A), .ALU_OP_PASS_B(ALU_OP_PASS_B)
+    ) alu_inst (
+        .operand_a(ex_operand_a), .operand_b(ex_alu_b), .alu_op_code(ex_alu_op),
+        .result(ex_alu_result), .zero_flag(ex_zero)
+    );
+
+    // CB and B offsets count instructions
+    always_comb begin
+        case (ex_pc_src)
+            PC_SRC_BRANCH_TARGET, PC_SRC_JUMP_TARGET: ex_target = ex_pc + (PC_WIDTH'(ex_imm) << 2);
+            default:                                  ex_target = ex_pc + PC_WIDTH'(4);
+        endcase
+    end
+
+    assign ex_branch_taken = (ex_branch_type == BRANCH_TYPE_UNCOND) ||
+                             (ex_branch_type == BRANCH_TYPE_COND && ex_zero);
+
+    EX_MEM_PipelineRegister #(.PC_WIDTH(PC_WIDTH), .DATA_WIDTH(DATA_WIDTH), .REG_ADDR_WIDTH(REG_ADDR_WIDTH))
+    ex_mem_inst (
+        .clk(clk), .rst_n(rst_n), .stall(1'b0), .flush(1'b0),
+        .pc_in(ex_pc), .alu_result_in(ex_alu_result), .read_data2_in(ex_operand_b),
+        .reg_write_enable_in(ex_reg_write), .mem_read_enable_in(ex_mem_read),
+        .mem_write_enable_in(ex_mem_write), .mem_to_reg_select_in(ex_mem_to_reg), .reg_rd_addr_in(ex_rd),
+        .pc_out(mem_pc), .alu_result_out(mem_alu_result), .read_data2_out(mem_store_data),
+        .reg_write_enable_out(mem_reg_write), .mem_read_enable_out(mem_mem_read),
+        .mem_write_enable_out(mem_mem_write), .mem_to_reg_select_out(mem_mem_to_reg), .reg_rd_addr_out(mem_rd)
+    );
+
+    // ---------------------------------------------------------------- MEM
+    DataMemory #(.DATA_WIDTH(DATA_WIDTH), .MEM_ADDR_WIDTH(MEM_ADDR_WIDTH), .DMEM_DEPTH(DMEM_DEPTH))
+    data_memory_inst (
+        .clk(clk), .addr(mem_alu_result[MEM_ADDR_WIDTH-1:0]), .write_data(mem_store_data),
+        .read_enable(mem_mem_read), .write_enable(mem_mem_write), .read_data(mem_read_data)
+    );
+
+    MEM_WB_PipelineRegister #(.DATA_WIDTH(DATA_WIDTH), .REG_ADDR_WIDTH(REG_ADDR_WIDTH)) mem_wb_inst (
+        .clk(clk), .rst_n(rst_n), .stall(1'b0), .flush(1'b0),
+        .alu_result_in(mem_alu_result), .mem_read_data_in(mem_read_data), .reg_write_enable_in(mem_reg_write),
+        .mem_to_reg_select_in(mem_mem_to_reg), .reg_rd_addr_in(mem_rd),
+        .alu_result_out(wb_alu_result), .mem_read_data_out(wb_mem_data), .reg_write_enable_out(wb_reg_write),
+        .mem_to_reg_select_out(wb_mem_to_reg), .reg_rd_addr_out(wb_rd)
+    );
+
+    // ---------------------------------------------------------------- WB
+    assign wb_write_data = (wb_mem_to_reg == MEM_TO_REG_MEM_DATA) ? wb_mem_data : wb_alu_result;
+
+    // ---------------------------------------------------------------- HALT
+    // HALT holds in ID (id_pc_write low) unless a taken branch in EX flushes
+    // it; after three cycles in ID the instructions ahead of it have retired
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n)
+            halt_count <= 2'd0;
+        else if (!id_pc_write && !ex_branch_taken && halt_count != 2'd3)
+            halt_count <= halt_count + 2'd1;
+    end
+    assign halt_out = (halt_count == 2'd3);
+
+    // ---------------------------------------------------------------- debug
+    assign debug_pc_out = pc;
+    for (genvar i = 0; i < REG_COUNT; i++) begin : g_debug_regs
+        assign debug_reg_file_out[i*DATA_WIDTH +: DATA_WIDTH] = register_file_inst.registers[i];
+    end
+
+endmodule
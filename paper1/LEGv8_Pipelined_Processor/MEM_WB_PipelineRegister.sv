@@ -0,0 +1,43 @@
+module MEM_WB_PipelineRegister #(
+    parameter DATA_WIDTH     = 64,
+    parameter REG_ADDR_WIDTH = 5
+) (
+    input  logic                      clk,
+    input  logic                      rst_n,
+    input  logic                      stall,
+    input  logic                      flush,
+    input  logic [DATA_WIDTH-1:0]     alu_result_in,
+    input  logic [DATA_WIDTH-1:0]     mem_read_data_in,
+    input  logic                      reg_write_enable_in,
+    input  logic                      mem_to_reg_select_in,
+    input  logic [REG_ADDR_WIDTH-1:0] reg_rd_addr_in,
+    output logic [DATA_WIDTH-1:0]     alu_result_out,
+    output logic [DATA_WIDTH-1:0]     mem_read_data_out,
+    output logic                      reg_write_enable_out,
+    output logic                      mem_to_reg_select_out,
+    output logic [REG_ADDR_WIDTH-1:0] reg_rd_addr_out
+);
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            alu_result_out        <= '0;
+            mem_read_data_out     <= '0;
+            reg_write_enable_out  <= 1'b0;
+            mem_to_reg_select_out <= 1'b0;
+            reg_rd_addr_out       <= '0;
+        end else if (flush) begin
+            alu_result_out        <= '0;
+            mem_read_data_out     <= '0;
+            reg_write_enable_out  <= 1'b0;
+            mem_to_reg_select_out <= 1'b0;
+            reg_rd_addr_out       <= '0;
+        end else if (!stall) begin
+            alu_result_out        <= alu_result_in;
+            mem_read_data_out     <= mem_read_data_in;
+            reg_write_enable_out  <= reg_write_enable_in;
+            mem_to_reg_select_out <= mem_to_reg_select_in;
+            reg_rd_addr_out       <= reg_rd_addr_in;
+        end
+    end
+
+endmodule
@@ -0,0 +1,18 @@
+module ProgramCounter #(
+    parameter PC_WIDTH = 64
+) (
+    input  logic                clk,
+    input  logic                rst_n,           // active low reset
+    input  logic                pc_write_enable, // low while the hazard unit stalls fetch
+    input  logic [PC_WIDTH-1:0] pc_next_val,
+    output logic [PC_WIDTH-1:0] pc_out
+);
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n)
+            pc_out <= '0;
+        else if (pc_write_enable)
+            pc_out <= pc_next_val;
+    end
+
+endmodule
@@ -0,0 +1,42 @@
+module RegisterFile #(
+    parameter DATA_WIDTH     = 64,
+    parameter REG_COUNT      = 32,
+    parameter REG_ADDR_WIDTH = 5
+) (
+    input  logic                      clk,
+    input  logic                      rst_n,
+    input  logic [REG_ADDR_WIDTH-1:0] read_addr1,
+    input  logic [REG_ADDR_WIDTH-1:0] read_addr2,
+    input  logic                      write_enable,
+    input  logic [REG_ADDR_WIDTH-1:0] write_addr,
+    input  logic [DATA_WIDTH-1:0]     write_data,
+    output logic [DATA_WIDTH-1:0]     read_data1,
+    output logic [DATA_WIDTH-1:0]     read_data2
+);
+
+    // X31 is XZR: reads return zero, writes are ignored
+    localparam [REG_ADDR_WIDTH-1:0] XZR_ADDR = REG_ADDR_WIDTH'(REG_COUNT - 1);
+
+    logic [DATA_WIDTH-1:0] registers [0:REG_COUNT-1];
+
+    always_ff @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            for (int i = 0; i < REG_COUNT; i++) registers[i] <= '0;
+        end else if (write_enable && write_addr != XZR_ADDR) begin
+            registers[write_addr] <= write_data;
+        end
+    end
+
+    // Write-through bypass: an instruction in ID reads the value WB writes in
+    // the same cycle, so the forwarding unit only covers EX/MEM and MEM/WB
+    always_comb begin
+        if (read_addr1 == XZR_ADDR) read_data1 = '0;
+        else if (write_enable && write_addr == read_addr1) read_data1 = write_data;
+        else read_data1 = registers[read_addr1];
+
+        if (read_addr2 == XZR_ADDR) read_data2 = '0;
+        else if (write_enable && write_addr == read_addr2) read_data2 = write_data;
+        else read_data2 = registers[read_addr2];
+    end
+
+endmodule
@@ -0,0 +1,28 @@
+module SignExtend #(
+    parameter INSTR_WIDTH             = 32,
+    parameter DATA_WIDTH              = 64,
+    parameter IMMEDIATE_WIDTH_I_TYPE  = 9,
+    parameter IMMEDIATE_WIDTH_D_TYPE  = 9,
+    parameter IMMEDIATE_WIDTH_CB_TYPE = 19,
+    parameter IMMEDIATE_WIDTH_B_TYPE  = 26
+) (
+    input  logic [INSTR_WIDTH-1:0] instr_in,
+    input  logic [1:0]             imm_type_select, // IMM_* below, from the ControlUnit
+    output logic [DATA_WIDTH-1:0]  extended_imm_out
+);
+
+    localparam logic [1:0] IMM_I  = 2'b00; // ADDI: instr[20:12]
+    localparam logic [1:0] IMM_D  = 2'b01; // LDUR/STUR address offset: instr[20:12]
+    localparam logic [1:0] IMM_CB = 2'b10; // CBZ: instr[23:5], in instructions
+    localparam logic [1:0] IMM_B  = 2'b11; // B: instr[25:0], in instructions
+
+    always_comb begin
+        case (imm_type_select)
+            IMM_I:   extended_imm_out = DATA_WIDTH'($signed(instr_in[12 +: IMMEDIATE_WIDTH_I_TYPE]));
+            IMM_D:   extended_imm_out = DATA_WIDTH'($signed(instr_in[12 +: IMMEDIATE_WIDTH_D_TYPE]));
+            IMM_CB:  extended_imm_out = DATA_WIDTH'($signed(instr_in[5 +: IMMEDIATE_WIDTH_CB_TYPE]));
+            default: extended_imm_out = DATA_WIDTH'($signed(instr_in[0 +: IMMEDIATE_WIDTH_B_TYPE]));
+        endcase
+    end
+
+endmodule
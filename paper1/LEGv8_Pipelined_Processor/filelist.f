@@ -0,0 +1,14 @@
+ProgramCounter.sv
+InstructionMemory.sv
+IF_ID_PipelineRegister.sv
+RegisterFile.sv
+SignExtend.sv
+ControlUnit.sv
+ID_EX_PipelineRegister.sv
+ALU.sv
+ForwardingUnit.sv
+HazardDetectionUnit.sv
+EX_MEM_PipelineRegister.sv
+DataMemory.sv
+MEM_WB_PipelineRegister.sv
+LEGv8_Processor.sv
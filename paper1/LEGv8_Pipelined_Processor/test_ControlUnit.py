@@ -0,0 +1,71 @@
+import cocotb
+from cocotb.triggers import Timer
+from verif.legv8p_iss import FUNCT, OP_ADDI, OP_B, OP_CBZ, OP_HALT, OP_LDUR, OP_R_TYPE, OP_STUR
+from verif.seeding import test_rng
+from verif.profiling import profiled
+
+SIGNALS = ("reg_write_enable", "mem_read_enable", "mem_write_enable", "mem_to_reg_select", "alu_src_select",
+           "alu_op_select", "branch_type", "pc_src_select", "pc_write_enable", "imm_type_select", "reg2loc_select")
+ALU_OP = {"ADD": 0b000, "SUB": 0b001, "AND": 0b010, "ORR": 0b011}
+NOP = (0, 0, 0, 0, 0, 0b000, 0b00, 0b00, 1, 0b00, 0)
+
+# Expected SIGNALS of each instruction; R-type per funct6
+EXPECTED = {
+    "ADDI": (1, 0, 0, 0, 1, 0b000, 0b00, 0b00, 1, 0b00, 0),
+    "LDUR": (1, 1, 0, 1, 1, 0b000, 0b00, 0b00, 1, 0b01, 0),
+    "STUR": (0, 0, 1, 0, 1, 0b000, 0b00, 0b00, 1, 0b01, 1),
+    "CBZ":  (0, 0, 0, 0, 0, 0b101, 0b10, 0b01, 1, 0b10, 1),
+    "B":    (0, 0, 0, 0, 0, 0b000, 0b01, 0b10, 1, 0b11, 0),
+    "HALT": (0, 0, 0, 0, 0, 0b000, 0b00, 0b00, 0, 0b00, 0),
+}
+for _name, _op in ALU_OP.items():
+    EXPECTED[_name] = (1, 0, 0, 0, 0, _op, 0b00, 0b00, 1, 0b00, 0)
+
+
+def decode_reference(opcode, funct6):
+    """Name the ControlUnit should decode instr[31:21]/instr[15:10] as; None for a NOP."""
+    if opcode == OP_R_TYPE:
+        return next((name for name, code in FUNCT.items() if code == funct6), None)
+    names = {OP_ADDI: "ADDI", OP_LDUR: "LDUR", OP_STUR: "STUR", OP_HALT: "HALT"}
+    if opcode in names:
+        return names[opcode]
+    if opcode >> 3 == OP_CBZ:
+        return "CBZ"
+    if opcode >> 5 == OP_B:
+        return "B"
+    return None
+
+
+async def check(dut, opcode, funct6):
+    dut.instr_opcode.value = opcode
+    dut.instr_funct6.value = funct6
+    await Timer(1, units="ns")
+    name = decode_reference(opcode, funct6)
+    expected = EXPECTED.get(name, NOP)
+    actual = tuple(getattr(dut, s).value.integer for s in SIGNALS)
+    for signal, want, got in zip(SIGNALS, expected, actual):
+        assert want == got, \
+            f"{name or 'NOP'} (opcode {opcode:011b}, funct6 {funct6:06b}): {signal} {got}, expected {want}"
+
+
+@cocotb.test()
+@profiled
+async def control_unit_directed_test(dut):
+    """Every instruction, with offset bits in the CB and B opcode fields, and NOP_INSTR."""
+    for funct6 in FUNCT.values():
+        await check(dut, OP_R_TYPE, funct6)
+    await check(dut, OP_R_TYPE, 0)  # undefined funct6: no write
+    for opcode in (OP_ADDI, OP_LDUR, OP_STUR, OP_HALT, OP_CBZ << 3, OP_CBZ << 3 | 0b111, OP_B << 5,
+                   OP_B << 5 | 0b11111, 0):
+        await check(dut, opcode, 0)
+
+
+@cocotb.test()
+@profiled
+async def control_unit_random_test(dut):
+    """Random opcodes and funct6 values: anything undecoded must be a NOP."""
+    rng = test_rng()
+    for _ in range(500):
+        opcode = rng.choice([rng.getrandbits(11), OP_R_TYPE, OP_CBZ << 3 | rng.getrandbits(3),
+                             OP_B << 5 | rng.getrandbits(5)])
+        await check(dut, opcode, rng.choice([rng.getrandbits(6), *FUNCT.values()]))
@@ -0,0 +1,55 @@
+import cocotb
+from cocotb.triggers import Timer
+from verif.seeding import test_rng
+from verif.profiling import profiled
+
+XZR = 31
+FWD_ID_EX, FWD_MEM_WB, FWD_EX_MEM = 0b00, 0b01, 0b10
+
+
+def forward_reference(rs, mem_rd, mem_write, wb_rd, wb_write):
+    """Operand source: the younger EX/MEM result first, never for XZR."""
+    if mem_write and mem_rd != XZR and mem_rd == rs:
+        return FWD_EX_MEM
+    if wb_write and wb_rd != XZR and wb_rd == rs:
+        return FWD_MEM_WB
+    return FWD_ID_EX
+
+
+async def check(dut, rs1, rs2, mem_rd, mem_write, wb_rd, wb_write):
+    dut.EX_RS1_addr.value = rs1
+    dut.EX_RS2_addr.value = rs2
+    dut.MEM_RD_addr.value = mem_rd
+    dut.MEM_RegWrite.value = mem_write
+    dut.WB_RD_addr.value = wb_rd
+    dut.WB_RegWrite.value = wb_write
+    await Timer(1, units="ns")
+    state = f"rs1=X{rs1} rs2=X{rs2} EX/MEM X{mem_rd} (write {mem_write}) MEM/WB X{wb_rd} (write {wb_write})"
+    expected_a = forward_reference(rs1, mem_rd, mem_write, wb_rd, wb_write)
+    expected_b = forward_reference(rs2, mem_rd, mem_write, wb_rd, wb_write)
+    assert dut.forward_A_select.value.integer == expected_a, f"{state}: forward_A {dut.forward_A_select.value}"
+    assert dut.forward_B_select.value.integer == expected_b, f"{state}: forward_B {dut.forward_B_select.value}"
+
+
+@cocotb.test()
+@profiled
+async def forwarding_directed_test(dut):
+    """Each source, the EX/MEM priority and XZR."""
+    await check(dut, 1, 2, 3, 1, 4, 1)    # no match
+    await check(dut, 1, 2, 1, 1, 2, 1)    # A from EX/MEM, B from MEM/WB
+    await check(dut, 1, 2, 2, 1, 1, 1)    # A from MEM/WB, B from EX/MEM
+    await check(dut, 5, 5, 5, 1, 5, 1)    # both stages write X5: EX/MEM wins
+    await check(dut, 5, 5, 5, 0, 5, 1)    # EX/MEM does not write: MEM/WB
+    await check(dut, 5, 5, 5, 0, 5, 0)    # neither writes
+    await check(dut, XZR, XZR, XZR, 1, XZR, 1)  # XZR always reads zero
+
+
+@cocotb.test()
+@profiled
+async def forwarding_random_test(dut):
+    """Random register numbers drawn from a few registers, so matches are frequent."""
+    rng = test_rng()
+    regs = [0, 1, 2, 3, XZR]
+    for _ in range(500):
+        await check(dut, rng.choice(regs), rng.choice(regs), rng.choice(regs), rng.randrange(2),
+                    rng.choice(regs), rng.randrange(2))
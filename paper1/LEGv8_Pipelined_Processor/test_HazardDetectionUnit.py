@@ -0,0 +1,62 @@
+import cocotb
+from cocotb.triggers import Timer
+from verif.legv8p_iss import OP_ADDI, OP_B, OP_CBZ, OP_HALT, OP_LDUR, OP_R_TYPE, OP_STUR, XZR
+from verif.seeding import test_rng
+from verif.profiling import profiled
+
+# instr[31:21] of each instruction class (CB and B carry offset bits below their opcode)
+OPCODES = {
+    "R": OP_R_TYPE, "ADDI": OP_ADDI, "LDUR": OP_LDUR, "STUR": OP_STUR, "HALT": OP_HALT,
+    "CBZ": OP_CBZ << 3 | 0b101, "B": OP_B << 5 | 0b10011, "NOP": 0,
+}
+USES_RS1 = {"R", "ADDI", "LDUR", "STUR"}
+USES_RS2 = {"R", "STUR", "CBZ"}
+
+
+def hazard_reference(name, mem_read, ex_rd, rs1, rs2, branch_taken):
+    """(pc_stall, if_id_stall, id_ex_flush, if_id_flush)"""
+    load_use = bool(mem_read and ex_rd != XZR and
+                    ((name in USES_RS1 and rs1 == ex_rd) or (name in USES_RS2 and rs2 == ex_rd)))
+    return int(load_use), int(load_use), int(load_use or branch_taken), int(branch_taken)
+
+
+async def check(dut, name, mem_read, ex_rd, rs1, rs2, branch_taken):
+    dut.IF_ID_instr_opcode.value = OPCODES[name]
+    dut.ID_EX_MemRead.value = mem_read
+    dut.ID_EX_RD_addr.value = ex_rd
+    dut.IF_ID_RS1_addr.value = rs1
+    dut.IF_ID_RS2_addr.value = rs2
+    dut.EX_branch_taken.value = branch_taken
+    await Timer(1, units="ns")
+    actual = tuple(getattr(dut, s).value.integer for s in ("pc_stall", "if_id_stall", "id_ex_flush", "if_id_flush"))
+    expected = hazard_reference(name, mem_read, ex_rd, rs1, rs2, branch_taken)
+    assert actual == expected, (f"{name} rs1=X{rs1} rs2=X{rs2}, EX load {mem_read} X{ex_rd}, taken {branch_taken}: "
+                                f"expected {expected}, got {actual}")
+
+
+@cocotb.test()
+@profiled
+async def hazard_directed_test(dut):
+    """Load-use on each operand, operands an instruction does not read, XZR and taken branches."""
+    await check(dut, "R", 1, 3, 3, 4, 0)      # Rn
+    await check(dut, "R", 1, 4, 3, 4, 0)      # Rm
+    await check(dut, "STUR", 1, 4, 3, 4, 0)   # store data (Rt)
+    await check(dut, "CBZ", 1, 4, 3, 4, 0)    # CBZ tests Rt
+    await check(dut, "CBZ", 1, 3, 3, 4, 0)    # CBZ does not read Rn
+    await check(dut, "ADDI", 1, 4, 3, 4, 0)   # ADDI does not read Rm
+    await check(dut, "B", 1, 3, 3, 3, 0)
+    await check(dut, "HALT", 1, 3, 3, 3, 0)
+    await check(dut, "R", 0, 3, 3, 3, 0)      # not a load
+    await check(dut, "R", 1, XZR, XZR, XZR, 0)
+    await check(dut, "R", 0, 3, 3, 3, 1)      # taken branch: flush IF/ID and ID/EX
+
+
+@cocotb.test()
+@profiled
+async def hazard_random_test(dut):
+    """Random instruction classes and register numbers."""
+    rng = test_rng()
+    regs = [0, 1, 2, XZR]
+    for _ in range(500):
+        await check(dut, rng.choice(list(OPCODES)), rng.randrange(2), rng.choice(regs), rng.choice(regs),
+                    rng.choice(regs), int(rng.random() < 0.2))
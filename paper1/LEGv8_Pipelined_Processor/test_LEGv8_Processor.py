@@ -0,0 +1,107 @@
+import cocotb
+from cocotb.clock import Clock
+from verif import ipc, legv8p_asm
+from verif.batch import BATCH_PROGRAMS, Legv8pHarness, ProgramImage
+from verif.legv8p_asm import HALT, WORD_BYTES, encode_b, encode_cb, encode_d, encode_i, encode_r, random_program
+from verif.legv8p_iss import XZR, Legv8pISS
+from verif.minimize import MINIMIZE_IMAGES, replay_images
+from verif.seeding import test_rng
+from verif.profiling import profiled
+
+# Every hazard the pipeline resolves, in one program
+DIRECTED_PROGRAM = dict(enumerate([
+    encode_i("ADDI", 1, XZR, 100),             # 0: X1 = 100
+    encode_i("ADDI", 2, XZR, -3),              # 1: X2 = -3
+    encode_r("ADD", 3, 1, 2),                  # 2: X3 = 97       (X2 from EX/MEM, X1 from MEM/WB)
+    encode_r("SUB", 4, 3, 1),                  # 3: X4 = -3       (X3 from EX/MEM)
+    encode_d("STUR", 3, XZR, 2 * WORD_BYTES),  # 4: M[2] = 97     (store data from MEM/WB)
+    encode_d("LDUR", 5, XZR, 2 * WORD_BYTES),  # 5: X5 = 97
+    encode_r("ORR", 6, 5, 4),                  # 6: X6 = 97 | -3  (load-use stall)
+    encode_r("AND", 7, 6, 1),                  # 7: X7 = X6 & 100
+    encode_d("LDUR", 8, XZR, 0),               # 8: X8 = M[0] = 0
+    encode_cb("CBZ", 8, 3),                    # 9: taken -> 12   (load-use stall on Rt)
+    encode_i("ADDI", 9, XZR, 1),               # 10: flushed
+    encode_i("ADDI", 9, XZR, 2),               # 11: flushed
+    encode_cb("CBZ", 1, 2),                    # 12: not taken
+    encode_b("B", 2),                          # 13: -> 15
+    encode_i("ADDI", 10, XZR, 1),              # 14: flushed
+    encode_i("ADDI", XZR, XZR, 5),             # 15: XZR ignores writes
+    encode_r("ADD", 11, XZR, 1),               # 16: X11 = 100    (XZR is never forwarded)
+    encode_d("STUR", 11, XZR, 3 * WORD_BYTES), # 17: M[3] = 100
+    HALT,                                      # 18
+    encode_i("ADDI", 12, XZR, 1),              # 19: never executes
+]))
+
+
+@cocotb.test()
+@profiled
+async def legv8p_directed(dut):
+    """Forwarding, load-use stalls, taken and not-taken branches and HALT against the ISS, cycle exact."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    iss = Legv8pISS(DIRECTED_PROGRAM)
+    iss.run_to_halt()
+    mask = (1 << 64) - 1
+    assert iss.regs[3] == 97 and iss.regs[6] == (97 | -3) & mask and iss.regs[11] == 100, \
+        "the ISS disagrees with the listing"
+    assert iss.stalls == 2 and iss.taken == 2, f"{iss.stalls} stalls, {iss.taken} taken branches"
+
+    harness = Legv8pHarness(dut)
+    cycles, error = await harness.run(ProgramImage("directed", DIRECTED_PROGRAM, {}, 100))
+    assert error is None, error
+    assert cycles == iss.cycles
+    dut._log.info(f"directed: {iss.retired} instructions in {cycles} cycles "
+                  f"({iss.stalls} load-use stalls, {iss.taken} taken branches)")
+
+    # The debug port is the register file, X0 in the low bits (still in the harness's ReadOnly phase)
+    flat = dut.debug_reg_file_out.value.integer
+    for r in range(32):
+        assert (flat >> (64 * r)) & mask == iss.regs[r], f"debug_reg_file_out X{r}"
+    assert dut.halt_out.value == 1
+
+
+@cocotb.test()
+@profiled
+async def legv8p_batch_programs(dut):
+    """Run BATCH_PROGRAMS random programs back to back in this one simulation, each checked against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    images = [
+        ProgramImage(f"prog{i}", random_program(rng, rng.choice([8, 32, 128])),
+                     {rng.randrange(32): rng.getrandbits(64) for _ in range(rng.randrange(8))}, 10_000)
+        for i in range(BATCH_PROGRAMS)
+    ]
+    result = await Legv8pHarness(dut).run_batch(images)
+    assert not result.failures, f"{len(result.failures)} program(s) failed: {', '.join(result.failures)}"
+
+
+@cocotb.test()
+@profiled
+async def legv8p_ipc(dut):
+    """
+    IPC of the verif/ipc.py workloads (loop, array, chain, random), each
+    checked against the ISS; `python -m verif.ipc` compares them with the
+    multicycle core.
+    """
+    rng = test_rng(ipc.IPC_TEST_SEED_NAME)
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    harness = Legv8pHarness(dut)
+    records = []
+    for workload in ipc.workloads(legv8p_asm, rng):
+        image = ProgramImage(workload.name, workload.imem, workload.dmem, 10_000)
+        cycles, error = await harness.run(image)
+        assert error is None, error
+        iss = Legv8pISS(image.imem, image.dmem)
+        iss.run_to_halt(image.max_cycles)
+        records.append(ipc.IpcRecord(image.name, workload.kind, "pipelined", iss.retired, cycles))
+    for line in ipc.report(records):
+        dut._log.info(line)
+    if ipc.IPC_FILE:
+        ipc.write_records(ipc.IPC_FILE, records)
+
+
+@cocotb.test(skip=not MINIMIZE_IMAGES)
+@profiled
+async def legv8p_replay_images(dut):
+    """Verdicts for the candidate images of verif/minimize.py ($MINIMIZE_IMAGES); skipped otherwise."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await replay_images(Legv8pHarness(dut))
@@ -0,0 +1,48 @@
+import cocotb
+from cocotb.triggers import Timer
+from verif.seeding import test_rng
+from verif.profiling import profiled
+
+MASK = (1 << 64) - 1
+
+# imm_type_select (SignExtend IMM_*) -> (lowest bit, width) of the immediate field
+IMM_I, IMM_D, IMM_CB, IMM_B = range(4)
+FIELDS = {
+    IMM_I: (12, 9),   # ADDI: instr[20:12]
+    IMM_D: (12, 9),   # LDUR/STUR: instr[20:12]
+    IMM_CB: (5, 19),  # CBZ: instr[23:5]
+    IMM_B: (0, 26),   # B: instr[25:0]
+}
+
+
+def sign_extend_reference(instr, imm_type):
+    lsb, width = FIELDS[imm_type]
+    field = (instr >> lsb) & ((1 << width) - 1)
+    return (field - ((field >> (width - 1)) << width)) & MASK
+
+
+async def check(dut, instr, imm_type):
+    dut.instr_in.value = instr
+    dut.imm_type_select.value = imm_type
+    await Timer(1, units="ns")
+    expected = sign_extend_reference(instr, imm_type)
+    actual = dut.extended_imm_out.value.integer
+    assert actual == expected, f"instr 0x{instr:08X}, type {imm_type}: expected 0x{expected:X}, got 0x{actual:X}"
+
+
+@cocotb.test()
+@profiled
+async def sign_extend_directed_test(dut):
+    """The extreme values of every immediate field."""
+    for instr in (0, 0xFFFFFFFF, 0x000FF000, 0x00100000, 0x007FFFE0, 0x00800000, 0x01FFFFFF, 0x02000000):
+        for imm_type in FIELDS:
+            await check(dut, instr, imm_type)
+
+
+@cocotb.test()
+@profiled
+async def sign_extend_random_test(dut):
+    """Random instruction words with every immediate type."""
+    rng = test_rng()
+    for _ in range(400):
+        await check(dut, rng.getrandbits(32), rng.randrange(4))
@@ -0,0 +1,63 @@
+//
+// File: Lev8SoakTop.sv
+// Description: Free-running soak wrapper around Lev8SingleCycleProcessor.
+//   The clock is generated here (needs Verilator --timing, see Makefile), so a
+//   testbench only waits for `done` instead of driving every edge from Python.
+//   The run stops when the core halts (next PC == PC, e.g. a JUMP to itself)
+//   or when `max_cycles` instructions have retired (watchdog). The core clock
+//   is gated off once `done` is set, so the final state can be read back at
+//   leisure.
+//
+module Lev8SoakTop
+#(
+  parameter int HALF_PERIOD = 5
+)
+(
+  input  logic        rst,
+  input  logic [31:0] max_cycles,
+  output logic        done,
+  output logic        halted,
+  output logic [31:0] cycles,
+  output logic [3:0]  debug_pc_out
+);
+
+  logic clk = 1'b0;
+  always #(HALF_PERIOD) clk = ~clk;
+
+  logic core_clk;
+  assign core_clk = clk & ~done;
+
+  logic [15:0] instruction_w;
+  logic [7:0]  alu_result_w;
+  logic [7:0]  reg_write_data_w;
+
+  Lev8SingleCycleProcessor core (
+    .clk(core_clk),
+    .rst(rst),
+    .debug_pc_out(debug_pc_out),
+    .debug_instruction_out(instruction_w),
+    .debug_alu_result(alu_result_w),
+    .debug_reg_write_data(reg_write_data_w)
+  );
+
+  // The instruction retiring at this edge jumps to itself: nothing can change anymore
+  logic self_loop;
+  assign self_loop = (core.pc_next_addr_w == debug_pc_out);
+
+  always_ff @(posedge clk or posedge rst) begin
+    if (rst) begin
+      cycles <= '0;
+      halted <= 1'b0;
+      done   <= 1'b0;
+    end else if (!done) begin
+      cycles <= cycles + 1;
+      if (self_loop) begin
+        halted <= 1'b1;
+        done   <= 1'b1;
+      end else if (cycles + 1 >= max_cycles) begin
+        done   <= 1'b1;
+      end
+    end
+  end
+
+endmodule
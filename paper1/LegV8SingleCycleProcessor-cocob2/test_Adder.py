@@ -1,9 +1,11 @@
 import cocotb
 from cocotb.triggers import Timer
 from cocotb.result import TestFailure
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def adder_basic_test(dut):
     """Test the Adder with basic addition cases."""
 
@@ -34,6 +36,7 @@ async def adder_basic_test(dut):
     dut._log.info("Basic adder test completed successfully")
 
 @cocotb.test()
+@profiled
 async def adder_overflow_test(dut):
     """Test the Adder with cases that cause 8-bit overflow (wrap-around)."""
 
@@ -65,15 +68,17 @@ async def adder_overflow_test(dut):
     dut._log.info("Overflow adder test completed successfully")
 
 @cocotb.test()
+@profiled
 async def adder_random_test(dut):
     """Test the Adder with a large number of random inputs."""
+    rng = test_rng()
 
     dut._log.info("Starting random adder test")
 
     num_tests = 1000
     for i in range(num_tests):
-        in1_val = random.randint(0, 255)
-        in2_val = random.randint(0, 255)
+        in1_val = rng.randint(0, 255)
+        in2_val = rng.randint(0, 255)
 
         dut.in1.value = in1_val
         dut.in2.value = in2_val
@@ -10,6 +10,8 @@
 #
 import cocotb
 from cocotb.triggers import Timer, ReadOnly
+from verif.coverage_models import lev8_control_model
+from verif.profiling import profiled
 
 # Define opcodes
 OP_R_TYPE = 0b0000
@@ -58,11 +60,13 @@ async def check_control_signals(dut, expected_signals, test_name=""):
 
 
 @cocotb.test()
+@profiled
 async def control_unit_test(dut):
     """
     Testbench for the ControlUnit module.
     """
     dut._log.info("Starting ControlUnit testbench")
+    cov = lev8_control_model()
 
     # Test cases with 'pc_src_sel' removed
     test_cases = [
@@ -112,5 +116,8 @@ async def control_unit_test(dut):
         dut.opcode.value = opcode
         await Timer(1, units="ns")  # Allow combinational logic to settle
         await check_control_signals(dut, expected, name)
+        cov["opcode"].sample(opcode)
 
+    cov.save()
+    dut._log.info(cov.report())
     dut._log.info("ControlUnit testbench finished successfully")
\ No newline at end of file
@@ -1,17 +1,20 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, ReadOnly, NextTimeStep
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 # A sentinel value to represent an uninitialized ('X') memory state
 UNINITIALIZED = -1
 
 @cocotb.test()
+@profiled
 async def test_data_memory(dut):
     """
     Test the DataMemory module for correct write and read operations.
     Handles uninitialized 'X' states and "Write-First" memory behavior.
     """
+    rng = test_rng()
 
     # 1. Clock Generation
     clock = Clock(dut.clk, 10, units="ns")
@@ -128,10 +131,10 @@ async def test_data_memory(dut):
     assert actual_data == 0, f"Read from unwritten 0x{unwritten_addr:02X}: Expected 0, Got {actual_data}"
 
     for i in range(100):
-        op_type = random.choice(["write", "read"])
-        addr = random.choice([x for x in range(256) if x != 0x05])
+        op_type = rng.choice(["write", "read"])
+        addr = rng.choice([x for x in range(256) if x != 0x05])
         if op_type == "write":
-            data = random.randint(0, 255)
+            data = rng.randint(0, 255)
             await perform_write(addr, data)
         else:
             read_val = await perform_read(addr)
@@ -1,15 +1,18 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import Timer
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 
 @cocotb.test()
+@profiled
 async def test_instruction_memory(dut):
     """
     Test the InstructionMemory module (byte-addressable version).
     Memory is pre-initialized in the testbench by writing two 8-bit halves per instruction.
     """
+    rng = test_rng()
 
     # Start a dummy clock for consistency with the design
     clock = Clock(dut.clk, 10, units="ns")
@@ -62,7 +65,7 @@ async def test_instruction_memory(dut):
     # Test 5 random even addresses (excluding special ones)
     for _ in range(5):
         while True:
-            rand_addr = random.randrange(0, 254, 2)
+            rand_addr = rng.randrange(0, 254, 2)
             if rand_addr not in [0, 10, 254]:
                 break
         expected = rand_addr + 0x1000
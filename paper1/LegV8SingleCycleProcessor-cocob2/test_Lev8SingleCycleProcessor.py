@@ -1,6 +1,17 @@
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import RisingEdge
+from verif.batch import BATCH_PROGRAMS, Lev8Harness, ProgramImage
+from verif.coverage_models import lev8_core_model
+from verif.lev8_asm import random_program
+from verif.lev8_fuzz import FUZZ_CYCLES, FUZZ_ITERATIONS, Lev8Fuzzer, image, write_crash
+from verif.lev8_iss import Lev8ISS
+from verif.minimize import MINIMIZE_IMAGES, replay_images
+from verif.monitors import Scoreboard, lev8_retire_monitor
+from verif.seeding import test_rng
+from verif.trace import monitor_trace
+from verif.tracediff import DIVERGE_CHECKPOINTS, replay_window
+from verif.profiling import profiled
 
 # Opcodes MATCHING the ControlUnit.sv
 OPCODE_R_TYPE = 0b0000
@@ -45,16 +56,14 @@ def decode_instruction(instruction_val):
     return opcode, rs1_addr, rs2_addr, rd_addr, immediate, sign_extended_immediate, jump_addr_8bit
 
 @cocotb.test()
+@profiled
 async def lev8_processor_test(dut):
     """Test the Lev8 Single Cycle Processor with a simple program."""
     clock = Clock(dut.clk, 10, units="ns")
     cocotb.start_soon(clock.start())
 
-    expected_regs = {i: 0 for i in range(8)}
     expected_mem = {i: 0 for i in range(256)}
     expected_mem[20] = 0xAA # Pre-load data for the LW test
-    current_pc = 0
-
     dut.rst.value = 1
     
     # Initialize Instruction Memory
@@ -78,79 +87,39 @@ async def lev8_processor_test(dut):
     
     dut._log.info("--- Reset complete, starting program execution ---")
 
-    for cycle in range(15):
-        dut._log.info(f"\n--- Cycle {cycle} ---")
-        
-        await Timer(1, units="ns") 
-
-        assert dut.debug_pc_out.value.integer == current_pc
-        dut._log.info(f"assert equality")
-        expected_instruction = IM_CONTENT.get(current_pc, 0x0000)
-        assert dut.debug_instruction_out.value.integer == expected_instruction
-
-        dut._log.info(f"  PC: {current_pc} | Instruction: 0x{dut.debug_instruction_out.value.integer:04X}")
-
-        opcode, rs1_addr, rs2_addr, rd_addr, immediate, sign_extended_immediate, jump_addr_8bit = \
-            decode_instruction(expected_instruction)
-
-        src1_val = expected_regs.get(rs1_addr, 0)
-        expected_alu_result = 0
-        predicted_reg_write_data = 0
-        next_pc = (current_pc + 2) & 0xFF
-
-        if opcode == OPCODE_ADDI:
-            alu_src2 = sign_extended_immediate
-            expected_alu_result = (src1_val + alu_src2) & 0xFF
-            predicted_reg_write_data = expected_alu_result
-            if rd_addr != 0: expected_regs[rd_addr] = predicted_reg_write_data
-        elif opcode == OPCODE_R_TYPE:
-            alu_src2 = expected_regs.get(rs2_addr, 0)
-            expected_alu_result = (src1_val + alu_src2) & 0xFF
-            predicted_reg_write_data = expected_alu_result
-            if rd_addr != 0: expected_regs[rd_addr] = predicted_reg_write_data
-        elif opcode == OPCODE_LW:
-            dut._log.info(f"Beginning of LW ... ")
-            alu_src2 = sign_extended_immediate
-            mem_addr = (src1_val + alu_src2) & 0xFF
-            expected_alu_result = mem_addr
-            predicted_reg_write_data = expected_mem.get(mem_addr, 0)
-            if rd_addr != 0: expected_regs[rd_addr] = predicted_reg_write_data
-            dut._log.info(f"End of LW ... ")
-        elif opcode == OPCODE_SW:
-            alu_src2 = sign_extended_immediate
-            mem_addr = (src1_val + alu_src2) & 0xFF
-            data_to_write = expected_regs.get(rs2_addr, 0)
-            expected_mem[mem_addr] = data_to_write
-            expected_alu_result = mem_addr
-        elif opcode == OPCODE_BEQ:
-            src2_val = expected_regs.get(rs2_addr, 0)
-            expected_alu_result = (src1_val - src2_val) & 0xFF
-            if expected_alu_result == 0:
-                next_pc = (current_pc + 2 + sign_extended_immediate) & 0xFF
-        elif opcode == OPCODE_JUMP:
-            next_pc = jump_addr_8bit
-        
-        # Log the prediction AFTER it's been calculated
-        dut._log.info(f"  PREDICT: ALU_res={expected_alu_result}, RegWriteData={predicted_reg_write_data}, NextPC={next_pc}")
-
-        assert dut.debug_alu_result.value.integer == expected_alu_result
-        if opcode in WRITE_BACK_OPCODES:
-            assert dut.debug_reg_write_data.value.integer == predicted_reg_write_data
-
-        dut._log.info(f"  ASSERT: OK")
-        
-        dut._log.info(f"Just before RisingEdge")
-        await RisingEdge(dut.clk)
-        dut._log.info(f"Just After RisingEdge")
-       
-        current_pc = next_pc
-        
-        if cycle > 8 and current_pc == 0:
-            dut._log.info("\n--- Program has looped back to PC 0, ending test. ---")
-            break
+    # One retire monitor feeds the ISS scoreboard, coverage and the log;
+    # a mismatch fails the test at the cycle it happens.
+    iss = Lev8ISS(IM_CONTENT, expected_mem)
+    cov = lev8_core_model()
+    monitor = lev8_retire_monitor(dut)
+    monitor.subscribe(Scoreboard(iss.step, log=dut._log, name="lev8_scoreboard"))
+
+    @monitor.subscribe
+    def sample_coverage(txn):
+        opcode, rs1_addr, rs2_addr, _, _, _, _ = decode_instruction(txn.instr)
+        cov.sample(opcode=opcode, rs1=rs1_addr, rs2=rs2_addr)
+        if opcode == OPCODE_BEQ:
+            cov["beq"].sample(txn.next_pc != ((txn.pc + 2) & 0xF))
+
+    @monitor.subscribe
+    def log_retire(txn):
+        dut._log.info(f"  Retired PC: {txn.pc} | Instruction: 0x{txn.instr:04X} | "
+                      f"ALU_res={txn.alu_result}, RegWriteData={txn.reg_write_data}, NextPC={txn.next_pc}")
+
+    trace = monitor_trace(monitor, "lev8", "lev8_processor_test")
+    monitor.start()
+
+    # Run until the program has looped back to PC 0 for the second time
+    await monitor.wait_for(lambda txn: monitor.count > 8 and txn.next_pc == 0, max_transactions=15)
+    monitor.stop()
+    if trace:
+        trace.close()
+    dut._log.info("\n--- Program has looped back to PC 0, ending test. ---")
 
     dut._log.info("\n--- Test Finished ---")
-    assert current_pc == 0
+    expected_regs = iss.regs
+    expected_mem = iss.dmem
+    assert iss.pc == 0
     assert expected_regs[1] == 5
     assert expected_regs[2] == 10
     assert expected_regs[3] == 15
@@ -158,4 +127,67 @@ async def lev8_processor_test(dut):
     assert expected_mem[25] == 15
     dut._log.info(f"Final Regs OK: R1={expected_regs[1]}, R2={expected_regs[2]}, R3={expected_regs[3]}, R4={expected_regs[4]}")
     dut._log.info(f"Final Mem OK: Mem[25]={expected_mem[25]}")
+    cov.save()
+    dut._log.info(cov.report())
     dut._log.info("Testbench passed successfully!")
+
+
+@cocotb.test()
+@profiled
+async def lev8_batch_programs(dut):
+    """Run BATCH_PROGRAMS random programs back to back in this one simulation, each checked against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    images = [
+        ProgramImage(f"prog{i}", random_program(rng),
+                     {rng.randrange(256): rng.randrange(256) for _ in range(rng.randrange(16))},
+                     rng.randrange(16, 256))
+        for i in range(BATCH_PROGRAMS)
+    ]
+    result = await Lev8Harness(dut).run_batch(images)
+    assert not result.failures, f"{len(result.failures)} program(s) failed: {', '.join(result.failures)}"
+
+
+@cocotb.test()
+@profiled
+async def lev8_fuzz(dut):
+    """Coverage-guided fuzzing: mutants that reach new control-path coverage run on the RTL against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    fuzzer = Lev8Fuzzer(rng)
+    harness = Lev8Harness(dut)
+    dut._log.info(f"Fuzzer start: {fuzzer.summary()}")
+
+    crashes = []
+    rtl_runs = 0
+    for i in range(FUZZ_ITERATIONS):
+        entry = fuzzer.mutate(rng.choice(fuzzer.corpus))
+        # New coverage always goes to the RTL; 1% of the rest as a sanity sample
+        if not fuzzer.add(entry) and rng.random() >= 0.01:
+            continue
+        imem, dmem = image(entry)
+        _, error = await harness.run(ProgramImage(f"fuzz{i}", imem, dmem, FUZZ_CYCLES))
+        rtl_runs += 1
+        if error:
+            crashes.append(write_crash(entry, error))
+
+    fuzzer.save()
+    fuzzer.coverage_model().save()
+    dut._log.info(f"Fuzzer end: {fuzzer.summary()}, {rtl_runs} RTL runs")
+    assert not crashes, f"{len(crashes)} mismatching program(s) saved: {', '.join(crashes)}"
+
+
+@cocotb.test(skip=not MINIMIZE_IMAGES)
+@profiled
+async def lev8_replay_images(dut):
+    """Verdicts for the candidate images of verif/minimize.py ($MINIMIZE_IMAGES); skipped otherwise."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await replay_images(Lev8Harness(dut))
+
+
+@cocotb.test(skip=not DIVERGE_CHECKPOINTS)
+@profiled
+async def lev8_replay_window(dut):
+    """Replay the failing window of a checkpointed soak run ($DIVERGE_CHECKPOINTS) and report the first divergence."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await replay_window(Lev8Harness(dut), lev8_retire_monitor(dut))
@@ -0,0 +1,65 @@
+import cocotb
+from verif.lev8_asm import encode_i, encode_jump, encode_r, load_program, random_program
+from verif.lev8_iss import DMEM_SIZE, NUM_REGS, OPCODE_ADDI, OPCODE_BEQ, Lev8ISS
+from verif.seeding import test_rng
+from verif.soak import SOAK_CHECKPOINT_EVERY, SOAK_CYCLES, compare_state, read_array, run_to_done
+from verif.tracediff import soak_checkpoints
+from verif.profiling import profiled
+
+
+def check_final_state(dut, iss):
+    compare_state("regs", read_array(dut.core.RF_inst.registers, NUM_REGS), iss.regs, log=dut._log)
+    compare_state("dmem", read_array(dut.core.DM_inst.mem, DMEM_SIZE), iss.dmem, log=dut._log)
+
+
+@cocotb.test()
+@profiled
+async def lev8_soak_random_loop(dut):
+    """Run a random looping program for SOAK_CYCLES instructions, then compare state with the ISS."""
+    # The 4-bit PC limits a Lev8 program to 8 instructions, so the soak program
+    # is a short loop that keeps rewriting registers and memory until the watchdog.
+    rng = test_rng()
+    dut.rst.value = 1
+    program = random_program(rng)
+    dmem = [rng.randrange(256) for _ in range(DMEM_SIZE)]
+    load_program(dut.core, program, dmem)
+
+    checkpoints = soak_checkpoints(dut, "lev8", "lev8_soak_random_loop", SOAK_CHECKPOINT_EVERY)
+    result = await run_to_done(dut, SOAK_CYCLES, dut.rst, reset_active=1, on_checkpoint=checkpoints)
+
+    iss = Lev8ISS(program, dict(enumerate(dmem)))
+    for _ in range(result.cycles):
+        iss.step()
+    if result.halted:
+        assert iss.pc == dut.debug_pc_out.value.integer, "DUT halted at a different PC than the ISS"
+    else:
+        assert result.cycles == SOAK_CYCLES, f"Watchdog stopped after {result.cycles} cycles"
+    check_final_state(dut, iss)
+
+
+@cocotb.test()
+@profiled
+async def lev8_soak_halt(dut):
+    """A countdown loop that ends in a JUMP to itself stops the soak top before the watchdog."""
+    dut.rst.value = 1
+    program = {
+        0:  encode_i(OPCODE_ADDI, 0, 2, 30),  # ADDI R2, R0, 30
+        2:  encode_i(OPCODE_ADDI, 2, 2, -1),  # loop: ADDI R2, R2, -1
+        4:  encode_r(3, 2, 3),                # ADD  R3, R3, R2
+        6:  encode_i(OPCODE_BEQ, 2, 0, 2),    # BEQ  R2, R0, +2 (-> 10)
+        8:  encode_jump(2),                   # JUMP loop
+        10: encode_jump(10),                  # halt: JUMP 10
+    }
+    load_program(dut.core, program, [0] * DMEM_SIZE)
+
+    result = await run_to_done(dut, SOAK_CYCLES, dut.rst, reset_active=1)
+
+    iss = Lev8ISS(program)
+    while iss.pc != 10:
+        iss.step()
+    iss.step()  # the halting JUMP retires once
+    assert result.halted, "Soak top did not detect the JUMP-to-self halt"
+    assert result.cycles == iss.retired, f"Retired {result.cycles} instructions, ISS {iss.retired}"
+    assert dut.debug_pc_out.value == 10, f"Halted at PC {dut.debug_pc_out.value.integer}, expected 10"
+    assert iss.regs[3] == sum(range(30)) & 0xFF
+    check_final_state(dut, iss)
@@ -1,10 +1,13 @@
 import cocotb
 from cocotb.triggers import Timer
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def test_mux2to1(dut):
     """Test the Mux2to1 module thoroughly for all selection and data cases."""
+    rng = test_rng()
 
     cocotb.log.info("Starting Mux2to1 testbench")
 
@@ -64,9 +67,9 @@ async def test_mux2to1(dut):
     # Run a series of random tests to increase coverage
     num_random_tests = 100
     for i in range(num_random_tests):
-        in0_val = random.randint(0, 255) # 8-bit value
-        in1_val = random.randint(0, 255) # 8-bit value
-        sel_val = random.randint(0, 1)   # 1-bit value
+        in0_val = rng.randint(0, 255) # 8-bit value
+        in1_val = rng.randint(0, 255) # 8-bit value
+        sel_val = rng.randint(0, 1)   # 1-bit value
 
         dut.in0.value = in0_val
         dut.in1.value = in1_val
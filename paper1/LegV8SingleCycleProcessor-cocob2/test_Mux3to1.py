@@ -1,10 +1,13 @@
 import cocotb
 from cocotb.triggers import Timer
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def test_mux3to1(dut):
     """Test the Mux3to1 module thoroughly for all select cases and random data."""
+    rng = test_rng()
 
     cocotb.log.info("Starting Mux3to1 testbench")
 
@@ -15,9 +18,9 @@ async def test_mux3to1(dut):
     for sel_val in select_values:
         cocotb.log.info(f"Testing with sel = {bin(sel_val)}")
         for i in range(10): # Run 10 random data tests for each sel value
-            in0_val = random.randint(0, 255)
-            in1_val = random.randint(0, 255)
-            in2_val = random.randint(0, 255)
+            in0_val = rng.randint(0, 255)
+            in1_val = rng.randint(0, 255)
+            in2_val = rng.randint(0, 255)
 
             # Assign inputs
             dut.in0.value = in0_val
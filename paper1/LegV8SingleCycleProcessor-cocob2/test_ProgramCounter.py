@@ -1,8 +1,10 @@
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def test_program_counter(dut):
     """Test the ProgramCounter module."""
 
@@ -1,8 +1,10 @@
 import cocotb
 from cocotb.triggers import Timer
 from cocotb.binary import BinaryValue
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def test_sign_extender(dut):
     """Test the SignExtender module for all possible 6-bit inputs."""
 
@@ -0,0 +1,69 @@
+//
+// File: RISCSoakTop.sv
+// Description: Free-running soak wrapper around RISC_Processor.
+//   The clock is generated here (needs Verilator --timing, see Makefile), so a
+//   testbench only waits for `done` instead of driving every edge from Python.
+//   The run stops when the core halts (the ProgramCounter holds, which is what
+//   JAL/JALR do in this core) or when `max_cycles` instructions have retired
+//   (watchdog). The core clock is gated off once `done` is set, so the final
+//   state can be read back at leisure.
+//
+module RISCSoakTop
+#(
+  parameter int HALF_PERIOD = 5
+)
+(
+  input  logic        rst_n,
+  input  logic [31:0] max_cycles,
+  output logic        done,
+  output logic        halted,
+  output logic [31:0] cycles,
+  output logic [31:0] debug_pc
+);
+
+  logic clk = 1'b0;
+  always #(HALF_PERIOD) clk = ~clk;
+
+  logic core_clk;
+  assign core_clk = clk & ~done;
+
+  logic [31:0] instr_w;
+  logic [31:0] reg_x10_w;
+  logic [31:0] reg_x11_w;
+  logic        reg_write_en_w;
+  logic [2:0]  alu_op_w;
+  logic [31:0] immediate_w;
+
+  RISC_Processor core (
+    .clk(core_clk),
+    .rst_n(rst_n),
+    .debug_pc(debug_pc),
+    .debug_instr(instr_w),
+    .debug_reg_x10(reg_x10_w),
+    .debug_reg_x11(reg_x11_w),
+    .debug_reg_write_en(reg_write_en_w),
+    .debug_alu_op(alu_op_w),
+    .debug_immediate(immediate_w)
+  );
+
+  // The instruction retiring at this edge leaves the PC where it is
+  logic self_loop;
+  assign self_loop = (core.programcounter_inst.pc_next_val == debug_pc);
+
+  always_ff @(posedge clk or negedge rst_n) begin
+    if (!rst_n) begin
+      cycles <= '0;
+      halted <= 1'b0;
+      done   <= 1'b0;
+    end else if (!done) begin
+      cycles <= cycles + 1;
+      if (self_loop) begin
+        halted <= 1'b1;
+        done   <= 1'b1;
+      end else if (cycles + 1 >= max_cycles) begin
+        done   <= 1'b1;
+      end
+    end
+  end
+
+endmodule
@@ -2,7 +2,13 @@ import cocotb
 from cocotb.triggers import Timer
 from cocotb.binary import BinaryValue
 from enum import IntEnum
-import random
+from verif.seeding import test_rng
+from verif.closure import run_until_closed
+from verif.coverage_models import RISCV_ALU_OPS, riscv_alu_model
+from verif.profiling import profiled
+
+# Every operation the test drives, directed and random, is sampled here and saved at the end
+cov = riscv_alu_model()
 
 # Define ALU operation codes as an IntEnum for readability
 class AluOp(IntEnum):
@@ -35,6 +41,45 @@ def to_unsigned(val, width):
     # Ensure the result fits within the width
     # return val & ((1 << width) - 1) # This is implicitly handled by Python's int behavior for positive numbers
 
+def alu_reference(op_a, op_b, op_code, data_width):
+    """Expected ALU result, matching the Verilog behavior (shift amount is operand_b[4:0])."""
+    max_unsigned = (1 << data_width) - 1
+    shift_amount = op_b & ((1 << (data_width.bit_length() - 1)) - 1)
+    if op_code == AluOp.ADD:
+        return (op_a + op_b) & max_unsigned
+    elif op_code == AluOp.SUB:
+        return (op_a - op_b) & max_unsigned
+    elif op_code == AluOp.AND:
+        return op_a & op_b
+    elif op_code == AluOp.OR:
+        return op_a | op_b
+    elif op_code == AluOp.XOR:
+        return op_a ^ op_b
+    elif op_code == AluOp.SLT:
+        return 1 if to_signed(op_a, data_width) < to_signed(op_b, data_width) else 0
+    elif op_code == AluOp.SLL:
+        return (op_a << shift_amount) & max_unsigned
+    elif op_code == AluOp.SRL:
+        return (op_a >> shift_amount) & max_unsigned
+    # Default case in Verilog is result_int = '0;
+    return 0
+
+def pick_operands(op_code, want_zero, rng, data_width):
+    """
+    Choose operands that steer `op_code` towards the requested zero flag.
+    Candidates derived from operand_a (equal, negated, complemented, wide
+    shifts) make the rare zero results (e.g. ADD to 0, OR of 0|0) cheap to
+    reach with 32-bit operands.
+    """
+    max_unsigned = (1 << data_width) - 1
+    for _ in range(64):
+        op_a = rng.choice([0, 1 << (data_width - 1), rng.randint(0, max_unsigned)])
+        op_b = rng.choice([op_a, (-op_a) & max_unsigned, ~op_a & rng.randint(0, max_unsigned), 0,
+                           rng.randint(0, data_width - 1), rng.randint(0, max_unsigned)])
+        if (alu_reference(op_a, op_b, op_code, data_width) == 0) == bool(want_zero):
+            return op_a, op_b
+    return rng.randint(0, max_unsigned), rng.randint(0, max_unsigned)
+
 async def drive_and_check(dut, operand_a, operand_b, alu_op, expected_result, expected_zero, data_width):
     """
     Drives inputs to the DUT, waits for combinational logic propagation,
@@ -60,13 +105,17 @@ async def drive_and_check(dut, operand_a, operand_b, alu_op, expected_result, ex
     assert actual_zero == expected_zero, \
         f"Zero flag mismatch for A={operand_a:#x}, B={operand_b:#x}, Op={AluOp(alu_op).name}. " \
         f"Expected {expected_zero}, got {actual_zero}"
+    cov.sample(alu_op=int(alu_op), zero=actual_zero)
+    return actual_zero
 
 @cocotb.test()
+@profiled
 async def test_alu(dut):
     """
     Thorough testbench for the ALU module, covering various operations,
     edge cases, and randomized inputs.
     """
+    rng = test_rng()
 
     # Get DATA_WIDTH from the DUT's parameter
     DATA_WIDTH = int(dut.DATA_WIDTH.value)
@@ -76,7 +125,6 @@ async def test_alu(dut):
     MAX_UNSIGNED = (1 << DATA_WIDTH) - 1
     MAX_SIGNED = (1 << (DATA_WIDTH - 1)) - 1
     MIN_SIGNED = -(1 << (DATA_WIDTH - 1))
-    SHIFT_MASK = (1 << (DATA_WIDTH.bit_length() - 1)) - 1 # For 32-bit, this is 0x1F (5 bits)
 
     # Initial values for all inputs
     dut.operand_a.value = 0
@@ -158,43 +206,31 @@ async def test_alu(dut):
     await drive_and_check(dut, MAX_UNSIGNED, DATA_WIDTH - 1, AluOp.SRL, (MAX_UNSIGNED >> (DATA_WIDTH - 1)) & MAX_UNSIGNED, 0, DATA_WIDTH)
 
     cocotb.log.info("--- Random Tests ---")
-    for i in range(200): # Run 200 random tests
-        op_a = random.randint(0, MAX_UNSIGNED)
-        op_b = random.randint(0, MAX_UNSIGNED)
-        op_code = random.choice(list(AluOp))
-
-        expected_res = 0
-        expected_zero = 0
-
-        if op_code == AluOp.ADD:
-            expected_res = (op_a + op_b) & MAX_UNSIGNED
-        elif op_code == AluOp.SUB:
-            expected_res = (op_a - op_b) & MAX_UNSIGNED
-        elif op_code == AluOp.AND:
-            expected_res = (op_a & op_b) & MAX_UNSIGNED
-        elif op_code == AluOp.OR:
-            expected_res = (op_a | op_b) & MAX_UNSIGNED
-        elif op_code == AluOp.XOR:
-            expected_res = (op_a ^ op_b) & MAX_UNSIGNED
-        elif op_code == AluOp.SLT:
-            # Convert operands to signed for comparison
-            signed_a = to_signed(op_a, DATA_WIDTH)
-            signed_b = to_signed(op_b, DATA_WIDTH)
-            expected_res = 1 if signed_a < signed_b else 0
-        elif op_code == AluOp.SLL:
-            # Shift amount is lower 5 bits for 32-bit data, or DATA_WIDTH.bit_length() - 1 for generic width
-            shift_amount = op_b & SHIFT_MASK
-            expected_res = (op_a << shift_amount) & MAX_UNSIGNED
-        elif op_code == AluOp.SRL:
-            # Shift amount is lower 5 bits for 32-bit data, or DATA_WIDTH.bit_length() - 1 for generic width
-            shift_amount = op_b & SHIFT_MASK
-            expected_res = (op_a >> shift_amount) & MAX_UNSIGNED
+    # The random phase closes its own copy of the model, so it still runs
+    # when the directed tests have already covered every bin.
+    closure_cov = riscv_alu_model()
+
+    # Run until every ALU op has produced both zero and non-zero results
+    # (or the CLOSURE_* budget runs out), biased towards the missing bins.
+    async def random_vector(i, target):
+        if "alu_op" in target:
+            op_code = AluOp(RISCV_ALU_OPS.index(target["alu_op"]))
+        else:
+            op_code = rng.choice(list(AluOp))
+        if "zero" in target:
+            op_a, op_b = pick_operands(op_code, target["zero"], rng, DATA_WIDTH)
         else:
-            # Default case in Verilog is result_int = '0;
-            expected_res = 0
+            op_a = rng.randint(0, MAX_UNSIGNED)
+            op_b = rng.randint(0, MAX_UNSIGNED)
 
+        expected_res = alu_reference(op_a, op_b, op_code, DATA_WIDTH)
         expected_zero = 1 if expected_res == 0 else 0
 
-        await drive_and_check(dut, op_a, op_b, op_code, expected_res, expected_zero, DATA_WIDTH)
+        actual_zero = await drive_and_check(dut, op_a, op_b, op_code, expected_res, expected_zero, DATA_WIDTH)
+        closure_cov.sample(alu_op=int(op_code), zero=actual_zero)
+
+    await run_until_closed(closure_cov, random_vector, rng, log=cocotb.log)
 
+    cov.save()
+    cocotb.log.info(cov.report())
     cocotb.log.info("All ALU tests passed successfully!")
\ No newline at end of file
@@ -1,6 +1,8 @@
 import cocotb
 from cocotb.triggers import Timer
 from cocotb.binary import BinaryValue
+from verif.coverage_models import riscv_control_model
+from verif.profiling import profiled
 
 # --- RISC-V ISA Constants (from RISC_ISA_pkg) ---
 # Opcodes
@@ -48,6 +50,10 @@ WB_SRC_ALU = BinaryValue("00", n_bits=2)
 WB_SRC_MEM = BinaryValue("01", n_bits=2)
 
 
+# Filled in by check_control_signals() and saved at the end of the test
+cov = riscv_control_model()
+
+
 async def check_control_signals(dut, opcode, funct3, funct7, alu_zero_flag, expected_outputs, test_name):
     """
     Helper function to set inputs, wait, and assert expected outputs.
@@ -67,10 +73,12 @@ async def check_control_signals(dut, opcode, funct3, funct7, alu_zero_flag, expe
         assert actual_value == expected_value, \
             f"{test_name}: {signal} mismatch! Expected {expected_value}, got {actual_value}"
 
+    cov.sample(instr=(int(funct7, 2) << 25) | int(opcode, 2), zero=alu_zero_flag)
     cocotb.log.info(f"--- Test Case: {test_name} PASSED ---")
 
 
 @cocotb.test()
+@profiled
 async def control_unit_test(dut):
     """Test the ControlUnit module thoroughly based on the corrected HDL."""
 
@@ -143,4 +151,6 @@ async def control_unit_test(dut):
     b_beq_not_taken_outputs['pc_next_sel'] = PC_SRC_INC # Stays PC+4
     await check_control_signals(dut, OP_BRANCH, FUNCT3_BEQ, FUNCT7_ADD, 0, b_beq_not_taken_outputs, "B-type BEQ (not taken)")
 
+    cov.save()
+    cocotb.log.info(cov.report())
     cocotb.log.info("All ControlUnit tests completed successfully!")
\ No newline at end of file
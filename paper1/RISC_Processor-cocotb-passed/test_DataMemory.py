@@ -3,6 +3,7 @@ from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
 from cocotb.binary import BinaryValue
 import random
+from verif.profiling import profiled
 
 # Helper function for a robust, synchronous reset
 async def reset_dut(dut):
@@ -17,6 +18,7 @@ async def reset_dut(dut):
     dut._log.info("DUT reset.")
 
 @cocotb.test()
+@profiled
 async def test_data_memory_combinational_read(dut):
     """
     Test for a DataMemory module with a combinational (asynchronous) read
@@ -1,6 +1,7 @@
 import cocotb
 from cocotb.triggers import Timer
 from cocotb.binary import BinaryValue
+from verif.profiling import profiled
 
 def sign_extend(value, num_bits, data_width):
     """
@@ -17,6 +18,7 @@ def sign_extend(value, num_bits, data_width):
         return value
 
 @cocotb.test()
+@profiled
 async def immediate_generator_test(dut):
     """Test the ImmediateGenerator module for various immediate types."""
 
@@ -2,9 +2,11 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, RisingEdge
 import os
-import random
+from verif.seeding import test_rng
+from verif.profiling import profiled
 
 @cocotb.test()
+@profiled
 async def test_instruction_memory(dut):
     """
     Testbench for the InstructionMemory module.
@@ -12,6 +14,7 @@ async def test_instruction_memory(dut):
     based on the provided address, matching the content of a dynamically
     generated instruction_memory.hex file.
     """
+    rng = test_rng()
 
     # --- Testbench Parameters (must match design's derived parameters) ---
     # These parameters are derived from the design's default IMEM_DEPTH_WORDS=1024
@@ -84,11 +87,10 @@ async def test_instruction_memory(dut):
 
     # 2. Test a selection of random addresses
     dut._log.info("Testing a selection of random addresses...")
-    random.seed(42) # For reproducibility of random tests
     num_random_tests = min(50, IMEM_DEPTH_WORDS) # Test up to 50 random addresses
 
     for _ in range(num_random_tests):
-        addr = random.randint(0, IMEM_DEPTH_WORDS - 1)
+        addr = rng.randint(0, IMEM_DEPTH_WORDS - 1)
 
         dut._log.info(f"Testing random address: {addr}")
         dut.addr.value = addr
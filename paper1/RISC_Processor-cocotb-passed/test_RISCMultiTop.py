@@ -0,0 +1,48 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge, ReadOnly, RisingEdge
+from verif.multicore import MULTI_CYCLES, cores
+from verif.riscv_asm import INNER_LOOP_INSTRUCTIONS, countdown_program, load_program
+from verif.riscv_iss import DMEM_WORDS, NUM_REGS, RiscvISS
+from verif.seeding import test_rng
+from verif.soak import compare_state, read_array
+from verif.profiling import profiled
+
+
+@cocotb.test()
+@profiled
+async def risc_multi_countdown(dut):
+    """NUM_CORES countdown programs of different lengths run for MULTI_CYCLES cycles; every core is checked against its ISS."""
+    rng = test_rng()
+    handles = cores(dut)
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    dut.rst_n.value = 0
+
+    models = []
+    for core in handles:
+        inner = rng.randrange(8, 64)
+        # Some cores halt early and sit on their JAL, others are cut off by MULTI_CYCLES
+        outer = max(1, min(2047, rng.randrange(MULTI_CYCLES // 2, 2 * MULTI_CYCLES)
+                           // (inner * INNER_LOOP_INSTRUCTIONS)))
+        program = countdown_program(outer, inner)
+        dmem = [rng.getrandbits(32) for _ in range(DMEM_WORDS)]
+        load_program(core, program, dmem)
+        models.append(RiscvISS(program, dict(enumerate(dmem))))
+    dut._log.info(f"{len(handles)} cores, {MULTI_CYCLES} cycles each")
+
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst_n.value = 1
+    await ClockCycles(dut.clk, MULTI_CYCLES)
+    await ReadOnly()
+
+    failures = []
+    for i, (core, iss) in enumerate(zip(handles, models)):
+        iss.run_to_halt(MULTI_CYCLES)
+        try:
+            compare_state(f"core{i}.regs", read_array(core.registerfile_inst.registers, NUM_REGS), iss.regs)
+            compare_state(f"core{i}.dmem", read_array(core.datamemory_inst.mem, DMEM_WORDS), iss.dmem)
+        except AssertionError as e:
+            failures.append(str(e))
+    assert not failures, f"{len(failures)} of {len(handles)} cores diverged:\n" + "\n".join(failures)
+    dut._log.info(f"All {len(handles)} cores match their ISS")
@@ -0,0 +1,34 @@
+import cocotb
+from verif.riscv_asm import INNER_LOOP_INSTRUCTIONS, countdown_program, load_program
+from verif.riscv_iss import DMEM_WORDS, NUM_REGS, RiscvISS
+from verif.seeding import test_rng
+from verif.soak import SOAK_CHECKPOINT_EVERY, SOAK_CYCLES, compare_state, read_array, run_to_done
+from verif.tracediff import soak_checkpoints
+from verif.profiling import profiled
+
+
+@cocotb.test()
+@profiled
+async def risc_soak_countdown(dut):
+    """Run a ~SOAK_CYCLES-instruction load/store loop to its halt, then compare state with the ISS."""
+    rng = test_rng()
+    dut.rst_n.value = 0
+    inner = rng.randrange(500, 1500)
+    outer = max(1, min(2047, SOAK_CYCLES // (inner * INNER_LOOP_INSTRUCTIONS)))
+    program = countdown_program(outer, inner)
+    dmem = [rng.getrandbits(32) for _ in range(DMEM_WORDS)]
+    dut._log.info(f"Countdown program: {outer} x {inner} iterations")
+    load_program(dut.core, program, dmem)
+
+    iss = RiscvISS(program, dict(enumerate(dmem)))
+    iss.run_to_halt()
+
+    # Watchdog well above the expected length, so only a hang trips it
+    checkpoints = soak_checkpoints(dut, "riscv", "risc_soak_countdown", SOAK_CHECKPOINT_EVERY)
+    result = await run_to_done(dut, 2 * iss.retired + 100, dut.rst_n, reset_active=0, on_checkpoint=checkpoints)
+
+    assert result.halted, f"Core did not halt within {2 * iss.retired + 100} cycles"
+    assert result.cycles == iss.retired, f"Retired {result.cycles} instructions, ISS {iss.retired}"
+    assert dut.debug_pc.value == iss.pc, f"Halted at PC 0x{dut.debug_pc.value.integer:X}, ISS 0x{iss.pc:X}"
+    compare_state("regs", read_array(dut.core.registerfile_inst.registers, NUM_REGS), iss.regs, log=dut._log)
+    compare_state("dmem", read_array(dut.core.datamemory_inst.mem, DMEM_WORDS), iss.dmem, log=dut._log)
@@ -1,39 +1,23 @@
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, Timer
-
-# --- RISC-V ISA Constants (for instruction encoding) ---
-OP_R_TYPE = 0b0110011
-OP_I_TYPE_ARITH = 0b0010011
-OP_LOAD = 0b0000011
-OP_STORE = 0b0100011
-OP_BRANCH = 0b1100011
-FUNCT3_ADD_SUB_ADDI = 0b000
-FUNCT3_LW_SW = 0b010  # Correct funct3 for 32-bit LW/SW
-FUNCT3_BEQ = 0b000
-FUNCT7_ADD = 0b0000000
-FUNCT7_SUB = 0b0100000
-X0 = 0
-
-# --- Instruction Encoding Helper Functions ---
-def encode_r_type(opcode, rd, funct3, rs1, rs2, funct7):
-    return (funct7 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
-
-def encode_i_type(opcode, rd, funct3, rs1, imm):
-    return ((imm & 0xFFF) << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
-
-def encode_s_type(opcode, imm, funct3, rs1, rs2):
-    imm_11_5 = (imm >> 5) & 0x7F
-    imm_4_0 = imm & 0x1F
-    return (imm_11_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_0 << 7) | opcode
-
-def encode_b_type(opcode, imm, funct3, rs1, rs2):
-    imm_val = imm & 0x1FFF # 13-bit immediate
-    imm_12 = (imm_val >> 12) & 0x1
-    imm_11 = (imm_val >> 11) & 0x1
-    imm_10_5 = (imm_val >> 5) & 0x3F
-    imm_4_1 = (imm_val >> 1) & 0xF
-    return (imm_12 << 31) | (imm_10_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_1 << 8) | (imm_11 << 7) | opcode
+from cocotb.triggers import ClockCycles, FallingEdge, ReadOnly, RisingEdge
+from verif.batch import BATCH_PROGRAMS, ProgramImage, RiscvHarness
+from verif.coverage_models import riscv_core_model
+from verif.minimize import MINIMIZE_IMAGES, replay_images
+from verif.monitors import Scoreboard, riscv_retire_monitor
+from verif.riscv_asm import (
+    FUNCT3_ADD_SUB_ADDI, FUNCT3_BEQ, FUNCT3_LW_SW, FUNCT7_ADD, OP_BRANCH, OP_I_TYPE_ARITH,
+    OP_LOAD, OP_R_TYPE, OP_STORE, X0, countdown_program, encode_b_type, encode_i_type, encode_r_type,
+    encode_s_type, load_program,
+)
+from verif.riscv_gen import generate_batch
+from verif.riscv_iss import DMEM_WORDS, NUM_REGS, RiscvISS
+from verif.seeding import test_rng
+from verif.snapshot import Snapshot
+from verif.soak import compare_state, read_array
+from verif.trace import monitor_trace
+from verif.tracediff import DIVERGE_CHECKPOINTS, replay_window
+from verif.profiling import profiled
 
 async def reset_dut(dut):
     """
@@ -60,12 +44,18 @@ async def reset_dut(dut):
 
 
 @cocotb.test()
+@profiled
 async def test_risc_processor_full(dut):
     """Test the single-cycle RISC processor with a full program."""
 
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
     dut._log.info("--- Starting Full RISC Processor Test ---")
 
+    # Start the retire monitor before reset so it sees the first instruction
+    # retire right after rst_n is released.
+    monitor = riscv_retire_monitor(dut)
+    monitor.start()
+
     # 1. Reset and check initial state
     await reset_dut(dut)
     assert dut.debug_pc.value == 0, f"PC not 0 after reset: {dut.debug_pc.value}"
@@ -100,59 +90,125 @@ async def test_risc_processor_full(dut):
     dut._log.info("Loading program into instruction memory...")
     for i, instr_val in enumerate(program):
         imem[i].value = instr_val
-        
-    # Wait for memory to load before starting execution
-    await FallingEdge(dut.clk)
+
+    # 3. Execute and verify every retired instruction against the ISS.
+    # The retire monitor samples once per cycle and feeds the scoreboard,
+    # coverage and the log.
+    iss = RiscvISS(program)
+    cov = riscv_core_model()
+    monitor.subscribe(Scoreboard(iss.step, log=dut._log, name="riscv_scoreboard"))
+
+    @monitor.subscribe
+    def sample_coverage(txn):
+        cov.sample(instr=txn.instr, rd=(txn.instr >> 7) & 0x1F,
+                   rs1=(txn.instr >> 15) & 0x1F, rs2=(txn.instr >> 20) & 0x1F)
+        if txn.instr & 0x7F == OP_BRANCH:
+            cov["beq"].sample(txn.next_pc != txn.pc + 4)
+
+    @monitor.subscribe
+    def log_retire(txn):
+        dut._log.info(f"--- Retired 0x{txn.pc:02X}: 0x{txn.instr:08X} -> PC={txn.next_pc}, "
+                      f"x10={txn.x10}, x11={txn.x11} ---")
+
+    trace = monitor_trace(monitor, "riscv", "test_risc_processor_full")
     dut._log.info("Program loaded. Starting execution.")
 
+    # The BEQ at 0x18 is taken, so the ADDI at 0x1C is skipped and the
+    # program retires 8 instructions, ending with the one at 0x20.
+    last = await monitor.wait_for(lambda txn: txn.pc == 0x20, max_transactions=len(program))
+    monitor.stop()
+    if trace:
+        trace.close()
+    assert monitor.count == 8, f"Expected 8 retired instructions, got {monitor.count}"
+    assert last.next_pc == 36, "PC should be 36"
 
-    # 3. Execute and verify cycle-by-cycle
-    dut._log.info("--- Cycle 1: Executing ADDI x10, x0, 50 ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 4, "PC should be 4 after first instruction"
-    assert dut.debug_reg_x10.value == 50, "x10 should be 50"
+    # 4. Final architectural state (wait_for returns in the ReadOnly phase)
+    dmem_word_addr = 8 // 4
+    assert dmem[dmem_word_addr].value == 110, f"Memory at word addr {dmem_word_addr} should be 110"
+    assert dut.debug_reg_x10.value == 110, "x10 should still be 110 (ADDI x10, 999 was skipped)"
+    assert dut.debug_reg_x11.value == 777, "x11 should be 777"
 
-    dut._log.info("--- Cycle 2: Executing ADDI x11, x0, 60 ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 8, "PC should be 8"
-    assert dut.debug_reg_x11.value == 60, "x11 should be 60"
-    assert dut.debug_reg_x10.value == 50, "x10 should remain 50"
+    cov.save()
+    dut._log.info(cov.report())
+    dut._log.info("🎉 Full RISC Processor test passed successfully! 🎉")
 
-    dut._log.info("--- Cycle 3: Executing ADD x10, x10, x11 ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 12, "PC should be 12"
-    assert dut.debug_reg_x10.value == 110, "x10 should be 110 (50+60)"
 
-    dut._log.info("--- Cycle 4: Executing SW x10, 8(x0) ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 16, "PC should be 16"
-    # Verify memory content. Address 8 is word 2 (8 / 4 = 2).
-    dmem_word_addr = 8 // 4
-    assert dmem[dmem_word_addr].value == 110, f"Memory at word addr {dmem_word_addr} should be 110"
-    assert dut.debug_reg_x10.value == 110, "x10 should not change on a store"
+@cocotb.test()
+@profiled
+async def test_risc_batch_programs(dut):
+    """Run BATCH_PROGRAMS countdown programs back to back in this one simulation, each checked against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    images = []
+    for i in range(BATCH_PROGRAMS):
+        program = countdown_program(rng.randrange(1, 8), rng.randrange(1, 32))
+        dmem = {rng.randrange(1024): rng.getrandbits(32) for _ in range(rng.randrange(32))}
+        images.append(ProgramImage(f"prog{i}", dict(enumerate(program)), dmem, 10_000))
+    result = await RiscvHarness(dut).run_batch(images)
+    assert not result.failures, f"{len(result.failures)} program(s) failed: {', '.join(result.failures)}"
 
-    dut._log.info("--- Cycle 5: Executing LW x11, 8(x0) ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 20, "PC should be 20"
-    assert dut.debug_reg_x11.value == 110, "x11 should be 110 after LW"
 
-    dut._log.info("--- Cycle 6: Executing BEQ x10, x0, +8 (Branch NOT taken) ---")
-    await RisingEdge(dut.clk)
-    # Branch is not taken, so PC increments normally from 0x14 to 0x18 (20 -> 24)
-    assert dut.debug_pc.value == 24, "PC should be 24 (branch not taken)"
-    assert dut.debug_reg_x10.value == 110, "x10 should be unchanged"
+@cocotb.test()
+@profiled
+async def test_risc_snapshot_scenarios(dut):
+    """Reset and load once, snapshot, then run several scenarios that each start from the restored snapshot."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    dut.rst_n.value = 0
+    program = countdown_program(3, 5)
+    dmem = [rng.getrandbits(32) for _ in range(DMEM_WORDS)]
+    load_program(dut, program, dmem)
+    await reset_dut(dut)
 
-    dut._log.info("--- Cycle 7: Executing BEQ x10, x11, +8 (Branch TAKEN) ---")
-    await RisingEdge(dut.clk)
-    # Branch is taken (110 == 110). Target is 0x18 + 8 = 0x20 (24 + 8 = 32)
-    assert dut.debug_pc.value == 32, "PC should be 32 (branch taken)"
-    # The instruction at 0x1C (ADDI x10, x0, 999) was skipped, so x10 is still 110
-    assert dut.debug_reg_x10.value == 110, "x10 should not have changed"
+    # Capture at the falling edge where reset was released, before the first instruction retires
+    await ReadOnly()
+    snap = Snapshot.capture(dut, exclude=["clk"])
+    dut._log.info(f"Snapshot of {len(snap.values)} signals/arrays")
 
-    dut._log.info("--- Cycle 8: Executing ADDI x11, x0, 777 (Landed after branch) ---")
-    await RisingEdge(dut.clk)
-    assert dut.debug_pc.value == 36, "PC should be 36"
-    assert dut.debug_reg_x11.value == 777, "x11 should be 777"
-    assert dut.debug_reg_x10.value == 110, "x10 should still be 110"
+    total = RiscvISS(program).run_to_halt()
+    for cycles in sorted(rng.sample(range(1, total + 1), min(6, total)), reverse=True):
+        await FallingEdge(dut.clk)
+        snap.restore()
+        await ReadOnly()
+        restored = Snapshot.capture(dut, exclude=["clk"])
+        assert not snap.diff(restored), f"Restore left differences: {snap.diff(restored)[:8]}"
+
+        await ClockCycles(dut.clk, cycles)
+        await ReadOnly()
+        iss = RiscvISS(program, dict(enumerate(dmem)))
+        iss.run(cycles)
+        compare_state(f"after {cycles} cycles: regs", read_array(dut.registerfile_inst.registers, NUM_REGS), iss.regs)
+        compare_state(f"after {cycles} cycles: dmem", read_array(dut.datamemory_inst.mem, DMEM_WORDS), iss.dmem)
+        assert dut.debug_pc.value == iss.pc, f"PC 0x{dut.debug_pc.value.integer:X} after {cycles} cycles, ISS 0x{iss.pc:X}"
 
-    dut._log.info("🎉 Full RISC Processor test passed successfully! 🎉")
\ No newline at end of file
+
+@cocotb.test()
+@profiled
+async def test_risc_random_programs(dut):
+    """BATCH_PROGRAMS constrained-random programs (verif/riscv_gen.py), run back to back against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    programs = generate_batch(BATCH_PROGRAMS, length=rng.choice([16, 64, 256]), seed=rng.getrandbits(32))
+    images = [
+        ProgramImage(f"random{i}", dict(enumerate(words)),
+                     {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(16)}, 100_000)
+        for i, words in enumerate(programs)
+    ]
+    result = await RiscvHarness(dut).run_batch(images)
+    assert not result.failures, f"{len(result.failures)} program(s) failed: {', '.join(result.failures)}"
+
+
+@cocotb.test(skip=not MINIMIZE_IMAGES)
+@profiled
+async def test_risc_replay_images(dut):
+    """Verdicts for the candidate images of verif/minimize.py ($MINIMIZE_IMAGES); skipped otherwise."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await replay_images(RiscvHarness(dut))
+
+
+@cocotb.test(skip=not DIVERGE_CHECKPOINTS)
+@profiled
+async def test_risc_replay_window(dut):
+    """Replay the failing window of a checkpointed soak run ($DIVERGE_CHECKPOINTS) and report the first divergence."""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start())
+    await replay_window(RiscvHarness(dut), riscv_retire_monitor(dut))
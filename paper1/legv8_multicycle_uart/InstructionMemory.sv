@@ -12,14 +12,13 @@ module InstructionMemory #(
     // RAM block
     (* ramstyle = "M9K" *) logic [INST_WIDTH-1:0] IMEM [0:(1<<ADDR_WIDTH)-1];
 
-    // Combinatorial read
-    assign instr_out = IMEM[addr_in];
-
-    // Synchronous write
+    // Synchronous write, registered read: instr_out is the word at the
+    // address of the previous cycle, which lets Quartus map IMEM to M9K
     always_ff @(posedge clk) begin
         if (write_en_in) begin
             IMEM[addr_in] <= write_data_in;
         end
+        instr_out <= IMEM[addr_in];
     end
 
 endmodule
\ No newline at end of file
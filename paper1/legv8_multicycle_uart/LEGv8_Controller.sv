@@ -1,7 +1,23 @@
-module LEGv8_Controller (
+module LEGv8_Controller #(
+    // 1: results go to a result_fifo (result_push/result_stall) instead of
+    // being sent byte by byte in SEND_RESULT
+    parameter RESULT_FIFO = 0,
+    // 1: trimmed sequence FETCH, DECODE (execute, memory access and write-back
+    // in one cycle), [SEND_RESULT], FETCH. Every datapath read is
+    // combinational (IMEM's registered read is addressed a cycle ahead) and
+    // the register file bypasses its write port, so the next instruction needs
+    // no stall; only register writes are reported in REPORT_ALL.
+    parameter FAST_CONTROLLER = 0,
+    // DataMemory word address bits: the state dump covers 1 << DMEM_ADDR_WIDTH words
+    parameter DMEM_ADDR_WIDTH = 4
+)(
     input  logic clk,
     input  logic rst,
     input  logic fsm_start,
+    input  logic [1:0] report_mode, // REPORT_* below, selected by the host (fpga_top)
+    input  logic       dump_en,     // send the architectural state dump after HALT
+    input  logic       perf_en,     // send the performance counters after HALT
+    input  logic       perf_request, // send the performance counters at the next instruction boundary
 
     // From Datapath
     input  logic [31:0] instr_word,
@@ -9,10 +25,17 @@ module LEGv8_Controller (
     input  logic [31:0] alu_result,
     input  logic [31:0] mem_read_data,
     input  logic [31:0] pc_out,
+    input  logic [31:0] store_data,
+    input  logic [31:0] dump_reg_data,
 
     // From Top Level (UART)
     input  logic tx_active,
 
+    // Result FIFO (RESULT_FIFO = 1)
+    input  logic        result_stall,
+    output logic        result_push,
+    output logic [31:0] result_word,
+
     // To Datapath
     output logic [31:0] current_instr,
     output logic [31:0] pc_latched,
@@ -30,6 +53,9 @@ module LEGv8_Controller (
     output logic        uncond_branch,
     output logic        cond_branch,
     output logic        branch_reg,
+    output logic        dump_active,
+    output logic [4:0]  dump_reg_addr,
+    output logic [DMEM_ADDR_WIDTH-1:0] dump_mem_addr,
 
     // To Top Level
     output logic [7:0]  tx_data,
@@ -42,6 +68,40 @@ module LEGv8_Controller (
     logic        mem_to_reg;
     logic        halt_signal;
     logic        branch_link;
+    logic        cu_mem_write;
+
+    // Result reporting modes:
+    //   REPORT_ALL    - the result of every instruction (default)
+    //   REPORT_WRITES - only instructions that write a register
+    //   REPORT_OUTPUT - only STUR to OUTPUT_ADDR (STUR Xt, [XZR, #-8]); the
+    //                   stored value is sent and DataMemory is not written
+    //   REPORT_HALT   - only the last result, once HALT is reached
+    localparam logic [1:0] REPORT_ALL    = 2'd0;
+    localparam logic [1:0] REPORT_WRITES = 2'd1;
+    localparam logic [1:0] REPORT_OUTPUT = 2'd2;
+    localparam logic [1:0] REPORT_HALT   = 2'd3;
+    localparam logic [31:0] OUTPUT_ADDR  = 32'hFFFF_FFF8;
+
+    // State dump after HALT (dump_en): DUMP_HEADER, X0..X31, the DataMemory
+    // words, then the 32-bit sum of all of these, each sent like a result
+    localparam integer DUMP_REGS  = 32;
+    localparam integer DUMP_DMEM  = 1 << DMEM_ADDR_WIDTH;
+    localparam integer DUMP_WORDS = 1 + DUMP_REGS + DUMP_DMEM + 1;
+    localparam integer DUMP_INDEX_WIDTH = $clog2(DUMP_WORDS + 1);
+    localparam logic [31:0] DUMP_HEADER = {8'hD5, 8'(DUMP_REGS), 16'(DUMP_DMEM)};
+
+    // Performance counters (perf_en after HALT, perf_request at any time):
+    // {PERF_HEADER, halted}, then cycles, instructions retired, MEM_WAIT
+    // cycles, SEND_RESULT cycles (UART / result FIFO), NEXT_INSTR stall
+    // cycles, and the 32-bit sum of all of these. Counted while the program
+    // runs (start to HALT), not while counters are being sent.
+    localparam integer PERF_COUNTERS = 5;
+    localparam integer PERF_WORDS = 1 + PERF_COUNTERS + 1;
+    localparam logic [30:0] PERF_HEADER = {8'hC5, 8'(PERF_COUNTERS), 15'b0};
+
+    logic output_store;
+    assign output_store = (report_mode == REPORT_OUTPUT) && is_stur && (alu_result == OUTPUT_ADDR);
+    assign mem_write = cu_mem_write && !output_store;
 
     ControlUnit cu_inst (
         .instr_in        (current_instr),
@@ -49,7 +109,7 @@ module LEGv8_Controller (
         .reg_write_out   (reg_write),
         .mem_to_reg_out  (mem_to_reg),
         .mem_read_out    (mem_read),
-        .mem_write_out   (mem_write),
+        .mem_write_out   (cu_mem_write),
         .alu_src_out     (alu_src),
         .uncond_branch_out(uncond_branch),
         .cond_branch_out (cond_branch),
@@ -62,8 +122,9 @@ module LEGv8_Controller (
         .branch_link_out (branch_link)
     );
 
-    typedef enum logic [3:0] { IDLE, FETCH, DECODE, EXECUTE, MEM_WAIT, CAPTURE_RESULT, SEND_RESULT, NEXT_INSTR, RESET_STATE } state_t;
+    typedef enum logic [3:0] { IDLE, FETCH, DECODE, EXECUTE, MEM_WAIT, CAPTURE_RESULT, SEND_RESULT, NEXT_INSTR, RESET_STATE, DUMP, PERF } state_t;
     state_t state = RESET_STATE;
+    state_t after_send;
 
     logic [31:0] result_value;
     logic [1:0]  byte_idx;
@@ -78,8 +139,67 @@ module LEGv8_Controller (
     logic mem_read_latched;
     logic mem_write_latched;
     logic [31:0] alu_result_latched;
+    logic output_store_latched;
+    logic report_result;
+    logic        dumping;
+    logic [DUMP_INDEX_WIDTH-1:0] dump_index;
+    logic [31:0] dump_checksum;
+    logic        perf_pending;
+    logic        perf_sending;
+    logic [2:0]  perf_index;
+    logic [31:0] perf_checksum;
+    logic [31:0] perf_word;
+    logic [31:0] cnt_cycles;
+    logic [31:0] cnt_retired;
+    logic [31:0] cnt_mem_wait;
+    logic [31:0] cnt_uart_stall;
+    logic [31:0] cnt_fixed_stall;
+
+    // Register / DataMemory word the datapath reads for dump word dump_index
+    assign dump_active = (state == DUMP);
+    assign dump_reg_addr = 5'(dump_index - 1'b1);
+    assign dump_mem_addr = DMEM_ADDR_WIDTH'(dump_index - DUMP_INDEX_WIDTH'(DUMP_REGS + 1));
+
+    // Next state once a word has been sent: the next dump/counter word, the
+    // frames that follow HALT, or the next instruction
+    always_comb begin
+        if (perf_sending) after_send = (perf_index == 3'd0) ? (sequence_active ? FETCH : IDLE) : PERF;
+        else if (dumping && dump_index != DUMP_INDEX_WIDTH'(DUMP_WORDS)) after_send = DUMP;
+        else if (halt_detected && dump_en && !dumping) after_send = DUMP;
+        else if (halt_detected) after_send = perf_pending ? PERF : IDLE;
+        else if (FAST_CONTROLLER != 0) after_send = perf_pending ? PERF : FETCH;
+        else after_send = NEXT_INSTR;
+    end
+
+    always_comb begin
+        case (perf_index)
+            3'd0:    perf_word = {PERF_HEADER, halt_detected};
+            3'd1:    perf_word = cnt_cycles;
+            3'd2:    perf_word = cnt_retired;
+            3'd3:    perf_word = cnt_mem_wait;
+            3'd4:    perf_word = cnt_uart_stall;
+            3'd5:    perf_word = cnt_fixed_stall;
+            default: perf_word = perf_checksum;
+        endcase
+    end
+
+    // FAST_CONTROLLER decides in DECODE, from the control unit directly
+    logic report_write;
+    logic report_output;
+    assign report_write = (FAST_CONTROLLER != 0) ? reg_write : reg_write_latched;
+    assign report_output = (FAST_CONTROLLER != 0) ? output_store : output_store_latched;
+
+    always_comb begin
+        case (report_mode)
+            REPORT_WRITES: report_result = report_write;
+            REPORT_OUTPUT: report_result = report_output;
+            REPORT_HALT:   report_result = 1'b0;
+            default:       report_result = (FAST_CONTROLLER != 0) ? report_write : 1'b1;
+        endcase
+    end
 
     assign fsm_sequence_active = sequence_active;
+    assign result_word = result_value;
 
     always_ff @(posedge clk or posedge rst) begin
         if (rst) begin
@@ -96,6 +216,7 @@ module LEGv8_Controller (
             halt_detected <= 1'b0;
             result_value <= 32'b0;
             tx_request <= 1'b0;
+            result_push <= 1'b0;
             current_instr <= 32'b0;
             pc_latched <= 32'b0;
             reg_write_latched <= 1'b0;
@@ -104,11 +225,33 @@ module LEGv8_Controller (
             mem_write_latched <= 1'b0;
             branch_link_latched <= 1'b0;
             alu_result_latched <= 32'b0;
+            output_store_latched <= 1'b0;
+            dumping <= 1'b0;
+            dump_index <= '0;
+            dump_checksum <= 32'b0;
+            perf_pending <= 1'b0;
+            perf_sending <= 1'b0;
+            perf_index <= 3'b0;
+            perf_checksum <= 32'b0;
+            cnt_cycles <= 32'b0;
+            cnt_retired <= 32'b0;
+            cnt_mem_wait <= 32'b0;
+            cnt_uart_stall <= 32'b0;
+            cnt_fixed_stall <= 32'b0;
         end else begin
             tx_start <= 1'b0;
             pc_write_en <= 1'b0;
             reg_write_en <= 1'b0;
             tx_request <= 1'b0;
+            result_push <= 1'b0;
+
+            if (perf_request) perf_pending <= 1'b1;
+            if (sequence_active && state != PERF && !(state == SEND_RESULT && perf_sending)) begin
+                cnt_cycles <= cnt_cycles + 1;
+                if (state == MEM_WAIT) cnt_mem_wait <= cnt_mem_wait + 1;
+                if (state == SEND_RESULT) cnt_uart_stall <= cnt_uart_stall + 1;
+                if (state == NEXT_INSTR) cnt_fixed_stall <= cnt_fixed_stall + 1;
+            end
 
             case (state)
                 RESET_STATE:
@@ -116,14 +259,27 @@ module LEGv8_Controller (
                     else reset_counter <= reset_counter + 1;
 
                 IDLE:
-                    if (fsm_start && !sequence_active) begin
-                        sequence_active <= 1'b1;
-                        halt_detected <= 1'b0;
-                        state <= FETCH;
+                    begin
+                        perf_sending <= 1'b0;
+                        if (fsm_start && !sequence_active) begin
+                            sequence_active <= 1'b1;
+                            halt_detected <= 1'b0;
+                            dumping <= 1'b0;
+                            result_value <= 32'b0;
+                            cnt_cycles <= 32'b0;
+                            cnt_retired <= 32'b0;
+                            cnt_mem_wait <= 32'b0;
+                            cnt_uart_stall <= 32'b0;
+                            cnt_fixed_stall <= 32'b0;
+                            state <= FETCH;
+                        end else if (perf_pending) begin
+                            state <= PERF;
+                        end
                     end
 
                 FETCH:
                     if (sequence_active && !halt_detected) begin
+                        perf_sending <= 1'b0;
                         current_instr <= instr_word;
                         pc_latched <= pc_out;
                         pc_write_en <= 1'b1;
@@ -134,10 +290,37 @@ module LEGv8_Controller (
 
                 DECODE:
                     begin
+                        cnt_retired <= cnt_retired + 1;
                         if (halt_signal) begin
                             halt_detected <= 1'b1;
                             sequence_active <= 1'b0;
-                            state <= IDLE;
+                            byte_idx <= 2'b00;
+                            dump_index <= '0;
+                            if (perf_en) perf_pending <= 1'b1;
+                            // REPORT_HALT: send the last result, then the dump and counters
+                            if (report_mode == REPORT_HALT) state <= SEND_RESULT;
+                            else if (dump_en) state <= DUMP;
+                            else if (perf_en || perf_pending) state <= PERF;
+                            else state <= IDLE;
+                        end else if (FAST_CONTROLLER != 0) begin
+                            // Operands, ALU result and load data are all valid
+                            // this cycle; the register write lands next cycle,
+                            // before the next instruction's DECODE
+                            if (mem_to_reg) result_value <= mem_read_data;
+                            else if (output_store) result_value <= store_data;
+                            else result_value <= alu_result;
+
+                            branch_link_latched <= branch_link;
+                            if (reg_write) begin
+                                if (branch_link) reg_write_data <= pc_latched + 4;
+                                else if (mem_to_reg) reg_write_data <= mem_read_data;
+                                else reg_write_data <= alu_result;
+                                reg_write_en <= 1'b1;
+                            end
+
+                            byte_idx <= 2'b00;
+                            if (report_result) state <= SEND_RESULT;
+                            else state <= perf_pending ? PERF : FETCH;
                         end else begin
                             reg_write_latched <= reg_write;
                             mem_to_reg_latched <= mem_to_reg;
@@ -151,6 +334,7 @@ module LEGv8_Controller (
                 EXECUTE:
                     begin
                         alu_result_latched <= alu_result;
+                        output_store_latched <= output_store;
                         if (mem_read_latched || mem_write_latched) state <= MEM_WAIT;
                         else state <= CAPTURE_RESULT;
                     end
@@ -161,7 +345,7 @@ module LEGv8_Controller (
                 CAPTURE_RESULT:
                     begin
                         if (mem_to_reg_latched) result_value <= mem_read_data;
-                        else if (reg_write_latched) result_value <= alu_result_latched;
+                        else if (output_store_latched) result_value <= store_data;
                         else result_value <= alu_result_latched;
 
                         if (reg_write_latched) begin
@@ -172,11 +356,23 @@ module LEGv8_Controller (
                         end
 
                         byte_idx <= 2'b00;
-                        state <= SEND_RESULT;
+                        if (report_result) begin
+                            state <= SEND_RESULT;
+                        end else begin
+                            state <= NEXT_INSTR;
+                            stall_counter <= 2'b0;
+                        end
                     end
 
                 SEND_RESULT:
-                    if (!tx_active && !tx_request) begin
+                    if (RESULT_FIFO != 0) begin
+                        // Hand the word to the FIFO; wait only while it applies backpressure
+                        if (!result_stall) begin
+                            result_push <= 1'b1;
+                            state <= after_send;
+                            stall_counter <= 2'b0;
+                        end
+                    end else if (!tx_active && !tx_request) begin
                         tx_request <= 1'b1;
                         case (byte_idx)
                             2'b00: tx_data <= result_value[7:0];
@@ -189,7 +385,7 @@ module LEGv8_Controller (
                         if (tx_active) begin
                             tx_request <= 1'b0;
                             if (byte_idx == 2'b11) begin
-                                state <= NEXT_INSTR;
+                                state <= after_send;
                                 stall_counter <= 2'b0;
                             end else begin
                                 byte_idx <= byte_idx + 1;
@@ -197,9 +393,41 @@ module LEGv8_Controller (
                         end
                     end
 
+                DUMP:
+                    begin
+                        if (dump_index == '0) begin
+                            result_value <= DUMP_HEADER;
+                            dump_checksum <= DUMP_HEADER;
+                        end else if (dump_index <= DUMP_INDEX_WIDTH'(DUMP_REGS)) begin
+                            result_value <= dump_reg_data;
+                            dump_checksum <= dump_checksum + dump_reg_data;
+                        end else if (dump_index <= DUMP_INDEX_WIDTH'(DUMP_REGS + DUMP_DMEM)) begin
+                            result_value <= mem_read_data;
+                            dump_checksum <= dump_checksum + mem_read_data;
+                        end else begin
+                            result_value <= dump_checksum;
+                        end
+                        dumping <= 1'b1;
+                        dump_index <= dump_index + 1'b1;
+                        byte_idx <= 2'b00;
+                        state <= SEND_RESULT;
+                    end
+
+                PERF:
+                    begin
+                        if (perf_index == 3'd0) perf_checksum <= perf_word;
+                        else perf_checksum <= perf_checksum + perf_word;
+                        result_value <= perf_word;
+                        perf_pending <= 1'b0;
+                        perf_sending <= 1'b1;
+                        perf_index <= (perf_index == 3'(PERF_WORDS - 1)) ? 3'd0 : perf_index + 1'b1;
+                        byte_idx <= 2'b00;
+                        state <= SEND_RESULT;
+                    end
+
                 NEXT_INSTR:
                     if (stall_counter == 2'd2) begin
-                        state <= FETCH;
+                        state <= perf_pending ? PERF : FETCH;
                     end else begin
                         stall_counter <= stall_counter + 1;
                     end
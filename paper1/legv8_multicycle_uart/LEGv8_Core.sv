@@ -1,12 +1,26 @@
-module LEGv8_Core (
+module LEGv8_Core #(
+    // Words of result FIFO between the controller and the UART (0 = none:
+    // the controller waits for every byte); see result_fifo.sv for POLICY
+    parameter RESULT_FIFO_DEPTH  = 64,
+    parameter RESULT_FIFO_POLICY = 0,
+    // 1: trimmed controller sequence (see LEGv8_Controller.sv)
+    parameter FAST_CONTROLLER    = 0,
+    // Word address bits of InstructionMemory and DataMemory
+    parameter IMEM_ADDR_WIDTH    = 6,
+    parameter DMEM_ADDR_WIDTH    = 4
+)(
     input  logic clk,
     input  logic rst,
     input  logic start,
+    input  logic [1:0] report_mode,
+    input  logic       dump_en,
+    input  logic       perf_en,
+    input  logic       perf_request,
 
     // IMEM Write Interface from Bootloader
     input  logic        imem_write_en_in,
     input  logic [31:0] imem_write_data_in,
-    input  logic [5:0]  imem_write_addr_in,
+    input  logic [IMEM_ADDR_WIDTH-1:0] imem_write_addr_in,
 
     // UART Interface
     input  logic tx_active,
@@ -34,6 +48,9 @@ module LEGv8_Core (
     logic        uncond_branch;
     logic        cond_branch;
     logic        branch_reg;
+    logic        dump_active;
+    logic [4:0]  dump_reg_addr;
+    logic [DMEM_ADDR_WIDTH-1:0] dump_mem_addr;
 
     // Datapath -> Controller Signals
     logic [31:0] instr_word;
@@ -41,8 +58,20 @@ module LEGv8_Core (
     logic [31:0] alu_result;
     logic [31:0] mem_read_data;
     logic [31:0] pc_out;
+    logic [31:0] store_data;
+    logic [31:0] dump_reg_data;
 
-    LEGv8_Datapath datapath_inst (
+    // Controller -> Result FIFO
+    logic        result_push;
+    logic [31:0] result_word;
+    logic        result_stall;
+    logic [7:0]  ctrl_tx_data;
+    logic        ctrl_tx_start;
+
+    LEGv8_Datapath #(
+        .IMEM_ADDR_WIDTH(IMEM_ADDR_WIDTH),
+        .DMEM_ADDR_WIDTH(DMEM_ADDR_WIDTH)
+    ) datapath_inst (
         .clk(clk),
         .rst(rst),
         .current_instr(current_instr),
@@ -61,6 +90,9 @@ module LEGv8_Core (
         .uncond_branch(uncond_branch),
         .cond_branch(cond_branch),
         .branch_reg(branch_reg),
+        .dump_active(dump_active),
+        .dump_reg_addr(dump_reg_addr),
+        .dump_mem_addr(dump_mem_addr),
         .imem_write_en_in(imem_write_en_in),
         .imem_write_data_in(imem_write_data_in),
         .imem_write_addr_in(imem_write_addr_in),
@@ -68,19 +100,34 @@ module LEGv8_Core (
         .instr_word(instr_word),
         .zero_flag(zero_flag),
         .alu_result(alu_result),
-        .mem_read_data(mem_read_data)
+        .mem_read_data(mem_read_data),
+        .store_data(store_data),
+        .dump_reg_data(dump_reg_data)
     );
 
-    LEGv8_Controller controller_inst (
+    LEGv8_Controller #(
+        .RESULT_FIFO(RESULT_FIFO_DEPTH > 0),
+        .FAST_CONTROLLER(FAST_CONTROLLER),
+        .DMEM_ADDR_WIDTH(DMEM_ADDR_WIDTH)
+    ) controller_inst (
         .clk(clk),
         .rst(rst),
         .fsm_start(start),
+        .report_mode(report_mode),
+        .dump_en(dump_en),
+        .perf_en(perf_en),
+        .perf_request(perf_request),
         .instr_word(instr_word),
         .zero_flag(zero_flag),
         .alu_result(alu_result),
         .mem_read_data(mem_read_data),
         .pc_out(pc_out),
+        .store_data(store_data),
+        .dump_reg_data(dump_reg_data),
         .tx_active(tx_active),
+        .result_stall(result_stall),
+        .result_push(result_push),
+        .result_word(result_word),
         .current_instr(current_instr),
         .pc_latched(pc_latched),
         .pc_write_en(pc_write_en),
@@ -97,9 +144,39 @@ module LEGv8_Core (
         .uncond_branch(uncond_branch),
         .cond_branch(cond_branch),
         .branch_reg(branch_reg),
-        .tx_data(tx_data),
-        .tx_start(tx_start),
+        .dump_active(dump_active),
+        .dump_reg_addr(dump_reg_addr),
+        .dump_mem_addr(dump_mem_addr),
+        .tx_data(ctrl_tx_data),
+        .tx_start(ctrl_tx_start),
         .fsm_sequence_active(core_active)
     );
 
+    generate
+        if (RESULT_FIFO_DEPTH > 0) begin : g_result_fifo
+            logic        fifo_empty;
+            logic [15:0] fifo_dropped;
+
+            result_fifo #(
+                .DEPTH(RESULT_FIFO_DEPTH),
+                .POLICY(RESULT_FIFO_POLICY)
+            ) result_fifo_inst (
+                .clk(clk),
+                .rst(rst),
+                .push(result_push),
+                .push_data(result_word),
+                .stall(result_stall),
+                .tx_active(tx_active),
+                .tx_data(tx_data),
+                .tx_start(tx_start),
+                .empty(fifo_empty),
+                .dropped(fifo_dropped)
+            );
+        end else begin : g_no_result_fifo
+            assign result_stall = 1'b0;
+            assign tx_data = ctrl_tx_data;
+            assign tx_start = ctrl_tx_start;
+        end
+    endgenerate
+
 endmodule
@@ -1,4 +1,7 @@
-module LEGv8_Datapath (
+module LEGv8_Datapath #(
+    parameter IMEM_ADDR_WIDTH = 6,  // InstructionMemory word address bits
+    parameter DMEM_ADDR_WIDTH = 4   // DataMemory word address bits
+)(
     input  logic clk,
     input  logic rst,
 
@@ -19,18 +22,23 @@ module LEGv8_Datapath (
     input  logic        uncond_branch, // Now from register
     input  logic        cond_branch,   // Now from register
     input  logic        branch_reg,    // Now from register
+    input  logic        dump_active,   // state dump: read dump_reg_addr / dump_mem_addr instead
+    input  logic [4:0]  dump_reg_addr,
+    input  logic [DMEM_ADDR_WIDTH-1:0] dump_mem_addr,
 
     // From Bootloader (via Core)
     input  logic        imem_write_en_in,
     input  logic [31:0] imem_write_data_in,
-    input  logic [5:0]  imem_write_addr_in,
+    input  logic [IMEM_ADDR_WIDTH-1:0] imem_write_addr_in,
 
     // To Controller
     output logic [31:0] pc_out,
     output logic [31:0] instr_word,
     output logic        zero_flag,
     output logic [31:0] alu_result,
-    output logic [31:0] mem_read_data
+    output logic [31:0] mem_read_data,
+    output logic [31:0] store_data,
+    output logic [31:0] dump_reg_data
 );
 
     logic [31:0] read_data1;
@@ -56,11 +64,14 @@ module LEGv8_Datapath (
 
     assign pc_next = branch_reg ? read_data1 : (branch_taken ? (pc_latched + imm_gen_out) : (pc_out + 4));
 
-    // Instruction Memory
-    logic [5:0] imem_addr;
-    assign imem_addr = imem_write_en_in ? imem_write_addr_in : pc_out[7:2];
+    // Instruction Memory. Its read is registered (M9K), so it is addressed
+    // with the PC the next cycle holds: instr_word always matches pc_out.
+    logic [31:0] pc_fetch;
+    assign pc_fetch = pc_write_en ? pc_next : pc_out;
+    logic [IMEM_ADDR_WIDTH-1:0] imem_addr;
+    assign imem_addr = imem_write_en_in ? imem_write_addr_in : pc_fetch[IMEM_ADDR_WIDTH+1:2];
 
-    InstructionMemory #(.INST_WIDTH(32), .ADDR_WIDTH(6))
+    InstructionMemory #(.INST_WIDTH(32), .ADDR_WIDTH(IMEM_ADDR_WIDTH))
     imem_inst (
         .clk(clk),
         .addr_in(imem_addr),
@@ -83,6 +94,8 @@ module LEGv8_Datapath (
 
     logic [4:0] rf_write_addr;
     assign rf_write_addr = branch_link_latched ? 5'd30 : rd;
+    logic [4:0] rf_read_addr1;
+    assign rf_read_addr1 = dump_active ? dump_reg_addr : rn;
     logic [4:0] rf_read_addr2;
     assign rf_read_addr2 = (is_stur || is_cbz || is_cbnz) ? rd : rm;
 
@@ -90,7 +103,7 @@ module LEGv8_Datapath (
         .clk            (clk),
         .rst            (rst),
         .write_en_in    (reg_write_en),
-        .read_addr1_in  (rn),
+        .read_addr1_in  (rf_read_addr1),
         .read_addr2_in  (rf_read_addr2),
         .write_addr_in  (rf_write_addr),
         .write_data_in  (reg_write_data),
@@ -120,13 +133,22 @@ module LEGv8_Datapath (
     );
 
     // Data Memory
-    DataMemory data_mem (
+    assign store_data = read_data2;
+    assign dump_reg_data = read_data1;
+
+    // Byte address; the read stays combinational (DECODE of FAST_CONTROLLER
+    // and the state dump use it the same cycle), so DataMemory maps to logic
+    logic [DMEM_ADDR_WIDTH+1:0] dmem_addr;
+    assign dmem_addr = dump_active ? {dump_mem_addr, 2'b00} : alu_result[DMEM_ADDR_WIDTH+1:0];
+
+    DataMemory #(.DATA_WIDTH(32), .ADDR_WIDTH(DMEM_ADDR_WIDTH + 2))
+    data_mem (
         .clk(clk),
         .rst(rst),
-        .addr_in(alu_result[5:0]),
+        .addr_in(dmem_addr),
         .write_data_in(read_data2),
         .mem_write_en_in(mem_write),
-        .mem_read_en_in(mem_read),
+        .mem_read_en_in(mem_read || dump_active),
         .read_data_out(mem_read_data)
     );
 
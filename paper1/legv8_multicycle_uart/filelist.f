@@ -0,0 +1,14 @@
+uart_tx.sv
+uart_rx.sv
+ALU.sv
+ControlUnit.sv
+ImmediateGenerator.sv
+RegisterFile.sv
+ProgramCounter.sv
+InstructionMemory.sv
+DataMemory.sv
+LEGv8_Datapath.sv
+LEGv8_Controller.sv
+result_fifo.sv
+LEGv8_Core.sv
+fpga_top.sv
@@ -1,14 +1,67 @@
+import argparse
+import json
 import serial
 import serial.tools.list_ports
 import time
 import os
 import struct
 
-BAUD = 115200
+BAUD = 115200  # after reset
 PACKET_SIZE = 4
 HANDSHAKE_TIMEOUT = 15.0 # seconds
 NO_DATA_TIMEOUT = 10.0
 
+# Result reporting modes of LEGv8_Controller (REPORT_*), selected with a
+# REPORT_MODE_CMD | mode byte after handshake 1; fpga_top echoes the mode in
+# the second byte of handshake 2.
+REPORT_MODE_CMD = 0xA0
+REPORT_MODES = {
+    "all": 0,     # the result of every instruction
+    "writes": 1,  # only instructions that write a register
+    "output": 2,  # only values stored with STUR Xt, [XZR, #-8] (address 0xFFFFFFF8)
+    "halt": 3,    # only the last result, once HALT is reached
+}
+RESULT_LABELS = {"all": "ALU Result", "writes": "Register Write", "output": "Output", "halt": "Final Result"}
+
+# Baud rate negotiation after handshake 1 (--baud): BAUD_CMD and the clocks
+# per bit proposed at FPGA_CLOCK_HZ (16-bit little endian); the FPGA answers
+# BAUD_CMD | clocks << 8 (0: refused) and switches. At the new rate the host
+# sends BAUD_PATTERN, the FPGA sends it back and the host confirms with
+# BAUD_CONFIRM_CMD. Without the confirmation the FPGA returns to the old rate
+# after BAUD_FPGA_TIMEOUT; so does the host. A proposal cut short (a divisor
+# byte lost) is dropped after BAUD_FPGA_TIMEOUT as well. Reset restores BAUD.
+FPGA_CLOCK_HZ = 50_000_000
+BAUD_CMD = 0xBD
+BAUD_CONFIRM_CMD = 0xBC
+BAUD_PATTERN = bytes([0x55, 0xAA, 0x00, 0xFF, 0x0F, 0xF0, 0x33, 0xCC])
+BAUD_ECHO_TIMEOUT = 0.25  # seconds
+BAUD_FPGA_TIMEOUT = 0.5   # fpga_top BAUD_TIMEOUT_CLKS
+BAUD_MAX_ERROR = 0.025    # tolerated difference between the host rate and the FPGA's divided clock
+
+# Block load: LOAD_BLOCKS_CMD after handshake 1 makes fpga_top take blocks
+# (base word address, word count, words; 32-bit little endian) in load mode.
+# Handshake 2 then carries the IMEM and DMEM word address bits in its upper
+# two bytes and handshake 3 the number of words written in its upper three.
+# Builds without block loads leave them 0; programs are then sent raw.
+LOAD_BLOCKS_CMD = 0xB1
+PROGRESS_BYTES = 1024
+
+# State dump after HALT (bit 2 of the report mode byte): DUMP_HEADER, X0..X31,
+# the DataMemory words, then the 32-bit sum of all of these. The header's low
+# 16 bits are the number of DataMemory words of the build.
+DUMP_FLAG = 0x04
+NUM_REGS = 32
+DUMP_HEADER = 0xD5000000 | NUM_REGS << 16
+
+# Performance counters after HALT (bit 3 of the report mode byte) or on
+# request (PERF_REQUEST_CMD while running): PERF_HEADER | halted, cycles,
+# instructions retired, memory-wait, UART-stall (SEND_RESULT) and fixed
+# NEXT_INSTR stall cycles, then the 32-bit sum of all of these
+PERF_FLAG = 0x08
+PERF_REQUEST_CMD = 0xC5
+PERF_HEADER = 0xC5050000
+PERF_WORDS = 7
+
 def select_com_port():
     """List available COM ports and let the user select one."""
     ports = list(serial.tools.list_ports.comports())
@@ -33,52 +86,186 @@ def select_com_port():
         except ValueError:
             print("Please enter a valid number.")
 
-def wait_for_handshake(ser, expected_value, buffer):
-    """Waits for a specific 4-byte little-endian integer from the serial port."""
-    print(f"--- Waiting for handshake code: 0x{expected_value:08X} ---")
-    expected_bytes = struct.pack('<I', expected_value)
+def wait_for_handshake(ser, expected_value, buffer, mask=0xFFFFFFFF):
+    """
+    Waits for a 4-byte little-endian integer from the serial port that matches
+    expected_value in the bits of mask; returns it, or None on timeout.
+    """
+    print(f"--- Waiting for handshake code: 0x{expected_value & mask:08X} (mask 0x{mask:08X}) ---")
     start_time = time.time()
     
     while time.time() - start_time < HANDSHAKE_TIMEOUT:
         if ser.in_waiting > 0:
             buffer += ser.read(ser.in_waiting)
 
-        if expected_bytes in buffer:
-            print(f"SUCCESS: Found handshake 0x{expected_value:08X} in buffer: {buffer.hex()}")
-            idx = buffer.find(expected_bytes)
-            # Cut the buffer to after the handshake
-            del buffer[:idx + PACKET_SIZE]
-            return True
+        for idx in range(len(buffer) - PACKET_SIZE + 1):
+            word = struct.unpack_from('<I', buffer, idx)[0]
+            if word & mask == expected_value & mask:
+                print(f"SUCCESS: Found handshake 0x{word:08X} in buffer: {buffer.hex()}")
+                # Cut the buffer to after the handshake
+                del buffer[:idx + PACKET_SIZE]
+                return word
         
         time.sleep(0.05)
 
-    print(f"\n--- TIMEOUT: Did not receive handshake 0x{expected_value:08X} after {HANDSHAKE_TIMEOUT} seconds. ---")
+    print(f"\n--- TIMEOUT: Did not receive handshake 0x{expected_value & mask:08X} after {HANDSHAKE_TIMEOUT} seconds. ---")
     print(f"Final buffer content: {buffer.hex()}")
-    return False
+    return None
+
+def negotiate_baud(ser, baud, buffer):
+    """Switch the FPGA and the port to baud (see BAUD_CMD); returns True if both switched."""
+    clks = round(FPGA_CLOCK_HZ / baud)
+    error = FPGA_CLOCK_HZ / clks / baud - 1
+    if not 0 < clks < 1 << 16 or abs(error) > BAUD_MAX_ERROR:
+        print(f"Error: {baud} baud is {100 * error:+.1f}% from any rate the FPGA can divide its clock to.")
+        return False
+    print(f"Proposing {baud} baud ({clks} clocks per bit, {100 * error:+.1f}% at the FPGA).")
+    ser.write(bytes([BAUD_CMD, clks & 0xFF, clks >> 8]))
+    ack = wait_for_handshake(ser, BAUD_CMD, buffer, mask=0xFF0000FF)
+    if ack is None or ack >> 8 != clks:
+        print("FPGA refused the baud rate (or does not support switching it).")
+        return False
+
+    previous = ser.baudrate
+    ser.baudrate = baud
+    ser.reset_input_buffer()
+    ser.write(BAUD_PATTERN)
+    echo = bytearray()
+    start_time = time.time()
+    while len(echo) < len(BAUD_PATTERN) and time.time() - start_time < BAUD_ECHO_TIMEOUT:
+        echo += ser.read(len(BAUD_PATTERN) - len(echo))
+    if bytes(echo) != BAUD_PATTERN:
+        print(f"Test pattern echoed as {echo.hex() or 'nothing'}; staying at {previous} baud.")
+        ser.baudrate = previous
+        time.sleep(BAUD_FPGA_TIMEOUT + 0.1)  # until the FPGA has gone back as well
+        ser.reset_input_buffer()
+        return False
+    ser.write(bytes([BAUD_CONFIRM_CMD]))
+    ser.flush()
+    print(f"Switched to {baud} baud.")
+    return True
+
+def read_program(spec):
+    """(base word address, words) of a FILE[@WORD_ADDRESS] program argument; the file is little-endian words."""
+    path, _, base = spec.partition("@")
+    with open(path, 'rb') as f:
+        data = f.read()
+    data += bytes(-len(data) % PACKET_SIZE)
+    return int(base, 0) if base else 0, list(struct.unpack(f"<{len(data) // PACKET_SIZE}I", data))
+
+def block_stream(blocks):
+    """Bytes of a block load: base word address, word count and words of every block."""
+    return b"".join(struct.pack(f"<II{len(words)}I", base, len(words), *words) for base, words in blocks)
+
+def send_bytes(ser, data):
+    """Write data in PROGRESS_BYTES chunks, printing the progress."""
+    for i in range(0, len(data), PROGRESS_BYTES):
+        ser.write(data[i:i + PROGRESS_BYTES])
+        print(f"\rSent {min(i + PROGRESS_BYTES, len(data))}/{len(data)} bytes.", end="", flush=True)
+    ser.flush()
+    print()
+
+def dump_words(header):
+    """Length of the state dump a word starts, or 0 if it is not a dump header."""
+    return 2 + NUM_REGS + (header & 0xFFFF) if header & 0xFFFF0000 == DUMP_HEADER else 0
+
+def decode_dump(words):
+    """(registers, DMEM words) of a state dump, or None if the header or checksum does not match."""
+    if not words or len(words) != dump_words(words[0]):
+        return None
+    if sum(words[:-1]) & 0xFFFFFFFF != words[-1]:
+        return None
+    return words[1:1 + NUM_REGS], words[1 + NUM_REGS:-1]
+
+def decode_perf(words):
+    """(halted, cycles, retired, mem_wait, uart_stall, fixed_stall) of a counter frame, or None."""
+    if len(words) != PERF_WORDS or words[0] & ~1 != PERF_HEADER:
+        return None
+    if sum(words[:-1]) & 0xFFFFFFFF != words[-1]:
+        return None
+    return (words[0] & 1, *words[1:-1])
+
+def print_counters(counters):
+    """Print the counters as a CPI breakdown."""
+    halted, cycles, retired, mem_wait, uart_stall, fixed_stall = counters
+    print(f"\n--- Performance counters ({'after HALT' if halted else 'running'}) ---")
+    print(f"{cycles} cycles, {retired} instructions, CPI {cycles / max(retired, 1):.2f}")
+    parts = [("fetch/decode/execute/capture", cycles - mem_wait - uart_stall - fixed_stall),
+             ("memory wait", mem_wait), ("UART / result FIFO wait", uart_stall), ("fixed NEXT_INSTR stall", fixed_stall)]
+    for name, value in parts:
+        print(f"  {name:<30} {value:10} cycles  CPI {value / max(retired, 1):6.2f}  {100 * value / max(cycles, 1):5.1f}%")
+
+def load_expected(path):
+    """Expected state JSON: {"regs": [...] or {"14": ...}, "dmem": [...] or {"6": ...}} (python -m verif.legv8_iss --expect)."""
+    with open(path) as f:
+        expected = json.load(f)
+    def entries(values):
+        return dict(enumerate(values)) if isinstance(values, list) else {int(k): v for k, v in values.items()}
+    return entries(expected.get("regs", [])), entries(expected.get("dmem", {}))
+
+def print_state(regs, dmem, expected=None):
+    """Print the dumped registers and DMEM; with an expected state, list the differences. Returns the mismatch count."""
+    print("\n--- Register file ---")
+    for i in range(0, NUM_REGS, 4):
+        print("  ".join(f"X{r:<2} = 0x{regs[r]:08X}" for r in range(i, i + 4)))
+    print("\n--- Data memory ---")
+    for i in range(0, len(dmem), 4):
+        print("  ".join(f"M[{4 * w:3}] = 0x{dmem[w]:08X}" for w in range(i, min(i + 4, len(dmem)))))
+    if expected is None:
+        return 0
+    mismatches = [(f"X{r}", regs[r], value) for r, value in expected[0].items() if regs[r] != value & 0xFFFFFFFF]
+    mismatches += [(f"M[{4 * w}]", dmem[w] if w < len(dmem) else None, value) for w, value in expected[1].items()
+                   if w >= len(dmem) or dmem[w] != value & 0xFFFFFFFF]
+    for name, got, value in mismatches:
+        found = "not in the dump" if got is None else f"0x{got:08X}"
+        print(f"MISMATCH: {name} = {found}, expected 0x{value & 0xFFFFFFFF:08X}")
+    print(f"\n{'STATE MATCHES' if not mismatches else f'{len(mismatches)} MISMATCH(ES)'} "
+          f"({len(expected[0])} registers, {len(expected[1])} DMEM words checked)")
+    return len(mismatches)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load a program into the LEGv8 FPGA core and print its results.")
+    parser.add_argument("--port", help="Serial port (asked for when omitted)")
+    parser.add_argument("--program", action="append",
+                        help="Binary program file, optionally FILE@WORD_ADDRESS to load it elsewhere than address 0; "
+                             "repeat for several sections (asked for when omitted)")
+    parser.add_argument("--report", choices=list(REPORT_MODES), default="all",
+                        help="Which results the core sends: all, register writes, STUR to the output address, "
+                             "or the last one at HALT (default: all)")
+    parser.add_argument("--dump", action="store_true", help="Receive the registers and DMEM after HALT")
+    parser.add_argument("--expect", help="Compare the dump with this JSON state (implies --dump)")
+    parser.add_argument("--perf", action="store_true", help="Receive the performance counters after HALT")
+    parser.add_argument("--perf-interval", type=float, help="Also request the counters every this many seconds")
+    parser.add_argument("--baud", type=int,
+                        help=f"Switch to this baud rate after reset (e.g. 3000000; the FPGA starts at {BAUD})")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
     print("\n--- LEGv8 Program Loader & Monitor (Robust Handshake) ---\n")
 
-    port = select_com_port()
+    port = args.port or select_com_port()
     if not port:
         return
 
-    while True:
+    specs = args.program or []
+    while not specs:
         filepath = input("Enter the path to the binary program file (e.g., program.bin): ")
         if os.path.exists(filepath):
-            break
+            specs = [filepath]
         else:
             print(f"Error: File not found at '{filepath}'. Please try again.")
 
     try:
-        with open(filepath, 'rb') as f:
-            program_bytes = f.read()
-    except IOError as e:
-        print(f"Error reading file: {e}")
+        blocks = [read_program(spec) for spec in specs]
+    except (IOError, ValueError) as e:
+        print(f"Error reading program: {e}")
         return
+    for spec, (base, words) in zip(specs, blocks):
+        print(f"Read {len(words)} words from '{spec.partition('@')[0]}' for word address {base}.")
 
-    num_bytes = len(program_bytes)
-    print(f"Read {num_bytes} bytes from '{filepath}'.")
+    expected = load_expected(args.expect) if args.expect else None
+    dump = args.dump or expected is not None
 
     try:
         with serial.Serial(port, BAUD, timeout=0.05) as ser:
@@ -90,45 +277,97 @@ def main():
                 print("FPGA did not acknowledge reset. Exiting.")
                 return
 
-            # --- STAGE 2: LOAD MODE --- #
+            if args.baud and args.baud != BAUD and not negotiate_baud(ser, args.baud, buffer):
+                print(f"Continuing at {ser.baudrate} baud.")
+
+            # --- STAGE 2: REPORT MODE & LOAD MODE --- #
+            config = REPORT_MODES[args.report] | (DUMP_FLAG if dump else 0) | (PERF_FLAG if args.perf else 0)
+            ser.write(bytes([REPORT_MODE_CMD | config, LOAD_BLOCKS_CMD]))
+            print(f"Requested report mode '{args.report}'{' with state dump' if dump else ''}"
+                  f"{' with performance counters' if args.perf else ''}.")
             input("\n>>> Now press the START button once to enter LOAD MODE, then press Enter here. <<<")
-            if not wait_for_handshake(ser, 2, buffer):
-                print("FPGA did not acknowledge LOAD mode. Exiting.")
+            handshake = wait_for_handshake(ser, 2 | config << 8, buffer, mask=0xFFFF)
+            if handshake is None:
+                print("FPGA did not acknowledge LOAD mode (or does not support the report mode). Exiting.")
                 return
 
             # --- STAGE 3: WRITING PROGRAM --- #
-            print(f"\nSending {num_bytes} bytes to {port}...")
+            imem_width, dmem_width = (handshake >> 16) & 0xFF, handshake >> 24
+            total_words = sum(len(words) for _, words in blocks)
+            if imem_width:
+                print(f"FPGA memories: {1 << imem_width} instruction words, {1 << dmem_width} data words.")
+                too_large = [(base, words) for base, words in blocks if base + len(words) > 1 << imem_width]
+                if too_large:
+                    print(f"Error: a section at word {too_large[0][0]} does not fit in the instruction memory. "
+                          "Reset the FPGA and try again.")
+                    return
+                data, expected_hs3 = block_stream(blocks), 3 | total_words << 8
+            elif len(blocks) == 1 and blocks[0][0] == 0:
+                print("FPGA does not support block loads; sending the program raw.")
+                data, expected_hs3 = block_stream(blocks)[8:], 3
+            else:
+                print("Error: FPGA does not support block loads, which sections at other addresses need. Exiting.")
+                return
+            print(f"\nSending {total_words} words in {len(blocks)} section(s) to {port}...")
             ser.flushInput()
-            bytes_sent = 0
-            for byte in program_bytes:
-                ser.write(bytes([byte]))
-                bytes_sent += 1
-                # A small delay can help prevent overwhelming the FPGA's UART buffer
-                time.sleep(0.001)
-            print(f"\rSent {bytes_sent}/{num_bytes} bytes.")
+            send_bytes(ser, data)
             print("\nProgram loading complete.")
 
             # --- STAGE 4: RUN MODE --- #
             input("\n>>> Press the START button a second time to RUN the program, then press Enter here. <<<")
-            if not wait_for_handshake(ser, 3, buffer):
-                print("FPGA did not acknowledge RUN mode. Exiting.")
+            if wait_for_handshake(ser, expected_hs3, buffer) is None:
+                print("FPGA did not acknowledge RUN mode (or did not receive every program word). Exiting.")
                 return
             
             # --- STAGE 5: MONITORING --- #
-            print("\n--- Waiting for ALU results ---")
-            last_rx_time = time.time()
-            while True:
+            label = RESULT_LABELS[args.report]
+            print(f"\n--- Waiting for results (report mode '{args.report}') ---")
+            last_rx_time = last_request = time.time()
+            counters_wanted = args.perf or args.perf_interval
+            def frame_length(word):
+                if dump and dump_words(word):
+                    return dump_words(word)
+                if counters_wanted and word & ~1 == PERF_HEADER:
+                    return PERF_WORDS
+                return 0
+            frame = []  # a possible dump or counter frame, from its header on
+            dumped = done = False
+            while not done:
+                if args.perf_interval and time.time() - last_request > args.perf_interval:
+                    ser.write(bytes([PERF_REQUEST_CMD]))
+                    last_request = time.time()
+
                 if ser.in_waiting > 0:
                     buffer += ser.read(ser.in_waiting)
                     last_rx_time = time.time()
 
-                while len(buffer) >= PACKET_SIZE:
+                while len(buffer) >= PACKET_SIZE and not done:
                     result_bytes = buffer[:PACKET_SIZE]
                     del buffer[:PACKET_SIZE]
                     result = struct.unpack('<I', result_bytes)[0]
-                    print(f"ALU Result = 0x{result:08X}")
+                    if not frame and not frame_length(result):
+                        print(f"{label} = 0x{result:08X}")
+                        continue
+                    frame.append(result)
+                    if len(frame) < frame_length(frame[0]):
+                        continue
+                    # A result that merely looks like a header fails the checksum and is printed
+                    state, counters = decode_dump(frame), decode_perf(frame)
+                    if state is not None:
+                        print_state(*state, expected)
+                        dumped = True
+                        done = not args.perf
+                    elif counters is not None:
+                        print_counters(counters)
+                        done = bool(counters[0]) and (dumped or not dump)
+                    else:
+                        for word in frame:
+                            print(f"{label} = 0x{word:08X}")
+                    frame = []
                 
-                if time.time() - last_rx_time > NO_DATA_TIMEOUT:
+                if not done and time.time() - last_rx_time > NO_DATA_TIMEOUT:
+                    if frame:
+                        print(f"\n--- Incomplete frame: {len(frame)} of {frame_length(frame[0])} words received. ---")
                     print(f"\n--- No data received for {NO_DATA_TIMEOUT} seconds. Exiting. ---")
                     break
                 
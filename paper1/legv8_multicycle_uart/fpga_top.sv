@@ -15,10 +15,38 @@ module fpga_top (
     logic       core_tx_start;
     logic       uart_tx_active;
 
+    // Result reporting mode (LEGv8_Controller REPORT_*), state dump and
+    // performance counters after HALT: the host may send
+    // REPORT_MODE_CMD | perf << 3 | dump << 2 | mode between handshake 1 and
+    // the first START; all are echoed in the second byte of handshake 2.
+    // PERF_REQUEST_CMD while the program runs asks for the counters.
+    localparam logic [3:0] REPORT_MODE_CMD = 4'hA;
+    localparam logic [7:0] PERF_REQUEST_CMD = 8'hC5;
+    logic [1:0] report_mode;
+    logic       dump_en;
+    logic       perf_en;
+    logic       perf_request;
+
+    // Memory sizes (word address bits). IMEM has a registered read and maps to
+    // M9K: 13 bits are 8192 instructions (32 KB) in 32 of the DE-10 Lite's 182
+    // blocks, 15 (128 blocks) is the largest that fits. DMEM is read
+    // combinationally and stays in logic, so keep it to a few hundred words.
+    // Both are echoed in handshake 2 of a block load.
+    parameter IMEM_ADDR_WIDTH = 13;
+    parameter DMEM_ADDR_WIDTH = 8;
+
+    // Program load: sent right after handshake 1, LOAD_BLOCKS_CMD makes S_LOAD
+    // take blocks (base word address, word count, then the words, each 32-bit
+    // little endian) instead of raw words from address 0; see the load logic
+    // at the end. The host may send it before or after the report mode byte.
+    localparam logic [7:0] LOAD_BLOCKS_CMD = 8'hB1;
+    logic        block_load;
+    logic [23:0] load_words;  // IMEM words written by a block load
+
     // IMEM Write Interface (for bootloader)
     logic imem_write_en;
     logic [31:0] imem_write_data;
-    logic [5:0] imem_write_addr;
+    logic [IMEM_ADDR_WIDTH-1:0] imem_write_addr;
 
     // --- Handshake & UART Muxing Logic ---
     logic [7:0] handshake_tx_data;
@@ -34,7 +62,8 @@ module fpga_top (
         S_HS2_B0, S_HS2_B1, S_HS2_B2, S_HS2_B3,
         S_LOAD,
         S_HS3_B0, S_HS3_B1, S_HS3_B2, S_HS3_B3,
-        S_RUN
+        S_RUN,
+        S_BAUD_DIV0, S_BAUD_DIV1, S_BAUD_ACK, S_BAUD_SWITCH, S_BAUD_CHECK, S_BAUD_ECHO, S_BAUD_CONFIRM
     } master_state_t;
     master_state_t master_state;
 
@@ -54,22 +83,52 @@ module fpga_top (
     assign uart_mux_tx_data = is_run_mode ? core_tx_data : handshake_tx_data;
     assign uart_mux_tx_dv   = is_run_mode ? core_tx_start : handshake_tx_start;
 
-    LEGv8_Core core_inst (
-        .clk(clk_50MHz), .rst(rst), .start(core_start_pulse), 
+    // Result FIFO between the core and the UART (result_fifo.sv); 0 = none
+    parameter RESULT_FIFO_DEPTH  = 64;
+    parameter RESULT_FIFO_POLICY = 0;
+    // 1: trimmed controller sequence, 2 cycles per instruction plus result sending
+    parameter FAST_CONTROLLER    = 0;
+
+    LEGv8_Core #( .RESULT_FIFO_DEPTH(RESULT_FIFO_DEPTH), .RESULT_FIFO_POLICY(RESULT_FIFO_POLICY),
+                  .FAST_CONTROLLER(FAST_CONTROLLER), .IMEM_ADDR_WIDTH(IMEM_ADDR_WIDTH), .DMEM_ADDR_WIDTH(DMEM_ADDR_WIDTH) ) core_inst (
+        .clk(clk_50MHz), .rst(rst), .start(core_start_pulse), .report_mode(report_mode), .dump_en(dump_en), .perf_en(perf_en), .perf_request(perf_request),
         .imem_write_en_in(imem_write_en), .imem_write_data_in(imem_write_data), .imem_write_addr_in(imem_write_addr),
         .tx_active(uart_tx_active), .tx_data(core_tx_data), .tx_start(core_tx_start), .core_active(led_act)
     );
 
+    // UART clocks per bit after reset (115200 baud at 50 MHz)
     parameter CLKS_PER_BIT = 434;
     logic [7:0] rx_data; logic rx_dv;
 
-    uart_tx #( .CLKS_PER_BIT(CLKS_PER_BIT) ) uart_tx_inst (
-        .clk(clk_50MHz), .rst(rst), .i_tx_data(uart_mux_tx_data), .i_tx_dv(uart_mux_tx_dv), .o_tx_active(uart_tx_active), .o_tx_serial(uart_tx)
+    // Baud rate negotiation, in S_IDLE (after handshake 1, before START): the
+    // host sends BAUD_CMD and the clocks per bit it proposes (16-bit little
+    // endian). fpga_top answers BAUD_CMD | proposal << 8 at the current rate,
+    // with proposal 0 when it refuses one below MIN_CLKS_PER_BIT, and switches
+    // both UARTs. At the new rate the host sends BAUD_PATTERN, fpga_top checks
+    // it and sends it back, and the host confirms with BAUD_CONFIRM_CMD. A
+    // wrong pattern byte, any other confirmation byte or BAUD_TIMEOUT_CLKS
+    // without one restores the previous rate; BAUD_TIMEOUT_CLKS without a
+    // divisor byte drops the command and keeps the rate. Reset restores
+    // CLKS_PER_BIT.
+    localparam logic [7:0]  BAUD_CMD = 8'hBD;
+    localparam logic [7:0]  BAUD_CONFIRM_CMD = 8'hBC;
+    localparam logic [63:0] BAUD_PATTERN = 64'hCC33_F00F_FF00_AA55;  // sent LSB first: 55 AA 00 FF 0F F0 33 CC
+    localparam integer      MIN_CLKS_PER_BIT = 4;
+    parameter BAUD_TIMEOUT_CLKS = 25_000_000;  // 0.5 s at 50 MHz
+    logic [15:0] clks_per_bit, clks_per_bit_prev, baud_proposal;
+    logic [63:0] baud_tx_shift; logic [3:0] baud_tx_left; logic [2:0] baud_index; logic baud_ok; logic [31:0] baud_timer;
+    logic [15:0] baud_rx_proposal;  // the proposal once its high byte arrives, 0 if refused
+    assign baud_rx_proposal = ({rx_data, baud_proposal[7:0]} >= 16'(MIN_CLKS_PER_BIT)) ? {rx_data, baud_proposal[7:0]} : 16'b0;
+
+    uart_tx uart_tx_inst (
+        .clk(clk_50MHz), .rst(rst), .i_tx_data(uart_mux_tx_data), .i_tx_dv(uart_mux_tx_dv), .i_clks_per_bit(clks_per_bit), .o_tx_active(uart_tx_active), .o_tx_serial(uart_tx)
     );
-    uart_rx #( .CLKS_PER_BIT(CLKS_PER_BIT) ) uart_rx_inst (
-        .clk(clk_50MHz), .rst(rst), .i_rx_serial(uart_rx_in), .o_rx_data(rx_data), .o_rx_dv(rx_dv)
+    uart_rx uart_rx_inst (
+        .clk(clk_50MHz), .rst(rst), .i_rx_serial(uart_rx_in), .i_clks_per_bit(clks_per_bit), .o_rx_data(rx_data), .o_rx_dv(rx_dv)
     );
 
+    assign perf_request = is_run_mode && rx_dv && (rx_data == PERF_REQUEST_CMD);
+
     logic start_edge, start_sync_0, start_sync_1;
     always_ff @(posedge clk_50MHz or posedge rst) begin
         if (rst) {start_sync_0, start_sync_1} <= 2'b0; else {start_sync_0, start_sync_1} <= {start, start_sync_0};
@@ -79,7 +138,8 @@ module fpga_top (
     logic start_released; logic [3:0] reset_counter; logic hs_tx_req;
     always_ff @(posedge clk_50MHz or posedge rst) begin
         if (rst) begin
-            master_state <= S_RESET_WAIT; reset_counter <= 4'b0; start_released <= 1'b0; handshake_tx_start <= 1'b0; hs_tx_req <= 1'b0;
+            master_state <= S_RESET_WAIT; reset_counter <= 4'b0; start_released <= 1'b0; handshake_tx_start <= 1'b0; hs_tx_req <= 1'b0; report_mode <= 2'b00; dump_en <= 1'b0; perf_en <= 1'b0; block_load <= 1'b0;
+            clks_per_bit <= 16'(CLKS_PER_BIT); clks_per_bit_prev <= 16'(CLKS_PER_BIT); baud_proposal <= 16'b0; baud_tx_shift <= 64'b0; baud_tx_left <= 4'b0; baud_index <= 3'b0; baud_ok <= 1'b0; baud_timer <= 32'b0;
         end else begin
             handshake_tx_start <= 1'b0;
             case (master_state)
@@ -90,38 +150,78 @@ module fpga_top (
                 S_HS1_B2: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS1_B3; end end
                 S_HS1_B3: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_IDLE;   end end
 
-                S_IDLE:   if (start_edge) begin master_state <= S_HS2_B0; start_released <= 1'b0; end
+                S_IDLE:   begin if (rx_dv && rx_data[7:4] == REPORT_MODE_CMD) {perf_en, dump_en, report_mode} <= rx_data[3:0]; if (rx_dv && rx_data == LOAD_BLOCKS_CMD) block_load <= 1'b1; if (rx_dv && rx_data == BAUD_CMD) begin baud_timer <= 32'b0; master_state <= S_BAUD_DIV0; end if (start_edge) begin master_state <= S_HS2_B0; start_released <= 1'b0; end end
 
                 S_HS2_B0: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h02; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS2_B1; end end
-                S_HS2_B1: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS2_B2; end end
-                S_HS2_B2: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS2_B3; end end
-                S_HS2_B3: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_LOAD;   end end
+                S_HS2_B1: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= {4'b0, perf_en, dump_en, report_mode}; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS2_B2; end end
+                S_HS2_B2: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= block_load ? 8'(IMEM_ADDR_WIDTH) : 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS2_B3; end end
+                S_HS2_B3: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= block_load ? 8'(DMEM_ADDR_WIDTH) : 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_LOAD;   end end
 
                 S_LOAD:   begin if (!start) start_released <= 1'b1; if (start_edge && start_released) master_state <= S_HS3_B0; end
 
                 S_HS3_B0: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h03; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS3_B1; end end
-                S_HS3_B1: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS3_B2; end end
-                S_HS3_B2: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS3_B3; end end
-                S_HS3_B3: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_RUN;    end end
+                S_HS3_B1: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= block_load ? load_words[7:0] : 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS3_B2; end end
+                S_HS3_B2: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= block_load ? load_words[15:8] : 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_HS3_B3; end end
+                S_HS3_B3: if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= block_load ? load_words[23:16] : 8'h00; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; master_state <= S_RUN;    end end
 
                 S_RUN:    master_state <= S_RUN;
+
+                // The rate has not changed yet, so a missing divisor byte only ends the command
+                S_BAUD_DIV0:    begin baud_timer <= baud_timer + 1;
+                                    if (rx_dv) begin baud_proposal[7:0] <= rx_data; baud_timer <= 32'b0; master_state <= S_BAUD_DIV1; end
+                                    else if (baud_timer == 32'(BAUD_TIMEOUT_CLKS)) master_state <= S_IDLE;
+                                end
+                S_BAUD_DIV1:    begin baud_timer <= baud_timer + 1;
+                                    if (rx_dv) begin baud_proposal <= baud_rx_proposal; baud_tx_shift <= {40'b0, baud_rx_proposal, BAUD_CMD}; baud_tx_left <= 4'd4; master_state <= S_BAUD_ACK; end
+                                    else if (baud_timer == 32'(BAUD_TIMEOUT_CLKS)) master_state <= S_IDLE;
+                                end
+                S_BAUD_ACK, S_BAUD_ECHO:
+                          if (!uart_tx_active && !hs_tx_req) begin hs_tx_req <= 1'b1; handshake_tx_data <= baud_tx_shift[7:0]; end else if (hs_tx_req) begin handshake_tx_start <= 1'b1; if (uart_tx_active) begin hs_tx_req <= 1'b0; baud_tx_shift <= baud_tx_shift >> 8; baud_tx_left <= baud_tx_left - 1'b1;
+                              if (baud_tx_left == 4'd1) begin baud_timer <= 32'b0; if (master_state == S_BAUD_ECHO) master_state <= S_BAUD_CONFIRM; else if (baud_proposal != 16'b0) master_state <= S_BAUD_SWITCH; else master_state <= S_IDLE; end end end
+                // Switch once the acknowledge's stop bit is out
+                S_BAUD_SWITCH:  if (!uart_tx_active) begin clks_per_bit_prev <= clks_per_bit; clks_per_bit <= baud_proposal; baud_index <= 3'b0; baud_ok <= 1'b1; baud_timer <= 32'b0; master_state <= S_BAUD_CHECK; end
+                S_BAUD_CHECK:   begin baud_timer <= baud_timer + 1;
+                                    if (rx_dv) begin if (rx_data != BAUD_PATTERN[8 * baud_index +: 8]) baud_ok <= 1'b0; baud_index <= baud_index + 1'b1;
+                                        if (baud_index == 3'd7) begin if (baud_ok && rx_data == BAUD_PATTERN[63:56]) begin baud_tx_shift <= BAUD_PATTERN; baud_tx_left <= 4'd8; master_state <= S_BAUD_ECHO; end else begin clks_per_bit <= clks_per_bit_prev; master_state <= S_IDLE; end end
+                                    end else if (baud_timer == 32'(BAUD_TIMEOUT_CLKS)) begin clks_per_bit <= clks_per_bit_prev; master_state <= S_IDLE; end
+                                end
+                S_BAUD_CONFIRM: begin baud_timer <= baud_timer + 1;
+                                    if (rx_dv) begin if (rx_data != BAUD_CONFIRM_CMD) clks_per_bit <= clks_per_bit_prev; master_state <= S_IDLE; end
+                                    else if (baud_timer == 32'(BAUD_TIMEOUT_CLKS)) begin clks_per_bit <= clks_per_bit_prev; master_state <= S_IDLE; end
+                                end
                 default:  master_state <= S_RESET_WAIT;
             endcase
         end
     end
 
-    logic [1:0]  byte_count_r; logic [31:0] imem_write_data_reg; logic [5:0]  imem_write_addr_reg; logic write_pulse;
+    // Program load (S_LOAD): every 4 received bytes form a little-endian word.
+    // Raw load: the words go to IMEM from address 0. Block load: a stream of
+    // blocks, each a base word address, a word count (0: the block is empty)
+    // and that many words, so an image with sections at any address streams in
+    // one pass; handshake 3 then carries the number of words written.
+    typedef enum logic [1:0] { LOAD_BASE, LOAD_COUNT, LOAD_DATA } load_phase_t;
+    load_phase_t load_phase;
+    logic [1:0]  byte_count_r; logic [31:0] imem_write_data_reg; logic [IMEM_ADDR_WIDTH-1:0] imem_write_addr_reg; logic word_valid;
+    logic [31:0] load_remaining;
     always_ff @(posedge clk_50MHz or posedge rst) begin
-        if (rst) write_pulse <= 1'b0; else write_pulse <= (rx_dv && (byte_count_r == 2'b11) && is_load_mode);
+        if (rst) word_valid <= 1'b0; else word_valid <= (rx_dv && (byte_count_r == 2'b11) && is_load_mode);
     end
-    assign imem_write_en   = write_pulse; assign imem_write_data = imem_write_data_reg; assign imem_write_addr = imem_write_addr_reg;
+    assign imem_write_en   = word_valid && (!block_load || load_phase == LOAD_DATA);
+    assign imem_write_data = imem_write_data_reg; assign imem_write_addr = imem_write_addr_reg;
     always_ff @(posedge clk_50MHz or posedge rst) begin
-        if (rst) {byte_count_r, imem_write_addr_reg, imem_write_data_reg} <= {'0, '0, '0};
-        else if (is_load_mode) begin
+        if (rst) begin
+            {byte_count_r, imem_write_addr_reg, imem_write_data_reg} <= {'0, '0, '0};
+            load_phase <= LOAD_BASE; load_remaining <= 32'b0; load_words <= 24'b0;
+        end else if (is_load_mode) begin
             if (rx_dv) if (byte_count_r == 2'b11) byte_count_r <= 2'b00; else byte_count_r <= byte_count_r + 1;
-            if (write_pulse) imem_write_addr_reg <= imem_write_addr_reg + 1;
+            if (imem_write_en) begin imem_write_addr_reg <= imem_write_addr_reg + 1; load_words <= load_words + 1; end
+            if (word_valid && block_load) case (load_phase)
+                LOAD_BASE:  begin imem_write_addr_reg <= IMEM_ADDR_WIDTH'(imem_write_data_reg); load_phase <= LOAD_COUNT; end
+                LOAD_COUNT: begin load_remaining <= imem_write_data_reg; if (imem_write_data_reg != 32'b0) load_phase <= LOAD_DATA; else load_phase <= LOAD_BASE; end
+                default:    begin load_remaining <= load_remaining - 1; if (load_remaining == 32'd1) load_phase <= LOAD_BASE; end
+            endcase
             if (rx_dv) case (byte_count_r) 2'b00: imem_write_data_reg[7:0]<=rx_data; 2'b01: imem_write_data_reg[15:8]<=rx_data; 2'b10: imem_write_data_reg[23:16]<=rx_data; 2'b11: imem_write_data_reg[31:24]<=rx_data; endcase
         end
     end
 
-endmodule
\ No newline at end of file
+endmodule
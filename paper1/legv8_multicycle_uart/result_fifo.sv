@@ -0,0 +1,106 @@
+//
+// File: result_fifo.sv
+// Description: Result FIFO between LEGv8_Controller and uart_tx.
+//   The controller pushes one 32-bit result per instruction and goes on
+//   executing; the FIFO sends the words LSB first through uart_tx with the
+//   request/acknowledge handshake the controller otherwise does itself in
+//   SEND_RESULT. With the default DEPTH of 64 (the IMEM size) a program
+//   without backward branches never waits for the UART.
+//   POLICY selects what happens to a result pushed while the FIFO is full:
+//     0 - backpressure: `stall` holds the controller in SEND_RESULT until a
+//         word has gone out, so no result is lost (default).
+//     1 - drop: the result is discarded and counted in `dropped`; the core
+//         never waits. For throughput measurements, the host sees gaps.
+//
+module result_fifo #(
+    parameter DEPTH  = 64,
+    parameter POLICY = 0
+)(
+    input  logic        clk,
+    input  logic        rst,
+
+    // From Controller
+    input  logic        push,
+    input  logic [31:0] push_data,
+    output logic        stall,
+
+    // To uart_tx
+    input  logic        tx_active,
+    output logic [7:0]  tx_data,
+    output logic        tx_start,
+
+    // Status
+    output logic        empty,
+    output logic [15:0] dropped
+);
+
+    localparam integer PTR_WIDTH = (DEPTH > 1) ? $clog2(DEPTH) : 1;
+
+    (* ramstyle = "M9K" *) logic [31:0] mem [0:DEPTH-1];
+
+    logic [PTR_WIDTH-1:0] wr_ptr;
+    logic [PTR_WIDTH-1:0] rd_ptr;
+    logic [PTR_WIDTH:0]   count;
+    logic [31:0]          head;        // mem[rd_ptr], registered read
+    logic                 head_valid;  // head has been read since the FIFO became non-empty
+    logic [1:0]           byte_idx;
+    logic                 tx_request;
+    logic                 full;
+    logic                 push_ok;
+    logic                 pop;
+
+    assign full    = (count == DEPTH);
+    assign empty   = (count == 0);
+    assign stall   = (POLICY == 0) && full;
+    assign push_ok = push && !full;
+    assign pop     = tx_request && tx_active && (byte_idx == 2'b11);
+
+    // Block RAM: write port from the controller, registered read of the head word
+    always_ff @(posedge clk) begin
+        if (push_ok) mem[wr_ptr] <= push_data;
+        head <= mem[rd_ptr];
+    end
+
+    always_ff @(posedge clk or posedge rst) begin
+        if (rst) begin
+            wr_ptr <= '0;
+            rd_ptr <= '0;
+            count <= '0;
+            head_valid <= 1'b0;
+            byte_idx <= 2'b00;
+            tx_request <= 1'b0;
+            tx_start <= 1'b0;
+            tx_data <= 8'h00;
+            dropped <= 16'b0;
+        end else begin
+            tx_start <= 1'b0;
+            head_valid <= !empty;
+
+            if (push_ok) wr_ptr <= (wr_ptr == PTR_WIDTH'(DEPTH - 1)) ? '0 : wr_ptr + 1'b1;
+            else if (push && dropped != 16'hFFFF) dropped <= dropped + 1'b1;
+
+            if (push_ok && !pop) count <= count + 1'b1;
+            else if (pop && !push_ok) count <= count - 1'b1;
+
+            // Same byte handshake as SEND_RESULT; the next word is only requested
+            // once uart_tx is idle again, long after `head` has followed rd_ptr
+            if (head_valid && !empty && !tx_active && !tx_request) begin
+                tx_request <= 1'b1;
+                case (byte_idx)
+                    2'b00: tx_data <= head[7:0];
+                    2'b01: tx_data <= head[15:8];
+                    2'b10: tx_data <= head[23:16];
+                    2'b11: tx_data <= head[31:24];
+                endcase
+            end else if (tx_request) begin
+                tx_start <= 1'b1;
+                if (tx_active) begin
+                    tx_request <= 1'b0;
+                    byte_idx <= byte_idx + 1'b1;
+                    if (byte_idx == 2'b11) rd_ptr <= (rd_ptr == PTR_WIDTH'(DEPTH - 1)) ? '0 : rd_ptr + 1'b1;
+                end
+            end
+        end
+    end
+
+endmodule
@@ -0,0 +1,324 @@
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+from verif import cpi, ipc, legv8_asm
+from verif.batch import BATCH_PROGRAMS, Legv8Harness, ProgramImage
+from verif.coverage_models import legv8_mnemonic
+from verif.legv8_asm import OUTPUT_OFFSET, countdown_program, encode_b, random_program, read_listing
+from verif.legv8_iss import DMEM_WORDS, DUMP_WORDS, IMEM_WORDS, REPORT_HALT, REPORT_MODES, Legv8ISS, decode_dump
+from verif.minimize import MINIMIZE_IMAGES, replay_images
+from verif.seeding import test_rng
+from verif.soak import compare_state, read_array
+from verif.uart import CLKS_PER_BIT, HIGH_BAUD_RATES, clks_per_bit
+from verif.profiling import profiled
+
+CLOCK_NS = 20  # 50 MHz board clock
+TEST_PROG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_prog.txt")
+
+
+@cocotb.test()
+@profiled
+async def legv8_test_prog(dut):
+    """Boot fpga_top through its handshakes, run test_prog.txt and check every UART result and the final state."""
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    program = read_listing(TEST_PROG)
+    iss = Legv8ISS(program)
+    iss.run_to_halt()
+    assert iss.regs[14] == 1149 and iss.dmem[6] == 150, "test_prog.txt no longer computes X14 = 1149, M[24] = 150"
+
+    harness = Legv8Harness(dut)
+    cycles, error = await harness.run(ProgramImage("test_prog", program, {}, 1000))
+    assert error is None, error
+    dut._log.info(f"test_prog.txt: {len(iss.results)} results, {iss.retired} instructions in {cycles} cycles "
+                  f"(CPI {cycles / iss.retired:.1f})")
+
+
+@cocotb.test()
+@profiled
+async def legv8_batch_programs(dut):
+    """Run BATCH_PROGRAMS random programs back to back through the handshakes, each checked against the ISS."""
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [
+        ProgramImage(f"prog{i}", random_program(rng, rng.choice([4, 16, 63])),
+                     {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(rng.randrange(8))}, 1000)
+        for i in range(BATCH_PROGRAMS)
+    ]
+    result = await Legv8Harness(dut).run_batch(images)
+    assert not result.failures, f"{len(result.failures)} program(s) failed: {', '.join(result.failures)}"
+
+
+@cocotb.test()
+@profiled
+async def legv8_block_load(dut):
+    """
+    Load programs over the UART as block loads (LOAD_BLOCKS_CMD) instead of
+    the backdoor: one split between both ends of IMEM (two blocks), then
+    random programs. The handshakes echo the memory sizes and the words
+    written, and IMEM must hold exactly the image.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    loop = countdown_program(10)
+    base = IMEM_WORDS - len(loop)
+    split = {0: encode_b("B", base), **{base + i: instr for i, instr in loop.items()}}
+    images = [ProgramImage("split", split, {}, 1000)]
+    images += [ProgramImage(f"prog{i}", random_program(rng, rng.choice([4, 16, 63])),
+                            {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(rng.randrange(8))}, 1000)
+               for i in range(8)]
+
+    harness = Legv8Harness(dut, uart_load=True)
+    for image in images:
+        _, error = await harness.run(image)
+        assert error is None, error
+        imem = read_array(dut.core_inst.datapath_inst.imem_inst.IMEM, IMEM_WORDS)
+        compare_state(f"{image.name}.imem", imem, [image.imem.get(i, 0) for i in range(IMEM_WORDS)])
+    dut._log.info(f"{len(images)} programs block-loaded into a {IMEM_WORDS}-word IMEM")
+
+
+@cocotb.test()
+@profiled
+async def legv8_baud_negotiation(dut):
+    """
+    Negotiate the clocks per bit of 1, 2 and 3 Mbaud at 50 MHz after
+    handshake 1, then block-load and run test_prog.txt and a random program
+    at that rate. A wrong test pattern and a proposal below the minimum
+    leave the rate at CLKS_PER_BIT; reset always restores it.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000),
+              ProgramImage("prog", random_program(rng, 63),
+                           {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(4)}, 1000)]
+
+    harness = Legv8Harness(dut, uart_load=True)
+    for baud in HIGH_BAUD_RATES:
+        harness.baud_clks = clks_per_bit(baud)
+        for image in images:
+            _, error = await harness.run(image)
+            assert error is None, f"{baud} baud: {error}"
+        assert dut.clks_per_bit.value.integer == harness.baud_clks
+        dut._log.info(f"{baud} baud ({harness.baud_clks} clocks per bit): test_prog.txt and {images[1].name} done, "
+                      f"the last result {harness.output_cycles} cycles after start")
+
+    harness.baud_clks = clks_per_bit(HIGH_BAUD_RATES[0])
+    harness.baud_pattern = bytes(reversed(harness.baud_test_pattern))
+    _, error = await harness.run(images[0])
+    assert error is None, f"wrong test pattern: {error}"
+    harness.baud_pattern = harness.baud_test_pattern
+    harness.baud_clks = harness.min_clks_per_bit - 1
+    _, error = await harness.run(images[0])
+    assert error is None, f"refused rate: {error}"
+    assert dut.clks_per_bit.value.integer == CLKS_PER_BIT
+
+
+@cocotb.test()
+@profiled
+async def legv8_baud_timeout(dut):
+    """
+    Cut a baud rate proposal short after BAUD_CMD and after its first
+    divisor byte: fpga_top drops it after BAUD_TIMEOUT_CLKS and keeps
+    CLKS_PER_BIT, the block load and test_prog.txt go on at that rate, and
+    a complete proposal afterwards still switches.
+    """
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    image = ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000)
+    harness = Legv8Harness(dut, uart_load=True, baud_clks=clks_per_bit(HIGH_BAUD_RATES[0]))
+    for divisor_bytes in (0, 1):
+        harness.baud_divisor_bytes = divisor_bytes
+        _, error = await harness.run(image)
+        assert error is None, f"proposal cut after {divisor_bytes} divisor byte(s): {error}"
+        assert dut.clks_per_bit.value.integer == CLKS_PER_BIT
+    harness.baud_divisor_bytes = 2
+    _, error = await harness.run(image)
+    assert error is None, f"complete proposal: {error}"
+    assert dut.clks_per_bit.value.integer == harness.baud_clks
+
+
+@cocotb.test(skip=not MINIMIZE_IMAGES)
+@profiled
+async def legv8_replay_images(dut):
+    """Verdicts for the candidate images of verif/minimize.py ($MINIMIZE_IMAGES); skipped otherwise."""
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    await replay_images(Legv8Harness(dut))
+
+
+@cocotb.test()
+@profiled
+async def legv8_cpi(dut):
+    """
+    CPI of test_prog.txt, countdown loops (more results than the result FIFO
+    holds) and CPI_PROGRAMS random programs, core-active and until the last
+    UART result, broken down with the controller's performance counters.
+    `python -m verif.cpi` compares builds with it.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [("test_prog", ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000))]
+    images += [("loop", ProgramImage(f"countdown{n}", countdown_program(n), {}, 1000)) for n in (10, 40)]
+    images += [("random", ProgramImage(f"prog{i}", random_program(rng, rng.choice([16, 63])), {}, 1000))
+               for i in range(cpi.CPI_PROGRAMS)]
+
+    harness = Legv8Harness(dut)
+    records = []
+    for kind, image in images:
+        cycles, error = await harness.run(image)
+        assert error is None, error
+        iss = Legv8ISS(image.imem, image.dmem)
+        iss.run_to_halt(image.max_cycles)
+        perf = harness.read_perf()
+        assert perf.retired == iss.retired, f"{image.name}: {perf.retired} instructions counted, {iss.retired} retired"
+        records.append(cpi.CpiRecord(image.name, kind, iss.retired, cycles, harness.output_cycles,
+                                     perf.mem_wait, perf.uart_stall, perf.fixed_stall))
+    drops = harness.result_drops()
+    for line in cpi.report(records):
+        dut._log.info(line)
+    if drops:
+        dut._log.info(f"The result FIFO dropped {drops} results of the last program")
+    if cpi.CPI_FILE:
+        cpi.write_records(cpi.CPI_FILE, records)
+
+
+@cocotb.test()
+@profiled
+async def legv8_ipc(dut):
+    """
+    IPC of the verif/ipc.py workloads, the same programs legv8p_ipc runs on
+    the pipelined LEGv8. Only the result at HALT is reported, so the cycle
+    counter (start to HALT) holds no UART time.
+    """
+    rng = test_rng(ipc.IPC_TEST_SEED_NAME)
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    harness = Legv8Harness(dut, report_mode=REPORT_HALT)
+    records = []
+    for workload in ipc.workloads(legv8_asm, rng):
+        image = ProgramImage(workload.name, workload.imem, workload.dmem, 10_000)
+        _, error = await harness.run(image)
+        assert error is None, error
+        perf = harness.read_perf()
+        assert perf.uart_stall == 0, f"{image.name}: {perf.uart_stall} SEND_RESULT cycles before HALT"
+        records.append(ipc.IpcRecord(image.name, workload.kind, "multicycle", perf.retired, perf.cycles))
+    for line in ipc.report(records):
+        dut._log.info(line)
+    if ipc.IPC_FILE:
+        ipc.write_records(ipc.IPC_FILE, records)
+
+
+@cocotb.test()
+@profiled
+async def legv8_report_modes(dut):
+    """
+    Every report mode selected over the UART: test_prog.txt, a countdown
+    loop and random programs (half of their stores to the output address),
+    each checked against the ISS in the same mode; logs the cycles until the
+    last result per mode.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000),
+              ProgramImage("countdown40", countdown_program(40, OUTPUT_OFFSET), {}, 1000)]
+    images += [ProgramImage(f"prog{i}", random_program(rng, rng.choice([16, 63]), output_stores=True),
+                            {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(rng.randrange(8))}, 1000)
+               for i in range(4)]
+
+    harness = Legv8Harness(dut)
+    output_cycles = {}
+    for name, mode in REPORT_MODES.items():
+        harness.report_mode = mode
+        for image in images:
+            cycles, error = await harness.run(image)
+            assert error is None, f"report mode {name}: {error}"
+            output_cycles[name, image.name] = harness.output_cycles
+        iss = Legv8ISS(images[1].imem, report_mode=mode)
+        iss.run_to_halt()
+        dut._log.info(f"report {name:>6}: {len(iss.results):3} results, countdown40 done after "
+                      f"{output_cycles[name, 'countdown40']} cycles")
+    for name in ("output", "halt"):
+        assert output_cycles[name, "countdown40"] < output_cycles["all", "countdown40"], \
+            f"report mode {name} is not faster than reporting every result on countdown40"
+
+
+@cocotb.test()
+@profiled
+async def legv8_state_dump(dut):
+    """
+    The state dump after HALT, with every result and with only the one at
+    HALT: test_prog.txt and random programs, each dump decoded and compared
+    with the ISS registers and data memory.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000)]
+    images += [ProgramImage(f"prog{i}", random_program(rng, rng.choice([16, 63])),
+                            {rng.randrange(DMEM_WORDS): rng.getrandbits(32) for _ in range(rng.randrange(8))}, 1000)
+               for i in range(4)]
+
+    harness = Legv8Harness(dut, dump=True)
+    for mode in ("all", "halt"):
+        harness.report_mode = REPORT_MODES[mode]
+        for image in images:
+            _, error = await harness.run(image)
+            assert error is None, f"report mode {mode}: {error}"
+            iss = harness.model(image)
+            iss.run_to_halt(image.max_cycles)
+            regs, dmem = decode_dump(harness.sink.words()[-DUMP_WORDS:])
+            assert (regs, dmem) == (iss.regs, iss.dmem), f"{image.name}: decoded dump differs from the ISS state"
+    dut._log.info(f"{len(images)} programs dumped in both report modes, {DUMP_WORDS} words per dump")
+
+
+@cocotb.test()
+@profiled
+async def legv8_perf_counters(dut):
+    """
+    The performance counter frame after HALT, with every result and with
+    only the one at HALT: instructions retired and memory waits match the
+    ISS, every instruction but HALT stalls 3 cycles in NEXT_INSTR and spends
+    4 in FETCH/DECODE/EXECUTE/CAPTURE_RESULT (FAST_CONTROLLER: 2 in
+    FETCH/DECODE, no MEM_WAIT or NEXT_INSTR). A counter request while
+    countdown40 runs is answered before HALT.
+    """
+    rng = test_rng()
+    cocotb.start_soon(Clock(dut.clk_50MHz, CLOCK_NS, units="ns").start())
+    images = [ProgramImage("test_prog", read_listing(TEST_PROG), {}, 1000),
+              ProgramImage("countdown10", countdown_program(10), {}, 1000)]
+    images += [ProgramImage(f"prog{i}", random_program(rng, rng.choice([16, 63])), {}, 1000) for i in range(4)]
+
+    harness = Legv8Harness(dut, perf=True)
+    base, wait, stall = (2, 0, 0) if harness.fast else (4, 1, 3)
+    records = []
+    for mode in ("all", "halt"):
+        harness.report_mode = REPORT_MODES[mode]
+        for image in images:
+            cycles, error = await harness.run(image)
+            assert error is None, f"report mode {mode}: {error}"
+            perf = harness.perf_counters
+            records.append(cpi.CpiRecord(image.name, mode, perf.retired, perf.cycles, harness.output_cycles,
+                                         perf.mem_wait, perf.uart_stall, perf.fixed_stall))
+            iss = harness.model(image)
+            memory = sum(legv8_mnemonic(iss.step().instr) in ("LDUR", "STUR") for _ in range(perf.retired))
+            assert perf.mem_wait == wait * memory, \
+                f"{image.name}: {perf.mem_wait} memory-wait cycles, {wait * memory} expected"
+            assert perf.fixed_stall == stall * (perf.retired - 1), f"{image.name}: {perf}"
+            assert perf.cycles == base * (perf.retired - 1) + 2 + perf.mem_wait + perf.uart_stall + perf.fixed_stall, \
+                f"{image.name}: {perf}"
+            assert abs(perf.cycles - cycles) <= 2, f"{image.name}: {perf.cycles} cycles counted, led_act {cycles}"
+            if mode == "halt":
+                assert perf.uart_stall == 0, f"{image.name}: {perf.uart_stall} SEND_RESULT cycles without results"
+    for line in cpi.report(records):
+        dut._log.info(line)
+
+    # On request while running: REPORT_HALT sends nothing else until HALT
+    harness.perf = False
+    image = ProgramImage("countdown40", countdown_program(40), {}, 1000)
+    run = cocotb.start_soon(harness.run(image))
+    while dut.led_act.value != 1:
+        await ClockCycles(dut.clk_50MHz, harness.clks_per_bit)
+    await harness.request_perf()
+    _, error = await run
+    assert error is None, error
+    assert len(harness.perf_frames) == 1, f"{len(harness.perf_frames)} counter frames for one request"
+    frame = harness.perf_frames[0]
+    assert not frame.halted and 0 < frame.retired < harness.read_perf().retired, f"counters on request: {frame}"
+    dut._log.info(f"counters on request after {frame.retired} instructions: {frame}")
@@ -0,0 +1,59 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge, ReadOnly, RisingEdge
+from verif.seeding import test_rng
+from verif.uart import FPGA_CLOCK_HZ, HIGH_BAUD_RATES, UartSource, clks_per_bit
+from verif.profiling import profiled
+
+# make TOPLEVEL=uart_rx MODULE=test_uart_rx
+CLOCK_NS = 20  # 50 MHz board clock
+RATES = (115_200, *HIGH_BAUD_RATES)
+HOST_ERROR = 0.02  # host rate error each test also tolerates, either way
+
+
+async def reset(dut, clks):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    dut.rst.value = 1
+    dut.i_rx_serial.value = 1
+    dut.i_clks_per_bit.value = clks
+    await ClockCycles(dut.clk, 3)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+
+async def monitor(dut, received):
+    """Collect o_rx_data on every o_rx_dv pulse."""
+    while True:
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        if dut.o_rx_dv.value == 1:
+            received.append(dut.o_rx_data.value.integer)
+
+
+@cocotb.test()
+@profiled
+async def uart_rx_rates(dut):
+    """
+    Bytes back to back at 115200 baud and 1, 2 and 3 Mbaud, i_clks_per_bit
+    changed while the line is idle. The host runs at the exact rate and
+    HOST_ERROR above and below it (fractional clocks per bit), so the
+    rounding of clks_per_bit leaves margin.
+    """
+    rng = test_rng()
+    await reset(dut, clks_per_bit(RATES[0]))
+    source = UartSource(dut.clk, dut.i_rx_serial)
+    received = []
+    cocotb.start_soon(monitor(dut, received))
+    for baud in RATES:
+        clks = clks_per_bit(baud)
+        await FallingEdge(dut.clk)
+        dut.i_clks_per_bit.value = clks
+        for host in (baud, baud * (1 - HOST_ERROR), baud * (1 + HOST_ERROR)):
+            source.clks_per_bit = FPGA_CLOCK_HZ / host
+            received.clear()
+            data = [0x00, 0xFF, 0x55, 0xAA] + [rng.randrange(256) for _ in range(16)]
+            await source.write(data)
+            await ClockCycles(dut.clk, 2 * clks)
+            assert received == data, \
+                f"{baud} baud, host at {host:.0f}: sent {bytes(data).hex()}, received {bytes(received).hex()}"
+        dut._log.info(f"{baud} baud: {clks} clocks per bit, host rate within {100 * HOST_ERROR:.0f}% either way")
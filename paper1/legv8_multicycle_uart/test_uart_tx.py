@@ -0,0 +1,65 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge, ReadOnly, RisingEdge
+from verif.seeding import test_rng
+from verif.uart import FPGA_CLOCK_HZ, HIGH_BAUD_RATES, UartSink, clks_per_bit
+from verif.profiling import profiled
+
+# make TOPLEVEL=uart_tx MODULE=test_uart_tx
+CLOCK_NS = 20  # 50 MHz board clock
+RATES = (115_200, *HIGH_BAUD_RATES)
+
+
+async def reset(dut, clks):
+    cocotb.start_soon(Clock(dut.clk, CLOCK_NS, units="ns").start())
+    dut.rst.value = 1
+    dut.i_tx_dv.value = 0
+    dut.i_tx_data.value = 0
+    dut.i_clks_per_bit.value = clks
+    await ClockCycles(dut.clk, 3)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+
+async def send_byte(dut, byte):
+    """Start `byte` with a one-clock i_tx_dv; returns the clocks o_tx_active stayed high."""
+    await FallingEdge(dut.clk)
+    dut.i_tx_data.value = byte
+    dut.i_tx_dv.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.i_tx_dv.value = 0
+    clocks = 0
+    while True:
+        await RisingEdge(dut.clk)
+        clocks += 1
+        await ReadOnly()
+        if dut.o_tx_active.value == 0:
+            return clocks
+
+
+@cocotb.test()
+@profiled
+async def uart_tx_rates(dut):
+    """
+    Bytes back to back at 115200 baud and 1, 2 and 3 Mbaud, i_clks_per_bit
+    changed between bytes: every frame takes exactly 10 bit times and a host
+    at the exact rate (a fractional number of clocks per bit) decodes it.
+    """
+    rng = test_rng()
+    await reset(dut, clks_per_bit(RATES[0]))
+    sink = UartSink(dut.clk, dut.o_tx_serial, FPGA_CLOCK_HZ / RATES[0]).start()
+    for baud in RATES:
+        clks = clks_per_bit(baud)
+        await FallingEdge(dut.clk)
+        dut.i_clks_per_bit.value = clks
+        sink.clks_per_bit = FPGA_CLOCK_HZ / baud
+        sink.clear()
+        data = [0x00, 0xFF, 0x55, 0xAA] + [rng.randrange(256) for _ in range(16)]
+        for byte in data:
+            clocks = await send_byte(dut, byte)
+            assert clocks == 10 * clks, f"{baud} baud: frame of 0x{byte:02X} took {clocks} clocks, expected {10 * clks}"
+        await ClockCycles(dut.clk, 2 * clks)
+        assert bytes(sink.data) == bytes(data), f"{baud} baud: sent {bytes(data).hex()}, decoded {bytes(sink.data).hex()}"
+        dut._log.info(f"{baud} baud: {len(data)} bytes at {clks} clocks per bit "
+                      f"({100 * (FPGA_CLOCK_HZ / clks / baud - 1):+.1f}% from the host rate)")
@@ -1,5 +1,6 @@
+// Clocks per bit come from i_clks_per_bit (434: 115200 baud at 50 MHz), so
+// the rate can change at run time; change it only while the line is idle.
 module uart_rx #(
-    parameter CLKS_PER_BIT = 434,
     parameter DEBUG_UART = 0,
     parameter SYNC_DELAY_CLKS = 2
 )
@@ -7,13 +8,15 @@ module uart_rx #(
     input  logic clk,
     input  logic rst,
     input  logic i_rx_serial,
+    input  logic [15:0] i_clks_per_bit,
     output logic [7:0] o_rx_data,
     output logic o_rx_dv
 );
 
     // FIXED: Proper calculations for half and full bit periods
-    localparam HALF_BIT_WAIT = CLKS_PER_BIT / 2;  // Middle of bit period
-    localparam FULL_BIT_WAIT = CLKS_PER_BIT - 1;  // Full bit period
+    logic [15:0] half_bit_wait, full_bit_wait;
+    assign half_bit_wait = i_clks_per_bit >> 1;   // Middle of bit period
+    assign full_bit_wait = i_clks_per_bit - 1'b1; // Full bit period
 
     typedef enum logic [1:0] { IDLE, SYNC, DATA, STOP } state_t;
     state_t state_r, prev_state_r;
@@ -48,7 +51,7 @@ module uart_rx #(
                 end
 
                 SYNC: begin
-                    if (clk_count_r == (HALF_BIT_WAIT - 1)) begin
+                    if (clk_count_r == (half_bit_wait - 1)) begin
                         // Verify we're still in start bit (should be low)
                         if (~i_rx_serial) begin
                             state_r <= DATA;
@@ -64,7 +67,7 @@ module uart_rx #(
                 end
 
                 DATA: begin
-                    if (clk_count_r == (FULL_BIT_WAIT)) begin
+                    if (clk_count_r == (full_bit_wait)) begin
                         // Sample the bit at the end of the bit period
                         data_r[bit_count_r] <= i_rx_serial;
                         clk_count_r <= 0;
@@ -85,7 +88,7 @@ module uart_rx #(
                 end
 
                 STOP: begin
-                    if (clk_count_r == (FULL_BIT_WAIT)) begin
+                    if (clk_count_r == (full_bit_wait)) begin
                         clk_count_r <= 0;
                         o_rx_dv_reg <= 1;  // Assert data valid for one cycle
                         state_r <= IDLE;
@@ -1,5 +1,6 @@
+// Clocks per bit come from i_clks_per_bit (434: 115200 baud at 50 MHz), so
+// the rate can change at run time; change it only while o_tx_active is low.
 module uart_tx #(
-    parameter CLKS_PER_BIT = 434, // 115200 baud for 50MHz clock
     parameter DEBUG_UART = 0      // Uncomment this line
 )
 (
@@ -7,6 +8,7 @@ module uart_tx #(
     input  logic rst,
     input  logic [7:0] i_tx_data,
     input  logic i_tx_dv,
+    input  logic [15:0] i_clks_per_bit,
     output logic o_tx_active,
     output logic o_tx_serial
 );
@@ -20,7 +22,7 @@ module uart_tx #(
 
     state_t state_r, state_n;
 
-    logic [9:0] clk_counter_r, clk_counter_n; // Reduced width
+    logic [15:0] clk_counter_r, clk_counter_n;
     logic [2:0] bit_index_r, bit_index_n;
     logic [7:0] tx_data_r, tx_data_n;
 
@@ -58,7 +60,7 @@ module uart_tx #(
 
             TX_START_BIT: begin
                 o_tx_serial = 1'b0;
-                if (clk_counter_r == (CLKS_PER_BIT - 1)) begin
+                if (clk_counter_r == (i_clks_per_bit - 1'b1)) begin
                     state_n = TX_DATA_BITS;
                     clk_counter_n = '0;
                     bit_index_n = '0;
@@ -69,7 +71,7 @@ module uart_tx #(
 
             TX_DATA_BITS: begin
                 o_tx_serial = tx_data_r[bit_index_r];
-                if (clk_counter_r == (CLKS_PER_BIT - 1)) begin
+                if (clk_counter_r == (i_clks_per_bit - 1'b1)) begin
                     if (DEBUG_UART) $display("[%0t] TX: Sending bit %d, value %b from tx_data_r=0x%h", $time, bit_index_r, tx_data_r[bit_index_r], tx_data_r);
                     clk_counter_n = '0;
                     if (bit_index_r == 3'd7) begin
@@ -85,7 +87,7 @@ module uart_tx #(
 
             TX_STOP_BIT: begin
                 o_tx_serial = 1'b1;
-                if (clk_counter_r == (CLKS_PER_BIT - 1)) begin
+                if (clk_counter_r == (i_clks_per_bit - 1'b1)) begin
                     state_n = IDLE;
                 end else begin
                     clk_counter_n = clk_counter_r + 1'b1;
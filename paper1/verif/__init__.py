@@ -0,0 +1,6 @@
+"""
+Shared verification helpers for the cocotb testbenches under paper1/.
+
+The processor directories put paper1/ on PYTHONPATH from their Makefiles,
+so a testbench can simply do ``from verif import coverage``.
+"""
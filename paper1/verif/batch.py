@@ -0,0 +1,597 @@
+"""
+Back-to-back program execution in one simulation.
+
+A harness runs a queue of program images through one single-cycle core
+without restarting the simulator: for every image it resets the core,
+backdoor-loads IMEM/DMEM, clocks it for as many cycles as the ISS needs to
+reach the halt (or the image's cycle budget), then compares registers,
+data memory and the final PC with the ISS and moves on. The simulator and
+cocotb start-up is paid once for the whole queue.
+
+Loading only writes the memory entries that differ from what the core
+holds after the previous program (known exactly, since it was just checked
+against the ISS), so short programs do not pay for a full DMEM rewrite.
+
+    harness = RiscvHarness(dut)
+    result = await harness.run_batch(images)
+    assert not result.failures
+
+BATCH_PROGRAMS sets the queue length the processor tests generate. Failing
+images are saved to CRASH_DIR (default fuzz/crashes/), where
+verif/minimize.py picks them up.
+
+Legv8Harness drives the whole fpga_top of legv8_multicycle_uart: it walks
+the reset/load/run handshakes with the start button, lets the core run until
+HALT and checks the results it sent over the UART as well as the final state.
+Besides the cycles the core was active it records the cycles until the last
+result byte arrived, which the result FIFO lets diverge. Its `report_mode`
+(REPORT_* of verif/legv8_iss.py), `dump` (the post-HALT state dump) and
+`perf` (the performance counters after HALT) are sent to fpga_top before
+loading; the ISS reports the same subset of results, the dump is expected
+after them and the counter frame last (decoded into `perf_counters`).
+`request_perf` asks for the counters while a program runs; such frames are
+taken out of the result stream into `perf_frames`. `fast` follows the
+FAST_CONTROLLER build (the Makefile exports it): the trimmed controller
+reports only register writes in REPORT_ALL, so the ISS does as well. With
+`uart_load` the program goes over the UART as a block load
+(LOAD_BLOCKS_CMD, one block per run of consecutive instructions) instead of
+the IMEM backdoor, and the handshakes must echo the memory sizes and the
+number of words written. The memory sizes follow the build's
+IMEM_ADDR_WIDTH / DMEM_ADDR_WIDTH. With `baud_clks` it negotiates that many
+clocks per bit after handshake 1 (fpga_top BAUD_CMD) and runs the rest of
+the boot and the program at the new rate; `baud_pattern` other than the
+test pattern must leave the rate unchanged, and so must
+`baud_divisor_bytes` below 2 (fpga_top waits BAUD_TIMEOUT_CLKS for the
+missing bytes, then drops the command).
+
+With `warm_start` (the default) the first run of every boot configuration
+(report mode, dump, perf, `uart_load`, baud rate) takes a Snapshot
+(verif/snapshot.py) of fpga_top in load mode, right after handshake 2.
+Later runs with that configuration restore it instead of repeating the
+reset, handshakes 1 and 2, the mode and baud bytes and the first START;
+IMEM and DMEM are left out of the snapshot, so loading still only writes
+the entries that changed.
+
+Legv8pHarness runs the pipelined LEGv8 (LEGv8_Pipelined_Processor) until
+halt_out and also checks that it took exactly the cycles the ISS's pipeline
+timing predicts (stalls and branch penalties included).
+"""
+import os
+import time
+from collections import namedtuple
+
+import cocotb
+from cocotb.triggers import ClockCycles, FallingEdge, ReadOnly, RisingEdge
+
+from verif import minimize
+from verif.cpi import PERF_WORDS, PerfCounters, split_perf_frames
+from verif.legv8_iss import (DMEM_ADDR_WIDTH, DMEM_WORDS, IMEM_ADDR_WIDTH, IMEM_WORDS, REPORT_ALL, REPORT_WRITES,
+                              Legv8ISS, load_blocks, load_stream, state_dump)
+from verif.legv8p_iss import Legv8pISS
+from verif.lev8_iss import Lev8ISS
+from verif.riscv_iss import RiscvISS
+from verif.snapshot import Snapshot
+from verif.soak import compare_state, read_array
+from verif.uart import CLKS_PER_BIT, UartSink, UartSource
+
+BATCH_PROGRAMS = int(os.environ.get("BATCH_PROGRAMS", "200"))
+FAST_CONTROLLER = int(os.environ.get("FAST_CONTROLLER", "0"))
+BAUD_TIMEOUT_CLKS = int(os.environ.get("BAUD_TIMEOUT_CLKS", "25000000"))
+
+# `imem`/`dmem` are sparse dicts (address -> value, absent = 0) in the
+# layout of the core's ISS; `max_cycles` caps programs that never halt.
+# The instruction at address 0 must not be a store: it is decoded while
+# reset is held and the data memories do not look at reset.
+ProgramImage = namedtuple("ProgramImage", "name imem dmem max_cycles")
+BatchResult = namedtuple("BatchResult", "programs cycles failures seconds")
+# fpga_top in load mode after handshake 2: the state, the bytes received so far and the line rate
+WarmStart = namedtuple("WarmStart", "snapshot received clks_per_bit")
+
+
+class CoreHarness:
+    """Reset/load/run/check cycle for one single-cycle core; subclasses describe the core."""
+
+    isa = None
+    clock_name = "clk"
+    reset_name = None
+    reset_active = 1
+    imem_path = None
+    dmem_path = None
+    regs_path = None
+    imem_entries = 0
+    dmem_entries = 0
+    num_regs = 0
+    pc_name = None
+
+    def __init__(self, dut, log=None):
+        self.dut = dut
+        self.clk = getattr(dut, self.clock_name)
+        self.reset = getattr(dut, self.reset_name)
+        self.log = log or dut._log
+        self._imem = None  # entries the DUT is known to hold, or None
+        self._dmem = None
+
+    def _handle(self, path):
+        handle = self.dut
+        for name in path.split("."):
+            handle = getattr(handle, name)
+        return handle
+
+    def imem_entries_of(self, image):
+        """The image's instructions as memory entries (index -> value)."""
+        return dict(image.imem)
+
+    def model(self, image):
+        raise NotImplementedError
+
+    @staticmethod
+    def _write(handle, known, wanted, size):
+        writes = 0
+        for i in range(size):
+            value = wanted.get(i, 0)
+            if known is None or known[i] != value:
+                handle[i].value = value
+                writes += 1
+        return writes
+
+    def load(self, image):
+        """Backdoor-write the entries that differ from the current memory contents."""
+        imem = self.imem_entries_of(image)
+        self._write(self._handle(self.imem_path), self._imem, imem, self.imem_entries)
+        self._write(self._handle(self.dmem_path), self._dmem, image.dmem, self.dmem_entries)
+        self._imem = [imem.get(i, 0) for i in range(self.imem_entries)]
+
+    async def run(self, image):
+        """Reset, load and run one image; returns (cycles, error message or None)."""
+        iss = self.model(image)
+        cycles = iss.run_to_halt(image.max_cycles)
+
+        await FallingEdge(self.clk)
+        self.reset.value = self.reset_active
+        self.load(image)
+        await RisingEdge(self.clk)
+        await FallingEdge(self.clk)
+        self.reset.value = 1 - self.reset_active
+        await ClockCycles(self.clk, cycles)
+        await ReadOnly()
+
+        dmem = read_array(self._handle(self.dmem_path), self.dmem_entries)
+        try:
+            compare_state(f"{image.name}.regs", read_array(self._handle(self.regs_path), self.num_regs), iss.regs)
+            compare_state(f"{image.name}.dmem", dmem, iss.dmem)
+            pc = getattr(self.dut, self.pc_name).value.integer
+            if pc != iss.pc:
+                raise AssertionError(f"{image.name}: PC 0x{pc:X} after {cycles} cycles, expected 0x{iss.pc:X}")
+        except AssertionError as e:
+            return cycles, str(e)
+        finally:
+            # X/Z entries read as None never match an image, so they are rewritten next time
+            self._dmem = dmem
+        return cycles, None
+
+    async def run_batch(self, images, stop_on_failure=False, crash_dir=None):
+        """
+        Run every image in order; returns a BatchResult listing the failing
+        images. Failing images are also written to `crash_dir` (default
+        $CRASH_DIR) for the minimizer.
+        """
+        started = time.monotonic()
+        programs = cycles = 0
+        failures = []
+        for image in images:
+            ran, error = await self.run(image)
+            programs += 1
+            cycles += ran
+            if error:
+                self.log.error(error)
+                failures.append(image.name)
+                self.log.info(f"Saved {minimize.save_image(self.isa, image, error, crash_dir)}")
+                if stop_on_failure:
+                    break
+        seconds = time.monotonic() - started
+        rate = programs / seconds if seconds > 0 else float("inf")
+        self.log.info(f"Batch: {programs} programs, {cycles} cycles, {len(failures)} failed, "
+                      f"{seconds:.2f}s ({rate:.1f} programs/s)")
+        return BatchResult(programs, cycles, failures, seconds)
+
+
+class Lev8Harness(CoreHarness):
+    isa = "lev8"
+    reset_name = "rst"
+    reset_active = 1
+    imem_path = "IM_inst.mem"
+    dmem_path = "DM_inst.mem"
+    regs_path = "RF_inst.registers"
+    imem_entries = 17  # PC 15 also fetches byte 16
+    dmem_entries = 256
+    num_regs = 8
+    pc_name = "debug_pc_out"
+
+    def imem_entries_of(self, image):
+        entries = {}
+        for addr, instr in image.imem.items():
+            entries[addr] = (instr >> 8) & 0xFF
+            entries[addr + 1] = instr & 0xFF
+        return entries
+
+    def model(self, image):
+        return Lev8ISS(image.imem, image.dmem)
+
+
+class RiscvHarness(CoreHarness):
+    isa = "riscv"
+    reset_name = "rst_n"
+    reset_active = 0
+    imem_path = "instructionmemory_inst.mem"
+    dmem_path = "datamemory_inst.mem"
+    regs_path = "registerfile_inst.registers"
+    imem_entries = 1024
+    dmem_entries = 1024
+    num_regs = 32
+    pc_name = "debug_pc"
+
+    def model(self, image):
+        program = [image.imem.get(i, 0) for i in range(max(image.imem, default=-1) + 1)]
+        return RiscvISS(program, image.dmem)
+
+
+class Legv8pHarness(CoreHarness):
+    """
+    LEGv8_Processor of LEGv8_Pipelined_Processor. `run` clocks the core
+    until halt_out and returns those cycles, which must equal the ISS's
+    `cycles`. Programs that do not halt within `max_cycles` instructions
+    only run for the cycles the ISS counted and are not checked: the
+    pipeline then holds several instructions in flight.
+    """
+
+    isa = "legv8p"
+    reset_name = "rst_n"
+    reset_active = 0
+    imem_path = "instruction_memory_inst.mem"
+    dmem_path = "data_memory_inst.mem"
+    regs_path = "register_file_inst.registers"
+    imem_entries = 1024
+    dmem_entries = 512
+    num_regs = 32
+    pc_name = "debug_pc_out"
+
+    def model(self, image):
+        return Legv8pISS(image.imem, image.dmem)
+
+    async def run(self, image):
+        """Reset, load and run one image until halt_out; returns (cycles, error message or None)."""
+        iss = self.model(image)
+        iss.run_to_halt(image.max_cycles)
+
+        await FallingEdge(self.clk)
+        self.reset.value = self.reset_active
+        self.load(image)
+        await RisingEdge(self.clk)
+        await FallingEdge(self.clk)
+        self.reset.value = 1 - self.reset_active
+        cycles = 0
+        budget = iss.cycles if not iss.halted() else iss.cycles + 8
+        while cycles < budget:
+            await RisingEdge(self.clk)
+            cycles += 1
+            await ReadOnly()
+            if self.dut.halt_out.value == 1:
+                break
+        await ReadOnly()
+
+        dmem = read_array(self._handle(self.dmem_path), self.dmem_entries)
+        if not iss.halted():
+            self._dmem = dmem
+            return cycles, None
+        try:
+            if self.dut.halt_out.value != 1:
+                raise AssertionError(f"{image.name}: no halt_out within {cycles} cycles, "
+                                     f"expected after {iss.cycles}")
+            compare_state(f"{image.name}.regs", read_array(self._handle(self.regs_path), self.num_regs), iss.regs)
+            compare_state(f"{image.name}.dmem", dmem, iss.dmem)
+            pc = getattr(self.dut, self.pc_name).value.integer
+            if pc != iss.pc:
+                raise AssertionError(f"{image.name}: PC 0x{pc:X} after HALT, expected 0x{iss.pc:X}")
+            if cycles != iss.cycles:
+                raise AssertionError(f"{image.name}: cycles {cycles} to halt_out, expected {iss.cycles} "
+                                     f"({iss.retired} instructions, {iss.stalls} load-use stalls, "
+                                     f"{iss.taken} taken branches)")
+        except AssertionError as e:
+            return cycles, str(e)
+        finally:
+            self._dmem = dmem
+        return cycles, None
+
+
+class Legv8Harness(CoreHarness):
+    """
+    fpga_top of legv8_multicycle_uart. The core is started through the
+    three start-button handshakes, so `run` returns the clock cycles the core
+    was active (start to HALT) rather than a retired-instruction count.
+    Programs that do not halt within `max_cycles` instructions are checked on
+    their UART results only: by the time a result has been received the core
+    is already executing the next instruction.
+    """
+
+    isa = "legv8"
+    clock_name = "clk_50MHz"
+    reset_name = "rst_n"
+    reset_active = 0
+    imem_path = "core_inst.datapath_inst.imem_inst.IMEM"
+    dmem_path = "core_inst.datapath_inst.data_mem.mem"
+    regs_path = "core_inst.datapath_inst.rf_inst.regs"
+    imem_entries = IMEM_WORDS
+    dmem_entries = DMEM_WORDS
+    num_regs = 32
+    pc_name = "core_inst.datapath_inst.pc_out"
+    drops_path = "core_inst.g_result_fifo.result_fifo_inst.dropped"
+    controller_path = "core_inst.controller_inst"
+    handshakes = [1, 2, 3]
+    report_mode_cmd = 0xA0  # fpga_top REPORT_MODE_CMD | perf << 3 | dump << 2 | mode
+    perf_request_cmd = 0xC5  # fpga_top PERF_REQUEST_CMD
+    load_blocks_cmd = 0xB1  # fpga_top LOAD_BLOCKS_CMD
+    baud_cmd = 0xBD  # fpga_top BAUD_CMD, BAUD_CONFIRM_CMD, BAUD_PATTERN, MIN_CLKS_PER_BIT
+    baud_confirm_cmd = 0xBC
+    baud_test_pattern = bytes([0x55, 0xAA, 0x00, 0xFF, 0x0F, 0xF0, 0x33, 0xCC])
+    min_clks_per_bit = 4
+
+    def __init__(self, dut, log=None, clks_per_bit=CLKS_PER_BIT, report_mode=REPORT_ALL, dump=False, perf=False,
+                 fast=FAST_CONTROLLER, uart_load=False, baud_clks=None, warm_start=True):
+        super().__init__(dut, log)
+        self.fast = fast
+        self.warm_start = warm_start
+        self._warm = {}  # boot configuration -> WarmStart
+        self.uart_load = uart_load
+        self.baud_clks = baud_clks
+        self.baud_pattern = self.baud_test_pattern
+        self.baud_divisor_bytes = 2
+        self.reset_clks_per_bit = clks_per_bit
+        self.clks_per_bit = clks_per_bit  # the current line rate
+        self.report_mode = report_mode
+        self.dump = dump
+        self.perf = perf
+        self.perf_counters = None
+        self.perf_frames = []
+        self.perf_requests = 0
+        self.sink = UartSink(self.clk, dut.uart_tx, clks_per_bit).start()
+        self.source = UartSource(self.clk, dut.uart_rx_in, clks_per_bit)
+        dut.start.value = 0
+
+    def load(self, image):
+        """With `uart_load` IMEM is cleared here and written by the block load in `boot`."""
+        if not self.uart_load:
+            return super().load(image)
+        self._write(self._handle(self.imem_path), self._imem, {}, self.imem_entries)
+        self._write(self._handle(self.dmem_path), self._dmem, image.dmem, self.dmem_entries)
+        self._imem = None  # written by the UART, not known until read back
+
+    def model(self, image):
+        report_mode = REPORT_WRITES if self.fast and self.report_mode == REPORT_ALL else self.report_mode
+        return Legv8ISS(image.imem, image.dmem, report_mode)
+
+    async def press_start(self, cycles=4):
+        self.dut.start.value = 1
+        await ClockCycles(self.clk, cycles)
+        self.dut.start.value = 0
+        await ClockCycles(self.clk, cycles)
+
+    async def request_perf(self):
+        """Ask the running core for its performance counters (PERF_REQUEST_CMD)."""
+        self.perf_requests += 1
+        await self.source.write([self.perf_request_cmd])
+
+    async def wait_until(self, condition, cycles):
+        """Poll `condition` once per bit time for at most `cycles` clocks; returns its last value."""
+        for _ in range(0, cycles, self.clks_per_bit):
+            if condition():
+                return True
+            await ClockCycles(self.clk, self.clks_per_bit)
+        return condition()
+
+    def set_line_rate(self, clks_per_bit):
+        self.clks_per_bit = self.sink.clks_per_bit = self.source.clks_per_bit = clks_per_bit
+
+    async def negotiate_baud(self, clks_per_bit, pattern=None, divisor_bytes=2):
+        """
+        Propose `clks_per_bit` to fpga_top (BAUD_CMD), send `pattern` (the test
+        pattern by default) at the new rate, check the echo and confirm.
+        Returns True if both sides switched; the bytes it received are taken
+        out of the sink, so the handshakes stay where `boot` expects them.
+        With fewer than 2 `divisor_bytes` the proposal is cut short: it waits
+        out BAUD_TIMEOUT_CLKS and checks that nothing was acknowledged.
+        """
+        pattern = self.baud_test_pattern if pattern is None else bytes(pattern)
+        start = len(self.sink.data)
+        await self.source.write([self.baud_cmd, clks_per_bit & 0xFF, clks_per_bit >> 8][:1 + divisor_bytes])
+        if divisor_bytes < 2:
+            await ClockCycles(self.clk, BAUD_TIMEOUT_CLKS + 16)
+            if len(self.sink.data) != start:
+                raise AssertionError(f"{len(self.sink.data) - start} bytes received for a cut-short baud proposal")
+            return False
+        if not await self.wait_until(lambda: len(self.sink.data) >= start + 4, 64 + self.word_cycles(1)):
+            raise AssertionError(f"no baud rate acknowledge ({len(self.sink.data) - start} bytes received)")
+        ack = self.sink.words(start)[0]
+        accepted = clks_per_bit if clks_per_bit >= self.min_clks_per_bit else 0
+        if ack != self.baud_cmd | accepted << 8:
+            raise AssertionError(f"baud rate acknowledge 0x{ack:08X}, expected 0x{self.baud_cmd | accepted << 8:08X}")
+        if not accepted:
+            del self.sink.data[start:]
+            return False
+        # fpga_top switches once the acknowledge's stop bit is out
+        await ClockCycles(self.clk, 2 * self.clks_per_bit)
+        previous = self.clks_per_bit
+        self.set_line_rate(clks_per_bit)
+        await self.source.write(pattern)
+        echoed = await self.wait_until(lambda: len(self.sink.data) >= start + 12, 64 + self.word_cycles(2))
+        if echoed and bytes(self.sink.data[start + 4:start + 12]) != self.baud_test_pattern:
+            raise AssertionError(f"baud rate test pattern echoed as {bytes(self.sink.data[start + 4:]).hex()}")
+        if echoed:
+            await self.source.write([self.baud_confirm_cmd])
+        else:
+            self.set_line_rate(previous)
+        del self.sink.data[start:]
+        return echoed
+
+    def _boot_config(self):
+        return (self.report_mode, self.dump, self.perf, self.uart_load, self.baud_clks, self.baud_pattern,
+                self.baud_divisor_bytes)
+
+    async def _capture_warm(self):
+        """Snapshot fpga_top once handshake 2 is off the wire, memories and clock excluded."""
+        await ClockCycles(self.clk, 2 * self.clks_per_bit)
+        await FallingEdge(self.clk)
+        await ReadOnly()
+        snapshot = Snapshot.capture(self.dut, exclude=[self.clock_name, self.imem_path, self.dmem_path])
+        self._warm[self._boot_config()] = WarmStart(snapshot, bytes(self.sink.data), self.clks_per_bit)
+        await FallingEdge(self.clk)
+
+    def word_cycles(self, words):
+        """Upper bound of the clocks needed to send `words` 32-bit words, request/acknowledge included."""
+        return words * 4 * (10 * self.clks_per_bit + 16)
+
+    async def boot(self, image=None, resumed=False):
+        """
+        Walk fpga_top from reset to S_RUN: handshake 1, the report mode byte
+        (unless REPORT_ALL without dump), START (load mode), handshake 2 with
+        the mode echoed in its second byte, START (run), handshake 3. With
+        `baud_clks` the rate is negotiated right after handshake 1. With
+        `uart_load` LOAD_BLOCKS_CMD follows handshake 1 and `image` is
+        streamed in load mode. `resumed` starts from a restored WarmStart,
+        after handshake 2.
+        """
+        config = self.perf << 3 | self.dump << 2 | self.report_mode
+        blocks = load_blocks(image.imem) if self.uart_load else []
+        for i, press in enumerate((True, True, False)):
+            if resumed and i == 0:
+                continue
+            received = await self.wait_until(lambda: len(self.sink.data) >= 4 * (i + 1), 64 + self.word_cycles(1))
+            if not received:
+                raise AssertionError(f"no handshake {i + 1} ({len(self.sink.data)} bytes received)")
+            if i == 0 and self.baud_clks:
+                switched = await self.negotiate_baud(self.baud_clks, self.baud_pattern, self.baud_divisor_bytes)
+                should_switch = (self.baud_clks >= self.min_clks_per_bit and self.baud_pattern == self.baud_test_pattern
+                                 and self.baud_divisor_bytes == 2)
+                if switched != should_switch:
+                    raise AssertionError(f"baud rate {'switched' if switched else 'not switched'} "
+                                         f"to {self.baud_clks} clocks per bit")
+            if i == 0 and config:
+                await self.source.write([self.report_mode_cmd | config])
+            if i == 0 and self.uart_load:
+                await self.source.write([self.load_blocks_cmd])
+            if i == 1 and self.warm_start and not resumed:
+                await self._capture_warm()
+            if i == 1 and self.uart_load:
+                await self.source.write(load_stream(blocks))
+            if press:
+                await self.press_start()
+        words = self.sink.words()[:3]
+        expected = list(self.handshakes)
+        expected[1] |= config << 8
+        if self.uart_load:
+            expected[1] |= IMEM_ADDR_WIDTH << 16 | DMEM_ADDR_WIDTH << 24
+            expected[2] |= sum(len(block) for _, block in blocks) << 8
+        if words != expected:
+            raise AssertionError(f"handshakes {[hex(w) for w in words]}, expected {[hex(w) for w in expected]}")
+
+    def result_drops(self):
+        """Results the result FIFO discarded (drop policy); 0 when the core has no FIFO."""
+        try:
+            return self._handle(self.drops_path).value.integer
+        except AttributeError:
+            return 0
+
+    def read_perf(self):
+        """The controller's performance counters, read through the hierarchy (no UART frame needed)."""
+        controller = self._handle(self.controller_path)
+        return PerfCounters(controller.halt_detected.value.integer,
+                            *(getattr(controller, name).value.integer
+                              for name in ("cnt_cycles", "cnt_retired", "cnt_mem_wait", "cnt_uart_stall",
+                                           "cnt_fixed_stall")))
+
+    async def _count_active(self):
+        """Count the cycles led_act is high, and from start to the last byte received (`output_cycles`)."""
+        elapsed = received = 0
+        while True:
+            await RisingEdge(self.clk)
+            if self.dut.led_act.value == 1:
+                self.active_cycles += 1
+            if self.active_cycles:
+                elapsed += 1
+                if len(self.sink.data) != received:
+                    received = len(self.sink.data)
+                    self.output_cycles = elapsed
+
+    async def run(self, image):
+        """Reset (or restore a WarmStart), load, boot and run one image; returns (active cycles, error or None)."""
+        iss = self.model(image)
+        iss.run_to_halt(image.max_cycles)
+        words = iss.results + (state_dump(iss.regs, iss.dmem) if self.dump and iss.halted() else [])
+        frame = PERF_WORDS if self.perf and iss.halted() else 0
+        wanted = 4 * (len(self.handshakes) + len(words) + frame)
+
+        await FallingEdge(self.clk)
+        warm = self._warm.get(self._boot_config()) if self.warm_start else None
+        if warm is None:
+            self.reset.value = self.reset_active
+            self.set_line_rate(self.reset_clks_per_bit)
+            self.load(image)
+            await ClockCycles(self.clk, 2)  # RegisterFile clears synchronously
+            await FallingEdge(self.clk)
+            self.sink.clear()
+        else:
+            warm.snapshot.restore()
+            self.set_line_rate(warm.clks_per_bit)
+            self.load(image)
+            self.sink.clear()
+            self.sink.data.extend(warm.received)
+        self.active_cycles = self.output_cycles = 0
+        self.perf_requests = 0
+        counter = cocotb.start_soon(self._count_active())
+        self.reset.value = 1 - self.reset_active
+        try:
+            await self.boot(image, resumed=warm is not None)
+            finished = await self.wait_until(
+                lambda: len(self.sink.data) + 4 * (self.result_drops() + PERF_WORDS * self.perf_requests) >= wanted
+                and not (iss.halted() and self.dut.led_act.value == 1),
+                self.word_cycles(len(words) + frame + 2) + 16 * iss.retired)
+            if not finished:
+                raise AssertionError(f"timed out: {len(self.sink.data)} of {wanted} bytes received, "
+                                     f"core {'active' if self.dut.led_act.value == 1 else 'halted'}")
+            # The last result is still on the wire when the core halts; let the UART drain
+            await ClockCycles(self.clk, 12 * self.clks_per_bit)
+        except AssertionError as e:
+            return self.active_cycles, f"{image.name}: {e}"
+        finally:
+            counter.kill()
+        await ReadOnly()
+
+        dmem = read_array(self._handle(self.dmem_path), self.dmem_entries)
+        try:
+            results, self.perf_frames = split_perf_frames(self.sink.words(4 * len(self.handshakes)))
+            if frame:
+                if not self.perf_frames or not self.perf_frames[-1].halted:
+                    raise AssertionError(f"{image.name}.perf: no counter frame after HALT")
+                self.perf_counters = self.perf_frames[-1]
+                if self.perf_counters.retired != iss.retired:
+                    raise AssertionError(f"{image.name}.perf: {self.perf_counters.retired} instructions counted, "
+                                         f"{iss.retired} retired")
+            drops = self.result_drops()
+            if drops:
+                # Drop policy: the received words are the expected ones with `drops` gaps
+                expected = iter(words)
+                if not all(word in expected for word in results):
+                    raise AssertionError(f"{image.name}.uart: {len(results)} words received ({drops} dropped) "
+                                         f"are not a subsequence of the {len(words)} expected")
+            else:
+                compare_state(f"{image.name}.uart", results if iss.halted() else results[:len(words)], words)
+            if iss.halted():
+                compare_state(f"{image.name}.regs", read_array(self._handle(self.regs_path), self.num_regs), iss.regs)
+                compare_state(f"{image.name}.dmem", dmem, iss.dmem)
+                pc = self._handle(self.pc_name).value.integer
+                if pc != iss.pc:
+                    raise AssertionError(f"{image.name}: PC 0x{pc:X} after HALT, expected 0x{iss.pc:X}")
+        except AssertionError as e:
+            return self.active_cycles, str(e)
+        finally:
+            self._dmem = dmem
+        return self.active_cycles, None
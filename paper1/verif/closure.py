@@ -0,0 +1,63 @@
+"""
+Coverage-closure driven random testing.
+
+Instead of a fixed iteration count, a random phase keeps generating vectors
+until its coverage model is closed or a vector/wall-time budget runs out.
+Most vectors are steered at a randomly chosen unhit bin (see
+CoverageModel.unhit_target); the rest stay purely random so the test still
+explores outside the model.
+
+The budgets can be overridden per run without editing the tests:
+
+    CLOSURE_MAX_VECTORS  maximum vectors per random phase (default 10000)
+    CLOSURE_MAX_SECONDS  wall-clock budget per random phase (default: none)
+    CLOSURE_MIN_VECTORS  keep going after closure until this many (default 0)
+    CLOSURE_BIAS         probability of steering at an unhit bin (default 0.8)
+"""
+import os
+import time
+from collections import namedtuple
+
+ClosureResult = namedtuple("ClosureResult", "vectors closed coverage seconds")
+
+
+def _env_number(name, default, cast):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+async def run_until_closed(model, step, rng, max_vectors=None, max_seconds=None,
+                           min_vectors=None, bias=None, log=None):
+    """
+    Call ``await step(index, target)`` until `model` is closed or a budget runs out.
+
+    `target` is a dict of cover point name -> bin value that the step should try
+    to produce (possibly empty); the step is responsible for driving the DUT,
+    checking it and sampling `model`. Returns a ClosureResult and logs the
+    number of vectors it took to close the model.
+    """
+    max_vectors = max_vectors if max_vectors is not None else _env_number("CLOSURE_MAX_VECTORS", 10000, int)
+    max_seconds = max_seconds if max_seconds is not None else _env_number("CLOSURE_MAX_SECONDS", None, float)
+    min_vectors = min_vectors if min_vectors is not None else _env_number("CLOSURE_MIN_VECTORS", 0, int)
+    bias = bias if bias is not None else _env_number("CLOSURE_BIAS", 0.8, float)
+
+    start = time.monotonic()
+    vectors = 0
+    while vectors < max_vectors:
+        if vectors >= min_vectors and model.is_closed():
+            break
+        if max_seconds is not None and time.monotonic() - start > max_seconds:
+            break
+        target = model.unhit_target(rng) if rng.random() < bias else {}
+        await step(vectors, target)
+        vectors += 1
+
+    result = ClosureResult(vectors, model.is_closed(), model.coverage(), time.monotonic() - start)
+    if log is not None:
+        if result.closed:
+            log.info(f"Coverage model '{model.name}' closed after {result.vectors} vectors "
+                     f"({result.seconds:.2f}s)")
+        else:
+            log.warning(f"Coverage model '{model.name}' NOT closed: {result.coverage:.1f}% after "
+                        f"{result.vectors} vectors ({result.seconds:.2f}s)\n{model.report()}")
+    return result
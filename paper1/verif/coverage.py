@@ -0,0 +1,308 @@
+"""
+Functional coverage collection for the cocotb testbenches.
+
+A CoverageModel holds cover points (one sampled value, one bin per legal
+value or value class) and crosses of those points. Every item keeps its hits
+in a flat ``array('Q')`` of counters indexed by bin, so CoverPoint.sample
+is a dict lookup plus one integer increment into preallocated storage.
+CoverageModel.sample is the convenient form: it builds a keyword dict and an
+argument tuple per cross on every call, so hot loops sample the points and
+crosses directly.
+
+Each simulator process saves its models as small JSON files (one per model
+per process) into $COVERAGE_DIR (default ``./coverage``). Files from parallel
+workers and different seeds are merged by summing the counters:
+
+    python -m verif.coverage coverage/ other_run/coverage/ --output merged.json
+"""
+import argparse
+import array
+import glob
+import json
+import os
+import sys
+import uuid
+
+COVERAGE_DIR = os.environ.get("COVERAGE_DIR", "coverage")
+
+
+def _counter_array(size):
+    """Return a zeroed array of 64-bit hit counters."""
+    return array.array("Q", bytes(8 * size))
+
+
+class CoverPoint:
+    """
+    Bins over a single sampled value.
+
+    `bins` lists the legal values. If `classify` is given, sampled values are
+    passed through it first, which lets a point bin value classes (e.g.
+    "undefined opcode" or "address in the top half of DMEM").
+    """
+
+    def __init__(self, name, bins, classify=None):
+        self.name = name
+        self.values = list(bins)
+        self.bins = [str(b) for b in self.values]
+        self.classify = classify
+        self._index = {b: i for i, b in enumerate(self.values)}
+        self.counts = _counter_array(len(self.bins))
+
+    def bin_index(self, value):
+        """Return the bin index for `value`, or None if it falls in no bin."""
+        if self.classify is not None:
+            value = self.classify(value)
+        return self._index.get(value)
+
+    def sample(self, value):
+        i = self.bin_index(value)
+        if i is not None:
+            self.counts[i] += 1
+        return i
+
+    def holes(self):
+        """Labels of the bins that were never hit."""
+        return [label for label, count in zip(self.bins, self.counts) if count == 0]
+
+    def unhit_indices(self):
+        return [i for i, count in enumerate(self.counts) if count == 0]
+
+    def bin_values(self, index):
+        """Map a bin index back to {point name: bin value}, for steering stimulus."""
+        return {self.name: self.values[index]}
+
+    def hit_count(self):
+        return sum(1 for count in self.counts if count)
+
+    def coverage(self):
+        return 100.0 * self.hit_count() / len(self.bins) if self.bins else 100.0
+
+
+class CoverCross(CoverPoint):
+    """
+    Cross product of two or more cover points.
+
+    The cross index is computed in mixed radix from the member points' bin
+    indices, so the counters stay a single flat array.
+    """
+
+    def __init__(self, name, points):
+        self.name = name
+        self.points = list(points)
+        self.classify = None
+        self._strides = []
+        stride = 1
+        for point in reversed(self.points):
+            self._strides.insert(0, stride)
+            stride *= len(point.bins)
+        labels = [""]
+        for point in self.points:
+            labels = [f"{prefix},{b}" if prefix else b for prefix in labels for b in point.bins]
+        self.bins = labels
+        self.counts = _counter_array(len(self.bins))
+
+    def bin_values(self, index):
+        return {
+            point.name: point.values[(index // stride) % len(point.values)]
+            for point, stride in zip(self.points, self._strides)
+        }
+
+    def bin_index(self, *values):
+        index = 0
+        for point, stride, value in zip(self.points, self._strides, values):
+            i = point.bin_index(value)
+            if i is None:
+                return None
+            index += i * stride
+        return index
+
+    def sample(self, *values):
+        i = self.bin_index(*values)
+        if i is not None:
+            self.counts[i] += 1
+        return i
+
+
+class CoverageModel:
+    """A named group of cover points and crosses that is saved as one file."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = {}
+        self._crosses = []
+        self._path = None
+
+    def point(self, name, bins, classify=None):
+        point = CoverPoint(name, bins, classify)
+        self.items[name] = point
+        return point
+
+    def cross(self, name, *point_names):
+        cross = CoverCross(name, [self.items[p] for p in point_names])
+        self.items[name] = cross
+        self._crosses.append((cross, point_names))
+        return cross
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    def sample(self, **values):
+        """
+        Sample every point named in `values`, then every cross whose member
+        points were all given. This allocates per call; hot loops call
+        point.sample() / cross.sample() directly.
+        """
+        for name, value in values.items():
+            item = self.items.get(name)
+            if item is not None and not isinstance(item, CoverCross):
+                item.sample(value)
+        for cross, point_names in self._crosses:
+            if all(p in values for p in point_names):
+                cross.sample(*(values[p] for p in point_names))
+
+    def coverage(self):
+        """Average coverage of all items, as a percentage."""
+        if not self.items:
+            return 100.0
+        return sum(item.coverage() for item in self.items.values()) / len(self.items)
+
+    def is_closed(self):
+        return all(item.hit_count() == len(item.bins) for item in self.items.values())
+
+    def unhit_target(self, rng):
+        """
+        Pick one unhit bin at random (from any point or cross) and return the
+        bin values that would hit it, e.g. {"alu_op": "SLT", "zero": 1}.
+        Returns {} once the model is closed.
+        """
+        open_items = [item for item in self.items.values() if item.hit_count() < len(item.bins)]
+        if not open_items:
+            return {}
+        item = rng.choice(open_items)
+        return item.bin_values(rng.choice(item.unhit_indices()))
+
+    def to_dict(self):
+        return {
+            "model": self.name,
+            "runs": 1,
+            "items": {
+                name: {"bins": item.bins, "counts": list(item.counts)}
+                for name, item in self.items.items()
+            },
+        }
+
+    def save(self, path=None):
+        """
+        Write this process's counters to `path`, or to a uniquely named file
+        in COVERAGE_DIR so parallel workers never overwrite each other.
+        Saving again from the same process rewrites the same file, so several
+        tests sharing one model can each save without double counting.
+        """
+        if path is None:
+            if self._path is None:
+                os.makedirs(COVERAGE_DIR, exist_ok=True)
+                self._path = os.path.join(
+                    COVERAGE_DIR, f"{self.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.json")
+            path = self._path
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    def report(self, show_holes=True):
+        return format_report(self.to_dict(), show_holes)
+
+
+def load(path):
+    """Return the list of coverage dicts stored in `path` (merged files hold several)."""
+    with open(path) as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def merge(results):
+    """
+    Merge coverage dicts (as written by CoverageModel.save) by summing
+    counters. Returns a dict of model name -> merged dict.
+    """
+    merged = {}
+    for result in results:
+        name = result["model"]
+        if name not in merged:
+            merged[name] = {
+                "model": name,
+                "runs": 0,
+                "items": {
+                    item: {"bins": list(data["bins"]), "counts": [0] * len(data["bins"])}
+                    for item, data in result["items"].items()
+                },
+            }
+        target = merged[name]
+        target["runs"] += result.get("runs", 1)
+        for item, data in result["items"].items():
+            if item not in target["items"] or target["items"][item]["bins"] != data["bins"]:
+                raise ValueError(f"Coverage item '{name}.{item}' has different bins across files")
+            counts = target["items"][item]["counts"]
+            for i, count in enumerate(data["counts"]):
+                counts[i] += count
+    return merged
+
+
+def collect_files(paths):
+    """Expand directories in `paths` to the coverage files they contain."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    return files
+
+
+def merge_files(paths):
+    return merge(result for f in collect_files(paths) for result in load(f))
+
+
+def format_report(result, show_holes=True, max_holes=16):
+    """Render one coverage dict as a plain-text table."""
+    lines = [f"Coverage model '{result['model']}' ({result['runs']} run(s))"]
+    percentages = []
+    for item, data in result["items"].items():
+        total = len(data["bins"])
+        hit = sum(1 for count in data["counts"] if count)
+        pct = 100.0 * hit / total if total else 100.0
+        percentages.append(pct)
+        lines.append(f"  {item:<24} {hit:5d}/{total:<5d} {pct:6.1f}%")
+        if show_holes and hit < total:
+            holes = [b for b, count in zip(data["bins"], data["counts"]) if count == 0]
+            shown = ", ".join(holes[:max_holes])
+            more = f" ... (+{len(holes) - max_holes} more)" if len(holes) > max_holes else ""
+            lines.append(f"      holes: {shown}{more}")
+    overall = sum(percentages) / len(percentages) if percentages else 100.0
+    lines.append(f"  {'TOTAL':<24} {'':11} {overall:6.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge and report functional coverage files.")
+    parser.add_argument("paths", nargs="*", default=[COVERAGE_DIR],
+                        help="Coverage files or directories (default: $COVERAGE_DIR)")
+    parser.add_argument("--output", "-o", help="Write the merged coverage to this JSON file")
+    parser.add_argument("--no-holes", action="store_true", help="Do not list unhit bins")
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.paths)
+    if not files:
+        print("No coverage files found.")
+        return 1
+    merged = merge(result for f in files for result in load(f))
+    for result in merged.values():
+        print(format_report(result, show_holes=not args.no_holes))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(list(merged.values()), f, indent=1)
+        print(f"Merged {len(files)} file(s) into '{args.output}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Predefined coverage models for the LEGv8 and RISC-V opcode spaces.
+
+Each factory returns a fresh CoverageModel whose model name is stable, so
+files written by different tests, workers and seeds merge into one report.
+The classifier functions are shared with the reference models.
+"""
+from verif.coverage import CoverageModel
+
+# --- Lev8 single-cycle core (16-bit instructions, LegV8SingleCycleProcessor-cocob2) ---
+LEV8_OPCODES = {
+    0b0000: "R_TYPE",
+    0b0001: "LW",
+    0b0010: "SW",
+    0b0011: "BEQ",
+    0b0100: "JUMP",
+    0b0101: "ADDI",
+}
+LEV8_ALU_OPS = ["ADD", "SUB", "AND", "OR", "XOR", "SLT", "SLL", "SRL"]
+LEV8_NUM_REGS = 8
+
+# --- RISC_Processor (32-bit RV32I subset) ---
+RISCV_CLASSES = ["R_ADD", "R_SUB", "ADDI", "LW", "SW", "BEQ", "JAL", "JALR", "LUI", "AUIPC", "UNDEF"]
+RISCV_NUM_REGS = 32
+RISCV_ALU_OPS = ["ADD", "SUB", "AND", "OR", "XOR", "SLT", "SLL", "SRL"]  # ALU.sv alu_op encoding
+
+# --- Multicycle LEGv8 core (32-bit instructions, legv8_multicycle_uart) ---
+LEGV8_MNEMONICS = [
+    "ADD", "SUB", "AND", "ORR", "EOR", "LSL", "LSR", "ASR", "ROR", "BR",
+    "ADDI", "SUBI", "LDUR", "STUR", "CBZ", "CBNZ", "B", "BL", "HALT", "UNDEF",
+]
+_LEGV8_OPCODE6 = {0b000101: "B", 0b100101: "BL"}
+_LEGV8_OPCODE8 = {0b10110100: "CBZ", 0b10110101: "CBNZ"}
+_LEGV8_OPCODE10 = {0b1001000100: "ADDI", 0b1101000100: "SUBI"}
+_LEGV8_OPCODE11 = {
+    0b10001011000: "ADD", 0b11001011000: "SUB", 0b10001010000: "AND",
+    0b10101010000: "ORR", 0b01001010000: "EOR", 0b11010011011: "LSL",
+    0b11010011010: "LSR", 0b11010011110: "ASR", 0b11010011111: "ROR",
+    0b11010110000: "BR", 0b11111000010: "LDUR", 0b11111000000: "STUR",
+    0b11111111111: "HALT",
+}
+
+BRANCH_OUTCOMES = ["taken", "not_taken"]
+# Data memory address classes of the 8-bit Lev8 address space
+LEV8_ADDR_CLASSES = ["zero", "low", "mid", "high", "max", "n/a"]
+
+
+def lev8_opcode_class(opcode):
+    return LEV8_OPCODES.get(opcode, "UNDEF")
+
+
+def lev8_alu_op_name(alu_op):
+    return LEV8_ALU_OPS[alu_op & 0x7]
+
+
+def branch_outcome(taken):
+    return "taken" if taken else "not_taken"
+
+
+def lev8_addr_class(addr):
+    """Class of a Lev8 data address; None (no memory access) is "n/a"."""
+    if addr is None:
+        return "n/a"
+    if addr == 0:
+        return "zero"
+    if addr == 0xFF:
+        return "max"
+    return "low" if addr < 0x10 else "mid" if addr < 0x80 else "high"
+
+
+def riscv_instr_class(instr):
+    """Classify a 32-bit RISC-V word the way RISC_Processor's ControlUnit decodes it."""
+    opcode = instr & 0x7F
+    if opcode == 0b0110011:
+        return "R_SUB" if (instr >> 25) == 0b0100000 else "R_ADD"
+    return {
+        0b0010011: "ADDI",
+        0b0000011: "LW",
+        0b0100011: "SW",
+        0b1100011: "BEQ",
+        0b1101111: "JAL",
+        0b1100111: "JALR",
+        0b0110111: "LUI",
+        0b0010111: "AUIPC",
+    }.get(opcode, "UNDEF")
+
+
+def legv8_mnemonic(instr):
+    """Decode a 32-bit LEGv8 word with the same priority as the multicycle ControlUnit."""
+    name = _LEGV8_OPCODE6.get(instr >> 26)
+    if name is None:
+        name = _LEGV8_OPCODE8.get(instr >> 24)
+    if name is None:
+        name = _LEGV8_OPCODE10.get(instr >> 22)
+    if name is None:
+        name = _LEGV8_OPCODE11.get(instr >> 21, "UNDEF")
+    return name
+
+
+def lev8_control_model():
+    model = CoverageModel("lev8_control")
+    model.point("opcode", list(LEV8_OPCODES.values()) + ["UNDEF"], lev8_opcode_class)
+    return model
+
+
+def lev8_alu_model():
+    model = CoverageModel("lev8_alu")
+    model.point("alu_op", LEV8_ALU_OPS, lev8_alu_op_name)
+    model.point("zero", [0, 1])
+    model.cross("alu_op_x_zero", "alu_op", "zero")
+    return model
+
+
+def lev8_regfile_model():
+    model = CoverageModel("lev8_regfile")
+    # R0 is hardwired to zero, so only R1-R7 are meaningful write targets
+    model.point("write_addr", range(1, LEV8_NUM_REGS))
+    model.point("read_addr1", range(LEV8_NUM_REGS))
+    model.point("read_addr2", range(LEV8_NUM_REGS))
+    model.cross("read_pair", "read_addr1", "read_addr2")
+    return model
+
+
+def lev8_core_model():
+    model = CoverageModel("lev8_core")
+    model.point("opcode", list(LEV8_OPCODES.values()) + ["UNDEF"], lev8_opcode_class)
+    model.point("beq", BRANCH_OUTCOMES, branch_outcome)
+    model.point("rs1", range(LEV8_NUM_REGS))
+    model.point("rs2", range(LEV8_NUM_REGS))
+    model.cross("reg_pair", "rs1", "rs2")
+    return model
+
+
+def lev8_fuzz_model():
+    """Control-path space the Lev8 fuzzer steers by: opcode x ALU op x branch outcome x address class."""
+    model = CoverageModel("lev8_fuzz")
+    model.point("opcode", list(LEV8_OPCODES.values()) + ["UNDEF"], lev8_opcode_class)
+    model.point("alu_op", LEV8_ALU_OPS[:2], lev8_alu_op_name)
+    model.point("branch", BRANCH_OUTCOMES + ["n/a"])
+    model.point("addr", LEV8_ADDR_CLASSES, lev8_addr_class)
+    model.cross("control_path", "opcode", "alu_op", "branch", "addr")
+    return model
+
+
+def riscv_alu_op_name(alu_op):
+    return RISCV_ALU_OPS[alu_op & 0x7]
+
+
+def riscv_alu_model():
+    model = CoverageModel("riscv_alu")
+    model.point("alu_op", RISCV_ALU_OPS, riscv_alu_op_name)
+    model.point("zero", [0, 1])
+    model.cross("alu_op_x_zero", "alu_op", "zero")
+    return model
+
+
+def riscv_regfile_model():
+    model = CoverageModel("riscv_regfile")
+    # x0 is hardwired to zero, so only x1-x31 are meaningful write targets
+    model.point("write_addr", range(1, RISCV_NUM_REGS))
+    model.point("read_addr1", range(RISCV_NUM_REGS))
+    model.point("read_addr2", range(RISCV_NUM_REGS))
+    model.cross("read_pair", "read_addr1", "read_addr2")
+    return model
+
+
+def riscv_control_model():
+    model = CoverageModel("riscv_control")
+    model.point("instr", RISCV_CLASSES, riscv_instr_class)
+    model.point("zero", [0, 1])
+    model.cross("instr_x_zero", "instr", "zero")
+    return model
+
+
+def riscv_core_model():
+    model = CoverageModel("riscv_core")
+    model.point("instr", RISCV_CLASSES, riscv_instr_class)
+    model.point("beq", BRANCH_OUTCOMES, branch_outcome)
+    model.point("rd", range(RISCV_NUM_REGS))
+    model.point("rs1", range(RISCV_NUM_REGS))
+    model.point("rs2", range(RISCV_NUM_REGS))
+    model.cross("reg_pair", "rs1", "rs2")
+    return model
+
+
+def legv8_core_model():
+    model = CoverageModel("legv8_core")
+    model.point("instr", LEGV8_MNEMONICS, legv8_mnemonic)
+    model.point("cbz", BRANCH_OUTCOMES, branch_outcome)
+    model.point("cbnz", BRANCH_OUTCOMES, branch_outcome)
+    return model
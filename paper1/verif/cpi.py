@@ -0,0 +1,165 @@
+"""
+Cycles per instruction of the multicycle LEGv8 core (legv8_multicycle_uart).
+
+The legv8_cpi test runs test_prog.txt, countdown loops and CPI_PROGRAMS
+random programs through Legv8Harness. For each it records the instructions
+the ISS executed, the cycles the core was active (start to HALT) and the
+cycles until its last result had arrived over the UART. With CPI_FILE set it
+writes them as JSON.
+
+`compare` builds and runs that test for several RTL configurations (make
+variables, comma-separated within one configuration) and prints their CPI
+side by side:
+
+    python -m verif.cpi RESULT_FIFO_DEPTH=0 RESULT_FIFO_DEPTH=64
+    python -m verif.cpi RESULT_FIFO_DEPTH=0 RESULT_FIFO_DEPTH=64 --common CLKS_PER_BIT=434
+    python -m verif.cpi FAST_CONTROLLER=0 FAST_CONTROLLER=1
+
+Simulation uses a short UART bit (CLKS_PER_BIT=8); pass CLKS_PER_BIT=434
+for the board's 115200 baud, where waiting on the UART dominates.
+
+The controller's performance counters (LEGv8_Controller.sv, sent after HALT
+when enabled or on request) split the core-active cycles into memory wait,
+SEND_RESULT (UART / result FIFO), the fixed NEXT_INSTR stall and the rest
+(FETCH, DECODE, EXECUTE, CAPTURE_RESULT); `decode_perf` reads a counter
+frame and the CPI records carry the breakdown. With FAST_CONTROLLER=1 the
+memory wait and NEXT_INSTR stall are gone and the rest is FETCH and DECODE.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+from verif import sweep as seed_sweep
+
+CPI_PROGRAMS = int(os.environ.get("CPI_PROGRAMS", "20"))
+CPI_FILE = os.environ.get("CPI_FILE")
+
+LEGV8_DIR = "legv8_multicycle_uart"
+CPI_TEST = "legv8_cpi"
+
+CpiRecord = namedtuple("CpiRecord", "name kind retired active_cycles output_cycles mem_wait uart_stall fixed_stall",
+                       defaults=(0, 0, 0))
+
+# Counter frame: PERF_HEADER | halted, the counters, then the 32-bit sum of all of them
+PERF_HEADER = 0xC5050000
+PERF_WORDS = 7
+PerfCounters = namedtuple("PerfCounters", "halted cycles retired mem_wait uart_stall fixed_stall")
+
+
+def decode_perf(words):
+    """PerfCounters of a counter frame; ValueError if the header, length or checksum is wrong."""
+    if len(words) != PERF_WORDS or words[0] & ~1 != PERF_HEADER:
+        raise ValueError(f"not a counter frame: {len(words)} words, header 0x{words[0] if words else 0:08X}")
+    if sum(words[:-1]) & 0xFFFFFFFF != words[-1]:
+        raise ValueError(f"counter frame checksum 0x{words[-1]:08X}, computed 0x{sum(words[:-1]) & 0xFFFFFFFF:08X}")
+    return PerfCounters(words[0] & 1, *words[1:-1])
+
+
+def split_perf_frames(words):
+    """(the words without counter frames, [PerfCounters]) of a received word stream."""
+    rest, frames, i = [], [], 0
+    while i < len(words):
+        if words[i] & ~1 == PERF_HEADER:
+            try:
+                frames.append(decode_perf(words[i:i + PERF_WORDS]))
+                i += PERF_WORDS
+                continue
+            except ValueError:
+                pass
+        rest.append(words[i])
+        i += 1
+    return rest, frames
+
+
+def breakdown(counters):
+    """[(label, cycles)] of PerfCounters (or a CpiRecord): where the core-active cycles went."""
+    cycles = getattr(counters, "cycles", None)
+    if cycles is None:
+        cycles = counters.active_cycles
+    stalls = counters.mem_wait + counters.uart_stall + counters.fixed_stall
+    return [("fetch/decode/execute/capture", cycles - stalls), ("memory wait", counters.mem_wait),
+            ("send result (UART/FIFO)", counters.uart_stall), ("fixed NEXT_INSTR stall", counters.fixed_stall)]
+
+
+def summarize(records):
+    """{kind: (programs, retired, active CPI, output CPI)}, CPI over all instructions of that kind."""
+    summary = {}
+    for kind in sorted({r.kind for r in records}):
+        group = [r for r in records if r.kind == kind]
+        retired = sum(r.retired for r in group) or 1
+        summary[kind] = (len(group), retired, sum(r.active_cycles for r in group) / retired,
+                         sum(r.output_cycles for r in group) / retired)
+    return summary
+
+
+def report(records):
+    """Log lines: one per program kind, plus its CPI breakdown when the records carry counters."""
+    lines = []
+    for kind, (programs, retired, active, output) in summarize(records).items():
+        lines.append(f"{kind:>10}: {programs:3} programs, {retired:6} instructions, CPI {active:6.1f} core-active, "
+                     f"{output:7.1f} until the last result")
+        group = [r for r in records if r.kind == kind]
+        if any(r.mem_wait or r.uart_stall or r.fixed_stall for r in group):
+            parts = [breakdown(r) for r in group]
+            lines.append(" " * 12 + ", ".join(f"{label} {sum(p[i][1] for p in parts) / retired:.2f}"
+                                               for i, (label, _) in enumerate(parts[0])))
+    return lines
+
+
+def write_records(path, records):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump([r._asdict() for r in records], f, indent=1)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [CpiRecord(**r) for r in json.load(f)]
+
+
+def compare(configs, common=(), outdir="cpi", seed=1, log=print):
+    """Build and run the CPI test for every configuration; returns {config: summary}."""
+    summaries = {}
+    for i, config in enumerate(configs):
+        run_dir = os.path.join(outdir, f"config_{i}")
+        os.makedirs(run_dir, exist_ok=True)
+        sim_build = f"sim_build_cpi_{i}"
+        make_extra = [*common, *(v for v in config.split(",") if v)]
+        seed_sweep.build(LEGV8_DIR, "test_fpga_top", "fpga_top", sim_build, make_extra,
+                         log_file=os.path.join(run_dir, "build.log"))
+        cpi_file = os.path.abspath(os.path.join(run_dir, "cpi.json"))
+        env = dict(os.environ, CPI_FILE=cpi_file)
+        result = seed_sweep.run_seed(LEGV8_DIR, "test_fpga_top", "fpga_top", seed, run_dir, CPI_TEST,
+                                     sim_build=sim_build, extra=make_extra, env=env)
+        if result.failures or not os.path.exists(cpi_file):
+            log(f"{config}: {CPI_TEST} failed, see {result.log_file}")
+            continue
+        summaries[config] = summarize(read_records(cpi_file))
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the CPI of multicycle LEGv8 configurations.")
+    parser.add_argument("configs", nargs="+", help="Configurations, e.g. RESULT_FIFO_DEPTH=0 (VAR=value,...)")
+    parser.add_argument("--common", nargs="*", default=[], help="VAR=value arguments for every configuration")
+    parser.add_argument("--outdir", default="cpi")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    summaries = compare(args.configs, args.common, args.outdir, args.seed)
+    if not summaries:
+        return 1
+    baseline = next(iter(summaries.values()))
+    for config, summary in summaries.items():
+        print(config)
+        for kind, (programs, retired, active, output) in summary.items():
+            speedup = baseline[kind][3] / output if kind in baseline and output else float("nan")
+            print(f"  {kind:>10}: {programs:3} programs, {retired:6} instr, CPI {active:6.1f} core-active, "
+                  f"{output:7.1f} to last result ({speedup:.2f}x vs {args.configs[0]})")
+    return 0 if len(summaries) == len(args.configs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+RTL/testbench dependency graph for change-impact regression.
+
+For each test directory the graph is built from:
+
+- filelist.f, which names the RTL files, plus any other *.sv of the
+  directory (wrappers the Makefile adds only for their own TOPLEVEL);
+- the SystemVerilog sources themselves: module/package definitions,
+  module instantiations (``ALU ALU_inst (...)``, with or without a
+  ``#(...)`` parameter block) and package imports;
+- the "dependencies" lists of *.json project descriptions (such as
+  Lev8SingleCycleProcessor.json), which name components by module name;
+- the Python imports of the testbench (test file -> verif helpers).
+
+A cocotb module test_<Top>.py depends on every file reachable from <Top>,
+its own test file and the verif helpers it imports. A generated top
+(regress.GENERATED_TOPS) depends on its generator script and on every file
+reachable from the module it instantiates. Makefile and
+filelist.f changes affect every test of their directory.
+
+Changed files can be given relative to the current directory, to paper1/
+or to a test directory; a bare name such as ALU.sv matches that file in
+every test directory. Names that match no dependency of any test are
+reported and make the command fail.
+
+    python -m verif.depgraph LegV8SingleCycleProcessor-cocob2/ALU.sv
+    python -m verif.depgraph ALU.sv verif/lev8_iss.py
+    python -m verif.depgraph --changed HEAD~1
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+
+from verif import regress
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_DEFINE_RE = re.compile(r"\b(module|package|interface)\s+([A-Za-z_]\w*)")
+_INSTANCE_RE = re.compile(
+    r"\b([A-Za-z_]\w*)\s*(?:#\s*\((?:[^()]|\([^()]*\))*\)\s*)?([A-Za-z_]\w*)\s*\(")
+_IMPORT_RE = re.compile(r"\b([A-Za-z_]\w*)\s*::")
+_PY_IMPORT_RE = re.compile(r"^\s*(?:from\s+verif(?:\.(\w+))?\s+import\s+\(?([\w, ]*)|import\s+verif\.(\w+))", re.M)
+
+_VERIF_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_DIR = os.path.dirname(_VERIF_DIR)  # paper1/
+
+
+def _read(path):
+    with open(path, errors="replace") as f:
+        return f.read()
+
+
+class DirectoryGraph:
+    """Module-level dependency graph of one cocotb directory."""
+
+    def __init__(self, directory):
+        self.dir = os.path.abspath(directory)
+        self.files = []
+        self.defined_in = {}   # module/package name -> file
+        self.uses = {}         # module/package name -> names it instantiates or imports
+        self._scan()
+
+    def _scan(self):
+        filelist = os.path.join(self.dir, "filelist.f")
+        if os.path.exists(filelist):
+            names = [line.strip() for line in _read(filelist).splitlines()
+                     if line.strip() and not line.startswith(("#", "//"))]
+        else:
+            names = []
+        # Tops added by the Makefile only for their own TOPLEVEL (soak wrappers) are not in filelist.f
+        names += sorted(os.path.basename(p) for p in glob.glob(os.path.join(self.dir, "*.sv"))
+                        if os.path.basename(p) not in names)
+        self.files = [os.path.join(self.dir, name) for name in names]
+
+        bodies = {}
+        for path in self.files:
+            if not os.path.exists(path):
+                continue
+            text = _COMMENT_RE.sub("", _read(path))
+            definitions = list(_DEFINE_RE.finditer(text))
+            for i, match in enumerate(definitions):
+                name = match.group(2)
+                end = definitions[i + 1].start() if i + 1 < len(definitions) else len(text)
+                self.defined_in[name] = path
+                bodies[name] = text[match.end():end]
+
+        for name, body in bodies.items():
+            used = {m.group(1) for m in _INSTANCE_RE.finditer(body) if m.group(1) in self.defined_in}
+            used |= {m.group(1) for m in _IMPORT_RE.finditer(body) if m.group(1) in self.defined_in}
+            used.discard(name)
+            self.uses[name] = used
+
+        for path in glob.glob(os.path.join(self.dir, "*.json")):
+            try:
+                data = json.loads(_read(path))
+            except ValueError:
+                continue
+            for component in data.get("components", []) if isinstance(data, dict) else []:
+                name = component.get("name")
+                deps = [d for d in component.get("dependencies", []) if d in self.defined_in]
+                if name in self.defined_in:
+                    self.uses.setdefault(name, set()).update(deps)
+
+    def closure(self, top):
+        """Names reachable from `top` (including `top`)."""
+        seen, stack = set(), [top]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.uses.get(name, ()))
+        return seen
+
+    def rtl_files(self, top):
+        return {self.defined_in[name] for name in self.closure(top) if name in self.defined_in}
+
+
+def python_deps(test_file):
+    """The test file plus every verif/*.py it imports, transitively."""
+    deps, stack = set(), [os.path.abspath(test_file)]
+    while stack:
+        path = stack.pop()
+        if path in deps or not os.path.exists(path):
+            continue
+        deps.add(path)
+        for match in _PY_IMPORT_RE.finditer(_read(path)):
+            if match.group(1) or match.group(3):
+                names = [match.group(1) or match.group(3)]
+            else:
+                names = [n.strip() for n in match.group(2).split(",")]
+            stack.extend(os.path.join(_VERIF_DIR, name + ".py") for name in names)
+        if path.startswith(_VERIF_DIR):
+            stack.append(os.path.join(_VERIF_DIR, "__init__.py"))
+    return deps
+
+
+def test_dependencies(dirs=None, root=None):
+    """Map (dir, module, toplevel) -> set of absolute file paths the test depends on."""
+    root = root or _PROJECT_DIR
+    graphs = {}
+    deps = {}
+    for directory, module, toplevel in regress.discover(dirs, root):
+        path = os.path.join(root, directory)
+        graph = graphs.setdefault(directory, DirectoryGraph(path))
+        if toplevel in regress.GENERATED_TOPS:
+            _, generator, instantiated = regress.GENERATED_TOPS[toplevel]
+            files = graph.rtl_files(instantiated) | python_deps(generator)
+        else:
+            files = graph.rtl_files(toplevel)
+        files |= python_deps(os.path.join(path, module + ".py"))
+        files |= {os.path.join(graph.dir, "Makefile"), os.path.join(graph.dir, "filelist.f")}
+        deps[(directory, module, toplevel)] = files
+    return deps
+
+
+def resolve(path, nodes, dirs=None, root=None):
+    """
+    The dependency `nodes` (absolute paths) that `path` names: as given from
+    the current directory, relative to `root` (paper1/), or relative to each
+    test directory, so a bare ALU.sv names the ALU.sv of every directory.
+    """
+    root = root or _PROJECT_DIR
+    candidates = [path, os.path.join(root, path)]
+    candidates += [os.path.join(root, directory, path) for directory in dirs or regress.TEST_DIRS]
+    found = []
+    for candidate in candidates:
+        candidate = os.path.abspath(candidate)
+        if candidate in nodes and candidate not in found:
+            found.append(candidate)
+    return found
+
+
+def impacted(changed, dirs=None, root=None):
+    """
+    The (dir, module, toplevel) tests whose dependencies include any of
+    `changed`, and the names in `changed` that match no dependency of any
+    test: returns (tests, unknown).
+    """
+    deps = test_dependencies(dirs, root)
+    nodes = set().union(*deps.values())
+    matched, unknown = set(), []
+    for path in changed:
+        found = resolve(path, nodes, dirs, root)
+        if not found:
+            unknown.append(path)
+        matched.update(found)
+    return [test for test, files in deps.items() if files & matched], unknown
+
+
+def git_changed(rev="HEAD", root=None):
+    """Files modified relative to `rev`, plus untracked files, as absolute paths."""
+    top = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=root, capture_output=True,
+                         text=True, check=True).stdout.strip()
+    diff = subprocess.run(["git", "diff", "--name-only", rev], cwd=top, capture_output=True,
+                          text=True, check=True).stdout.split()
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=top,
+                               capture_output=True, text=True, check=True).stdout.split()
+    return [os.path.join(top, path) for path in diff + untracked]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the tests affected by changed files.")
+    parser.add_argument("files", nargs="*", help="Changed files")
+    parser.add_argument("--changed", metavar="REV", nargs="?", const="HEAD",
+                        help="Use the files changed since git revision REV (default HEAD)")
+    parser.add_argument("--dirs", nargs="+", default=regress.TEST_DIRS)
+    parser.add_argument("--show-deps", action="store_true", help="Print every test's dependencies")
+    args = parser.parse_args(argv)
+
+    if args.show_deps:
+        for (directory, module, _), files in sorted(test_dependencies(args.dirs).items()):
+            print(f"{directory}/{module}:")
+            for path in sorted(files):
+                print(f"    {os.path.relpath(path)}")
+        return 0
+    tests, unknown = impacted(list(args.files), args.dirs)
+    if args.changed:
+        # Files of the diff that no test depends on (docs, tools) are expected, not an error
+        tests = sorted(set(tests) | set(impacted(git_changed(args.changed), args.dirs)[0]))
+    for directory, module, toplevel in tests:
+        print(f"{directory}/{module}  (TOPLEVEL={toplevel})")
+    for path in unknown:
+        print(f"error: '{path}' is not a dependency of any test", file=sys.stderr)
+    return 1 if unknown else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Instructions per cycle of the pipelined LEGv8 (LEGv8_Pipelined_Processor)
+against the multicycle core (legv8_multicycle_uart).
+
+Both cores run the same workloads, each assembled with the core's own
+encoders (verif/legv8p_asm.py, verif/legv8_asm.py):
+
+- loop:   a countdown loop that sums its counter into X2 and a data word
+          (one taken branch per iteration);
+- array:  the sum of an 8-word array, every LDUR followed by its use
+          (load-use stalls);
+- chain:  Fibonacci in two registers, every instruction depending on the
+          one before it (forwarding);
+- random: IPC_PROGRAMS random programs over the instructions both cores
+          implement.
+
+The legv8p_ipc test (test_LEGv8_Processor.py) records the pipeline's clock
+cycles from reset to halt_out; legv8_ipc (test_fpga_top.py) records the
+multicycle controller's cycle counter from start to HALT with only the last
+result reported, so the UART does not count. Both draw the programs from
+test_rng("ipc_workloads"), so one RANDOM_SEED gives both cores the same
+programs. With IPC_FILE set each writes its IpcRecords as JSON.
+
+`compare` builds and runs both tests and prints the IPC per workload side
+by side; make variables for the multicycle build (e.g. its trimmed
+controller sequence) go after --multicycle:
+
+    python -m verif.ipc
+    python -m verif.ipc --multicycle FAST_CONTROLLER=1
+
+Instruction counts differ slightly between the cores on random programs
+(32- vs 64-bit registers can take a CBZ differently), so IPC rather than
+cycles is compared.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+from verif import legv8p_asm
+from verif import sweep as seed_sweep
+
+IPC_PROGRAMS = int(os.environ.get("IPC_PROGRAMS", "20"))
+IPC_FILE = os.environ.get("IPC_FILE")
+
+IPC_TEST_SEED_NAME = "ipc_workloads"
+ARRAY_WORDS = 8
+RANDOM_DMEM_WORDS = 16  # the multicycle core's data memory
+
+# (dir, module, toplevel, test) of each core's IPC test
+CORES = {
+    "pipelined": ("LEGv8_Pipelined_Processor", "test_LEGv8_Processor", "LEGv8_Processor", "legv8p_ipc"),
+    "multicycle": ("legv8_multicycle_uart", "test_fpga_top", "fpga_top", "legv8_ipc"),
+}
+
+IpcRecord = namedtuple("IpcRecord", "name kind core retired cycles")
+# A workload: `imem`/`dmem` in the layout of the core's ISS
+Workload = namedtuple("Workload", "name kind imem dmem")
+
+
+def loop_program(asm, count=20):
+    """Countdown from `count`: X2 sums the counter, stored to data word 0 every iteration, X3 reloads it."""
+    return dict(enumerate([
+        asm.encode_i("ADDI", 1, asm.XZR, count),   # 0: X1 = count
+        asm.encode_i("ADDI", 4, asm.XZR, 1),       # 1: X4 = 1
+        asm.encode_r("ADD", 2, 2, 1),              # 2: loop: X2 += X1
+        asm.encode_d("STUR", 2, asm.XZR, 0),       # 3: M[0] = X2
+        asm.encode_r("SUB", 1, 1, 4),              # 4: X1 -= 1
+        asm.encode_cb("CBZ", 1, 2),                # 5: -> 7 when done
+        asm.encode_b("B", -4),                     # 6: -> loop
+        asm.encode_d("LDUR", 3, asm.XZR, 0),       # 7: X3 = M[0]
+        asm.HALT,                                  # 8
+    ]))
+
+
+def array_program(asm, words=ARRAY_WORDS):
+    """X2 = sum of data words 0..words-1, each used right after its load; the sum goes to word `words`."""
+    program = []
+    for i in range(words):
+        program += [asm.encode_d("LDUR", 1, asm.XZR, i * asm.WORD_BYTES), asm.encode_r("ADD", 2, 2, 1)]
+    program += [asm.encode_d("STUR", 2, asm.XZR, words * asm.WORD_BYTES), asm.HALT]
+    return dict(enumerate(program))
+
+
+def chain_program(asm, pairs=12):
+    """Fibonacci in X1/X2: 2 * pairs ALU instructions, each reading the previous one's result."""
+    program = [asm.encode_i("ADDI", 1, asm.XZR, 1)]
+    for _ in range(pairs):
+        program += [asm.encode_r("ADD", 2, 2, 1), asm.encode_r("ADD", 1, 1, 2)]
+    program += [asm.encode_d("STUR", 1, asm.XZR, 0), asm.HALT]
+    return dict(enumerate(program))
+
+
+def workloads(asm, rng, programs=None):
+    """
+    The workloads assembled with `asm` (verif/legv8p_asm.py or
+    verif/legv8_asm.py); `rng` draws the array contents and the random
+    programs, in the same order for either encoder module.
+    """
+    programs = IPC_PROGRAMS if programs is None else programs
+    array = {i: rng.randrange(1, 256) for i in range(ARRAY_WORDS)}
+    result = [Workload("loop20", "loop", loop_program(asm), {}),
+              Workload("array8", "array", array_program(asm), array),
+              Workload("fib12", "chain", chain_program(asm), {})]
+    for i in range(programs):
+        length = rng.choice([16, 63])
+        result.append(Workload(f"prog{i}", "random",
+                               legv8p_asm.random_program(rng, length, dmem_words=RANDOM_DMEM_WORDS, asm=asm), {}))
+    return result
+
+
+def summarize(records):
+    """{kind: (programs, retired, cycles, IPC)}, IPC over all instructions of that kind."""
+    summary = {}
+    for kind in sorted({r.kind for r in records}):
+        group = [r for r in records if r.kind == kind]
+        retired = sum(r.retired for r in group)
+        cycles = sum(r.cycles for r in group)
+        summary[kind] = (len(group), retired, cycles, retired / cycles if cycles else 0.0)
+    return summary
+
+
+def report(records):
+    """Log lines: one per workload kind."""
+    return [f"{kind:>8}: {programs:3} programs, {retired:6} instructions, {cycles:7} cycles, IPC {ipc:.3f}"
+            for kind, (programs, retired, cycles, ipc) in summarize(records).items()]
+
+
+def write_records(path, records):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump([r._asdict() for r in records], f, indent=1)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [IpcRecord(**r) for r in json.load(f)]
+
+
+def compare(extra=None, outdir="ipc", seed=1, log=print):
+    """Build and run the IPC test of both cores; returns {core: summary} for those that passed."""
+    extra = extra or {}
+    summaries = {}
+    for core, (directory, module, toplevel, test) in CORES.items():
+        run_dir = os.path.join(outdir, core)
+        os.makedirs(run_dir, exist_ok=True)
+        sim_build = "sim_build_ipc"
+        make_extra = list(extra.get(core, ()))
+        seed_sweep.build(directory, module, toplevel, sim_build, make_extra,
+                         log_file=os.path.join(run_dir, "build.log"))
+        ipc_file = os.path.abspath(os.path.join(run_dir, "ipc.json"))
+        env = dict(os.environ, IPC_FILE=ipc_file)
+        result = seed_sweep.run_seed(directory, module, toplevel, seed, run_dir, test,
+                                     sim_build=sim_build, extra=make_extra, env=env)
+        if result.failures or not os.path.exists(ipc_file):
+            log(f"{core}: {test} failed, see {result.log_file}")
+            continue
+        summaries[core] = summarize(read_records(ipc_file))
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the IPC of the pipelined and multicycle LEGv8 cores.")
+    parser.add_argument("--pipelined", nargs="*", default=[], help="VAR=value arguments for the pipelined build")
+    parser.add_argument("--multicycle", nargs="*", default=[], help="VAR=value arguments for the multicycle build")
+    parser.add_argument("--outdir", default="ipc")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    summaries = compare({"pipelined": args.pipelined, "multicycle": args.multicycle}, args.outdir, args.seed)
+    if not summaries:
+        return 1
+    for core, summary in summaries.items():
+        print(core)
+        for kind, (programs, retired, cycles, ipc) in summary.items():
+            print(f"  {kind:>8}: {programs:3} programs, {retired:6} instr, {cycles:7} cycles, IPC {ipc:.3f}")
+    if len(summaries) == len(CORES):
+        pipelined, multicycle = summaries["pipelined"], summaries["multicycle"]
+        print("speedup (pipelined IPC / multicycle IPC)")
+        for kind in pipelined:
+            if kind in multicycle and multicycle[kind][3]:
+                print(f"  {kind:>8}: {pipelined[kind][3] / multicycle[kind][3]:.2f}x")
+    return 0 if len(summaries) == len(CORES) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
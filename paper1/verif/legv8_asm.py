@@ -0,0 +1,120 @@
+"""
+LEGv8 instruction encoders, a listing reader and a random program generator
+for the multicycle core (legv8_multicycle_uart).
+
+Programs are dicts of word index -> 32-bit instruction, the layout of the
+ISS (verif/legv8_iss.py) and of the IMEM backdoor loader.
+"""
+from verif.coverage_models import _LEGV8_OPCODE6, _LEGV8_OPCODE8, _LEGV8_OPCODE10, _LEGV8_OPCODE11
+from verif.legv8_iss import DMEM_WORDS, HALT, IMEM_WORDS, OUTPUT_ADDR, XZR
+
+OUTPUT_OFFSET = OUTPUT_ADDR - (1 << 32)  # STUR Xt, [XZR, #-8] stores to OUTPUT_ADDR
+WORD_BYTES = 4  # LDUR/STUR offset of one data word
+
+_OPCODES = {name: (code, width) for width, table in ((6, _LEGV8_OPCODE6), (8, _LEGV8_OPCODE8),
+                                                     (10, _LEGV8_OPCODE10), (11, _LEGV8_OPCODE11))
+            for code, name in table.items()}
+
+R_TYPE = ["ADD", "SUB", "AND", "ORR", "EOR"]
+SHIFTS = ["LSL", "LSR", "ASR", "ROR"]
+
+
+def _opcode(name):
+    code, width = _OPCODES[name]
+    return code << (32 - width)
+
+
+def encode_r(name, rd, rn, rm=0, shamt=0):
+    """R format: ADD/SUB/AND/ORR/EOR (Rm) and LSL/LSR/ASR/ROR (shamt), BR (Rn)."""
+    return _opcode(name) | (rm << 16) | ((shamt & 0x3F) << 10) | (rn << 5) | rd
+
+
+def encode_i(name, rd, rn, imm):
+    """I format: ADDI/SUBI with a 12-bit immediate."""
+    return _opcode(name) | ((imm & 0xFFF) << 10) | (rn << 5) | rd
+
+
+def encode_d(name, rt, rn, offset):
+    """D format: LDUR/STUR with a 9-bit signed byte offset."""
+    return _opcode(name) | ((offset & 0x1FF) << 12) | (rn << 5) | rt
+
+
+def encode_cb(name, rt, words):
+    """CB format: CBZ/CBNZ, branch offset in instructions."""
+    return _opcode(name) | ((words & 0x7FFFF) << 5) | rt
+
+
+def encode_b(name, words):
+    """B format: B/BL, branch offset in instructions."""
+    return _opcode(name) | (words & 0x3FFFFFF)
+
+
+def read_listing(path):
+    """Words of a test_prog.txt style listing (hex word, then an optional // comment, per line)."""
+    program = []
+    with open(path) as f:
+        for line in f:
+            text = line.split("//")[0].strip()
+            if text:
+                program.append(int(text, 16))
+    return dict(enumerate(program))
+
+
+def random_program(rng, length=32, output_stores=False):
+    """
+    A random program of `length` instructions (at most IMEM_WORDS - 1)
+    ending in HALT. Loads and stores address DMEM through XZR (its first 64
+    words at most, the reach of a 9-bit offset), branches only go forward
+    (CBZ/CBNZ/B/BL over 1-4 instructions), so every program halts. With
+    `output_stores` half of the stores go to OUTPUT_ADDR instead.
+    """
+    length = min(length, IMEM_WORDS - 1)
+    data_words = min(DMEM_WORDS, 64)
+    regs = range(XZR)
+    program = {}
+    for pc in range(length):
+        kind = rng.randrange(10)
+        skip = min(rng.randrange(1, 5), length - pc)
+        rd, rn, rm = rng.choice(regs), rng.randrange(32), rng.randrange(32)
+        if kind < 3:
+            program[pc] = encode_r(rng.choice(R_TYPE), rd, rn, rm)
+        elif kind < 4:
+            program[pc] = encode_r(rng.choice(SHIFTS), rd, rn, shamt=rng.randrange(32))
+        elif kind < 6:
+            program[pc] = encode_i(rng.choice(["ADDI", "SUBI"]), rd, rn, rng.randrange(-2048, 2048))
+        elif kind < 8:
+            name, offset = rng.choice(["LDUR", "STUR"]), 4 * rng.randrange(data_words)
+            if output_stores and name == "STUR" and rng.randrange(2):
+                offset = OUTPUT_OFFSET
+            program[pc] = encode_d(name, rd, XZR, offset)
+        elif kind < 9:
+            program[pc] = encode_cb(rng.choice(["CBZ", "CBNZ"]), rn, skip)
+        else:
+            program[pc] = encode_b(rng.choice(["B", "BL"]), skip)
+    program[length] = HALT
+    return program
+
+
+def countdown_program(count, store_offset=8):
+    """
+    A loop of `count` iterations that sums its counter into X2 and a DMEM
+    word, then halts: 2 + 4 * count results, enough to fill the result FIFO.
+    store_offset=OUTPUT_OFFSET sends the running sum to the output address.
+    """
+    return dict(enumerate([
+        encode_i("ADDI", 1, XZR, count),   # 0: X1 = count
+        encode_r("ADD", 2, 2, 1),          # 1: loop: X2 += X1
+        encode_d("STUR", 2, XZR, store_offset),  # 2: M[8] = X2
+        encode_i("SUBI", 1, 1, 1),         # 3: X1 -= 1
+        encode_cb("CBNZ", 1, -3),          # 4: -> loop
+        encode_d("LDUR", 3, XZR, 8),       # 5: X3 = M[8]
+        HALT,                              # 6
+    ]))
+
+
+def load_program(core, program, dmem=None):
+    """Backdoor-load `program` (and data words, if given) into a LEGv8_Core handle."""
+    for index, instr in program.items():
+        core.datapath_inst.imem_inst.IMEM[index].value = instr
+    for index, data in (dmem or {}).items():
+        core.datapath_inst.data_mem.mem[index].value = data
@@ -0,0 +1,274 @@
+"""
+Instruction-set simulator for the multicycle LEGv8 core
+(legv8_multicycle_uart, LEGv8_Core.sv).
+
+It models the RTL as built rather than the LEGv8 reference:
+
+- registers and data are 32 bits wide; X31 reads as zero and ignores writes;
+- ADDI/SUBI sign-extend imm12 (ImmediateGenerator has no unsigned I format);
+- shifts take the shift amount from shamt[4:0];
+- instruction memory holds IMEM_WORDS words indexed with the PC's word
+  address, so the PC wraps every 4 * IMEM_WORDS bytes; data memory holds
+  DMEM_WORDS words indexed with the address's. Both follow the build's
+  IMEM_ADDR_WIDTH / DMEM_ADDR_WIDTH (the Makefile exports them; 64 and 16
+  words by default, fpga_top's board defaults are 13 and 8);
+- CBZ/CBNZ test Rt, BR jumps to Rn, BL writes PC+4 to X30;
+- undefined opcodes write nothing but still produce an ALU result
+  (Rn + Rm) and advance the PC;
+- HALT stops the controller after the PC has already moved past it;
+- every other instruction has one 32-bit result: the loaded word for LDUR,
+  otherwise the ALU result (the address for STUR, the branch offset for
+  B/BL, Rt for CBZ/CBNZ, Rm for BR). `results` collects the ones sent over
+  the UART in `report_mode` (LEGv8_Controller REPORT_*):
+    REPORT_ALL    - every result;
+    REPORT_WRITES - results of instructions that write a register (R-type,
+                    ADDI/SUBI, LDUR, BL; X31 as destination included);
+    REPORT_OUTPUT - the value stored by STUR to OUTPUT_ADDR, which then
+                    leaves data memory untouched;
+    REPORT_HALT   - the last result (0 if there was none) once HALT executes.
+
+With the state dump enabled the core sends `state_dump` words after HALT:
+DUMP_HEADER, X0..X31, the data memory words and their 32-bit sum.
+fpga_program_loader.py checks a dump against the JSON this writes, for the
+memory sizes of the board build:
+
+    IMEM_ADDR_WIDTH=13 DMEM_ADDR_WIDTH=8 \
+        python -m verif.legv8_iss legv8_multicycle_uart/program.bin --expect expected.json
+
+`load_stream` encodes a program for fpga_top's block load (LOAD_BLOCKS_CMD).
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from collections import namedtuple
+
+from verif.coverage_models import legv8_mnemonic
+
+XLEN_MASK = 0xFFFFFFFF
+NUM_REGS = 32
+XZR = 31
+LINK_REG = 30
+IMEM_ADDR_WIDTH = int(os.environ.get("IMEM_ADDR_WIDTH", "6"))
+DMEM_ADDR_WIDTH = int(os.environ.get("DMEM_ADDR_WIDTH", "4"))
+IMEM_WORDS = 1 << IMEM_ADDR_WIDTH
+DMEM_WORDS = 1 << DMEM_ADDR_WIDTH
+HALT = 0xFFE00000
+OUTPUT_ADDR = 0xFFFFFFF8  # STUR Xt, [XZR, #-8]
+
+REPORT_ALL, REPORT_WRITES, REPORT_OUTPUT, REPORT_HALT = range(4)
+REPORT_MODES = {"all": REPORT_ALL, "writes": REPORT_WRITES, "output": REPORT_OUTPUT, "halt": REPORT_HALT}
+
+DUMP_HEADER = 0xD5000000 | NUM_REGS << 16 | DMEM_WORDS
+DUMP_WORDS = 1 + NUM_REGS + DMEM_WORDS + 1
+
+# One executed instruction; `result` is the UART word (None for HALT).
+Legv8Retire = namedtuple("Legv8Retire", "pc instr result next_pc")
+
+_R_TYPE = {
+    "ADD": lambda a, b, s: a + b,
+    "SUB": lambda a, b, s: a - b,
+    "AND": lambda a, b, s: a & b,
+    "ORR": lambda a, b, s: a | b,
+    "EOR": lambda a, b, s: a ^ b,
+    "LSL": lambda a, b, s: a << s,
+    "LSR": lambda a, b, s: a >> s,
+    "ASR": lambda a, b, s: (a - ((a & 0x80000000) << 1)) >> s,
+    "ROR": lambda a, b, s: (a >> s) | (a << (32 - s)) if s else a,
+}
+_REG_WRITES = set(_R_TYPE) | {"ADDI", "SUBI", "LDUR", "BL"}
+
+
+def _sext(value, bits):
+    sign = 1 << (bits - 1)
+    return ((value & (sign - 1)) - (value & sign)) & XLEN_MASK
+
+
+def imm_i(instr):
+    return _sext(instr >> 10, 12)
+
+
+def imm_d(instr):
+    return _sext(instr >> 12, 9)
+
+
+def imm_cb(instr):
+    return _sext((instr >> 5) << 2, 21)
+
+
+def imm_b(instr):
+    return _sext(instr << 2, 28)
+
+
+class Legv8ISS:
+    """
+    Architectural model of LEGv8_Core. `imem` maps word index -> 32-bit
+    instruction, `dmem` maps word index -> initial data word (absent = 0),
+    `report_mode` is one of REPORT_*.
+    """
+
+    def __init__(self, imem, dmem=None, report_mode=REPORT_ALL):
+        self.imem = dict(imem)
+        self.report_mode = report_mode
+        self.reset(dmem)
+
+    def reset(self, dmem=None):
+        self.pc = 0
+        self.regs = [0] * NUM_REGS
+        self.dmem = [0] * DMEM_WORDS
+        for word, value in (dmem or {}).items():
+            self.dmem[word] = value & XLEN_MASK
+        self.results = []
+        self.last_result = 0
+        self.retired = 0
+        self.stopped = False
+
+    def fetch(self, pc=None):
+        return self.imem.get(((self.pc if pc is None else pc) >> 2) % IMEM_WORDS, 0)
+
+    def read_reg(self, r):
+        return 0 if r == XZR else self.regs[r]
+
+    def write_reg(self, r, value):
+        if r != XZR:
+            self.regs[r] = value & XLEN_MASK
+
+    def step(self):
+        """Execute one instruction and return its Legv8Retire record."""
+        pc = self.pc
+        instr = self.fetch()
+        name = legv8_mnemonic(instr)
+        rd, rn, rm = instr & 0x1F, (instr >> 5) & 0x1F, (instr >> 16) & 0x1F
+        next_pc = (pc + 4) & XLEN_MASK
+        result = output = None  # output: the value of a STUR to OUTPUT_ADDR in REPORT_OUTPUT
+
+        if name == "HALT":
+            self.stopped = True
+            if self.report_mode == REPORT_HALT:
+                self.results.append(self.last_result)
+        elif name in _R_TYPE:
+            result = _R_TYPE[name](self.read_reg(rn), self.read_reg(rm), (instr >> 10) & 0x1F) & XLEN_MASK
+            self.write_reg(rd, result)
+        elif name in ("ADDI", "SUBI"):
+            sign = 1 if name == "ADDI" else -1
+            result = (self.read_reg(rn) + sign * imm_i(instr)) & XLEN_MASK
+            self.write_reg(rd, result)
+        elif name in ("LDUR", "STUR"):
+            addr = (self.read_reg(rn) + imm_d(instr)) & XLEN_MASK
+            word = (addr >> 2) % DMEM_WORDS
+            if name == "LDUR":
+                result = self.dmem[word]
+                self.write_reg(rd, result)
+            elif self.report_mode == REPORT_OUTPUT and addr == OUTPUT_ADDR:
+                result, output = addr, self.read_reg(rd)
+            else:
+                result = addr
+                self.dmem[word] = self.read_reg(rd)
+        elif name in ("CBZ", "CBNZ"):
+            result = self.read_reg(rd)
+            if (result == 0) == (name == "CBZ"):
+                next_pc = (pc + imm_cb(instr)) & XLEN_MASK
+        elif name in ("B", "BL"):
+            result = imm_b(instr)
+            next_pc = (pc + result) & XLEN_MASK
+            if name == "BL":
+                self.write_reg(LINK_REG, pc + 4)
+        elif name == "BR":
+            result = self.read_reg(rm)
+            next_pc = self.read_reg(rn)
+        else:
+            result = (self.read_reg(rn) + self.read_reg(rm)) & XLEN_MASK
+
+        if output is not None:
+            self.last_result = output
+            self.results.append(output)
+        elif result is not None:
+            self.last_result = result
+            if self.report_mode == REPORT_ALL or (self.report_mode == REPORT_WRITES and name in _REG_WRITES):
+                self.results.append(result)
+        self.pc = next_pc
+        self.retired += 1
+        return Legv8Retire(pc, instr, result, next_pc)
+
+    def run(self, max_instructions):
+        return [self.step() for _ in range(max_instructions)]
+
+    def halted(self):
+        """True once a HALT has executed (the controller waits for the next start)."""
+        return self.stopped
+
+    def run_to_halt(self, max_instructions=None):
+        """Step until HALT has executed; returns the executed count (HALT included)."""
+        while not self.stopped:
+            if max_instructions is not None and self.retired >= max_instructions:
+                return self.retired
+            self.step()
+        return self.retired
+
+
+def state_dump(regs, dmem):
+    """The words of the post-HALT state dump: header, registers, data memory, checksum."""
+    words = [DUMP_HEADER, *regs, *dmem]
+    return words + [sum(words) & XLEN_MASK]
+
+
+def decode_dump(words):
+    """(regs, dmem) of a state dump; ValueError if the header, length or checksum is wrong."""
+    if len(words) != DUMP_WORDS or words[0] != DUMP_HEADER:
+        raise ValueError(f"not a state dump: {len(words)} words, header 0x{words[0] if words else 0:08X}")
+    if sum(words[:-1]) & XLEN_MASK != words[-1]:
+        raise ValueError(f"state dump checksum 0x{words[-1]:08X}, computed 0x{sum(words[:-1]) & XLEN_MASK:08X}")
+    return list(words[1:1 + NUM_REGS]), list(words[1 + NUM_REGS:-1])
+
+
+def load_blocks(imem):
+    """[(base, words)] of a program: one block per run of consecutive word indexes."""
+    blocks = []
+    for index in sorted(imem):
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == index:
+            blocks[-1][1].append(imem[index])
+        else:
+            blocks.append((index, [imem[index]]))
+    return blocks
+
+
+def load_stream(blocks):
+    """
+    Bytes of a block load (fpga_top LOAD_BLOCKS_CMD): for each (base, words)
+    block its base word address, word count and words, 32-bit little endian.
+    """
+    data = bytearray()
+    for base, words in blocks:
+        data += struct.pack(f"<II{len(words)}I", base, len(words), *words)
+    return bytes(data)
+
+
+def read_bin(path):
+    """Program of a program.bin (little-endian 32-bit words, as the loader sends them)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return dict(enumerate(struct.unpack(f"<{len(data) // 4}I", data[:len(data) // 4 * 4])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a program.bin on the LEGv8 ISS.")
+    parser.add_argument("program", help="Binary program file (program.bin)")
+    parser.add_argument("--report", choices=list(REPORT_MODES), default="all")
+    parser.add_argument("--max-instructions", type=int, default=100000)
+    parser.add_argument("--expect", help="Write the final registers and data memory as JSON for the loader")
+    args = parser.parse_args(argv)
+
+    iss = Legv8ISS(read_bin(args.program), report_mode=REPORT_MODES[args.report])
+    iss.run_to_halt(args.max_instructions)
+    for result in iss.results:
+        print(f"0x{result:08X}")
+    print(f"{iss.retired} instructions, {'halted' if iss.halted() else 'no HALT'}, {len(iss.results)} results")
+    if args.expect:
+        with open(args.expect, "w") as f:
+            json.dump({"regs": iss.regs, "dmem": iss.dmem}, f, indent=1)
+    return 0 if iss.halted() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
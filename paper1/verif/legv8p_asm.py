@@ -0,0 +1,78 @@
+"""
+Instruction encoders and a random program generator for the pipelined
+LEGv8 (LEGv8_Pipelined_Processor).
+
+The encoders take the same arguments as those of verif/legv8_asm.py, so a
+program written against the instructions both cores implement (ADD, SUB,
+AND, ORR, ADDI, LDUR, STUR, CBZ, B, HALT) assembles for either core; the
+IPC comparison (verif/ipc.py) relies on that. Programs are dicts of word
+index -> 32-bit instruction, the layout of the ISS (verif/legv8p_iss.py).
+"""
+import sys
+
+from verif.legv8p_iss import (FUNCT, HALT, IMEM_WORDS, OP_ADDI, OP_B, OP_CBZ, OP_LDUR, OP_R_TYPE,
+                              OP_STUR, WORD_BYTES, XZR)
+
+R_TYPE = list(FUNCT)
+_OPCODES = {"ADDI": OP_ADDI, "LDUR": OP_LDUR, "STUR": OP_STUR}
+
+
+def encode_r(name, rd, rn, rm=0):
+    """R format: ADD/SUB/AND/ORR, the operation in funct6 (shamt field)."""
+    return OP_R_TYPE << 21 | (rm << 16) | (FUNCT[name] << 10) | (rn << 5) | rd
+
+
+def encode_i(name, rd, rn, imm):
+    """ADDI with a 9-bit signed immediate in instr[20:12]."""
+    return _OPCODES[name] << 21 | ((imm & 0x1FF) << 12) | (rn << 5) | rd
+
+
+def encode_d(name, rt, rn, offset):
+    """D format: LDUR/STUR with a 9-bit signed byte offset."""
+    return _OPCODES[name] << 21 | ((offset & 0x1FF) << 12) | (rn << 5) | rt
+
+
+def encode_cb(name, rt, words):
+    """CB format: CBZ, branch offset in instructions."""
+    assert name == "CBZ", name
+    return OP_CBZ << 24 | ((words & 0x7FFFF) << 5) | rt
+
+
+def encode_b(name, words):
+    """B format: B, branch offset in instructions."""
+    assert name == "B", name
+    return OP_B << 26 | (words & 0x3FFFFFF)
+
+
+def random_program(rng, length=32, regs=8, dmem_words=32, asm=None):
+    """
+    A random program of `length` instructions ending in HALT. Operands come
+    from X0..X(regs-1) and XZR, so most instructions depend on a recent one
+    (forwarding and load-use stalls). Loads and stores address the first
+    `dmem_words` data words through XZR (at most 32, the reach of a 9-bit
+    offset) and branches only go forward (CBZ/B over 1-4 instructions), so
+    every program halts. `asm` encodes with another core's encoders (same
+    arguments, HALT and WORD_BYTES), e.g. verif/legv8_asm.py.
+    """
+    asm = asm or sys.modules[__name__]
+    length = min(length, IMEM_WORDS - 1)
+    choices = [*range(regs), XZR]
+    program = {}
+    for pc in range(length):
+        kind = rng.randrange(10)
+        skip = min(rng.randrange(1, 5), length - pc)
+        rd, rn, rm = rng.randrange(regs), rng.choice(choices), rng.choice(choices)
+        if kind < 4:
+            program[pc] = asm.encode_r(rng.choice(R_TYPE), rd, rn, rm)
+        elif kind < 6:
+            program[pc] = asm.encode_i("ADDI", rd, rn, rng.randrange(-256, 256))
+        elif kind < 7:
+            program[pc] = asm.encode_d("LDUR", rd, XZR, rng.randrange(dmem_words) * asm.WORD_BYTES)
+        elif kind < 8:
+            program[pc] = asm.encode_d("STUR", rng.choice(choices), XZR, rng.randrange(dmem_words) * asm.WORD_BYTES)
+        elif kind < 9:
+            program[pc] = asm.encode_cb("CBZ", rng.choice(choices), skip)
+        else:
+            program[pc] = asm.encode_b("B", skip)
+    program[length] = asm.HALT
+    return program
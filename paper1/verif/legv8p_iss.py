@@ -0,0 +1,205 @@
+"""
+Instruction-set simulator for the pipelined 64-bit LEGv8
+(LEGv8_Pipelined_Processor, LEGv8_Processor.sv).
+
+It models the RTL built from LEGv8_Pipelined_Processor.json rather than the
+LEGv8 reference:
+
+- registers and data are 64 bits wide; X31 reads as zero and ignores writes;
+- R-type instructions all use ADD's opcode (OP_R_TYPE_ARITH) and select
+  ADD/SUB/AND/ORR with funct6 in the shamt field (instr[15:10]); other
+  funct6 values do nothing;
+- ADDI, LDUR and STUR take a 9-bit signed immediate from instr[20:12];
+- instruction memory holds 1024 words indexed with PC[11:2]; data memory
+  holds 512 doublewords indexed with address[11:3];
+- CBZ tests Rt; CBZ and B offsets count instructions;
+- HALT (the multicycle core's 0xFFE00000) stops fetching, the PC stays on
+  the instruction after it;
+- undefined opcodes, NOP_INSTR (0) among them, do nothing.
+
+`cycles` follows the RTL's pipeline timing: one cycle per instruction, one
+more for each load-use stall (an LDUR followed by an instruction reading
+the loaded register), two for each taken branch (resolved in EX) and three
+behind HALT until the instructions ahead of it have written back, i.e. the
+clock cycles from reset to halt_out.
+"""
+from collections import namedtuple
+
+XLEN_MASK = (1 << 64) - 1
+NUM_REGS = 32
+XZR = 31
+IMEM_WORDS = 1024
+DMEM_WORDS = 512
+WORD_BYTES = 8
+HALT = 0xFFE00000
+NOP = 0x00000000
+
+# Opcodes, each compared at its format's width (instr[31:21], [31:24], [31:26])
+OP_R_TYPE = 0b10001011000
+OP_ADDI = 0b10010001000
+OP_LDUR = 0b11111000010
+OP_STUR = 0b11111000000
+OP_HALT = 0b11111111111
+OP_CBZ = 0b10110100
+OP_B = 0b000101
+FUNCT = {"ADD": 0b100000, "SUB": 0b100010, "AND": 0b100100, "ORR": 0b100101}
+
+PIPELINE_DRAIN = 3
+LOAD_USE_STALL = 1
+BRANCH_PENALTY = 2
+
+# One executed instruction; `result` is the value written back or stored
+# (None for branches and NOPs), `stall` the cycles it waited in ID.
+Legv8pRetire = namedtuple("Legv8pRetire", "pc instr result next_pc stall")
+
+_R_TYPE = {
+    FUNCT["ADD"]: lambda a, b: a + b,
+    FUNCT["SUB"]: lambda a, b: a - b,
+    FUNCT["AND"]: lambda a, b: a & b,
+    FUNCT["ORR"]: lambda a, b: a | b,
+}
+_FUNCT_NAMES = {code: name for name, code in FUNCT.items()}
+
+
+def _sext(value, bits):
+    sign = 1 << (bits - 1)
+    return ((value & (sign - 1)) - (value & sign)) & XLEN_MASK
+
+
+def imm_d(instr):
+    """ADDI, LDUR and STUR: instr[20:12]."""
+    return _sext(instr >> 12, 9)
+
+
+def imm_cb(instr):
+    return _sext((instr >> 5) << 2, 21)
+
+
+def imm_b(instr):
+    return _sext(instr << 2, 28)
+
+
+def legv8p_mnemonic(instr):
+    """Mnemonic the ControlUnit decodes `instr` as ("NOP" for everything it ignores)."""
+    opcode = instr >> 21
+    if opcode == OP_R_TYPE:
+        return _FUNCT_NAMES.get((instr >> 10) & 0x3F, "NOP")
+    if opcode == OP_ADDI:
+        return "ADDI"
+    if opcode == OP_LDUR:
+        return "LDUR"
+    if opcode == OP_STUR:
+        return "STUR"
+    if opcode == OP_HALT:
+        return "HALT"
+    if instr >> 24 == OP_CBZ:
+        return "CBZ"
+    if instr >> 26 == OP_B:
+        return "B"
+    return "NOP"
+
+
+def source_regs(instr):
+    """Registers HazardDetectionUnit checks against a load in EX (decoded from the opcode alone)."""
+    opcode = instr >> 21
+    rt, rn, rm = instr & 0x1F, (instr >> 5) & 0x1F, (instr >> 16) & 0x1F
+    sources = set()
+    if opcode in (OP_R_TYPE, OP_ADDI, OP_LDUR, OP_STUR):
+        sources.add(rn)
+    if opcode == OP_R_TYPE:
+        sources.add(rm)
+    elif opcode == OP_STUR or instr >> 24 == OP_CBZ:
+        sources.add(rt)
+    return sources
+
+
+class Legv8pISS:
+    """
+    Architectural and timing model of LEGv8_Processor. `imem` maps word
+    index -> 32-bit instruction, `dmem` maps doubleword index -> initial
+    value (absent = 0).
+    """
+
+    def __init__(self, imem, dmem=None):
+        self.imem = dict(imem)
+        self.reset(dmem)
+
+    def reset(self, dmem=None):
+        self.pc = 0
+        self.regs = [0] * NUM_REGS
+        self.dmem = [0] * DMEM_WORDS
+        for word, value in (dmem or {}).items():
+            self.dmem[word] = value & XLEN_MASK
+        self.retired = 0
+        self.cycles = 0
+        self.stalls = 0
+        self.taken = 0
+        self.stopped = False
+        self._load_rt = None  # destination of an LDUR in EX, for the next instruction's stall
+
+    def fetch(self, pc=None):
+        return self.imem.get(((self.pc if pc is None else pc) >> 2) % IMEM_WORDS, 0)
+
+    def read_reg(self, r):
+        return 0 if r == XZR else self.regs[r]
+
+    def write_reg(self, r, value):
+        if r != XZR:
+            self.regs[r] = value & XLEN_MASK
+
+    def step(self):
+        """Execute one instruction and return its Legv8pRetire record."""
+        pc = self.pc
+        instr = self.fetch()
+        name = legv8p_mnemonic(instr)
+        rt, rn, rm = instr & 0x1F, (instr >> 5) & 0x1F, (instr >> 16) & 0x1F
+        next_pc = (pc + 4) & XLEN_MASK
+        result = None
+        taken = False
+        stall = LOAD_USE_STALL if self._load_rt in source_regs(instr) else 0
+
+        if name == "HALT":
+            self.stopped = True
+        elif name in FUNCT:
+            result = _R_TYPE[FUNCT[name]](self.read_reg(rn), self.read_reg(rm)) & XLEN_MASK
+            self.write_reg(rt, result)
+        elif name == "ADDI":
+            result = (self.read_reg(rn) + imm_d(instr)) & XLEN_MASK
+            self.write_reg(rt, result)
+        elif name in ("LDUR", "STUR"):
+            word = (((self.read_reg(rn) + imm_d(instr)) & XLEN_MASK) >> 3) % DMEM_WORDS
+            if name == "LDUR":
+                result = self.dmem[word]
+                self.write_reg(rt, result)
+            else:
+                result = self.dmem[word] = self.read_reg(rt)
+        elif name == "CBZ":
+            taken = self.read_reg(rt) == 0
+            if taken:
+                next_pc = (pc + imm_cb(instr)) & XLEN_MASK
+        elif name == "B":
+            taken = True
+            next_pc = (pc + imm_b(instr)) & XLEN_MASK
+
+        self.cycles += 1 + stall + (BRANCH_PENALTY if taken else 0) + (PIPELINE_DRAIN if self.stopped else 0)
+        self.stalls += stall
+        self.taken += taken
+        self._load_rt = rt if name == "LDUR" and rt != XZR else None
+        self.pc = next_pc
+        self.retired += 1
+        return Legv8pRetire(pc, instr, result, next_pc, stall)
+
+    def run(self, max_instructions):
+        return [self.step() for _ in range(max_instructions)]
+
+    def halted(self):
+        """True once HALT has been fetched (halt_out rises PIPELINE_DRAIN cycles later)."""
+        return self.stopped
+
+    def run_to_halt(self, max_instructions=None):
+        """Step until HALT; returns the executed count (HALT included)."""
+        while not self.stopped:
+            if max_instructions is not None and self.retired >= max_instructions:
+                return self.retired
+            self.step()
+        return self.retired
@@ -0,0 +1,57 @@
+"""
+Lev8 instruction encoders and a random program generator, shared by the
+Lev8 soak and multi-core testbenches.
+
+Programs are dicts of byte address -> 16-bit instruction, the layout the ISS
+(verif/lev8_iss.py) and the IM backdoor loaders use.
+"""
+from verif.lev8_iss import (
+    NUM_REGS, OPCODE_ADDI, OPCODE_BEQ, OPCODE_JUMP, OPCODE_LW, OPCODE_R_TYPE, OPCODE_SW,
+)
+
+# The 4-bit PC limits a program to 8 instructions
+PROGRAM_SLOTS = 8
+
+
+def encode_i(opcode, rs1, rd, imm):
+    """I/B layout: LW, SW, ADDI and BEQ (rd is the rs2 field for SW and BEQ)."""
+    return (opcode << 12) | (rs1 << 9) | (rd << 6) | (imm & 0x3F)
+
+
+def encode_r(rs1, rs2, rd):
+    return (OPCODE_R_TYPE << 12) | (rs1 << 9) | (rs2 << 6) | (rd << 3)
+
+
+def encode_jump(target):
+    return (OPCODE_JUMP << 12) | (target & 0xF)
+
+
+def random_program(rng):
+    """
+    A random 8-instruction program; branch offsets and jump targets stay even
+    (aligned). DataMemory writes even while the core is held in reset, so the
+    instruction at address 0 (decoded throughout reset) is never a SW.
+    """
+    program = {}
+    for pc in range(0, 2 * PROGRAM_SLOTS, 2):
+        kinds = [OPCODE_R_TYPE, OPCODE_ADDI, OPCODE_LW, OPCODE_BEQ, OPCODE_JUMP] + ([OPCODE_SW] if pc else [])
+        kind = rng.choice(kinds)
+        rs1, rs2 = rng.randrange(NUM_REGS), rng.randrange(NUM_REGS)
+        if kind == OPCODE_R_TYPE:
+            program[pc] = encode_r(rs1, rs2, rng.randrange(NUM_REGS))
+        elif kind == OPCODE_BEQ:
+            program[pc] = encode_i(kind, rs1, rs2, rng.randrange(-16, 16) * 2)
+        elif kind == OPCODE_JUMP:
+            program[pc] = encode_jump(rng.randrange(PROGRAM_SLOTS) * 2)
+        else:
+            program[pc] = encode_i(kind, rs1, rs2, rng.randrange(64))
+    return program
+
+
+def load_program(core, program, dmem=None):
+    """Backdoor-load `program` (and a full DMEM image, if given) into a Lev8SingleCycleProcessor handle."""
+    for addr, instr in program.items():
+        core.IM_inst.mem[addr].value = (instr >> 8) & 0xFF
+        core.IM_inst.mem[addr + 1].value = instr & 0xFF
+    for addr, data in enumerate(dmem or ()):
+        core.DM_inst.mem[addr].value = data
@@ -0,0 +1,280 @@
+"""
+Coverage-guided mutation fuzzer for the Lev8 core.
+
+The fuzzer keeps a corpus of programs (IM_CONTENT-style images: eight
+16-bit instructions plus a few DMEM bytes), mutates them (bit flips, opcode
+swaps, field re-draws, slot swaps, splices of two corpus entries, DMEM
+tweaks) and runs every mutant on the ISS. The feedback is
+
+- the control-path cross of verif/coverage_models.lev8_fuzz_model: opcode
+  x ALU op x branch outcome x data address class, per retired instruction,
+  and the pairs of consecutive cross bins (control-path edges);
+- register dataflow: (register, PC that last wrote it, PC that reads it)
+  for every source operand, with "reset value" as a writer;
+- value classes: opcode x class of the first operand x class of the result
+  (0, 1, 0x7F, 0x80, 0xFF, other positive, other negative).
+
+The control-path bins and edges saturate within the first session (a few
+hundred features); the dataflow and value features keep telling programs
+apart after that. A mutant that reaches a feature no corpus entry reached
+stays in the corpus.
+
+Only those new-coverage mutants go to the RTL: the lev8_fuzz test runs them
+through the batch harness (reset, load, run, compare with the ISS), and a
+mismatch is written to the crash directory for the minimizer.
+
+The corpus, the reached bins and the cumulative executions/CPU time live in
+$FUZZ_DIR/lev8_corpus.json (default fuzz/), so every session continues
+where the last one stopped and reports coverage per CPU hour.
+
+    python -m verif.lev8_fuzz --iterations 200000     # grow the corpus on the ISS only
+    python -m verif.lev8_fuzz --show
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from verif.coverage_models import lev8_fuzz_model
+from verif.lev8_asm import PROGRAM_SLOTS, random_program
+from verif.lev8_iss import (
+    DMEM_SIZE, NUM_REGS, OPCODE_ADDI, OPCODE_BEQ, OPCODE_LW, OPCODE_R_TYPE, OPCODE_SW, PC_MASK, Lev8ISS, decode,
+)
+
+FUZZ_DIR = os.environ.get("FUZZ_DIR", "fuzz")
+FUZZ_ITERATIONS = int(os.environ.get("FUZZ_ITERATIONS", "20000"))
+FUZZ_CYCLES = int(os.environ.get("FUZZ_CYCLES", "64"))
+
+# IM_CONTENT of test_Lev8SingleCycleProcessor.py: the first corpus entry
+SEED_PROGRAM = [0x5045, 0x508A, 0x0298, 0x1114, 0x20D9, 0x3284, 0x4000, 0x0000]
+SEED_DMEM = {"20": 0xAA}  # JSON keys
+
+# Stored with the corpus; bump it when the numbering of features() changes
+FEATURE_VERSION = 2
+
+PCS = PC_MASK + 1
+RESET_WRITER = PCS  # dataflow "writer" of a register nobody wrote yet
+# Source registers each opcode reads (rs2 of SW is the stored value)
+_READS = {OPCODE_R_TYPE: (0, 1), OPCODE_LW: (0,), OPCODE_SW: (0, 1), OPCODE_BEQ: (0, 1), OPCODE_ADDI: (0,)}
+_WRITES = (OPCODE_R_TYPE, OPCODE_LW, OPCODE_ADDI)
+_SPECIAL_VALUES = {0: 0, 1: 1, 0x7F: 2, 0x80: 3, 0xFF: 4}
+VALUE_CLASSES = 7
+
+
+def value_class(value):
+    """0, 1, 0x7F, 0x80, 0xFF, other positive, other negative (as a signed byte)."""
+    return _SPECIAL_VALUES.get(value, 6 if value & 0x80 else 5)
+
+
+def image(entry):
+    """Corpus entry -> (imem dict, dmem dict) in the ISS layout."""
+    return ({2 * i: instr for i, instr in enumerate(entry["imem"])},
+            {int(addr): value for addr, value in entry["dmem"].items()})
+
+
+class Lev8Fuzzer:
+    """Corpus, coverage feedback and mutators; `next()` yields the next interesting mutant."""
+
+    def __init__(self, rng, path=None, cycles=FUZZ_CYCLES):
+        self.rng = rng
+        self.path = path or os.path.join(FUZZ_DIR, "lev8_corpus.json")
+        self.cycles = cycles
+        self.model = lev8_fuzz_model()
+        self.cross = self.model["control_path"]
+        nbins = len(self.cross.bins)
+        # Feature numbering: cross bins, edges, dataflow triples, value classes
+        self._flow_base = nbins + nbins * nbins
+        self._value_base = self._flow_base + NUM_REGS * (PCS + 1) * PCS
+        self.features_total = self._value_base + 16 * VALUE_CLASSES * VALUE_CLASSES
+        self.corpus = []
+        self.seen = set()
+        self.executions = 0
+        self.cpu_seconds = 0.0
+        self._started = time.process_time()
+        self.load()
+        if not self.corpus:
+            self.add({"imem": list(SEED_PROGRAM), "dmem": dict(SEED_DMEM)})
+            for _ in range(8):
+                program = random_program(rng)
+                self.add({"imem": [program[2 * i] for i in range(PROGRAM_SLOTS)], "dmem": {}})
+
+    # --- feedback ---
+
+    def model_for(self, entry):
+        imem, dmem = image(entry)
+        return Lev8ISS(imem, dmem)
+
+    def features(self, entry):
+        """
+        Features reached by `entry` within `cycles` instructions (or until it
+        halts). Bins are the cross indices, edge (a, b) is numbered
+        len(bins) + a * len(bins) + b, then come the (register, writer PC,
+        reader PC) triples and the (opcode, operand class, result class)
+        triples.
+        """
+        iss = self.model_for(entry)
+        reached = set()
+        nbins = len(self.cross.bins)
+        flow_base, value_base = self._flow_base, self._value_base
+        writer = [RESET_WRITER] * NUM_REGS
+        prev = None
+        while iss.retired < self.cycles:
+            halting = iss.halted()
+            d = decode(iss.fetch())
+            pc, operand = iss.pc, iss.regs[d.rs1]
+            r = iss.step()
+            for field in _READS.get(d.opcode, ()):
+                reg = (d.rs1, d.rs2)[field]
+                reached.add(flow_base + (reg * (PCS + 1) + writer[reg]) * PCS + pc)
+            if d.opcode in _WRITES and d.rd != 0:
+                writer[d.rd] = pc
+            reached.add(value_base + (d.opcode * VALUE_CLASSES + value_class(operand)) * VALUE_CLASSES
+                        + value_class(r.reg_write_data))
+            branch = "n/a" if d.opcode != OPCODE_BEQ else "taken" if r.alu_result == 0 else "not_taken"
+            addr = r.alu_result if d.opcode in (OPCODE_LW, OPCODE_SW) else None
+            alu_op = 1 if d.opcode == OPCODE_BEQ else 0
+            index = self.cross.bin_index(d.opcode, alu_op, branch, addr)
+            reached.add(index)
+            if prev is not None:
+                reached.add(nbins + prev * nbins + index)
+            prev = index
+            if halting:
+                break
+        self.executions += 1
+        return reached
+
+    def add(self, entry, reached=None):
+        """Add `entry` to the corpus if it reaches a bin not seen yet; returns the new bins."""
+        reached = self.features(entry) if reached is None else reached
+        new = reached - self.seen
+        if new:
+            self.seen |= new
+            self.corpus.append(entry)
+        return new
+
+    # --- mutators ---
+
+    def _bit_flip(self, entry):
+        slot = self.rng.randrange(PROGRAM_SLOTS)
+        entry["imem"][slot] ^= 1 << self.rng.randrange(16)
+
+    def _opcode_swap(self, entry):
+        slot = self.rng.randrange(PROGRAM_SLOTS)
+        entry["imem"][slot] = (entry["imem"][slot] & 0x0FFF) | (self.rng.randrange(8) << 12)
+
+    def _field_redraw(self, entry):
+        slot = self.rng.randrange(PROGRAM_SLOTS)
+        shift, width = self.rng.choice([(9, 3), (6, 3), (3, 3), (0, 6), (0, 4)])
+        mask = ((1 << width) - 1) << shift
+        entry["imem"][slot] = (entry["imem"][slot] & ~mask & 0xFFFF) | (self.rng.getrandbits(width) << shift)
+
+    def _slot_swap(self, entry):
+        a, b = self.rng.sample(range(PROGRAM_SLOTS), 2)
+        entry["imem"][a], entry["imem"][b] = entry["imem"][b], entry["imem"][a]
+
+    def _splice(self, entry):
+        other = self.rng.choice(self.corpus)
+        cut = self.rng.randrange(1, PROGRAM_SLOTS)
+        entry["imem"][cut:] = other["imem"][cut:]
+
+    def _dmem_tweak(self, entry):
+        entry["dmem"][str(self.rng.randrange(DMEM_SIZE))] = self.rng.randrange(256)
+
+    MUTATORS = ("_bit_flip", "_opcode_swap", "_field_redraw", "_slot_swap", "_splice", "_dmem_tweak")
+
+    def mutate(self, parent):
+        entry = {"imem": list(parent["imem"]), "dmem": dict(parent["dmem"])}
+        for _ in range(1 + int(self.rng.expovariate(1.0))):
+            getattr(self, self.rng.choice(self.MUTATORS))(entry)
+        if entry["imem"][0] >> 12 == OPCODE_SW:
+            # The first instruction executes during reset; DataMemory would see that store
+            entry["imem"][0] &= 0x0FFF
+        return entry
+
+    def next(self, max_tries=None):
+        """Mutate until a mutant reaches new bins; returns (entry, new bins) or (None, set())."""
+        tries = 0
+        while max_tries is None or tries < max_tries:
+            tries += 1
+            entry = self.mutate(self.rng.choice(self.corpus))
+            new = self.add(entry)
+            if new:
+                return entry, new
+        return None, set()
+
+    # --- persistence ---
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("bins") != len(self.cross.bins) or data.get("features") != FEATURE_VERSION:
+            return  # the coverage model or the feature numbering changed, start over
+        self.corpus = data["corpus"]
+        self.seen = set(data["seen"])
+        self.executions = data["executions"]
+        self.cpu_seconds = data["cpu_seconds"]
+
+    def save(self):
+        cpu = self.cpu_seconds + time.process_time() - self._started
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"bins": len(self.cross.bins), "features": FEATURE_VERSION, "corpus": self.corpus, "seen": sorted(self.seen),
+                       "executions": self.executions, "cpu_seconds": cpu}, f)
+        return self.path
+
+    def coverage_model(self):
+        """lev8_fuzz_model with one hit per reached bin, for the usual coverage reports."""
+        for i in self.seen:
+            if i < len(self.cross.bins):
+                self.cross.counts[i] = max(self.cross.counts[i], 1)
+        return self.model
+
+    def summary(self):
+        cpu = self.cpu_seconds + time.process_time() - self._started
+        per_hour = len(self.seen) / (cpu / 3600) if cpu > 0 else 0.0
+        bins = sum(1 for i in self.seen if i < len(self.cross.bins))
+        edges = sum(1 for i in self.seen if len(self.cross.bins) <= i < self._flow_base)
+        flows = sum(1 for i in self.seen if self._flow_base <= i < self._value_base)
+        values = len(self.seen) - bins - edges - flows
+        return (f"corpus {len(self.corpus)}, {bins}/{len(self.cross.bins)} control-path bins, "
+                f"{edges} edges, {flows} dataflow pairs, {values} value classes, "
+                f"{self.executions} executions, {cpu:.1f} CPU s ({per_hour:,.0f} features/CPU hour)")
+
+
+def write_crash(entry, error, directory=None):
+    """Store a program that failed on the RTL, for verif/minimize.py."""
+    directory = directory or os.path.join(FUZZ_DIR, "crashes")
+    os.makedirs(directory, exist_ok=True)
+    name = "lev8_" + "".join(f"{w:04x}" for w in entry["imem"])
+    path = os.path.join(directory, name + ".json")
+    with open(path, "w") as f:
+        json.dump({"isa": "lev8", "imem": entry["imem"], "dmem": entry["dmem"], "error": error}, f, indent=1)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grow the Lev8 fuzzing corpus on the ISS.")
+    parser.add_argument("--iterations", type=int, default=FUZZ_ITERATIONS, help="Mutants to try")
+    parser.add_argument("--seed", type=int, help="Random seed (default: random)")
+    parser.add_argument("--corpus", help="Corpus file (default $FUZZ_DIR/lev8_corpus.json)")
+    parser.add_argument("--show", action="store_true", help="Only print the corpus statistics")
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(1 << 31)
+    fuzzer = Lev8Fuzzer(random.Random(seed), args.corpus)
+    if not args.show:
+        before = len(fuzzer.seen)
+        for _ in range(args.iterations):
+            fuzzer.add(fuzzer.mutate(fuzzer.rng.choice(fuzzer.corpus)))
+        print(f"{len(fuzzer.seen) - before} new features in {args.iterations} iterations (seed {seed})")
+        fuzzer.save()
+    print(fuzzer.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
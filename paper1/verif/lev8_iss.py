@@ -0,0 +1,127 @@
+"""
+Instruction-set simulator for the Lev8 single-cycle core
+(LegV8SingleCycleProcessor-cocob2).
+
+It models what the RTL does rather than what the ISA sheet says:
+
+- the PC is 4 bits wide, so PC+2, branch targets and jump targets wrap at 16;
+- the ControlUnit ignores the funct field, so every R-type instruction is ADD;
+- JUMP targets are instruction[3:0];
+- instruction memory is byte-wide and fetches {mem[pc], mem[pc+1]}, so an
+  odd PC (reachable through odd branch offsets or jump targets) executes the
+  low byte of one instruction and the high byte of the next;
+- instructions that do not write back still drive the ALU (ADD of the two
+  register fields), which shows up on debug_alu_result;
+- undefined opcodes behave as NOPs.
+"""
+from collections import namedtuple
+
+OPCODE_R_TYPE = 0b0000
+OPCODE_LW = 0b0001
+OPCODE_SW = 0b0010
+OPCODE_BEQ = 0b0011
+OPCODE_JUMP = 0b0100
+OPCODE_ADDI = 0b0101
+
+PC_MASK = 0xF
+DATA_MASK = 0xFF
+NUM_REGS = 8
+DMEM_SIZE = 256
+
+# One retired instruction. The DUT retire monitor builds the same tuple, so a
+# scoreboard can compare the two field by field.
+Lev8Retire = namedtuple("Lev8Retire", "pc instr alu_result reg_write_data next_pc")
+
+Lev8Decoded = namedtuple("Lev8Decoded", "opcode rs1 rs2 rd imm jump_target")
+
+
+def sign_extend6(value):
+    """SignExtender.sv: 6-bit immediate to 8 bits."""
+    return (value | 0xC0) if value & 0x20 else value
+
+
+def decode(instr):
+    """Split a 16-bit word into the fields the top level wires out of it."""
+    opcode = (instr >> 12) & 0xF
+    rs1 = (instr >> 9) & 0x7
+    rs2 = (instr >> 6) & 0x7
+    i_type = opcode in (OPCODE_LW, OPCODE_ADDI)
+    rd = rs2 if i_type else (instr >> 3) & 0x7
+    return Lev8Decoded(opcode, rs1, rs2, rd, sign_extend6(instr & 0x3F), instr & PC_MASK)
+
+
+class Lev8ISS:
+    """
+    Architectural model of the Lev8 core. `imem` maps byte address -> 16-bit
+    instruction (the layout of IM_CONTENT in the testbench), `dmem` maps byte
+    address -> initial data byte.
+    """
+
+    def __init__(self, imem, dmem=None):
+        self.imem = dict(imem)
+        self._bytes = {}
+        for addr, instr in self.imem.items():
+            self._bytes[addr] = (instr >> 8) & 0xFF
+            self._bytes[addr + 1] = instr & 0xFF
+        self.reset(dmem)
+
+    def reset(self, dmem=None):
+        self.pc = 0
+        self.regs = [0] * NUM_REGS
+        self.dmem = [0] * DMEM_SIZE
+        for addr, value in (dmem or {}).items():
+            self.dmem[addr] = value & DATA_MASK
+        self.retired = 0
+
+    def fetch(self, pc=None):
+        pc = self.pc if pc is None else pc
+        return (self._bytes.get(pc, 0) << 8) | self._bytes.get(pc + 1, 0)
+
+    def step(self):
+        """Execute one instruction and return its Lev8Retire record."""
+        pc = self.pc
+        instr = self.fetch()
+        d = decode(instr)
+        src1 = self.regs[d.rs1]
+        src2 = self.regs[d.rs2]
+        pc_plus_2 = (pc + 2) & PC_MASK
+        next_pc = pc_plus_2
+
+        if d.opcode in (OPCODE_LW, OPCODE_SW, OPCODE_ADDI):
+            alu_result = (src1 + d.imm) & DATA_MASK
+        elif d.opcode == OPCODE_BEQ:
+            alu_result = (src1 - src2) & DATA_MASK
+        else:
+            alu_result = (src1 + src2) & DATA_MASK
+
+        reg_write_data = self.dmem[alu_result] if d.opcode == OPCODE_LW else alu_result
+
+        if d.opcode in (OPCODE_R_TYPE, OPCODE_LW, OPCODE_ADDI) and d.rd != 0:
+            self.regs[d.rd] = reg_write_data
+        elif d.opcode == OPCODE_SW:
+            self.dmem[alu_result] = src2
+        elif d.opcode == OPCODE_BEQ and alu_result == 0:
+            next_pc = (pc_plus_2 + d.imm) & PC_MASK
+        elif d.opcode == OPCODE_JUMP:
+            next_pc = d.jump_target
+
+        self.pc = next_pc
+        self.retired += 1
+        return Lev8Retire(pc, instr, alu_result, reg_write_data, next_pc)
+
+    def run(self, max_instructions):
+        return [self.step() for _ in range(max_instructions)]
+
+    def halted(self):
+        """True when the next instruction is a JUMP to itself."""
+        d = decode(self.fetch())
+        return d.opcode == OPCODE_JUMP and d.jump_target == self.pc
+
+    def run_to_halt(self, max_instructions=None):
+        """Step until the halting JUMP has retired once (as the soak tops count it); returns retired count."""
+        while not self.halted():
+            if max_instructions is not None and self.retired >= max_instructions:
+                return self.retired
+            self.step()
+        self.step()
+        return self.retired
@@ -0,0 +1,452 @@
+"""
+Delta-debugging minimizer for programs that make a core disagree with its ISS.
+
+A failing image (a fuzzer crash file, or an image a batch test saved to
+CRASH_DIR) is shrunk to a small reproducer with ddmin over its instruction
+and data memory entries. Removing an entry clears it to 0, which every core
+executes as a no-op (Lev8 ADD R0,R0,R0; RISC_Processor has no opcode 0; an
+undefined LEGv8 word writes nothing), so the remaining instructions keep
+their addresses and branch offsets stay valid.
+
+Every candidate is screened on the ISS first: candidates that break a core
+constraint (a Lev8 SW at address 0) or stop halting while the failing image
+halted are rejected without a simulation. The ISS never accepts one: an RTL
+bug can change control flow, and then instructions the ISS never fetches
+still matter, so only the RTL decides that a candidate fails. Verdicts are
+cached by image content.
+
+The remaining candidates of a ddmin round go to the RTL together, split
+over up to --jobs simulator processes (one build, see verif/sweep.py). Each
+process runs its share back to back through the core's batch harness (the
+<isa>_replay_images tests) and writes one verdict per image. By default a
+candidate only counts as failing if it fails the same comparison (regs,
+dmem, PC, UART) as the original.
+
+The result is a cocotb test, written to $MINIMIZE_DIR (default minimized/)
+next to the minimized image, ready to be appended to the core's test module
+(--append does that). The minimized image is run once more on its own
+before it is written; if it no longer fails, the minimization counts as
+failed and the last image confirmed on the RTL is written instead.
+
+    python -m verif.minimize fuzz/crashes/lev8_5045508a02981114.json -j 8
+    python -m verif.minimize fuzz/crashes --append       # every crash file in the directory
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from verif import sweep
+from verif.legv8_iss import Legv8ISS
+from verif.legv8p_iss import Legv8pISS
+from verif.lev8_iss import OPCODE_SW, Lev8ISS
+from verif.riscv_iss import RiscvISS
+
+CRASH_DIR = os.environ.get("CRASH_DIR", os.path.join("fuzz", "crashes"))
+MINIMIZE_DIR = os.environ.get("MINIMIZE_DIR", "minimized")
+MINIMIZE_SIM_BUILD = "sim_build_minimize"
+# Set by the RTL oracle for the <isa>_replay_images tests
+MINIMIZE_IMAGES = os.environ.get("MINIMIZE_IMAGES")
+MINIMIZE_VERDICTS = os.environ.get("MINIMIZE_VERDICTS")
+
+# Where each ISA's RTL lives and how its regression tests look. `imem_step`
+# converts the instruction lists of crash files to addresses.
+IsaSpec = namedtuple("IsaSpec", "dir module toplevel replay_test harness clock period_ns test_prefix "
+                                "imem_step max_cycles")
+
+ISAS = {
+    "lev8": IsaSpec("LegV8SingleCycleProcessor-cocob2", "test_Lev8SingleCycleProcessor",
+                    "Lev8SingleCycleProcessor", "lev8_replay_images", "Lev8Harness", "clk", 10,
+                    "lev8_", 2, 64),
+    "riscv": IsaSpec("RISC_Processor-cocotb-passed", "test_RISC_Processor", "RISC_Processor",
+                     "test_risc_replay_images", "RiscvHarness", "clk", 10, "test_risc_", 1, 100_000),
+    "legv8": IsaSpec("legv8_multicycle_uart", "test_fpga_top", "fpga_top", "legv8_replay_images",
+                     "Legv8Harness", "clk_50MHz", 20, "legv8_", 1, 10_000),
+    "legv8p": IsaSpec("LEGv8_Pipelined_Processor", "test_LEGv8_Processor", "LEGv8_Processor",
+                      "legv8p_replay_images", "Legv8pHarness", "clk", 10, "legv8p_", 1, 10_000),
+}
+
+# `reproduced` is False when the minimized image passed its final RTL run
+# and imem/dmem/error are those of the last image confirmed before
+MinimizeResult = namedtuple("MinimizeResult", "imem dmem error reproduced candidates iss_rejected "
+                                              "rtl_runs rtl_rounds seconds")
+
+
+# --- images on disk ---
+
+def _int_keys(mapping):
+    return {int(k): v for k, v in mapping.items() if v}
+
+
+def image_dict(name, imem, dmem, max_cycles):
+    """The JSON form of an image (sparse memories, absent = 0)."""
+    return {"name": name, "imem": {str(k): v for k, v in sorted(imem.items())},
+            "dmem": {str(k): v for k, v in sorted(dmem.items())}, "max_cycles": max_cycles}
+
+
+def save_image(isa, image, error=None, directory=None):
+    """Write a ProgramImage (and the mismatch it caused) as <isa>_<hash>.json; returns the path."""
+    directory = directory or CRASH_DIR
+    os.makedirs(directory, exist_ok=True)
+    data = image_dict(image.name, image.imem, image.dmem, image.max_cycles)
+    data.update(isa=isa, error=error)
+    digest = hashlib.sha1(json.dumps([data["imem"], data["dmem"]]).encode()).hexdigest()[:12]
+    path = os.path.join(directory, f"{isa}_{digest}.json")
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+    return path
+
+
+def load_image(path):
+    """Read a crash/image file; returns (isa, name, imem, dmem, max_cycles, error)."""
+    with open(path) as f:
+        data = json.load(f)
+    isa = data["isa"]
+    spec = ISAS[isa]
+    imem = data["imem"]
+    if isinstance(imem, list):  # lev8_fuzz crash files list the instruction slots
+        imem = {spec.imem_step * i: word for i, word in enumerate(imem) if word}
+    else:
+        imem = _int_keys(imem)
+    name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+    return (isa, name, imem, _int_keys(data.get("dmem", {})),
+            data.get("max_cycles", spec.max_cycles), data.get("error"))
+
+
+# --- ISS screening ---
+
+def model(isa, imem, dmem):
+    if isa == "lev8":
+        return Lev8ISS(imem, dmem)
+    if isa == "riscv":
+        return RiscvISS([imem.get(i, 0) for i in range(max(imem, default=-1) + 1)], dmem)
+    if isa == "legv8p":
+        return Legv8pISS(imem, dmem)
+    return Legv8ISS(imem, dmem)
+
+
+def valid(isa, imem):
+    """Core constraints the batch harnesses rely on."""
+    return not (isa == "lev8" and imem.get(0, 0) >> 12 == OPCODE_SW)
+
+
+def execution(isa, imem, dmem, max_cycles):
+    """(tuple of fetched (pc, instr), halted) on the ISS, with the batch harness's cycle budget."""
+    iss = model(isa, imem, dmem)
+    trace = []
+    while not iss.halted() and iss.retired < max_cycles:
+        trace.append((iss.pc, iss.fetch()))
+        iss.step()
+    return tuple(trace), iss.halted()
+
+
+def signature(name, error):
+    """Which comparison failed: 'regs', 'dmem', 'uart', 'PC', ... (the part after the image name)."""
+    if error is None:
+        return None
+    rest = error[len(name):] if error.startswith(name) else error
+    return rest.lstrip(".: ").split(":")[0].split(" ")[0]
+
+
+# --- the RTL oracle ---
+
+class RtlOracle:
+    """
+    Runs lists of images on the RTL of one ISA, in parallel simulator
+    processes after a single build; calling it returns one error message
+    (or None) per image.
+    """
+
+    def __init__(self, isa, jobs=None, outdir=None, extra=(), log=print):
+        self.spec = ISAS[isa]
+        self.jobs = jobs or os.cpu_count()
+        self.outdir = os.path.abspath(outdir or os.path.join(MINIMIZE_DIR, "runs"))
+        self.extra = list(extra)
+        self.log = log
+        self._built = False
+        self._calls = 0
+
+    def _build(self):
+        os.makedirs(self.outdir, exist_ok=True)
+        self.log(f"Building {self.spec.toplevel} in {self.spec.dir}/{MINIMIZE_SIM_BUILD} ...")
+        sweep.build(self.spec.dir, self.spec.module, self.spec.toplevel, MINIMIZE_SIM_BUILD, self.extra,
+                    log_file=os.path.join(self.outdir, "build.log"))
+        self._built = True
+
+    def _run_chunk(self, index, images):
+        images_file = os.path.join(self.outdir, f"images_{index}.json")
+        verdicts_file = os.path.join(self.outdir, f"verdicts_{index}.json")
+        with open(images_file, "w") as f:
+            json.dump(images, f)
+        if os.path.exists(verdicts_file):
+            os.remove(verdicts_file)
+        env = dict(os.environ, MINIMIZE_IMAGES=images_file, MINIMIZE_VERDICTS=verdicts_file)
+        result = sweep.run_seed(self.spec.dir, self.spec.module, self.spec.toplevel, index, self.outdir,
+                                self.spec.replay_test, MINIMIZE_SIM_BUILD, self.extra, env)
+        verdicts = {}
+        if os.path.exists(verdicts_file):
+            with open(verdicts_file) as f:
+                verdicts = json.load(f)
+        missing = f"no verdict, simulator error (see {result.log_file})"
+        return [verdicts.get(image["name"], missing) for image in images]
+
+    def __call__(self, images):
+        if not self._built:
+            self._build()
+        chunks = [images[i::self.jobs] for i in range(min(self.jobs, len(images)))]
+        base = self._calls * self.jobs
+        self._calls += 1
+        with ThreadPoolExecutor(max_workers=len(chunks) or 1) as pool:
+            results = list(pool.map(self._run_chunk, range(base, base + len(chunks)), chunks))
+        errors = {}
+        for chunk, verdicts in zip(chunks, results):
+            for image, error in zip(chunk, verdicts):
+                errors[image["name"]] = error
+        return [errors[image["name"]] for image in images]
+
+
+# --- ddmin ---
+
+class Minimizer:
+    """
+    ddmin over the memory entries of one failing image. `oracle(images)`
+    returns an error message or None per image dict (see RtlOracle).
+    """
+
+    def __init__(self, isa, imem, dmem, max_cycles, oracle, error=None, same_error=True, log=print):
+        self.isa = isa
+        self.imem = dict(imem)
+        self.dmem = dict(dmem)
+        self.max_cycles = max_cycles
+        self.oracle = oracle
+        self.error = error
+        self.same_error = same_error
+        self.log = log
+        self._cache = {}
+        self._errors = {}  # key -> RTL error of the images confirmed to fail
+        self.candidates = self.iss_rejected = self.rtl_runs = self.rtl_rounds = 0
+        self._halts = execution(isa, imem, dmem, max_cycles)[1]
+
+    @staticmethod
+    def _key(imem, dmem):
+        return tuple(sorted(imem.items())), tuple(sorted(dmem.items()))
+
+    def _reproduces(self, name, error):
+        if error is None:
+            return False
+        return not self.same_error or self.error is None or \
+            signature(name, error) == signature("original", self.error)
+
+    def test(self, candidates):
+        """Verdicts (True = still fails) for a list of (imem, dmem); one parallel RTL round at most."""
+        verdicts = [None] * len(candidates)
+        pending = []
+        for i, (imem, dmem) in enumerate(candidates):
+            self.candidates += 1
+            key = self._key(imem, dmem)
+            if key in self._cache:
+                verdicts[i] = self._cache[key]
+                continue
+            if not valid(self.isa, imem) or (self._halts and not execution(self.isa, imem, dmem, self.max_cycles)[1]):
+                self.iss_rejected += 1
+                verdicts[i] = self._cache[key] = False
+            else:
+                pending.append((i, key))
+        if pending:
+            images = [image_dict(f"cand{self.candidates}_{i}", *candidates[i], self.max_cycles)
+                      for i, _ in pending]
+            errors = self.oracle(images)
+            self.rtl_runs += len(images)
+            self.rtl_rounds += 1
+            for (i, key), image, error in zip(pending, images, errors):
+                fails = self._reproduces(image["name"], error)
+                verdicts[i] = self._cache[key] = fails
+                if fails:
+                    self._errors[key] = error
+        return verdicts
+
+    def _ddmin(self, items, build):
+        """Smallest subset of `items` (1-minimal) for which build(subset) still fails."""
+        n = 2
+        while len(items) >= 2:
+            size = -(-len(items) // n)
+            chunks = [items[i:i + size] for i in range(0, len(items), size)]
+            complements = [[x for x in items if x not in chunk] for chunk in chunks] if len(chunks) > 2 else []
+            options = chunks + complements
+            verdicts = self.test([build(option) for option in options])
+            hit = next((i for i, v in enumerate(verdicts) if v), None)
+            if hit is not None and hit < len(chunks):
+                items, n = options[hit], 2
+            elif hit is not None:
+                items, n = options[hit], max(n - 1, 2)
+            elif n >= len(items):
+                break
+            else:
+                n = min(2 * n, len(items))
+        if len(items) == 1 and self.test([build([])])[0]:
+            items = []
+        return items
+
+    def run(self):
+        """Confirm the failure, then shrink IMEM and DMEM until neither changes; returns a MinimizeResult."""
+        started = time.monotonic()
+        original = image_dict("original", self.imem, self.dmem, self.max_cycles)
+        error = self.oracle([original])[0]
+        self.rtl_runs += 1
+        self.rtl_rounds += 1
+        if error is None:
+            raise ValueError("the image does not fail on the RTL")
+        self.error = error
+        self._errors[self._key(self.imem, self.dmem)] = error
+        self._cache[self._key(self.imem, self.dmem)] = True
+        confirmed = [(self.imem, self.dmem, error)]  # images kept by a pass that failed on the RTL
+
+        while True:
+            before = (len(self.imem), len(self.dmem))
+            dmem = self.dmem
+            kept = self._ddmin(sorted(self.imem), lambda keys: ({k: self.imem[k] for k in keys}, dmem))
+            self.imem = {k: self.imem[k] for k in kept}
+            imem = self.imem
+            kept = self._ddmin(sorted(self.dmem), lambda keys: (imem, {k: dmem[k] for k in keys}))
+            self.dmem = {k: dmem[k] for k in kept}
+            key = self._key(self.imem, self.dmem)
+            if key in self._errors and key != self._key(*confirmed[-1][:2]):
+                confirmed.append((self.imem, self.dmem, self._errors[key]))
+            self.log(f"  {len(self.imem)} instruction(s), {len(self.dmem)} data word(s) left "
+                     f"({self.rtl_runs} RTL runs in {self.rtl_rounds} rounds, "
+                     f"{self.iss_rejected} rejected by the ISS)")
+            if (len(self.imem), len(self.dmem)) == before:
+                break
+        # Re-run the result on its own: it must still fail, and its error goes into the regression test
+        final = self.oracle([image_dict("final", self.imem, self.dmem, self.max_cycles)])[0]
+        self.rtl_runs += 1
+        self.rtl_rounds += 1
+        imem, dmem, error, reproduced = self.imem, self.dmem, final, self._reproduces("final", final)
+        if not reproduced:
+            previous = [c for c in confirmed if self._key(*c[:2]) != self._key(self.imem, self.dmem)]
+            imem, dmem, error = (previous or confirmed)[-1]
+            self.log(f"  the minimized image {'passes' if final is None else 'fails differently'} on its own; "
+                     f"falling back to the last confirmed image ({len(imem)} instruction(s), "
+                     f"{len(dmem)} data word(s))")
+        return MinimizeResult(imem, dmem, error, reproduced, self.candidates, self.iss_rejected,
+                              self.rtl_runs, self.rtl_rounds, time.monotonic() - started)
+
+
+# --- output ---
+
+def regression_test(isa, imem, dmem, max_cycles, error, source=None):
+    """Source of a cocotb test that replays the minimized image; returns (test name, text)."""
+    spec = ISAS[isa]
+    digest = hashlib.sha1(json.dumps([sorted(imem.items()), sorted(dmem.items())]).encode()).hexdigest()[:8]
+    name = f"{spec.test_prefix}regress_{digest}"
+    width = 4 if isa == "lev8" else 8
+    imem_text = ", ".join(f"{k}: 0x{v:0{width}X}" for k, v in sorted(imem.items()))
+    dmem_text = ", ".join(f"{k}: 0x{v:X}" for k, v in sorted(dmem.items()))
+    summary = error.strip().splitlines()[0] if error else "RTL/ISS mismatch"
+    for prefix in ("final", "original"):
+        if summary.startswith(prefix):
+            summary = summary[len(prefix):].lstrip(".: ")
+    origin = f" from {source}" if source else ""
+    text = f'''
+
+@cocotb.test()
+@profiled
+async def {name}(dut):
+    """Minimized{origin}: {summary}"""
+    cocotb.start_soon(Clock(dut.{spec.clock}, {spec.period_ns}, units="ns").start())
+    image = ProgramImage("regress_{digest}", {{{imem_text}}}, {{{dmem_text}}}, {max_cycles})
+    _, error = await {spec.harness}(dut).run(image)
+    assert error is None, error
+'''
+    return name, text
+
+
+def write_outputs(isa, result, max_cycles, source, directory=None, append=False):
+    directory = directory or MINIMIZE_DIR
+    os.makedirs(directory, exist_ok=True)
+    name, text = regression_test(isa, result.imem, result.dmem, max_cycles, result.error, source)
+    test_path = os.path.join(directory, f"{name}.py")
+    with open(test_path, "w") as f:
+        f.write(text.lstrip("\n"))
+    data = image_dict(name, result.imem, result.dmem, max_cycles)
+    data.update(isa=isa, error=result.error, source=source)
+    with open(os.path.join(directory, f"{name}.json"), "w") as f:
+        json.dump(data, f, indent=1)
+    if append:
+        spec = ISAS[isa]
+        module = os.path.join(spec.dir, spec.module + ".py")
+        with open(module) as f:
+            present = f"async def {name}(" in f.read()
+        if not present:
+            with open(module, "a") as f:
+                f.write(text)
+        return test_path, module
+    return test_path, None
+
+
+# --- the test side ---
+
+async def replay_images(harness, images_file=None, verdicts_file=None):
+    """Body of the <isa>_replay_images tests: run every image of the list, write {name: error or None}."""
+    from verif.batch import ProgramImage
+
+    with open(images_file or MINIMIZE_IMAGES) as f:
+        images = json.load(f)
+    verdicts = {}
+    for data in images:
+        image = ProgramImage(data["name"], _int_keys(data["imem"]), _int_keys(data["dmem"]), data["max_cycles"])
+        _, verdicts[image.name] = await harness.run(image)
+    with open(verdicts_file or MINIMIZE_VERDICTS, "w") as f:
+        json.dump(verdicts, f)
+    harness.log.info(f"Replayed {len(images)} image(s), {sum(e is not None for e in verdicts.values())} failing")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shrink failing program images to minimal regression tests.")
+    parser.add_argument("paths", nargs="+", help="Crash/image JSON files or directories of them")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Parallel simulator processes")
+    parser.add_argument("--any-error", action="store_true",
+                        help="Accept candidates that fail any comparison, not only the original one")
+    parser.add_argument("--outdir", help=f"Output directory (default $MINIMIZE_DIR, {MINIMIZE_DIR})")
+    parser.add_argument("--append", action="store_true", help="Append the regression test to the core's test module")
+    parser.add_argument("make_args", nargs="*", help="Extra VAR=value arguments passed to make")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files += sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+    outdir = os.path.abspath(args.outdir or MINIMIZE_DIR)
+    oracles = {}
+    status = 0
+    for path in files:
+        isa, name, imem, dmem, max_cycles, error = load_image(path)
+        if isa not in oracles:
+            os.makedirs(outdir, exist_ok=True)
+            runs = tempfile.mkdtemp(prefix=f"{isa}_", dir=outdir)
+            oracles[isa] = RtlOracle(isa, args.jobs, runs, args.make_args)
+        print(f"{path}: {isa}, {len(imem)} instruction(s), {len(dmem)} data word(s)")
+        minimizer = Minimizer(isa, imem, dmem, max_cycles, oracles[isa], error, not args.any_error)
+        try:
+            result = minimizer.run()
+        except ValueError as e:
+            print(f"  skipped: {e}")
+            status = 1
+            continue
+        test_path, module = write_outputs(isa, result, max_cycles, os.path.basename(path), args.outdir, args.append)
+        if not result.reproduced:
+            print("  minimization failed: the minimized image did not fail again on the RTL")
+            status = 1
+        print(f"  -> {len(result.imem)} instruction(s), {len(result.dmem)} data word(s) in {result.seconds:.1f}s; "
+              f"{result.candidates} candidates, {result.rtl_runs} on the RTL. Test: {test_path}"
+              + (f" (appended to {module})" if module else ""))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
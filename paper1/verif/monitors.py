@@ -0,0 +1,208 @@
+"""
+Transaction-level monitors for the processor testbenches.
+
+A monitor samples its signals once per clock, at ReadOnly after the clock
+edge (when every signal has settled for that time step), turns the samples
+into transactions and publishes them to its subscribers. Scoreboards,
+coverage collectors and trace writers all subscribe to the same monitor,
+so the DUT is sampled once per cycle no matter how many consumers there are.
+
+    monitor = lev8_retire_monitor(dut)
+    monitor.subscribe(Scoreboard(iss.step, log=dut._log))
+    monitor.subscribe(lambda txn: cov.sample(opcode=txn.instr >> 12))
+    monitor.start()
+    await monitor.wait_for(lambda txn: txn.next_pc == 0, max_transactions=100)
+"""
+import cocotb
+from cocotb.triggers import Event, FallingEdge, ReadOnly, RisingEdge
+
+from verif.lev8_iss import Lev8Retire
+from verif.riscv_iss import RiscvRetire
+
+
+def resolve(handle):
+    """Integer value of a signal handle, or None while it holds X/Z bits."""
+    try:
+        return handle.value.integer
+    except ValueError:
+        return None
+
+
+class Monitor:
+    """
+    Samples `signals` (name -> handle) at ReadOnly after every `edge` of
+    `clk` and publishes a dict of name -> integer value (None for X/Z).
+    Cycles where `reset` equals `reset_active` are skipped.
+    """
+
+    def __init__(self, clk, signals, reset=None, reset_active=1, edge=RisingEdge, name="monitor"):
+        self.clk = clk
+        self.signals = dict(signals)
+        self.reset = reset
+        self.reset_active = reset_active
+        self.edge = edge
+        self.name = name
+        self.subscribers = []
+        self.cycle = 0
+        self.count = 0
+        self._waiters = []
+        self._task = None
+
+    def subscribe(self, callback):
+        """Call `callback(transaction)` for every transaction, in subscription order."""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def start(self):
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def in_reset(self):
+        return self.reset is not None and resolve(self.reset) == self.reset_active
+
+    def sample(self):
+        return {name: resolve(handle) for name, handle in self.signals.items()}
+
+    def transaction(self, sample):
+        """Turn one sample into a transaction (or None to publish nothing)."""
+        return sample
+
+    def on_reset(self):
+        pass
+
+    def publish(self, txn):
+        self.count += 1
+        for callback in self.subscribers:
+            callback(txn)
+        for waiter in list(self._waiters):
+            predicate, event, limit = waiter
+            if predicate(txn) or (limit is not None and self.count >= limit):
+                event.set(txn)
+                self._waiters.remove(waiter)
+
+    async def wait_for(self, predicate, max_transactions=None):
+        """
+        Wait until a published transaction satisfies `predicate` and return
+        it. With `max_transactions`, give up after that many more
+        transactions and raise AssertionError.
+        """
+        limit = None if max_transactions is None else self.count + max_transactions
+        event = Event(f"{self.name}.wait_for")
+        self._waiters.append((predicate, event, limit))
+        await event.wait()
+        if not predicate(event.data):
+            raise AssertionError(f"{self.name}: condition not reached within {max_transactions} transactions")
+        return event.data
+
+    async def _run(self):
+        edge = self.edge(self.clk)
+        readonly = ReadOnly()
+        while True:
+            await edge
+            await readonly
+            self.cycle += 1
+            if self.in_reset():
+                self.on_reset()
+                continue
+            txn = self.transaction(self.sample())
+            if txn is not None:
+                self.publish(txn)
+
+
+class RetireMonitor(Monitor):
+    """
+    Builds one retired-instruction transaction per cycle of a single-cycle
+    core from two consecutive samples: the instruction, PC and datapath
+    values seen while it executes, and the PC/state seen after it retired.
+    `build(before, after)` returns the transaction.
+
+    The processor monitors sample on the falling edge: mid-cycle every
+    combinational value of the executing instruction has settled, and a
+    reset released between rising edges (as the RISC testbench does) is
+    seen before the first instruction retires.
+    """
+
+    def __init__(self, clk, signals, build, reset=None, reset_active=1, edge=FallingEdge, name="retire"):
+        super().__init__(clk, signals, reset, reset_active, edge, name)
+        self.build = build
+        self._before = None
+
+    def on_reset(self):
+        self._before = None
+
+    def transaction(self, sample):
+        before, self._before = self._before, sample
+        if before is None:
+            return None
+        return self.build(before, sample)
+
+
+def lev8_retire_monitor(dut):
+    """Retire monitor for Lev8SingleCycleProcessor; publishes Lev8Retire tuples."""
+    def build(before, after):
+        return Lev8Retire(before["pc"], before["instr"], before["alu_result"],
+                          before["reg_write_data"], after["pc"])
+
+    return RetireMonitor(dut.clk, {
+        "pc": dut.debug_pc_out,
+        "instr": dut.debug_instruction_out,
+        "alu_result": dut.debug_alu_result,
+        "reg_write_data": dut.debug_reg_write_data,
+    }, build, reset=dut.rst, reset_active=1, name="lev8_retire")
+
+
+def riscv_retire_monitor(dut):
+    """Retire monitor for RISC_Processor; publishes RiscvRetire tuples."""
+    def build(before, after):
+        return RiscvRetire(before["pc"], before["instr"], after["pc"], after["x10"], after["x11"])
+
+    return RetireMonitor(dut.clk, {
+        "pc": dut.debug_pc,
+        "instr": dut.debug_instr,
+        "x10": dut.debug_reg_x10,
+        "x11": dut.debug_reg_x11,
+    }, build, reset=dut.rst_n, reset_active=0, name="riscv_retire")
+
+
+class Scoreboard:
+    """
+    Subscriber that compares every DUT transaction with the next one from
+    `expected` (typically an ISS's step method). Fields that are None in the
+    expected transaction are not compared. A mismatch raises AssertionError
+    immediately, which fails the test at the failing cycle.
+    """
+
+    def __init__(self, expected, fields=None, log=None, name="scoreboard"):
+        self.expected = expected
+        self.fields = fields
+        self.log = log
+        self.name = name
+        self.matched = 0
+
+    def __call__(self, txn):
+        exp = self.expected()
+        fields = self.fields or txn._fields
+        mismatches = [
+            f"{field}: DUT={_fmt(getattr(txn, field))} expected={_fmt(getattr(exp, field))}"
+            for field in fields
+            if getattr(exp, field) is not None and getattr(txn, field) != getattr(exp, field)
+        ]
+        if mismatches:
+            raise AssertionError(f"{self.name}: transaction {self.matched} mismatch "
+                                 f"({'; '.join(mismatches)})\n  DUT:      {txn}\n  expected: {exp}")
+        self.matched += 1
+        if self.log is not None:
+            self.log.debug(f"{self.name}: {txn}")
+
+
+def _fmt(value):
+    return "X" if value is None else hex(value)
@@ -0,0 +1,139 @@
+"""
+N cores per simulation.
+
+Every simulator run pays a fixed start-up cost (Verilator model, Python
+interpreter, cocotb scheduler) whatever the program length. The multi-core
+tops amortize it: `generate` writes a wrapper with NUM_CORES instances of a
+core (core0, core1, ...) on one shared clock and reset, each with its own
+instruction and data memories, so one run checks NUM_CORES programs.
+
+The Makefiles generate the wrapper on demand, so a run is just:
+
+    make -C LegV8SingleCycleProcessor-cocob2 TOPLEVEL=Lev8MultiTop MODULE=test_Lev8MultiTop NUM_CORES=16
+
+`sweep` builds and runs the multi-core test for several N and reports the
+throughput of each, to find the best N for a machine:
+
+    python -m verif.multicore sweep --core lev8 --cores 1 2 4 8 16 32
+    python -m verif.multicore generate --core riscv --cores 8 --output RISCMultiTop.sv
+"""
+import argparse
+import os
+import sys
+from collections import namedtuple
+
+from verif import sweep as seed_sweep
+
+NUM_CORES = int(os.environ.get("NUM_CORES", "4"))
+MULTI_CYCLES = int(os.environ.get("MULTI_CYCLES", "2000"))
+
+CoreSpec = namedtuple("CoreSpec", "module top dir test clock reset outputs")
+
+CORES = {
+    "lev8": CoreSpec(
+        "Lev8SingleCycleProcessor", "Lev8MultiTop", "LegV8SingleCycleProcessor-cocob2",
+        "test_Lev8MultiTop", "clk", "rst",
+        ["debug_pc_out", "debug_instruction_out", "debug_alu_result", "debug_reg_write_data"],
+    ),
+    "riscv": CoreSpec(
+        "RISC_Processor", "RISCMultiTop", "RISC_Processor-cocotb-passed",
+        "test_RISCMultiTop", "clk", "rst_n",
+        ["debug_pc", "debug_instr", "debug_reg_x10", "debug_reg_x11", "debug_reg_write_en",
+         "debug_alu_op", "debug_immediate"],
+    ),
+}
+
+MultiResult = namedtuple("MultiResult", "cores seconds passed core_cycles_per_s programs_per_s")
+
+
+def generate(core, n):
+    """SystemVerilog source of the `n`-core wrapper for `core` (a CORES key)."""
+    spec = CORES[core]
+    lines = [
+        "//",
+        f"// File: {spec.top}.sv",
+        f"// Description: {n} x {spec.module} on one clock and reset.",
+        "//   Generated by verif/multicore.py - do not edit.",
+        "//",
+        f"module {spec.top} (",
+        f"  input logic {spec.clock},",
+        f"  input logic {spec.reset}",
+        ");",
+        "",
+    ]
+    for i in range(n):
+        ports = [f".{spec.clock}({spec.clock})", f".{spec.reset}({spec.reset})"]
+        ports += [f".{name}()" for name in spec.outputs]
+        lines.append(f"  {spec.module} core{i} (")
+        lines.append(",\n".join(f"    {port}" for port in ports))
+        lines.append("  );")
+        lines.append("")
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+
+def write_wrapper(core, n, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(generate(core, n))
+
+
+def cores(dut, n=None):
+    """Handles of the core instances of a multi-core top."""
+    return [getattr(dut, f"core{i}") for i in range(NUM_CORES if n is None else n)]
+
+
+def sweep(core, counts, cycles, outdir, seed=1, extra=(), log=print):
+    """Build and run the multi-core test for every N in `counts`; returns [MultiResult]."""
+    spec = CORES[core]
+    results = []
+    for n in counts:
+        sim_build = f"sim_build_multi_{n}"
+        run_dir = os.path.join(outdir, spec.dir, f"cores_{n}")
+        os.makedirs(run_dir, exist_ok=True)
+        make_extra = [f"NUM_CORES={n}", *extra]
+        seed_sweep.build(spec.dir, spec.test, spec.top, sim_build, make_extra,
+                         log_file=os.path.join(run_dir, "build.log"))
+        env = dict(os.environ, MULTI_CYCLES=str(cycles))
+        result = seed_sweep.run_seed(spec.dir, spec.test, spec.top, seed, run_dir,
+                                     sim_build=sim_build, extra=make_extra, env=env)
+        seconds = result.seconds or float("inf")
+        programs = n * len(result.tests)
+        multi = MultiResult(n, result.seconds, not result.failures,
+                            n * cycles * len(result.tests) / seconds, programs / seconds)
+        log(f"  N={n:<4} {result.seconds:7.2f}s  {multi.core_cycles_per_s:14,.0f} core-cycles/s  "
+            f"{multi.programs_per_s:8.2f} programs/s  {'pass' if multi.passed else 'FAIL'}")
+        results.append(multi)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and benchmark multi-core simulation tops.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="Write an N-core wrapper")
+    gen.add_argument("--core", choices=sorted(CORES), required=True)
+    gen.add_argument("--cores", "-n", type=int, default=NUM_CORES)
+    gen.add_argument("--output", "-o", required=True)
+    bench = sub.add_parser("sweep", help="Measure throughput over several N")
+    bench.add_argument("--core", choices=sorted(CORES), required=True)
+    bench.add_argument("--cores", "-n", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    bench.add_argument("--cycles", type=int, default=MULTI_CYCLES, help="MULTI_CYCLES per run")
+    bench.add_argument("--seed", type=int, default=1)
+    bench.add_argument("--outdir", default="multicore")
+    bench.add_argument("make_args", nargs="*", help="Extra VAR=value arguments passed to make")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        write_wrapper(args.core, args.cores, args.output)
+        return 0
+    print(f"{args.core}: {args.cycles} cycles per run, N = {' '.join(map(str, args.cores))}")
+    results = sweep(args.core, args.cores, args.cycles, args.outdir, args.seed, args.make_args)
+    passing = [r for r in results if r.passed]
+    if passing:
+        best = max(passing, key=lambda r: r.core_cycles_per_s)
+        print(f"Best throughput at N={best.cores}: {best.core_cycles_per_s:,.0f} core-cycles/s")
+    return 0 if len(passing) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Opt-in per-test simulation profiling.
+
+Decorate a test with ``@profiled`` (below ``@cocotb.test()``). Unless
+SIM_PROFILE=1 is set the decorator returns the test unchanged, so it costs
+nothing in normal regressions. With profiling on, each test writes a JSON
+record to $PROFILE_DIR (default ``./profile``) with:
+
+- wall time, simulated time, simulated cycles and cycles per second
+  (cycles are sim time / PROFILE_CLOCK_NS, default 10 ns, the period all
+  testbenches here use);
+- how often each trigger type was awaited (Timer, RisingEdge, FallingEdge,
+  ClockCycles, ReadOnly, ...), counted by wrapping the trigger __await__.
+  Only the trigger the testbench awaits counts: the RisingEdges a
+  ClockCycles waits on internally are part of that one ClockCycles;
+- the wall time spent running testbench Python between awaits, which
+  separates reference-model cost from simulator plus scheduler cost;
+- with PROFILE_SAMPLE_HZ set, a sampled Python stack profile attributing
+  time to testbench functions. Samples where the main thread has no Python
+  frame are time spent inside the simulator itself.
+
+Aggregate the records of a run (the sweep runner does this with --profile):
+
+    python -m verif.profiling profile/ --top 15
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+import cocotb
+from cocotb.triggers import Trigger
+from cocotb.utils import get_sim_time
+
+try:
+    from cocotb.triggers import Waitable
+except ImportError:  # pragma: no cover - older cocotb
+    Waitable = None
+
+PROFILE_ENABLED = os.environ.get("SIM_PROFILE", "0") not in ("", "0")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profile")
+PROFILE_CLOCK_NS = float(os.environ.get("PROFILE_CLOCK_NS", 10))
+PROFILE_SAMPLE_HZ = float(os.environ.get("PROFILE_SAMPLE_HZ", 0))
+
+_COCOTB_DIR = os.path.dirname(cocotb.__file__)
+_active = None
+
+
+class _TestStats:
+    def __init__(self):
+        self.triggers = Counter()
+        self.python_seconds = 0.0
+        self.resumed = time.perf_counter()
+
+    def close_slice(self):
+        if self.resumed is not None:
+            self.python_seconds += time.perf_counter() - self.resumed
+            self.resumed = None
+
+
+def _counting_await(original):
+    @functools.wraps(original)
+    def __await__(self):
+        stats = _active
+        if stats is not None and _awaited_by_trigger(sys._getframe(1), __await__.__code__):
+            # e.g. a RisingEdge inside ClockCycles: the outer trigger accounts for it
+            return (yield from original(self))
+        if stats is not None:
+            stats.close_slice()
+            stats.triggers[type(self).__name__] += 1
+        result = yield from original(self)
+        if _active is not None and _active.resumed is None:
+            _active.resumed = time.perf_counter()
+        return result
+    return __await__
+
+
+def _awaited_by_trigger(frame, code):
+    """True if a counting __await__ (`code`) is on the stack above `frame`."""
+    while frame is not None:
+        if frame.f_code is code:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def _install_hooks():
+    originals = [(Trigger, Trigger.__await__)]
+    if Waitable is not None:
+        originals.append((Waitable, Waitable.__await__))
+    for cls, original in originals:
+        cls.__await__ = _counting_await(original)
+    return originals
+
+
+def _remove_hooks(originals):
+    for cls, original in originals:
+        cls.__await__ = original
+
+
+class StackSampler:
+    """
+    Background thread sampling the main thread's Python stack at `hz`.
+    Counts are per function ("file:function"): `self` when it is the
+    innermost testbench frame, `cumulative` when anywhere on the stack.
+    """
+
+    def __init__(self, hz, thread_id=None):
+        self.interval = 1.0 / hz
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.total = 0
+        self.in_simulator = 0
+        self.in_cocotb = 0
+        self.self_counts = Counter()
+        self.cumulative = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            self.total += 1
+            if frame is None:
+                self.in_simulator += 1
+                continue
+            seen = set()
+            innermost = None
+            while frame is not None:
+                code = frame.f_code
+                if not code.co_filename.startswith(_COCOTB_DIR):
+                    key = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                    if innermost is None:
+                        innermost = key
+                    if key not in seen:
+                        seen.add(key)
+                        self.cumulative[key] += 1
+                frame = frame.f_back
+            if innermost is None:
+                self.in_cocotb += 1
+            else:
+                self.self_counts[innermost] += 1
+
+    def to_dict(self):
+        return {
+            "interval_seconds": self.interval,
+            "total": self.total,
+            "in_simulator": self.in_simulator,
+            "in_cocotb": self.in_cocotb,
+            "functions": {
+                key: {"self": self.self_counts[key], "cumulative": count}
+                for key, count in self.cumulative.most_common()
+            },
+        }
+
+
+def profiled(test=None, clock_period_ns=None):
+    """Decorator recording a profile record for one cocotb test (see module docstring)."""
+    if test is None:
+        return functools.partial(profiled, clock_period_ns=clock_period_ns)
+    if not PROFILE_ENABLED:
+        return test
+    period = clock_period_ns or PROFILE_CLOCK_NS
+
+    @functools.wraps(test)
+    async def wrapper(dut, *args, **kwargs):
+        global _active
+        originals = _install_hooks()
+        stats = _active = _TestStats()
+        sampler = StackSampler(PROFILE_SAMPLE_HZ).start() if PROFILE_SAMPLE_HZ > 0 else None
+        sim_start = get_sim_time("ns")
+        wall_start = time.perf_counter()
+        passed = False
+        try:
+            result = await test(dut, *args, **kwargs)
+            passed = True
+            return result
+        finally:
+            stats.close_slice()
+            wall = time.perf_counter() - wall_start
+            _active = None
+            _remove_hooks(originals)
+            if sampler is not None:
+                sampler.stop()
+            sim_ns = get_sim_time("ns") - sim_start
+            cycles = sim_ns / period
+            record = {
+                "module": test.__module__,
+                "test": test.__name__,
+                "passed": passed,
+                "wall_seconds": wall,
+                "sim_time_ns": sim_ns,
+                "sim_cycles": cycles,
+                "cycles_per_second": cycles / wall if wall > 0 else 0.0,
+                "python_seconds": stats.python_seconds,
+                "triggers": dict(stats.triggers),
+                "stack_samples": sampler.to_dict() if sampler is not None else None,
+            }
+            save_record(record)
+            dut._log.info(f"Profile: {wall:.3f}s wall, {sim_ns:.0f} ns sim, "
+                          f"{record['cycles_per_second']:.0f} cycles/s, "
+                          f"{stats.python_seconds:.3f}s in testbench Python, triggers {dict(stats.triggers)}")
+
+    return wrapper
+
+
+def save_record(record, directory=None):
+    directory = directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{record['module']}.{record['test']}.{os.getpid()}.{uuid.uuid4().hex[:8]}.json")
+    with open(path, "w") as f:
+        json.dump(record, f, indent=1)
+    return path
+
+
+def load_records(paths):
+    records = []
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+        for name in files:
+            with open(name) as f:
+                records.append(json.load(f))
+    return records
+
+
+def aggregate(records):
+    """Sum the records per (module, test). Returns a dict keyed by "module.test"."""
+    totals = {}
+    for r in records:
+        key = f"{r['module']}.{r['test']}"
+        t = totals.setdefault(key, {
+            "runs": 0, "failed": 0, "wall_seconds": 0.0, "sim_time_ns": 0.0, "sim_cycles": 0.0,
+            "python_seconds": 0.0, "triggers": Counter(), "samples": Counter(), "samples_total": 0,
+            "samples_in_simulator": 0,
+        })
+        t["runs"] += 1
+        t["failed"] += not r["passed"]
+        for field in ("wall_seconds", "sim_time_ns", "sim_cycles", "python_seconds"):
+            t[field] += r[field]
+        t["triggers"].update(r["triggers"])
+        stacks = r.get("stack_samples")
+        if stacks:
+            t["samples_total"] += stacks["total"]
+            t["samples_in_simulator"] += stacks["in_simulator"]
+            t["samples"].update({k: v["self"] for k, v in stacks["functions"].items()})
+    return totals
+
+
+def format_summary(totals, top=10):
+    lines = [f"{'test':<50} {'runs':>4} {'wall s':>8} {'py %':>6} {'cycles/s':>10}  triggers"]
+    for key, t in sorted(totals.items(), key=lambda kv: -kv[1]["wall_seconds"]):
+        wall = t["wall_seconds"]
+        rate = t["sim_cycles"] / wall if wall > 0 else 0.0
+        py = 100.0 * t["python_seconds"] / wall if wall > 0 else 0.0
+        triggers = ", ".join(f"{name}={count}" for name, count in t["triggers"].most_common())
+        lines.append(f"{key:<50} {t['runs']:>4} {wall:>8.2f} {py:>6.1f} {rate:>10.0f}  {triggers}")
+        if t["samples_total"]:
+            sim_pct = 100.0 * t["samples_in_simulator"] / t["samples_total"]
+            lines.append(f"    stack samples: {t['samples_total']} ({sim_pct:.1f}% in simulator)")
+            for name, count in t["samples"].most_common(top):
+                lines.append(f"      {100.0 * count / t['samples_total']:5.1f}%  {name}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate per-test simulation profile records.")
+    parser.add_argument("paths", nargs="*", default=[PROFILE_DIR], help="Record files or directories")
+    parser.add_argument("--top", type=int, default=10, help="Hot functions listed per test")
+    parser.add_argument("--output", "-o", help="Write the aggregated totals to this JSON file")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.paths)
+    if not records:
+        print("No profile records found.")
+        return 1
+    totals = aggregate(records)
+    print(format_summary(totals, args.top))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(totals, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
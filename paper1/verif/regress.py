@@ -0,0 +1,167 @@
+"""
+Full regression runner with history-aware scheduling.
+
+Discovers every cocotb module in the processor directories (test_<Top>.py
+tests the HDL module <Top>, kept as <Top>.sv or generated by the Makefile,
+see GENERATED_TOPS), estimates each module's run time from the
+results database (verif/results_db.py) and runs them on a pool of workers:
+
+- modules that failed in their recent runs go first, so a broken change is
+  reported within the first minutes;
+- the rest start longest first (LPT), which keeps the pool busy until the
+  end instead of leaving one long test running alone;
+- with --shards N --shard I the modules are split into N groups of
+  balanced estimated run time (greedy LPT) and only group I runs, for
+  spreading a regression over several machines.
+
+Every module builds into its own SIM_BUILD (sim_build_<Top>), so modules of
+the same directory can run in parallel. Results are appended to the
+database.
+
+    python -m verif.regress -j 8
+    python -m verif.regress --shards 4 --shard 0 --dry-run
+    python -m verif.regress --changed origin/main    # only tests affected by the diff
+"""
+import argparse
+import glob
+import heapq
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from verif import multicore, results_db, sweep
+
+# Directories (relative to paper1/) with a cocotb Makefile
+TEST_DIRS = ["LegV8SingleCycleProcessor-cocob2", "RISC_Processor-cocotb-passed", "legv8_multicycle_uart",
+             "LEGv8_Pipelined_Processor"]
+# Estimate for a module with no history; large, so new tests are scheduled early
+UNKNOWN_SECONDS = 120.0
+# Tops the Makefiles generate into generated/ instead of keeping as <Top>.sv:
+# toplevel -> (directory, generator script, the module it instantiates)
+GENERATED_TOPS = {spec.top: (spec.dir, os.path.abspath(multicore.__file__), spec.module)
+                  for spec in multicore.CORES.values()}
+
+Job = namedtuple("Job", "dir module toplevel estimate recent_failures")
+
+
+def discover(dirs=None, root=None):
+    """Yield (dir, module, toplevel) for every test_<Top>.py with a <Top>.sv next to it or in GENERATED_TOPS."""
+    root = root or os.getcwd()
+    for directory in dirs or TEST_DIRS:
+        path = os.path.join(root, directory)
+        for test in sorted(glob.glob(os.path.join(path, "test_*.py"))):
+            module = os.path.splitext(os.path.basename(test))[0]
+            toplevel = module[len("test_"):]
+            generated = GENERATED_TOPS.get(toplevel, (None,))[0] == os.path.basename(os.path.normpath(path))
+            if generated or os.path.exists(os.path.join(path, toplevel + ".sv")):
+                yield os.path.relpath(path, root), module, toplevel
+
+
+def plan(modules, db, last=5):
+    """Attach run-time estimates and recent failure counts to the discovered modules."""
+    jobs = []
+    for directory, module, toplevel in modules:
+        mean, fails = results_db.module_history(db, directory, module, last)
+        jobs.append(Job(directory, module, toplevel, UNKNOWN_SECONDS if mean is None else mean, fails))
+    return order(jobs)
+
+
+def order(jobs):
+    """Recently failing modules first, then longest estimated run time first."""
+    return sorted(jobs, key=lambda j: (-j.recent_failures, -j.estimate, j.dir, j.module))
+
+
+def shard(jobs, shards):
+    """Split `jobs` into `shards` lists of balanced estimated time (greedy LPT)."""
+    bins = [(0.0, i, []) for i in range(shards)]
+    heapq.heapify(bins)
+    for job in sorted(jobs, key=lambda j: -j.estimate):
+        total, i, members = heapq.heappop(bins)
+        members.append(job)
+        heapq.heappush(bins, (total + job.estimate, i, members))
+    return [order(members) for _, _, members in sorted(bins, key=lambda b: b[1])]
+
+
+def run_job(job, seed, outdir, extra=(), env=None):
+    job_outdir = os.path.join(outdir, job.dir, job.module)
+    os.makedirs(job_outdir, exist_ok=True)
+    return sweep.run_seed(job.dir, job.module, job.toplevel, seed, job_outdir,
+                          sim_build=f"sim_build_{job.toplevel}", extra=extra, env=env)
+
+
+def run(jobs, jobs_parallel, seed, outdir, db=None, extra=(), env=None, log=print):
+    """Run `jobs` in the given order on a worker pool; returns [(job, SeedResult)]."""
+    results = []
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=jobs_parallel) as pool:
+        futures = {pool.submit(run_job, job, seed, outdir, extra, env): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            result = future.result()
+            if db is not None:
+                results_db.record(db, job.dir, job.module, job.toplevel, result, started)
+            status = "FAIL " + ",".join(result.failures) if result.failures else "pass"
+            log(f"  {job.dir}/{job.module:<32} {status:<8} {result.seconds:7.1f}s (est {job.estimate:.1f}s)")
+            results.append((job, result))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the cocotb regression, scheduled by past run times.")
+    parser.add_argument("--dirs", nargs="+", default=TEST_DIRS, help="Test directories to include")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Parallel simulator processes")
+    parser.add_argument("--seed", type=int, help="RANDOM_SEED for every module (default: random)")
+    parser.add_argument("--shards", type=int, default=1, help="Split the regression into this many shards")
+    parser.add_argument("--shard", type=int, default=0, help="Shard to run (0-based)")
+    parser.add_argument("--db", default=results_db.RESULTS_DB, help="Results database")
+    parser.add_argument("--outdir", default="regress", help="Logs and results files")
+    parser.add_argument("--changed", metavar="REV", nargs="?", const="HEAD",
+                        help="Only run tests affected by files changed since git REV (default HEAD)")
+    parser.add_argument("--files", nargs="+", default=[], help="Only run tests affected by these files")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the schedule")
+    parser.add_argument("make_args", nargs="*", help="Extra VAR=value arguments passed to make")
+    args = parser.parse_args(argv)
+
+    db = results_db.connect(args.db)
+    modules = list(discover(args.dirs))
+    if args.changed or args.files:
+        from verif import depgraph
+        modules, unknown = depgraph.impacted(args.files, args.dirs)
+        if unknown:
+            print(f"Not a dependency of any test: {', '.join(unknown)}", file=sys.stderr)
+            return 1
+        changed = list(args.files)
+        if args.changed:
+            # Files of the diff that no test depends on (docs, tools) simply select nothing
+            changed += depgraph.git_changed(args.changed)
+            modules = sorted(set(modules) | set(depgraph.impacted(changed, args.dirs)[0]))
+        print(f"{len(changed)} changed file(s) affect {len(modules)} module(s).")
+    jobs = plan(modules, db)
+    if args.shards > 1:
+        jobs = shard(jobs, args.shards)[args.shard]
+    total = sum(j.estimate for j in jobs)
+    print(f"{len(jobs)} module(s), estimated {total:.0f}s serial / "
+          f"{total / max(1, min(args.jobs, len(jobs) or 1)):.0f}s on {args.jobs} worker(s)")
+    if args.dry_run:
+        for job in jobs:
+            flag = f"  [failed {job.recent_failures}x recently]" if job.recent_failures else ""
+            print(f"  {job.estimate:8.1f}s  {job.dir}/{job.module}{flag}")
+        return 0
+
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(1 << 31)
+    print(f"RANDOM_SEED={seed}")
+    start = time.monotonic()
+    results = run(jobs, args.jobs, seed, args.outdir, db, args.make_args)
+    failing = [(job, r) for job, r in results if r.failures]
+    print(f"{len(results) - len(failing)}/{len(results)} module(s) passed in {time.monotonic() - start:.1f}s.")
+    for job, r in failing:
+        for test in r.failures:
+            print(f"  FAIL {sweep.replay_line(job.dir, job.module, job.toplevel, seed, test, args.make_args)}")
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Local SQLite store of regression results and timings.
+
+Every run made through verif.sweep or verif.regress appends one row per
+test: directory, module, test, seed, a hash of the RTL it ran against,
+duration, pass/fail, simulated time and cycles. The scheduler in
+verif.regress reads the history back to order and shard work.
+
+The database lives at $RESULTS_DB (default ``results.db`` in the current
+directory). Results of a plain ``make`` run can be added by hand:
+
+    python -m verif.results_db record --dir RISC_Processor-cocotb-passed \\
+        --module test_ALU --toplevel ALU --seed 1234 RISC_Processor-cocotb-passed/results.xml
+    python -m verif.results_db show
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+RESULTS_DB = os.environ.get("RESULTS_DB", "results.db")
+CLOCK_PERIOD_NS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    started     REAL NOT NULL,
+    dir         TEXT NOT NULL,
+    module      TEXT NOT NULL,
+    toplevel    TEXT NOT NULL,
+    test        TEXT NOT NULL,
+    seed        INTEGER,
+    rtl_hash    TEXT,
+    duration    REAL NOT NULL,
+    passed      INTEGER NOT NULL,
+    sim_time_ns REAL,
+    sim_cycles  REAL
+);
+CREATE INDEX IF NOT EXISTS results_module ON results (dir, module, started);
+"""
+
+
+def connect(path=None):
+    db = sqlite3.connect(path or RESULTS_DB, timeout=30)
+    db.executescript(_SCHEMA)
+    return db
+
+
+def filelist(workdir):
+    """RTL files of a cocotb directory, as listed in its filelist.f."""
+    path = os.path.join(workdir, "filelist.f")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        names = [line.strip() for line in f if line.strip() and not line.startswith(("#", "//"))]
+    return [os.path.join(workdir, name) for name in names]
+
+
+def rtl_hash(workdir):
+    """Short hash over the contents of every file in `workdir`'s filelist.f."""
+    digest = hashlib.sha1()
+    for path in sorted(filelist(workdir)):
+        digest.update(os.path.basename(path).encode())
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def _dir_key(workdir):
+    return os.path.basename(os.path.abspath(workdir))
+
+
+def record(db, workdir, module, toplevel, seed_result, started=None, rtl=None):
+    """
+    Append the per-test results of one simulator run (a verif.sweep SeedResult).
+    A run that produced no results.xml entries is stored as one failed row
+    for the whole module, so crashes count as recent failures too.
+    """
+    started = started or time.time()
+    rtl = rtl or rtl_hash(workdir)
+    rows = [
+        (started, _dir_key(workdir), module, toplevel, t.name, seed_result.seed, rtl,
+         t.seconds, int(t.passed), t.sim_time_ns, t.sim_time_ns / CLOCK_PERIOD_NS)
+        for t in seed_result.tests
+    ]
+    if not rows:
+        rows.append((started, _dir_key(workdir), module, toplevel, "*", seed_result.seed, rtl,
+                     seed_result.seconds, 0, None, None))
+    with db:
+        db.executemany(
+            "INSERT INTO results (started, dir, module, toplevel, test, seed, rtl_hash, duration, "
+            "passed, sim_time_ns, sim_cycles) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def module_history(db, workdir, module, last=5):
+    """
+    Return (mean wall seconds per run, number of failed runs) over the
+    `last` recorded runs of `module`, or (None, 0) if it never ran.
+    A run is all rows sharing one start time.
+    """
+    runs = db.execute(
+        "SELECT SUM(duration), MIN(passed) FROM results WHERE dir = ? AND module = ? "
+        "GROUP BY started ORDER BY started DESC LIMIT ?",
+        (_dir_key(workdir), module, last)).fetchall()
+    if not runs:
+        return None, 0
+    return sum(r[0] for r in runs) / len(runs), sum(1 for r in runs if not r[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and inspect regression results.")
+    parser.add_argument("--db", default=RESULTS_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Add the results.xml of a finished run")
+    rec.add_argument("--dir", default=".")
+    rec.add_argument("--module", required=True)
+    rec.add_argument("--toplevel", required=True)
+    rec.add_argument("--seed", type=int)
+    rec.add_argument("results_xml")
+    show = sub.add_parser("show", help="Per-module duration and failure summary")
+    show.add_argument("--last", type=int, default=5, help="Runs per module to average over")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.command == "record":
+        from verif.sweep import SeedResult, parse_results
+        tests = parse_results(args.results_xml)
+        result = SeedResult(args.seed, tests, [t.name for t in tests if not t.passed],
+                            sum(t.seconds for t in tests), args.results_xml, None)
+        print(f"Recorded {record(db, args.dir, args.module, args.toplevel, result)} result(s).")
+        return 0
+
+    rows = db.execute("SELECT DISTINCT dir, module FROM results ORDER BY dir, module").fetchall()
+    print(f"{'module':<60} {'mean s':>8} {'fails':>6}")
+    for directory, module in rows:
+        mean, fails = module_history(db, directory, module, args.last)
+        print(f"{directory + '/' + module:<60} {mean:>8.2f} {fails:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+RV32 instruction encoders for the RISC_Processor testbenches.
+
+Moved out of test_RISC_Processor.py so the processor test, the soak test
+and the program generators all share one set of encoders.
+"""
+
+# --- RISC-V ISA Constants (for instruction encoding) ---
+OP_R_TYPE = 0b0110011
+OP_I_TYPE_ARITH = 0b0010011
+OP_LOAD = 0b0000011
+OP_STORE = 0b0100011
+OP_BRANCH = 0b1100011
+OP_JAL = 0b1101111
+OP_JALR = 0b1100111
+OP_LUI = 0b0110111
+OP_AUIPC = 0b0010111
+FUNCT3_ADD_SUB_ADDI = 0b000
+FUNCT3_LW_SW = 0b010  # Correct funct3 for 32-bit LW/SW
+FUNCT3_BEQ = 0b000
+FUNCT7_ADD = 0b0000000
+FUNCT7_SUB = 0b0100000
+X0 = 0
+
+
+# --- Instruction Encoding Helper Functions ---
+def encode_r_type(opcode, rd, funct3, rs1, rs2, funct7):
+    return (funct7 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_i_type(opcode, rd, funct3, rs1, imm):
+    return ((imm & 0xFFF) << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_s_type(opcode, imm, funct3, rs1, rs2):
+    imm_11_5 = (imm >> 5) & 0x7F
+    imm_4_0 = imm & 0x1F
+    return (imm_11_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_0 << 7) | opcode
+
+def encode_b_type(opcode, imm, funct3, rs1, rs2):
+    imm_val = imm & 0x1FFF # 13-bit immediate
+    imm_12 = (imm_val >> 12) & 0x1
+    imm_11 = (imm_val >> 11) & 0x1
+    imm_10_5 = (imm_val >> 5) & 0x3F
+    imm_4_1 = (imm_val >> 1) & 0xF
+    return (imm_12 << 31) | (imm_10_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_1 << 8) | (imm_11 << 7) | opcode
+
+def encode_j_type(opcode, rd, imm):
+    imm_val = imm & 0x1FFFFF # 21-bit immediate
+    imm_20 = (imm_val >> 20) & 0x1
+    imm_10_1 = (imm_val >> 1) & 0x3FF
+    imm_11 = (imm_val >> 11) & 0x1
+    imm_19_12 = (imm_val >> 12) & 0xFF
+    return (imm_20 << 31) | (imm_10_1 << 21) | (imm_11 << 20) | (imm_19_12 << 12) | (rd << 7) | opcode
+
+
+# --- Mnemonic shorthands for the subset RISC_Processor executes ---
+def add(rd, rs1, rs2):
+    return encode_r_type(OP_R_TYPE, rd, FUNCT3_ADD_SUB_ADDI, rs1, rs2, FUNCT7_ADD)
+
+def sub(rd, rs1, rs2):
+    return encode_r_type(OP_R_TYPE, rd, FUNCT3_ADD_SUB_ADDI, rs1, rs2, FUNCT7_SUB)
+
+def addi(rd, rs1, imm):
+    return encode_i_type(OP_I_TYPE_ARITH, rd, FUNCT3_ADD_SUB_ADDI, rs1, imm)
+
+def lw(rd, rs1, imm):
+    return encode_i_type(OP_LOAD, rd, FUNCT3_LW_SW, rs1, imm)
+
+def sw(rs2, rs1, imm):
+    return encode_s_type(OP_STORE, imm, FUNCT3_LW_SW, rs1, rs2)
+
+def beq(rs1, rs2, imm):
+    return encode_b_type(OP_BRANCH, imm, FUNCT3_BEQ, rs1, rs2)
+
+def halt():
+    """JAL x0, 0: RISC_Processor holds the PC on JAL, so this stops the core."""
+    return encode_j_type(OP_JAL, X0, 0)
+
+
+# Instructions per iteration of countdown_program's inner loop
+INNER_LOOP_INSTRUCTIONS = 7
+
+
+def countdown_program(outer, inner):
+    """
+    Nested countdown: the inner loop adds its counter into a memory word and
+    walks the pointer x5 through all of data memory, so the run produces
+    steady load/store traffic until the final JAL halts the core.
+    """
+    return [
+        addi(1, X0, outer),   # 0x00: x1 = outer
+        addi(3, X0, -1),      # 0x04: x3 = -1
+        addi(2, X0, inner),   # 0x08: outer: x2 = inner
+        lw(4, 5, 0),          # 0x0C: inner: x4 = mem[x5]
+        add(4, 4, 2),         # 0x10: x4 += x2
+        sw(4, 5, 0),          # 0x14: mem[x5] = x4
+        addi(5, 5, 4),        # 0x18: x5 += 4 (wraps through the 1024 words)
+        add(2, 2, 3),         # 0x1C: x2 -= 1
+        beq(2, X0, 8),        # 0x20: inner done -> 0x28
+        beq(X0, X0, -24),     # 0x24: -> inner
+        add(1, 1, 3),         # 0x28: x1 -= 1
+        beq(1, X0, 8),        # 0x2C: outer done -> 0x34
+        beq(X0, X0, -40),     # 0x30: -> outer
+        halt(),               # 0x34: JAL x0, 0
+    ]
+
+
+def load_program(core, program, dmem=None):
+    """Backdoor-load `program` (and a full DMEM image, if given) into a RISC_Processor handle."""
+    for i, instr in enumerate(program):
+        core.instructionmemory_inst.mem[i].value = instr
+    for i, word in enumerate(dmem or ()):
+        core.datamemory_inst.mem[i].value = word
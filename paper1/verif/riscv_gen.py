@@ -0,0 +1,237 @@
+"""
+Constrained-random program generator for RISC_Processor.
+
+Programs use the subset the core executes (ADD, SUB, ADDI, LW, SW, BEQ and
+a JAL x0, 0 halt) and are valid by construction:
+
+- loads and stores address data memory through x0 (words 0..511) or x31,
+  which the prologue sets to 2048 (words 512..1023), with word-aligned
+  non-negative offsets, so every access lands inside the 1024-word DMEM;
+- random BEQs only branch forward, over 1-4 instructions of the same block;
+- loops are counted: x29 is loaded with the trip count, decremented at the
+  end of the body and tested with BEQ, and no other instruction writes it;
+- every program ends in the halt, and the first instruction is never a
+  store (it is decoded while reset is held).
+
+Programs are built as columns (kind, rd, rs1, rs2, imm) and encoded in one
+vectorized pass with NumPy when it is installed, falling back to the
+scalar encoders of verif/riscv_asm.py otherwise. `generate_batch` encodes
+a whole batch of programs at once.
+
+    python -m verif.riscv_gen --count 10000 --length 64 --seed 1
+    python -m verif.riscv_gen --count 20 --output programs/    # $readmemh files
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from verif import riscv_asm
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Instruction kinds (column values)
+ADD, SUB, ADDI, LW, SW, BEQ, HALT = range(7)
+
+# Registers with a fixed role; random destinations are x1..x28
+LOOP_REG = 29
+BASE_REG = 31
+BASE_VALUE = 2048
+DEST_REGS = range(1, 29)
+
+DMEM_WORDS = 1024
+IMEM_WORDS = 1024
+
+_OPCODE = [riscv_asm.OP_R_TYPE, riscv_asm.OP_R_TYPE, riscv_asm.OP_I_TYPE_ARITH, riscv_asm.OP_LOAD,
+           riscv_asm.OP_STORE, riscv_asm.OP_BRANCH, riscv_asm.OP_JAL]
+_FUNCT3 = [riscv_asm.FUNCT3_ADD_SUB_ADDI, riscv_asm.FUNCT3_ADD_SUB_ADDI, riscv_asm.FUNCT3_ADD_SUB_ADDI,
+           riscv_asm.FUNCT3_LW_SW, riscv_asm.FUNCT3_LW_SW, riscv_asm.FUNCT3_BEQ, 0]
+_FUNCT7 = [riscv_asm.FUNCT7_ADD, riscv_asm.FUNCT7_SUB, 0, 0, 0, 0, 0]
+
+
+class Program:
+    """One program as instruction columns; `words()` encodes it."""
+
+    def __init__(self):
+        self.kind, self.rd, self.rs1, self.rs2, self.imm = [], [], [], [], []
+
+    def __len__(self):
+        return len(self.kind)
+
+    def emit(self, kind, rd=0, rs1=0, rs2=0, imm=0):
+        self.kind.append(kind)
+        self.rd.append(rd)
+        self.rs1.append(rs1)
+        self.rs2.append(rs2)
+        self.imm.append(imm)
+
+    def columns(self):
+        return self.kind, self.rd, self.rs1, self.rs2, self.imm
+
+    def words(self):
+        return encode(*self.columns())
+
+
+def _encode_scalar(kind, rd, rs1, rs2, imm):
+    if kind in (ADD, SUB):
+        return riscv_asm.encode_r_type(_OPCODE[kind], rd, _FUNCT3[kind], rs1, rs2, _FUNCT7[kind])
+    if kind in (ADDI, LW):
+        return riscv_asm.encode_i_type(_OPCODE[kind], rd, _FUNCT3[kind], rs1, imm)
+    if kind == SW:
+        return riscv_asm.encode_s_type(_OPCODE[kind], imm, _FUNCT3[kind], rs1, rs2)
+    if kind == BEQ:
+        return riscv_asm.encode_b_type(_OPCODE[kind], imm, _FUNCT3[kind], rs1, rs2)
+    return riscv_asm.encode_j_type(_OPCODE[kind], rd, imm)
+
+
+def _encode_numpy(kind, rd, rs1, rs2, imm):
+    kind = np.asarray(kind, dtype=np.int64)
+    rd, rs1, rs2, imm = (np.asarray(c, dtype=np.int64) for c in (rd, rs1, rs2, imm))
+    opcode = np.asarray(_OPCODE, dtype=np.int64)[kind]
+    funct3 = np.asarray(_FUNCT3, dtype=np.int64)[kind] << 12
+    funct7 = np.asarray(_FUNCT7, dtype=np.int64)[kind] << 25
+    regs = (rs2 << 20) | (rs1 << 15)
+    r_type = funct7 | regs | funct3 | (rd << 7) | opcode
+    i_type = ((imm & 0xFFF) << 20) | (rs1 << 15) | funct3 | (rd << 7) | opcode
+    s_type = (((imm >> 5) & 0x7F) << 25) | regs | funct3 | ((imm & 0x1F) << 7) | opcode
+    b = imm & 0x1FFF
+    b_type = (((b >> 12) & 1) << 31) | (((b >> 5) & 0x3F) << 25) | regs | funct3 \
+        | (((b >> 1) & 0xF) << 8) | (((b >> 11) & 1) << 7) | opcode
+    j = imm & 0x1FFFFF
+    j_type = (((j >> 20) & 1) << 31) | (((j >> 1) & 0x3FF) << 21) | (((j >> 11) & 1) << 20) \
+        | (((j >> 12) & 0xFF) << 12) | (rd << 7) | opcode
+    words = np.select(
+        [kind <= SUB, (kind == ADDI) | (kind == LW), kind == SW, kind == BEQ],
+        [r_type, i_type, s_type, b_type], j_type)
+    return words.astype(np.uint32)
+
+
+def encode(kind, rd, rs1, rs2, imm):
+    """Encode instruction columns into a list of 32-bit words (vectorized with NumPy if available)."""
+    if np is not None:
+        return _encode_numpy(kind, rd, rs1, rs2, imm).tolist()
+    return [_encode_scalar(*fields) for fields in zip(kind, rd, rs1, rs2, imm)]
+
+
+class ProgramGenerator:
+    """
+    Draws programs of roughly `length` instructions from `rng` (a
+    random.Random). The weights choose between straight-line blocks, blocks
+    guarded by a forward BEQ and counted loops.
+    """
+
+    def __init__(self, rng, length=64, max_trip_count=8, weights=(6, 2, 1)):
+        self.rng = rng
+        self.length = min(length, IMEM_WORDS - 16)
+        self.max_trip_count = max_trip_count
+        self.weights = weights
+
+    def _memory_operand(self):
+        """(base register, byte offset) of a random in-range word."""
+        word = self.rng.randrange(DMEM_WORDS)
+        if word < DMEM_WORDS // 2:
+            return 0, word * 4
+        return BASE_REG, word * 4 - BASE_VALUE
+
+    def _straight(self, program):
+        rng = self.rng
+        choice = rng.randrange(10)
+        rd = rng.choice(DEST_REGS)
+        rs1, rs2 = rng.randrange(32), rng.randrange(32)
+        if choice < 3:
+            program.emit(ADDI, rd, rs1, imm=rng.randrange(-2048, 2048))
+        elif choice < 5:
+            program.emit(ADD, rd, rs1, rs2)
+        elif choice < 6:
+            program.emit(SUB, rd, rs1, rs2)
+        elif choice < 8:
+            base, offset = self._memory_operand()
+            program.emit(LW, rd, base, imm=offset)
+        else:
+            base, offset = self._memory_operand()
+            program.emit(SW, rs1=base, rs2=rs2, imm=offset)
+
+    def _forward_branch(self, program):
+        skip = self.rng.randrange(1, 5)
+        rs1, rs2 = self.rng.randrange(32), self.rng.randrange(32)
+        program.emit(BEQ, rs1=rs1, rs2=rs2, imm=4 * (skip + 1))
+        for _ in range(skip):
+            self._straight(program)
+
+    def _loop(self, program):
+        body = self.rng.randrange(1, 9)
+        program.emit(ADDI, LOOP_REG, 0, imm=self.rng.randrange(1, self.max_trip_count + 1))
+        for _ in range(body):
+            self._straight(program)
+        program.emit(ADDI, LOOP_REG, LOOP_REG, imm=-1)
+        program.emit(BEQ, rs1=LOOP_REG, rs2=0, imm=8)
+        program.emit(BEQ, rs1=0, rs2=0, imm=-4 * (body + 2))
+
+    def program(self):
+        """A new Program (columns, not yet encoded)."""
+        rng = self.rng
+        program = Program()
+        program.emit(ADDI, BASE_REG, 0, imm=BASE_VALUE // 2)
+        program.emit(ADD, BASE_REG, BASE_REG, BASE_REG)
+        for rd in rng.sample(DEST_REGS, 4):
+            program.emit(ADDI, rd, 0, imm=rng.randrange(-2048, 2048))
+        blocks = [self._straight, self._forward_branch, self._loop]
+        while len(program) < self.length:
+            rng.choices(blocks, self.weights)[0](program)
+        program.emit(HALT)
+        return program
+
+    def words(self):
+        return self.program().words()
+
+
+def generate_batch(count, length=64, seed=0, **kwargs):
+    """`count` programs as lists of words; the whole batch is encoded in one pass."""
+    generator = ProgramGenerator(random.Random(seed), length, **kwargs)
+    programs = [generator.program() for _ in range(count)]
+    columns = [[], [], [], [], []]
+    for program in programs:
+        for column, values in zip(columns, program.columns()):
+            column.extend(values)
+    words = encode(*columns)
+    result, start = [], 0
+    for program in programs:
+        result.append(words[start:start + len(program)])
+        start += len(program)
+    return result
+
+
+def write_hex(path, words):
+    """One 8-digit hex word per line, the $readmemh format of InstructionMemory.sv."""
+    with open(path, "w") as f:
+        f.write("".join(f"{w:08x}\n" for w in words))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate constrained-random RISC_Processor programs.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--length", type=int, default=64, help="Approximate instructions per program")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Directory for program_<n>.hex files")
+    args = parser.parse_args(argv)
+
+    start = time.monotonic()
+    programs = generate_batch(args.count, args.length, args.seed)
+    seconds = time.monotonic() - start
+    instructions = sum(len(p) for p in programs)
+    print(f"{len(programs)} programs, {instructions} instructions in {seconds:.3f}s "
+          f"({len(programs) / seconds if seconds else float('inf'):,.0f} programs/s, "
+          f"{'numpy' if np is not None else 'scalar'} encoding)")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        for i, words in enumerate(programs):
+            write_hex(os.path.join(args.output, f"program_{i}.hex"), words)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
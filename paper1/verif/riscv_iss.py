@@ -0,0 +1,133 @@
+"""
+Instruction-set simulator for RISC_Processor (RISC_Processor-cocotb-passed).
+
+It models the RTL, including where the RTL departs from RV32I:
+
+- funct3 is ignored: every OP is ADD/SUB (by funct7), every OP-IMM is ADDI,
+  every LOAD/STORE a word access and every BRANCH a BEQ;
+- data memory is word addressed with (rs1 + imm)[11:2], i.e. 1024 words;
+- JAL/JALR/LUI/AUIPC drive the ALU with XOR and a zero immediate (the
+  ImmediateGenerator has no U/J formats), so JAL and AUIPC write PC, LUI
+  writes rs1 and JALR writes rs1 ^ imm_i;
+- JAL and JALR select pc_next_sel 2'b10/2'b11, which the ProgramCounter
+  treats as "hold": the PC stays put and the instruction re-executes every
+  cycle. Tests use a JAL as a halt instruction for that reason.
+"""
+from collections import namedtuple
+
+XLEN_MASK = 0xFFFFFFFF
+NUM_REGS = 32
+IMEM_WORDS = 1024
+DMEM_WORDS = 1024
+
+OP_R_TYPE = 0b0110011
+OP_I_TYPE_ARITH = 0b0010011
+OP_LOAD = 0b0000011
+OP_STORE = 0b0100011
+OP_BRANCH = 0b1100011
+OP_JAL = 0b1101111
+OP_JALR = 0b1100111
+OP_LUI = 0b0110111
+OP_AUIPC = 0b0010111
+FUNCT7_SUB = 0b0100000
+
+# One retired instruction; x10/x11 are the values after it retired (the
+# registers RISC_Processor exposes on its debug ports).
+RiscvRetire = namedtuple("RiscvRetire", "pc instr next_pc x10 x11")
+
+
+def _sext(value, bits):
+    sign = 1 << (bits - 1)
+    return ((value & (sign - 1)) - (value & sign)) & XLEN_MASK
+
+
+def imm_i(instr):
+    return _sext(instr >> 20, 12)
+
+
+def imm_s(instr):
+    return _sext(((instr >> 25) << 5) | ((instr >> 7) & 0x1F), 12)
+
+
+def imm_b(instr):
+    value = (((instr >> 31) & 1) << 12) | (((instr >> 7) & 1) << 11) | \
+            (((instr >> 25) & 0x3F) << 5) | (((instr >> 8) & 0xF) << 1)
+    return _sext(value, 13)
+
+
+class RiscvISS:
+    """Architectural model of RISC_Processor. `imem` is a list of 32-bit words from address 0."""
+
+    def __init__(self, imem, dmem=None):
+        self.imem = list(imem)
+        self.reset(dmem)
+
+    def reset(self, dmem=None):
+        self.pc = 0
+        self.regs = [0] * NUM_REGS
+        self.dmem = [0] * DMEM_WORDS
+        for word, value in (dmem or {}).items():
+            self.dmem[word] = value & XLEN_MASK
+        self.retired = 0
+
+    def fetch(self, pc=None):
+        index = ((self.pc if pc is None else pc) >> 2) % IMEM_WORDS
+        return self.imem[index] if index < len(self.imem) else 0
+
+    def write_reg(self, rd, value):
+        if rd != 0:
+            self.regs[rd] = value & XLEN_MASK
+
+    def step(self):
+        """Execute one instruction and return its RiscvRetire record."""
+        pc = self.pc
+        instr = self.fetch()
+        opcode = instr & 0x7F
+        rd = (instr >> 7) & 0x1F
+        rs1 = self.regs[(instr >> 15) & 0x1F]
+        rs2 = self.regs[(instr >> 20) & 0x1F]
+        next_pc = (pc + 4) & XLEN_MASK
+
+        if opcode == OP_R_TYPE:
+            if (instr >> 25) == FUNCT7_SUB:
+                self.write_reg(rd, rs1 - rs2)
+            else:
+                self.write_reg(rd, rs1 + rs2)
+        elif opcode == OP_I_TYPE_ARITH:
+            self.write_reg(rd, rs1 + imm_i(instr))
+        elif opcode == OP_LOAD:
+            self.write_reg(rd, self.dmem[((rs1 + imm_i(instr)) >> 2) % DMEM_WORDS])
+        elif opcode == OP_STORE:
+            self.dmem[((rs1 + imm_s(instr)) >> 2) % DMEM_WORDS] = rs2
+        elif opcode == OP_BRANCH:
+            if rs1 == rs2:
+                next_pc = (pc + imm_b(instr)) & XLEN_MASK
+        elif opcode in (OP_JAL, OP_AUIPC):
+            self.write_reg(rd, pc)
+            if opcode == OP_JAL:
+                next_pc = pc
+        elif opcode == OP_JALR:
+            self.write_reg(rd, rs1 ^ imm_i(instr))
+            next_pc = pc
+        elif opcode == OP_LUI:
+            self.write_reg(rd, rs1)
+
+        self.pc = next_pc
+        self.retired += 1
+        return RiscvRetire(pc, instr, next_pc, self.regs[10], self.regs[11])
+
+    def halted(self):
+        """True when the next instruction is a JAL, which holds the PC forever."""
+        return self.fetch() & 0x7F == OP_JAL
+
+    def run(self, max_instructions):
+        return [self.step() for _ in range(max_instructions)]
+
+    def run_to_halt(self, max_instructions=None):
+        """Step until the halting JAL has retired once (as the soak tops count it); returns retired count."""
+        while not self.halted():
+            if max_instructions is not None and self.retired >= max_instructions:
+                return self.retired
+            self.step()
+        self.step()
+        return self.retired
@@ -0,0 +1,54 @@
+"""
+Per-test seeded random number generators.
+
+Every random test should draw its stimulus from ``test_rng()`` instead of the
+global ``random`` module. The generator is seeded from the run seed (cocotb's
+RANDOM_SEED, which the sweep runner sets per worker) mixed with the test
+name, so adding or reordering tests never changes another test's stimulus,
+and a failure is replayed by re-running just that test with the same
+RANDOM_SEED:
+
+    make MODULE=test_ALU TOPLEVEL=ALU TESTCASE=alu_random_test RANDOM_SEED=1234
+
+TEST_SEED overrides the per-test seed directly (it wins over RANDOM_SEED),
+which is handy when a seed was copied from a log line.
+"""
+import os
+import random
+import sys
+import zlib
+
+import cocotb
+
+
+def run_seed():
+    """The seed of this simulator run (RANDOM_SEED, chosen by cocotb if unset)."""
+    seed = getattr(cocotb, "RANDOM_SEED", None)
+    if seed is None:
+        seed = int(os.environ.get("RANDOM_SEED", "0"))
+    return int(seed)
+
+
+def test_seed(name, base=None):
+    """Derive the seed of test `name`; TEST_SEED in the environment overrides it."""
+    override = os.environ.get("TEST_SEED")
+    if override:
+        return int(override, 0)
+    base = run_seed() if base is None else base
+    return zlib.crc32(f"{base}:{name}".encode()) & 0x7FFFFFFF
+
+
+def test_rng(name=None, log=None):
+    """
+    Return a random.Random seeded for the calling test and log the seed.
+
+    `name` defaults to the name of the calling function, which for a
+    ``@cocotb.test()`` coroutine is the test name.
+    """
+    if name is None:
+        name = sys._getframe(1).f_code.co_name
+    seed = test_seed(name)
+    log = log if log is not None else cocotb.log
+    log.info(f"Test '{name}' seed {seed} (RANDOM_SEED={run_seed()}; "
+             f"replay with TESTCASE={name} RANDOM_SEED={run_seed()} or TEST_SEED={seed})")
+    return random.Random(seed)
@@ -0,0 +1,121 @@
+"""
+Simulation state snapshots taken and restored through VPI.
+
+Tests spend most of their short runs on warm-up: reset sequencing,
+backdoor program loads, and on fpga_top the S_RESET_WAIT counter and the
+UART handshakes. A Snapshot records every writable signal and memory
+element below a handle once, at a settled point (ReadOnly), and writes all
+of them back later. Many scenarios can then start from the same post-reset
+or post-load state without repeating the warm-up:
+
+    await FallingEdge(dut.clk)
+    await ReadOnly()
+    snap = Snapshot.capture(dut, exclude=["clk"])
+    for scenario in scenarios:
+        await FallingEdge(dut.clk)
+        snap.restore()
+        await scenario(dut)
+
+Restore at the same clock phase as the capture (the clock is excluded and
+keeps running), so the restored flops do not see a spurious edge. Because
+every net is restored, combinational values are consistent with the flops
+from the first delta on.
+
+Snapshots can be saved to JSON and loaded by another run of the same
+build (SNAPSHOT_DIR, default "snapshots/"), e.g. to start a sweep of seeds
+from one post-handshake fpga_top state.
+"""
+import json
+import os
+
+from cocotb.binary import BinaryValue
+from cocotb.handle import (
+    HierarchyArrayObject, HierarchyObject, ModifiableObject, NonHierarchyIndexableObject,
+)
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "snapshots")
+
+
+def _encode(value):
+    """JSON-friendly copy of a signal value: binary strings keep X/Z bits."""
+    if isinstance(value, BinaryValue):
+        return value.binstr
+    return value
+
+
+def _decode(value):
+    if isinstance(value, str):
+        return BinaryValue(value, n_bits=len(value))
+    return value
+
+
+class Snapshot:
+    """Values of every writable signal below a handle, keyed by hierarchical path."""
+
+    def __init__(self, values, handles=None):
+        self.values = values            # path -> value, or list of values for an unpacked array
+        self._handles = handles or {}   # path -> handle, filled by capture() or resolved lazily
+
+    @classmethod
+    def capture(cls, root, exclude=()):
+        """Record `root` and everything below it; names in `exclude` (e.g. the clock) are skipped."""
+        values, handles = {}, {}
+        cls._walk(root, "", set(exclude), values, handles)
+        return cls(values, handles)
+
+    @classmethod
+    def _walk(cls, handle, prefix, exclude, values, handles):
+        for child in handle:
+            name = child._name.split(".")[-1]
+            path = f"{prefix}{name}"
+            if name in exclude or path in exclude:
+                continue
+            if isinstance(child, (HierarchyObject, HierarchyArrayObject)):
+                cls._walk(child, path + ".", exclude, values, handles)
+            elif isinstance(child, NonHierarchyIndexableObject):
+                values[path] = [_encode(element.value) for element in child]
+                handles[path] = child
+            elif isinstance(child, ModifiableObject):
+                values[path] = _encode(child.value)
+                handles[path] = child
+
+    def _resolve(self, root, path):
+        handle = self._handles.get(path)
+        if handle is None:
+            handle = root
+            for name in path.split("."):
+                handle = getattr(handle, name)
+            self._handles[path] = handle
+        return handle
+
+    def restore(self, root=None):
+        """
+        Write every recorded value back. Call it outside ReadOnly, at the
+        clock phase of the capture; `root` is needed for snapshots loaded
+        from a file.
+        """
+        for path, value in self.values.items():
+            handle = self._resolve(root, path)
+            if isinstance(value, list):
+                for element, element_value in zip(handle, value):
+                    element.value = _decode(element_value)
+            else:
+                handle.value = _decode(value)
+
+    def diff(self, other):
+        """Paths whose values differ between two snapshots (missing paths included)."""
+        paths = set(self.values) | set(other.values)
+        return sorted(p for p in paths if self.values.get(p) != other.values.get(p))
+
+    def save(self, name, directory=None):
+        directory = directory or SNAPSHOT_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(self.values, f)
+        return path
+
+    @classmethod
+    def load(cls, name, directory=None):
+        with open(os.path.join(directory or SNAPSHOT_DIR, f"{name}.json")) as f:
+            return cls(json.load(f))
@@ -0,0 +1,93 @@
+"""
+Free-running soak runs for the single-cycle cores.
+
+The soak tops (Lev8SoakTop.sv, RISCSoakTop.sv) generate their own clock and
+count retired instructions in RTL, so a soak test does no per-cycle Python
+work at all: it releases reset, sleeps until the wrapper raises `done`
+(the core halted, or `max_cycles` ran out), then reads the register file
+and data memory back in bulk and compares them with the ISS.
+
+    result = await run_to_done(dut, max_cycles, dut.rst, reset_active=1)
+    iss.run(result.cycles)
+    compare_state("regs", read_array(dut.core.RF_inst.registers, 8), iss.regs)
+
+SOAK_CYCLES sets the watchdog (default 1,000,000 instructions):
+
+    make TOPLEVEL=Lev8SoakTop MODULE=test_Lev8SoakTop SOAK_CYCLES=20000000
+
+With SOAK_CHECKPOINT_EVERY=N the testbench wakes up every N cycles to save
+a checkpoint of the core, so a failing soak can be bisected and replayed
+(verif/tracediff.py).
+"""
+import os
+import time
+from collections import namedtuple
+
+from cocotb.triggers import ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+from verif.monitors import resolve
+
+SOAK_CYCLES = int(os.environ.get("SOAK_CYCLES", "1000000"))
+SOAK_CHECKPOINT_EVERY = int(os.environ.get("SOAK_CHECKPOINT_EVERY", "0"))
+SOAK_CLOCK_NS = 10  # 2 * HALF_PERIOD of the soak tops
+
+SoakResult = namedtuple("SoakResult", "cycles halted seconds sim_time_ns")
+
+
+async def run_to_done(dut, max_cycles, reset, reset_active=1, reset_ns=20, log=None,
+                      on_checkpoint=None, checkpoint_every=None):
+    """
+    Reset the soak top, let it run until `done` and return a SoakResult.
+    The testbench is not woken up between reset release and `done`, unless
+    `on_checkpoint` is given: it is then called in ReadOnly with the retired
+    count at reset release and about every `checkpoint_every` cycles.
+    """
+    log = log or dut._log
+    dut.max_cycles.value = max_cycles
+    reset.value = reset_active
+    await Timer(reset_ns, units="ns")
+    reset.value = 1 - reset_active
+    started = time.monotonic()
+    if on_checkpoint is not None:
+        every = checkpoint_every or SOAK_CHECKPOINT_EVERY
+        await ReadOnly()
+        on_checkpoint(0)
+        while not dut.done.value:
+            await Timer(every * SOAK_CLOCK_NS, units="ns")
+            await ReadOnly()
+            if not dut.done.value:
+                on_checkpoint(dut.cycles.value.integer)
+    else:
+        if not dut.done.value:
+            await RisingEdge(dut.done)
+        await ReadOnly()
+    seconds = time.monotonic() - started
+    result = SoakResult(dut.cycles.value.integer, bool(dut.halted.value), seconds,
+                        get_sim_time(units="ns"))
+    rate = result.cycles / seconds if seconds > 0 else float("inf")
+    reason = "halted" if result.halted else f"watchdog ({max_cycles} cycles)"
+    log.info(f"Soak done after {result.cycles} cycles: {reason}, "
+             f"{seconds:.2f}s wall, {rate:,.0f} cycles/s")
+    return result
+
+
+def read_array(handle, n):
+    """Values of the first `n` entries of an unpacked array handle (None for X/Z)."""
+    return [resolve(handle[i]) for i in range(n)]
+
+
+def compare_state(label, actual, expected, max_report=8, log=None):
+    """Raise AssertionError listing the first `max_report` indices where `actual` != `expected`."""
+    mismatches = [(i, a, e) for i, (a, e) in enumerate(zip(actual, expected)) if a != e]
+    if len(actual) != len(expected):
+        raise AssertionError(f"{label}: {len(actual)} entries read, {len(expected)} expected")
+    if mismatches:
+        lines = [f"  {label}[{i}] = {'X' if a is None else hex(a)}, expected {hex(e)}"
+                 for i, a, e in mismatches[:max_report]]
+        more = len(mismatches) - max_report
+        if more > 0:
+            lines.append(f"  ... and {more} more")
+        raise AssertionError(f"{label}: {len(mismatches)} mismatch(es)\n" + "\n".join(lines))
+    if log is not None:
+        log.info(f"{label}: {len(expected)} entries match")
@@ -0,0 +1,237 @@
+"""
+Multi-seed random regression sweeps.
+
+Runs one cocotb module over N seeds in parallel. The simulator is built once
+into a sweep-specific SIM_BUILD directory; every seed then runs as its own
+``make`` process (its own simulator instance) with a distinct RANDOM_SEED
+and results file. Failing (seed, test) pairs are written to a replay list,
+one make command per line with the sweep's make arguments (e.g. the
+parameters of the design under test), which can be fed back with ``--replay``.
+With ``--waves`` the first failures are re-run on a traced build and a
+waveform window around each failure is kept (see verif/waves.py); with
+``--profile`` the per-test profile records are aggregated (verif/profiling.py).
+
+Run from paper1/:
+
+    python -m verif.sweep --dir LegV8SingleCycleProcessor-cocob2 \\
+        --module test_ALU --toplevel ALU --seeds 32 --jobs 8
+    python -m verif.sweep --dir LegV8SingleCycleProcessor-cocob2 \\
+        --replay sweep/LegV8SingleCycleProcessor-cocob2/test_ALU/replay.txt
+"""
+import argparse
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from verif import results_db
+
+SeedResult = namedtuple("SeedResult", "seed tests failures seconds results_file log_file")
+TestResult = namedtuple("TestResult", "name passed sim_time_ns seconds")
+
+SWEEP_SIM_BUILD = "sim_build_sweep"
+
+
+def make_command(workdir, module, toplevel, sim_build, extra=(), target=None):
+    cmd = ["make", "-C", workdir, f"MODULE={module}", f"TOPLEVEL={toplevel}", f"SIM_BUILD={sim_build}"]
+    cmd.extend(extra)
+    if target:
+        cmd.append(target)
+    return cmd
+
+
+def build(workdir, module, toplevel, sim_build=SWEEP_SIM_BUILD, extra=(), log_file=None):
+    """Build the simulator executable once so the parallel runs only execute it."""
+    cmd = make_command(workdir, module, toplevel, sim_build, extra, target=f"{sim_build}/Vtop")
+    with open(log_file or os.devnull, "w") as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Simulator build failed: {shlex.join(cmd)}" +
+                           (f" (see {log_file})" if log_file else ""))
+
+
+def parse_results(path):
+    """Return the TestResults recorded in a cocotb results.xml file."""
+    results = []
+    if not os.path.exists(path):
+        return results
+    for case in ET.parse(path).iter("testcase"):
+        failed = case.find("failure") is not None or case.find("error") is not None
+        results.append(TestResult(
+            case.get("name"),
+            not failed,
+            float(case.get("sim_time_ns", 0) or 0),
+            float(case.get("time", 0) or 0),
+        ))
+    return results
+
+
+def run_seed(workdir, module, toplevel, seed, outdir, testcase=None,
+             sim_build=SWEEP_SIM_BUILD, extra=(), env=None):
+    """Run `module` once with RANDOM_SEED=`seed` and return a SeedResult."""
+    results_file = os.path.abspath(os.path.join(outdir, f"results_{seed}.xml"))
+    log_file = os.path.abspath(os.path.join(outdir, f"seed_{seed}.log"))
+    make_extra = [f"COCOTB_RESULTS_FILE={results_file}", *extra]
+    if testcase:
+        make_extra.append(f"TESTCASE={testcase}")
+    cmd = make_command(workdir, module, toplevel, sim_build, make_extra)
+    run_env = dict(os.environ if env is None else env)
+    run_env["RANDOM_SEED"] = str(seed)
+    run_env.pop("TEST_SEED", None)
+
+    start = time.monotonic()
+    with open(log_file, "w") as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, env=run_env)
+    seconds = time.monotonic() - start
+
+    tests = parse_results(results_file)
+    failures = [t.name for t in tests if not t.passed]
+    if not tests and proc.returncode == 0:
+        # Nothing recorded although make succeeded: treat as a crash, not a pass
+        failures = [testcase or "<no results>"]
+    elif proc.returncode != 0 and not failures:
+        failures = [testcase or "<simulator error>"]
+    return SeedResult(seed, tests, failures, seconds, results_file, log_file)
+
+
+# make variables of a replay line that are not passed through as make arguments
+_REPLAY_FIELDS = ("MODULE", "TOPLEVEL", "TESTCASE", "RANDOM_SEED")
+
+
+def replay_line(workdir, module, toplevel, seed, test, extra=()):
+    """The make command that re-runs one failing test, `extra` make arguments included."""
+    testcase = "" if test.startswith("<") else f" TESTCASE={test}"
+    args = "".join(f" {shlex.quote(arg)}" for arg in extra)
+    return f"make -C {workdir} MODULE={module} TOPLEVEL={toplevel}{args}{testcase} RANDOM_SEED={seed}"
+
+
+def write_replay_list(path, workdir, module, toplevel, results, extra=()):
+    lines = [
+        replay_line(workdir, module, toplevel, r.seed, test, extra)
+        for r in sorted(results, key=lambda r: r.seed)
+        for test in r.failures
+    ]
+    with open(path, "w") as f:
+        f.write("".join(line + "\n" for line in lines))
+    return lines
+
+
+def read_replay_list(path):
+    """Parse a replay list back into (workdir, module, toplevel, testcase, seed, extra) tuples."""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            words = shlex.split(line)
+            if not words or words[0] != "make":
+                continue
+            workdir = words[words.index("-C") + 1] if "-C" in words else "."
+            fields = dict(w.split("=", 1) for w in words if "=" in w)
+            extra = [w for w in words[1:] if "=" in w and w.split("=", 1)[0] not in _REPLAY_FIELDS]
+            entries.append((workdir, fields["MODULE"], fields["TOPLEVEL"],
+                            fields.get("TESTCASE"), int(fields["RANDOM_SEED"]), extra))
+    return entries
+
+
+def sweep(workdir, module, toplevel, seeds, jobs, outdir, testcase=None, extra=(), env=None, log=print):
+    """Build once, run every seed in parallel and return the list of SeedResults."""
+    os.makedirs(outdir, exist_ok=True)
+    log(f"Building {toplevel} in {workdir}/{SWEEP_SIM_BUILD} ...")
+    build(workdir, module, toplevel, extra=extra, log_file=os.path.join(outdir, "build.log"))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_seed, workdir, module, toplevel, seed, outdir, testcase, extra=extra, env=env)
+                   for seed in seeds]
+        for future in futures:
+            result = future.result()
+            status = "FAIL " + ",".join(result.failures) if result.failures else "pass"
+            log(f"  seed {result.seed:>10}: {status} ({result.seconds:.1f}s)")
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a cocotb module over many random seeds in parallel.")
+    parser.add_argument("--dir", default=".", help="Directory containing the cocotb Makefile")
+    parser.add_argument("--module", help="cocotb MODULE (test file without .py)")
+    parser.add_argument("--toplevel", help="TOPLEVEL HDL module")
+    parser.add_argument("--testcase", help="Only run this test function")
+    parser.add_argument("--seeds", type=int, default=16, help="Number of seeds to run (default 16)")
+    parser.add_argument("--base-seed", type=int, help="Seed of the seed generator (default: random)")
+    parser.add_argument("--seed-list", type=int, nargs="+", help="Run exactly these seeds")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Parallel simulator processes")
+    parser.add_argument("--outdir", help="Where to put logs, results and the replay list "
+                                         "(default sweep/<dir>/<module>)")
+    parser.add_argument("--replay", help="Re-run the failures listed in a replay file instead of new seeds")
+    parser.add_argument("--waves", type=int, nargs="?", const=1, default=0, metavar="N",
+                        help="Re-run the first N failures with tracing and keep a waveform window (default 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run with SIM_PROFILE=1 and print the aggregated per-test profile")
+    parser.add_argument("make_args", nargs="*", help="Extra VAR=value arguments passed to make")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        entries = read_replay_list(args.replay)
+        if not entries:
+            print(f"No replay entries in '{args.replay}'.")
+            return 0
+        failed = 0
+        for workdir, module, toplevel, testcase, seed, extra in entries:
+            outdir = args.outdir or os.path.join("sweep", os.path.basename(os.path.abspath(workdir)), module)
+            extra = extra + args.make_args
+            result = sweep(workdir, module, toplevel, [seed], 1, outdir, testcase, extra)[0]
+            failed += bool(result.failures)
+            if args.waves and result.failures:
+                from verif import waves
+                waves.capture_failures([result], workdir, module, toplevel, os.path.join(outdir, "waves"),
+                                       extra=extra)
+        print(f"Replay: {failed}/{len(entries)} still failing.")
+        return 1 if failed else 0
+
+    if not args.module or not args.toplevel:
+        parser.error("--module and --toplevel are required unless --replay is given")
+    if args.seed_list:
+        seeds = args.seed_list
+    else:
+        base = args.base_seed if args.base_seed is not None else random.SystemRandom().randrange(1 << 31)
+        print(f"Seed generator base seed: {base}")
+        seeds = random.Random(base).sample(range(1, 1 << 31), args.seeds)
+
+    outdir = args.outdir or os.path.join("sweep", os.path.basename(os.path.abspath(args.dir)), args.module)
+    env = None
+    if args.profile:
+        env = dict(os.environ, SIM_PROFILE="1", PROFILE_DIR=os.path.abspath(os.path.join(outdir, "profile")))
+    results = sweep(args.dir, args.module, args.toplevel, seeds, args.jobs, outdir, args.testcase,
+                    args.make_args, env)
+    db = results_db.connect()
+    for result in results:
+        results_db.record(db, args.dir, args.module, args.toplevel, result)
+    if args.profile:
+        from verif import profiling
+        records = profiling.load_records([env["PROFILE_DIR"]])
+        if records:
+            print(profiling.format_summary(profiling.aggregate(records)))
+
+    failing = [r for r in results if r.failures]
+    replay_path = os.path.join(outdir, "replay.txt")
+    write_replay_list(replay_path, args.dir, args.module, args.toplevel, results, args.make_args)
+    print(f"{len(results) - len(failing)}/{len(results)} seeds passed.")
+    if failing:
+        print(f"Failing seeds written to '{replay_path}':")
+        for r in failing:
+            print(f"  {r.seed}: {', '.join(r.failures)}  (log: {r.log_file})")
+        if args.waves:
+            from verif import waves
+            print("Capturing waveforms of failing tests:")
+            waves.capture_failures(failing, args.dir, args.module, args.toplevel,
+                                   os.path.join(outdir, "waves"), limit=args.waves, extra=args.make_args)
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Unit tests for verif.lev8_fuzz (ISS only)."""
+import random
+
+from verif.lev8_fuzz import Lev8Fuzzer
+
+
+def grow(fuzzer, iterations):
+    before = len(fuzzer.seen)
+    for _ in range(iterations):
+        fuzzer.add(fuzzer.mutate(fuzzer.rng.choice(fuzzer.corpus)))
+    return len(fuzzer.seen) - before
+
+
+def test_resumed_session_gains_coverage(tmp_path):
+    path = str(tmp_path / "lev8_corpus.json")
+    first = Lev8Fuzzer(random.Random(1), path)
+    assert grow(first, 3000) > 0
+    first.save()
+
+    resumed = Lev8Fuzzer(random.Random(2), path)
+    assert resumed.seen == first.seen and resumed.corpus == first.corpus
+    assert grow(resumed, 3000) > 0
@@ -0,0 +1,35 @@
+"""Unit tests for verif.minimize that run without a simulator (the RTL oracle is replaced)."""
+import json
+import os
+
+from verif import minimize
+from verif.lev8_asm import encode_i, encode_jump
+from verif.lev8_iss import OPCODE_ADDI
+
+BAD = encode_i(OPCODE_ADDI, 0, 3, 5)  # the instruction the fake RTL "miscomputes"
+
+
+class FakeOracle:
+    """Stands in for RtlOracle: an image fails while it still contains BAD."""
+
+    def __init__(self, isa, jobs=None, outdir=None, extra=(), log=print):
+        assert os.path.isdir(outdir)
+
+    def __call__(self, images):
+        return [f"{image['name']}: regs x3 mismatch" if BAD in image["imem"].values() else None
+                for image in images]
+
+
+def test_main_creates_missing_outdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(minimize, "RtlOracle", FakeOracle)
+    crash = tmp_path / "lev8_crash.json"
+    program = [encode_i(OPCODE_ADDI, 0, 1, 1), BAD, encode_i(OPCODE_ADDI, 0, 2, 7), encode_jump(6)]
+    crash.write_text(json.dumps({"isa": "lev8", "imem": program, "error": "crash: regs x3 mismatch"}))
+    outdir = tmp_path / "fresh" / "minimized"
+
+    assert minimize.main([str(crash), "--jobs", "1", "--outdir", str(outdir)]) == 0
+
+    (image,) = outdir.glob("*.json")
+    data = json.loads(image.read_text())
+    assert BAD in data["imem"].values()
+    assert len(data["imem"]) < len(program)
@@ -0,0 +1,464 @@
+"""
+Columnar execution traces.
+
+A trace is a table with one row per retired instruction (or per cycle) and
+a fixed set of fixed-width unsigned columns: cycle, pc, instr, ALU result,
+write-back data, memory op, ... The writer keeps at most `chunk_rows` rows
+as tuples, transposes a full chunk into typed columns in one pass,
+compresses them column by column with a stdlib codec (zlib by default, or
+bz2/lzma) and appends them to the file. A run of any length therefore
+needs constant memory, and an unfinished file (the simulator died) can
+still be read up to its last complete chunk. Recording still costs a
+Python tuple per row, about 2-3x writing the same row as a log line (see
+`bench`); the gain over log text is the size (about 50x smaller) and the
+read side.
+
+File layout (little-endian):
+
+    b"CTRACE1\\n", u32 header length, JSON header (columns, codec, meta)
+    per chunk: b"CK", u32 rows, u32 compressed size per column, the column blobs
+    JSON index of chunk offsets, u64 index offset, b"CTRACEND"
+
+X/Z samples are stored as 0 with their bit set in the `xmask` column
+(bit i = i-th schema column), so a differ can tell X from 0.
+
+The reader decompresses each column once into an .npy file in
+<trace>.cols/ and returns it as a read-only NumPy memmap, so analysis
+scripts slice and compare multi-million-row traces without loading them:
+
+    writer = TraceWriter("trace/run.ctr", SCHEMAS["lev8"], meta={"test": "lev8_processor_test"})
+    monitor.subscribe(writer.subscriber(monitor))
+    ...
+    writer.close()
+
+    pc = TraceReader("trace/run.ctr").column("pc")
+
+Tests record their retire monitors to $TRACE_DIR (e.g. TRACE_DIR=trace) when it is set.
+
+    python -m verif.trace info trace/run.ctr
+    python -m verif.trace dump trace/run.ctr --start 1000 --count 20
+    python -m verif.trace bench --rows 5000000       # throughput and size vs. log text
+"""
+import argparse
+import array
+import bisect
+import bz2
+import itertools
+import json
+import lzma
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+from operator import attrgetter
+
+from verif.coverage_models import legv8_mnemonic
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TRACE_DIR = os.environ.get("TRACE_DIR")
+TRACE_CHUNK_ROWS = int(os.environ.get("TRACE_CHUNK_ROWS", "65536"))
+TRACE_CODEC = os.environ.get("TRACE_CODEC", "zlib")
+
+MAGIC = b"CTRACE1\n"
+END_MAGIC = b"CTRACEND"
+CHUNK_MAGIC = b"CK"
+
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Unsigned column types; the array typecode is picked by item size on this platform
+DTYPES = {"u8": 1, "u16": 2, "u32": 4, "u64": 8}
+_TYPECODES = {array.array(code).itemsize: code for code in "QLIHB"}
+
+# `get(txn)` computes a column that is not a transaction field
+Column = namedtuple("Column", "name dtype get")
+Column.__new__.__defaults__ = (None,)
+
+MEM_NONE, MEM_LOAD, MEM_STORE = range(3)
+
+
+_LEV8_MEM_OPS = {1: MEM_LOAD, 2: MEM_STORE}
+_RISCV_MEM_OPS = {0b0000011: MEM_LOAD, 0b0100011: MEM_STORE}
+_LEGV8_MEM_OPS = {"LDUR": MEM_LOAD, "STUR": MEM_STORE}
+
+
+def _lev8_mem_op(txn):
+    return _LEV8_MEM_OPS.get((txn.instr or 0) >> 12, MEM_NONE)
+
+
+def _riscv_mem_op(txn):
+    return _RISCV_MEM_OPS.get((txn.instr or 0) & 0x7F, MEM_NONE)
+
+
+def _legv8_mem_op(txn):
+    return _LEGV8_MEM_OPS.get(legv8_mnemonic(txn.instr or 0), MEM_NONE)
+
+
+# Per-retire columns of each core, matching its Retire tuple (DUT monitors and ISS alike)
+SCHEMAS = {
+    "lev8": [Column("pc", "u8"), Column("instr", "u16"), Column("alu_result", "u8"),
+             Column("reg_write_data", "u8"), Column("next_pc", "u8"), Column("mem_op", "u8", _lev8_mem_op)],
+    "riscv": [Column("pc", "u32"), Column("instr", "u32"), Column("next_pc", "u32"), Column("x10", "u32"),
+              Column("x11", "u32"), Column("mem_op", "u8", _riscv_mem_op)],
+    "legv8": [Column("pc", "u32"), Column("instr", "u32"), Column("result", "u32"), Column("next_pc", "u32"),
+              Column("mem_op", "u8", _legv8_mem_op)],
+}
+
+
+def _typecode(dtype):
+    return _TYPECODES[DTYPES[dtype]]
+
+
+class TraceWriter:
+    """
+    Streams rows to a columnar trace file. Columns are the `cycle` of each
+    row, the schema columns and the `xmask` of X/Z samples.
+    """
+
+    def __init__(self, path, schema, meta=None, chunk_rows=None, codec=None):
+        self.path = path
+        self.schema = [Column(*c) if not isinstance(c, Column) else c for c in schema]
+        if len(self.schema) > 32:
+            raise ValueError("at most 32 columns (xmask is 32 bits wide)")
+        self.columns = [Column("cycle", "u64")] + self.schema + [Column("xmask", "u32")]
+        self.chunk_rows = chunk_rows or TRACE_CHUNK_ROWS
+        self.codec = codec or TRACE_CODEC
+        self._compress = CODECS[self.codec][0]
+        self.raw_bytes = 0
+        self._chunks = []
+        self._flushed = 0  # rows written in complete chunks
+        self._pending = []  # rows (tuples in schema order) of the chunk being filled
+        self._cycles = []  # their cycles, None for "the row number"
+        self._masks = [(1 << DTYPES[c.dtype] * 8) - 1 for c in self.schema]
+        self._row = self._row_getter()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "wb")
+        header = json.dumps({
+            "columns": [[c.name, c.dtype] for c in self.columns],
+            "codec": self.codec, "chunk_rows": self.chunk_rows, "meta": meta or {},
+        }).encode()
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def _row_getter(self):
+        """txn -> row tuple; one attrgetter call for the leading field columns."""
+        getters = [c.get or attrgetter(c.name) for c in self.schema]
+        head = next((i for i, c in enumerate(self.schema) if c.get), len(self.schema))
+        if head < 2 or not all(c.get for c in self.schema[head:]):
+            return lambda txn: tuple([get(txn) for get in getters])
+        fields, computed = attrgetter(*(c.name for c in self.schema[:head])), getters[head:]
+        if not computed:
+            return fields
+        if len(computed) == 1:
+            (get,) = computed
+            return lambda txn: fields(txn) + (get(txn),)
+        return lambda txn: fields(txn) + tuple([get(txn) for get in computed])
+
+    @property
+    def rows(self):
+        return self._flushed + len(self._pending)
+
+    def append(self, values, cycle=None):
+        """Add one row: `values` in schema order, None for X/Z."""
+        self._pending.append(tuple(values))
+        self._cycles.append(cycle)
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def record(self, txn, cycle=None):
+        """Add one transaction (a Retire namedtuple or anything with the schema's fields)."""
+        pending = self._pending
+        pending.append(self._row(txn))
+        self._cycles.append(cycle)
+        if len(pending) >= self.chunk_rows:
+            self.flush()
+
+    def _buffers(self):
+        """The pending rows as one typed array per column (cycle, schema columns, xmask)."""
+        rows = len(self._pending)
+        xmask = None
+        cycles = self._cycles
+        if None in cycles:
+            cycles = [self._flushed + row if cycle is None else cycle for row, cycle in enumerate(cycles)]
+        buffers = [array.array(_typecode("u64"), cycles)]
+        for i, (column, mask, values) in enumerate(zip(self.schema, self._masks, zip(*self._pending))):
+            if None in values:
+                xmask = xmask or [0] * rows
+                bit = 1 << i
+                for row, value in enumerate(values):
+                    if value is None:
+                        xmask[row] |= bit
+                values = [0 if value is None else value for value in values]
+            if min(values) < 0 or max(values) > mask:
+                values = [value & mask for value in values]
+            buffers.append(array.array(_typecode(column.dtype), values))
+        typecode = _typecode("u32")
+        buffers.append(array.array(typecode, xmask) if xmask else array.array(typecode, [0]) * rows)
+        return buffers
+
+    def subscriber(self, monitor):
+        """Monitor callback that records every transaction with the monitor's cycle count."""
+        return lambda txn: self.record(txn, monitor.cycle)
+
+    def flush(self):
+        """Compress and write the buffered rows as one chunk."""
+        rows = len(self._pending)
+        if not rows:
+            return
+        blobs = []
+        for buffer in self._buffers():
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            raw = buffer.tobytes()
+            self.raw_bytes += len(raw)
+            blobs.append(self._compress(raw))
+        self._chunks.append([self._file.tell(), rows])
+        self._file.write(CHUNK_MAGIC + struct.pack(f"<{1 + len(blobs)}I", rows, *(len(b) for b in blobs)))
+        for blob in blobs:
+            self._file.write(blob)
+        self._flushed += rows
+        self._pending = []
+        self._cycles = []
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        index_offset = self._file.tell()
+        self._file.write(json.dumps({"chunks": self._chunks, "rows": self.rows}).encode())
+        self._file.write(struct.pack("<Q", index_offset) + END_MAGIC)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    """Random access to a trace file; `column()` returns NumPy memmaps."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a columnar trace")
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length))
+            self._data_start = f.tell()
+        self.columns = [Column(name, dtype) for name, dtype in header["columns"]]
+        self.names = [c.name for c in self.columns]
+        self.codec = header["codec"]
+        self.meta = header["meta"]
+        self._decompress = CODECS[self.codec][1]
+        self.chunks = self._index()
+        self._starts = list(itertools.accumulate([0] + [rows for _, rows in self.chunks]))
+        self.rows = self._starts[-1]
+        self._last_chunk = (None, None)  # (index, decoded chunk) of the last row() call
+
+    def _index(self):
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size >= 16:
+                f.seek(size - 16)
+                tail = f.read(16)
+                if tail[8:] == END_MAGIC:
+                    (offset,) = struct.unpack("<Q", tail[:8])
+                    f.seek(offset)
+                    return json.loads(f.read(size - 16 - offset))["chunks"]
+            # No index: the writer was not closed; walk the complete chunks
+            chunks, offset = [], self._data_start
+            n = len(self.columns)
+            while offset + 6 + 4 * n <= size:
+                f.seek(offset)
+                head = f.read(6 + 4 * n)
+                if head[:2] != CHUNK_MAGIC:
+                    break
+                rows, *sizes = struct.unpack(f"<{1 + n}I", head[2:])
+                end = offset + 6 + 4 * n + sum(sizes)
+                if end > size:
+                    break
+                chunks.append([offset, rows])
+                offset = end
+            return chunks
+
+    def read_chunk(self, index, names=None):
+        """{column name: array} of one chunk (NumPy arrays when available, else array.array)."""
+        offset, rows = self.chunks[index]
+        n = len(self.columns)
+        wanted = set(names or self.names)
+        result = {}
+        with open(self.path, "rb") as f:
+            f.seek(offset + 2)
+            rows, *sizes = struct.unpack(f"<{1 + n}I", f.read(4 + 4 * n))
+            for column, size in zip(self.columns, sizes):
+                if column.name not in wanted:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                raw = self._decompress(f.read(size))
+                if np is not None:
+                    result[column.name] = np.frombuffer(raw, dtype=f"<u{DTYPES[column.dtype]}")
+                else:
+                    values = array.array(_typecode(column.dtype))
+                    values.frombytes(raw)
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    result[column.name] = values
+        return result
+
+    def iter_chunks(self, names=None):
+        for i in range(len(self.chunks)):
+            yield self.read_chunk(i, names)
+
+    def _cache_path(self, name):
+        return os.path.join(self.path + ".cols", f"{name}.npy")
+
+    def column(self, name):
+        """
+        One column as a read-only memmap. The column is decompressed chunk by
+        chunk into <trace>.cols/<name>.npy the first time (and again when the
+        trace is newer than the cache).
+        """
+        if np is None:
+            raise RuntimeError("TraceReader.column needs NumPy; use iter_chunks() without it")
+        column = self.columns[self.names.index(name)]
+        path = self._cache_path(name)
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(self.path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            out = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=f"<u{DTYPES[column.dtype]}",
+                                            shape=(self.rows,))
+            start = 0
+            for chunk in self.iter_chunks([name]):
+                values = chunk[name]
+                out[start:start + len(values)] = values
+                start += len(values)
+            out.flush()
+            del out
+            os.replace(path + ".tmp", path)
+        return np.load(path, mmap_mode="r")
+
+    def arrays(self, names=None):
+        return {name: self.column(name) for name in names or self.names}
+
+    def row(self, index):
+        """
+        One row as a dict. Only the chunk holding it is decompressed, and it
+        is kept until a row of another chunk is asked for, so reading rows in
+        order decompresses every chunk once.
+        """
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        i = bisect.bisect_right(self._starts, index) - 1
+        cached, chunk = self._last_chunk
+        if cached != i:
+            chunk = self.read_chunk(i)
+            self._last_chunk = (i, chunk)
+        index -= self._starts[i]
+        return {name: int(values[index]) for name, values in chunk.items()}
+
+
+def monitor_trace(monitor, isa, name, directory=None):
+    """Record `monitor` to <$TRACE_DIR>/<name>.ctr when tracing is enabled; returns the writer or None."""
+    directory = directory or TRACE_DIR
+    if not directory:
+        return None
+    writer = TraceWriter(os.path.join(directory, f"{name}.ctr"), SCHEMAS[isa], meta={"isa": isa, "source": "dut"})
+    monitor.subscribe(writer.subscriber(monitor))
+    return writer
+
+
+def iss_trace(iss, isa, path, max_instructions, meta=None):
+    """Run an ISS for up to `max_instructions` (or until it halts) and write its retire records."""
+    with TraceWriter(path, SCHEMAS[isa], meta=dict(meta or {}, isa=isa, source="iss")) as writer:
+        while iss.retired < max_instructions:
+            # Lev8/RISC-V halted() flags the halting jump before it retires, LEGv8's after HALT ran
+            halting = iss.halted()
+            if halting and isa == "legv8":
+                break
+            writer.record(iss.step())
+            if halting:
+                break
+    return writer.rows
+
+
+def _bench(rows, codec, chunk_rows, directory):
+    """Write `rows` synthetic Lev8 retire rows as a trace and as log text; returns a summary line."""
+    from verif.lev8_iss import Lev8Retire
+
+    # The monitor builds the transactions either way; both sides time only recording them
+    txns = [Lev8Retire(i % 16 & 0xE, 0x5045 + (i % 7), i & 0xFF, (i * 3) & 0xFF, (i + 2) % 16 & 0xE)
+            for i in range(rows)]
+    path = os.path.join(directory, "bench.ctr")
+    start = time.monotonic()
+    with TraceWriter(path, SCHEMAS["lev8"], chunk_rows=chunk_rows, codec=codec) as writer:
+        for txn in txns:
+            writer.record(txn)
+    trace_seconds = time.monotonic() - start
+    trace_size = os.path.getsize(path)
+
+    text_path = os.path.join(directory, "bench.log")
+    start = time.monotonic()
+    with open(text_path, "w") as f:
+        for txn in txns:
+            f.write(f"  Retired PC: {txn.pc} | Instruction: 0x{txn.instr:04X} | ALU_res={txn.alu_result}, "
+                    f"RegWriteData={txn.reg_write_data}, NextPC={txn.next_pc}\n")
+    text_seconds = time.monotonic() - start
+    text_size = os.path.getsize(text_path)
+
+    read = ""
+    if np is not None:
+        start = time.monotonic()
+        TraceReader(path).column("pc")
+        read = f"; pc column to memmap in {time.monotonic() - start:.2f}s"
+    return (f"{rows} rows: trace {trace_size / 1e6:.2f} MB in {trace_seconds:.2f}s "
+            f"({rows / trace_seconds:,.0f} rows/s, {writer.raw_bytes / max(trace_size, 1):.1f}x {codec}), "
+            f"log text {text_size / 1e6:.2f} MB in {text_seconds:.2f}s{read}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect columnar execution traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Columns, rows, chunks and compression of a trace")
+    info.add_argument("path")
+    dump = sub.add_parser("dump", help="Print rows as text")
+    dump.add_argument("path")
+    dump.add_argument("--start", type=int, default=0)
+    dump.add_argument("--count", type=int, default=20)
+    bench = sub.add_parser("bench", help="Write a synthetic trace and the equivalent log text")
+    bench.add_argument("--rows", type=int, default=1_000_000)
+    bench.add_argument("--codec", choices=sorted(CODECS), default=TRACE_CODEC)
+    bench.add_argument("--chunk-rows", type=int, default=TRACE_CHUNK_ROWS)
+    bench.add_argument("--dir", default="trace")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        os.makedirs(args.dir, exist_ok=True)
+        print(_bench(args.rows, args.codec, args.chunk_rows, args.dir))
+        return 0
+    reader = TraceReader(args.path)
+    if args.command == "info":
+        print(f"{args.path}: {reader.rows} rows in {len(reader.chunks)} chunk(s), codec {reader.codec}, "
+              f"{os.path.getsize(args.path) / 1e6:.2f} MB")
+        print(f"  columns: {', '.join(f'{c.name}:{c.dtype}' for c in reader.columns)}")
+        if reader.meta:
+            print(f"  meta: {json.dumps(reader.meta)}")
+        return 0
+    for index in range(args.start, min(args.start + args.count, reader.rows)):
+        row = reader.row(index)
+        print(f"{index:>10}  " + "  ".join(f"{name}={row[name]:#x}" for name in reader.names))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
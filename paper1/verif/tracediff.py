@@ -0,0 +1,377 @@
+"""
+First-divergence search between a DUT run and the ISS.
+
+Two traces (verif/trace.py) are compared column by column in large
+vectorized windows of their memmaps; the first row where any shared column
+(or the DUT's X mask) differs is reported together with the rows before it:
+
+    python -m verif.tracediff diff trace/lev8_processor_test.ctr trace/lev8_ref.ctr
+
+Long runs are not traced at all. A soak run with SOAK_CHECKPOINT_EVERY=N
+instead saves a snapshot of the core (verif/snapshot.py) every N cycles to
+checkpoints/<test>/. When its final state comparison fails, the checkpoints
+are bisected against the ISS: only log2(#checkpoints) of them are loaded
+and compared with the architectural state the ISS reaches at the same
+instruction count. This gives the last good and first bad checkpoint:
+
+    python -m verif.tracediff bisect checkpoints/lev8_soak_random_loop
+
+Only that window is then re-simulated with full visibility. The
+*_replay_window test of the visible core restores the last good checkpoint,
+records the window's retire trace next to an ISS trace started from the same
+state, and fails with the divergent instruction, the architectural state
+before it and the signals that differ:
+
+    make MODULE=test_Lev8SingleCycleProcessor TESTCASE=lev8_replay_window \\
+        DIVERGE_CHECKPOINTS=checkpoints/lev8_soak_random_loop
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+from collections import namedtuple
+
+from verif.lev8_iss import Lev8ISS
+from verif.riscv_iss import RiscvISS
+from verif.trace import TRACE_DIR, SCHEMAS, TraceReader, TraceWriter, iss_trace, np
+
+CHECKPOINT_DIR = os.environ.get("CHECKPOINT_DIR", "checkpoints")
+DIVERGE_CHECKPOINTS = os.environ.get("DIVERGE_CHECKPOINTS")
+TRACEDIFF_WINDOW = 1 << 20  # rows compared per vectorized step
+
+# Architectural state elements of the single-cycle cores, relative to the core instance
+ArchPaths = namedtuple("ArchPaths", "pc regs dmem imem")
+ARCH_PATHS = {
+    "lev8": ArchPaths("PC_inst.pc_out", "RF_inst.registers", "DM_inst.mem", "IM_inst.mem"),
+    "riscv": ArchPaths("programcounter_inst.pc_reg", "registerfile_inst.registers",
+                       "datamemory_inst.mem", "instructionmemory_inst.mem"),
+}
+# Clocks and resets keep their values from the replaying testbench
+CHECKPOINT_EXCLUDE = ["clk", "rst", "rst_n"]
+
+Divergence = namedtuple("Divergence", "index cycle columns dut ref")
+ArchState = namedtuple("ArchState", "retired pc regs dmem")
+
+
+# --- trace comparison ---
+
+def _rows(reader, names):
+    for chunk in reader.iter_chunks(names):
+        yield from zip(*(chunk[name] for name in names))
+
+
+def first_divergence(dut, ref, columns=None, window=TRACEDIFF_WINDOW):
+    """
+    First row where `dut` and `ref` (TraceReaders) differ in `columns`
+    (default: every column both have except `cycle`); None if they match.
+    A trace that ends early diverges at its length, with columns ["rows"].
+    """
+    columns = columns or [name for name in dut.names if name in ref.names and name != "cycle"]
+    rows = min(dut.rows, ref.rows)
+    index = None
+    if np is not None:
+        dut_columns, ref_columns = dut.arrays(columns), ref.arrays(columns)
+        for start in range(0, rows, window):
+            stop = min(start + window, rows)
+            differs = np.zeros(stop - start, dtype=bool)
+            for name in columns:
+                differs |= dut_columns[name][start:stop] != ref_columns[name][start:stop]
+            hits = np.flatnonzero(differs)
+            if len(hits):
+                index = start + int(hits[0])
+                break
+    else:
+        for i, (a, b) in enumerate(zip(_rows(dut, columns), _rows(ref, columns))):
+            if a != b:
+                index = i
+                break
+    if index is not None:
+        dut_row, ref_row = dut.row(index), ref.row(index)
+        differing = [name for name in columns if dut_row[name] != ref_row[name]]
+        return Divergence(index, dut_row["cycle"], differing, dut_row, ref_row)
+    if dut.rows != ref.rows:
+        return Divergence(rows, None, ["rows"], dut.row(rows) if rows < dut.rows else None,
+                          ref.row(rows) if rows < ref.rows else None)
+    return None
+
+
+def _fmt_row(row, names):
+    if row is None:
+        return "(trace ended)"
+    return "  ".join(f"{name}=0x{row[name]:X}" for name in names)
+
+
+def report(divergence, dut, ref, context=3, state=None, columns=None):
+    """Text report: the divergent row of both traces, the rows before it and the state before it."""
+    names = columns or [name for name in ref.names if name in dut.names and name not in ("cycle", "xmask")]
+    index = divergence.index
+    lines = [f"First divergence at instruction {index}"
+             + (f" (DUT cycle {divergence.cycle})" if divergence.cycle is not None else "")
+             + f": {', '.join(divergence.columns)} differ"]
+    for i in range(max(0, index - context), index):
+        lines.append(f"  {i:>10}  {_fmt_row(dut.row(i), names)}")
+    lines.append(f"  DUT {index:>6}  {_fmt_row(divergence.dut, names)}")
+    lines.append(f"  ISS {index:>6}  {_fmt_row(divergence.ref, names)}")
+    if divergence.dut is not None and divergence.dut["xmask"]:
+        x_columns = [name for bit, name in enumerate(dut.names[1:-1]) if divergence.dut["xmask"] >> bit & 1]
+        lines.append(f"  X/Z in DUT columns: {', '.join(x_columns)}")
+    for name in divergence.columns:
+        if name not in ("rows", "xmask") and divergence.dut is not None and divergence.ref is not None:
+            lines.append(f"  {name}: DUT 0x{divergence.dut[name]:X}, expected 0x{divergence.ref[name]:X}")
+    if state is not None:
+        lines.append(f"Architectural state before it (ISS, {state.retired} retired):")
+        lines.extend("  " + line for line in format_state(state))
+    return "\n".join(lines)
+
+
+# --- architectural state and checkpoints ---
+
+def _int(value):
+    """Snapshot value -> int, or None for X/Z."""
+    if isinstance(value, int):
+        return value
+    return int(value, 2) if value and set(value) <= {"0", "1"} else None
+
+
+def snapshot_state(isa, values, retired):
+    """ArchState from the values of a Snapshot taken on a core instance."""
+    paths = ARCH_PATHS[isa]
+    return ArchState(retired, _int(values[paths.pc]), [_int(v) for v in values[paths.regs]],
+                     [_int(v) for v in values[paths.dmem]])
+
+
+def iss_state(iss):
+    return ArchState(iss.retired, iss.pc, list(iss.regs), list(iss.dmem))
+
+
+def iss_from_snapshot(isa, values, retired=0):
+    """An ISS holding the program and architectural state of a core Snapshot's values."""
+    paths = ARCH_PATHS[isa]
+    words = [_int(v) or 0 for v in values[paths.imem]]
+    state = snapshot_state(isa, values, retired)
+    if isa == "lev8":
+        # IM_inst.mem is byte-wide, big-endian instructions at even addresses
+        imem = {addr: (words[addr] << 8) | (words[addr + 1] if addr + 1 < len(words) else 0)
+                for addr in range(0, len(words), 2)}
+        iss = Lev8ISS(imem)
+    else:
+        iss = RiscvISS(words)
+    iss.pc = state.pc or 0
+    iss.regs = [value or 0 for value in state.regs]
+    iss.dmem = [value or 0 for value in state.dmem]
+    iss.retired = retired
+    return iss
+
+
+def state_diff(dut, ref, max_report=8):
+    """Lines describing where two ArchStates differ (empty when they match)."""
+    lines = []
+    if dut.pc != ref.pc:
+        lines.append(f"pc = {_fmt(dut.pc)}, expected {_fmt(ref.pc)}")
+    for label, actual, expected in (("regs", dut.regs, ref.regs), ("dmem", dut.dmem, ref.dmem)):
+        mismatches = [(i, a, e) for i, (a, e) in enumerate(zip(actual, expected)) if a != e]
+        lines.extend(f"{label}[{i}] = {_fmt(a)}, expected {_fmt(e)}" for i, a, e in mismatches[:max_report])
+        if len(mismatches) > max_report:
+            lines.append(f"... and {len(mismatches) - max_report} more {label} mismatches")
+    return lines
+
+
+def _fmt(value):
+    return "X" if value is None else f"0x{value:X}"
+
+
+def format_state(state):
+    lines = [f"pc = {_fmt(state.pc)}",
+             "regs: " + " ".join(f"r{i}={_fmt(v)}" for i, v in enumerate(state.regs) if v)]
+    stored = [(i, v) for i, v in enumerate(state.dmem) if v]
+    lines.append("dmem: " + (" ".join(f"[{i}]={_fmt(v)}" for i, v in stored[:16]) or "all zero")
+                 + (f" ... ({len(stored)} non-zero)" if len(stored) > 16 else ""))
+    return lines
+
+
+class Checkpoints:
+    """
+    Snapshots of one core instance, saved as <directory>/<retired>.json
+    with a checkpoints.json index. Call the object with the current
+    retired-instruction count, in ReadOnly (e.g. as run_to_done's
+    `on_checkpoint`).
+    """
+
+    def __init__(self, isa, core, directory, log=None):
+        self.isa = isa
+        self.core = core
+        self.directory = directory
+        self.log = log
+        self.retired = []
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(directory, name))
+
+    def __call__(self, retired):
+        from verif.snapshot import Snapshot
+
+        Snapshot.capture(self.core, exclude=CHECKPOINT_EXCLUDE).save(f"{retired:012d}", self.directory)
+        self.retired.append(retired)
+        with open(os.path.join(self.directory, "checkpoints.json"), "w") as f:
+            json.dump({"isa": self.isa, "retired": self.retired}, f)
+        if self.log is not None:
+            self.log.debug(f"Checkpoint after {retired} instructions")
+
+
+def soak_checkpoints(dut, isa, name, every, directory=None):
+    """Checkpoints of a soak top's `core` in <CHECKPOINT_DIR>/<name>, or None when `every` is 0."""
+    if not every:
+        return None
+    directory = os.path.join(directory or CHECKPOINT_DIR, name)
+    dut._log.info(f"Checkpointing every {every} cycles to {directory}/; on a mismatch run "
+                  f"python -m verif.tracediff bisect {directory}")
+    return Checkpoints(isa, dut.core, directory, log=dut._log)
+
+
+def load_checkpoints(directory):
+    """(isa, sorted retired counts) of a checkpoint directory."""
+    with open(os.path.join(directory, "checkpoints.json")) as f:
+        index = json.load(f)
+    return index["isa"], sorted(index["retired"])
+
+
+def load_checkpoint(directory, retired):
+    """Snapshot values of one checkpoint (read directly, so bisecting needs no simulator)."""
+    with open(os.path.join(directory, f"{retired:012d}.json")) as f:
+        return json.load(f)
+
+
+class IssStates:
+    """ISS architectural state at any instruction count, stepping on from the nearest cached state."""
+
+    def __init__(self, iss):
+        self._cache = {iss.retired: iss}
+
+    def model_at(self, retired):
+        start = max(r for r in self._cache if r <= retired)
+        iss = copy.deepcopy(self._cache[start])
+        while iss.retired < retired:
+            iss.step()
+        self._cache[retired] = copy.deepcopy(iss)
+        return iss
+
+    def __call__(self, retired):
+        return iss_state(self.model_at(retired))
+
+
+def bisect_checkpoints(directory, log=print):
+    """
+    Binary search for the first checkpoint whose architectural state differs
+    from the ISS (started from the first checkpoint). Returns (isa, last
+    good retired count, first bad retired count or None, the ISS states).
+    Assumes a divergence persists, which holds for corrupted state; a
+    divergence that heals before the next checkpoint is not found.
+    """
+    isa, retired = load_checkpoints(directory)
+    states = IssStates(iss_from_snapshot(isa, load_checkpoint(directory, retired[0]), retired[0]))
+    lo, hi = 0, len(retired)  # retired[lo] matches; the first mismatch is in (lo, hi]
+    loaded = 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        dut = snapshot_state(isa, load_checkpoint(directory, retired[mid]), retired[mid])
+        loaded += 1
+        if state_diff(dut, states(retired[mid])):
+            hi = mid
+        else:
+            lo = mid
+    bad = retired[hi] if hi < len(retired) else None
+    log(f"{directory}: {len(retired)} checkpoints, {loaded} compared; last good after {retired[lo]} instructions, "
+        + (f"first bad after {bad}" if bad is not None else "no bad checkpoint"))
+    return isa, retired[lo], bad, states
+
+
+async def replay_window(harness, monitor, directory=None, trace_dir=None):
+    """
+    Re-simulate the window between the last good and first bad checkpoint
+    on a visible core (`harness` from verif/batch.py, `monitor` its retire
+    monitor, not started) and raise AssertionError describing the first
+    divergence from the ISS.
+    """
+    from cocotb.triggers import FallingEdge, RisingEdge
+    from verif.snapshot import Snapshot
+
+    directory = directory or DIVERGE_CHECKPOINTS
+    log = harness.log
+    isa, good, bad, states = bisect_checkpoints(directory, log=log.info)
+    if bad is None:
+        log.info("Every checkpoint matches the ISS; nothing to replay")
+        return
+    window = bad - good
+    snapshot = Snapshot(load_checkpoint(directory, good))
+
+    # The monitor sees reset, then the restored state at the first sample
+    monitor.start()
+    await FallingEdge(harness.clk)
+    harness.reset.value = harness.reset_active
+    await RisingEdge(harness.clk)
+    await FallingEdge(harness.clk)
+    harness.reset.value = 1 - harness.reset_active
+    snapshot.restore(harness.dut)
+
+    trace_dir = trace_dir or TRACE_DIR or "trace"
+    base = os.path.join(trace_dir, os.path.basename(os.path.normpath(directory)))
+    writer = TraceWriter(f"{base}_window_dut.ctr", SCHEMAS[isa], meta={"isa": isa, "source": "dut", "from": good})
+    monitor.subscribe(writer.subscriber(monitor))
+    await monitor.wait_for(lambda txn: monitor.count >= window, max_transactions=window)
+    monitor.stop()
+    writer.close()
+    # wait_for returns in ReadOnly, after the window's last instruction retired
+    dut_state = snapshot_state(isa, Snapshot.capture(harness.dut, exclude=CHECKPOINT_EXCLUDE).values, bad)
+    iss_trace(states.model_at(good), isa, f"{base}_window_ref.ctr", bad, meta={"from": good})
+
+    dut, ref = TraceReader(f"{base}_window_dut.ctr"), TraceReader(f"{base}_window_ref.ctr")
+    divergence = first_divergence(dut, ref)
+    if divergence is not None:
+        text = report(divergence, dut, ref, state=states(good + divergence.index))
+        raise AssertionError(f"Window {good}..{bad} from {directory}:\n{text}")
+    differs = state_diff(dut_state, states(bad))
+    if differs:
+        raise AssertionError(f"Window {good}..{bad}: every retired instruction matches, but the state "
+                             f"after it differs:\n  " + "\n  ".join(differs))
+    log.info(f"Window {good}..{bad} replayed without a divergence (the soak mismatch did not reproduce)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find where a DUT run first diverges from the ISS.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff = sub.add_parser("diff", help="Compare a DUT trace with a reference trace")
+    diff.add_argument("dut")
+    diff.add_argument("ref")
+    diff.add_argument("--columns", nargs="+", help="Columns to compare (default: all shared but cycle)")
+    diff.add_argument("--context", type=int, default=3, help="Rows shown before the divergence")
+    bisect = sub.add_parser("bisect", help="Bisect soak checkpoints against the ISS")
+    bisect.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        dut, ref = TraceReader(args.dut), TraceReader(args.ref)
+        divergence = first_divergence(dut, ref, args.columns)
+        if divergence is None:
+            print(f"No divergence in {dut.rows} rows")
+            return 0
+        print(report(divergence, dut, ref, args.context, columns=args.columns))
+        return 1
+
+    isa, good, bad, states = bisect_checkpoints(args.directory)
+    if bad is None:
+        return 0
+    dut = snapshot_state(isa, load_checkpoint(args.directory, bad), bad)
+    print(f"State after {bad} instructions:")
+    for line in state_diff(dut, states(bad)):
+        print(f"  {line}")
+    module, test = {"lev8": ("test_Lev8SingleCycleProcessor", "lev8_replay_window"),
+                    "riscv": ("test_RISC_Processor", "test_risc_replay_window")}[isa]
+    print(f"Replay the {bad - good}-instruction window with full visibility:\n"
+          f"  make MODULE={module} TESTCASE={test} DIVERGE_CHECKPOINTS={os.path.abspath(args.directory)}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Cycle-based UART models for the legv8_multicycle_uart testbenches.
+
+The RTL UARTs count CLKS_PER_BIT clocks per bit (8N1, LSB first). The
+testbench builds fpga_top with a small CLKS_PER_BIT (the Makefile passes
+-GCLKS_PER_BIT=$(CLKS_PER_BIT), default 8) so a byte takes 80 clocks
+instead of 4340, and the models below count the same clocks.
+
+    sink = UartSink(dut.clk_50MHz, dut.uart_tx, CLKS_PER_BIT)
+    sink.start()
+    words = await sink.read_words(3)      # the three handshakes
+
+    source = UartSource(dut.clk_50MHz, dut.uart_rx_in, CLKS_PER_BIT)
+    await source.write([0xA3])            # report mode byte, see fpga_top
+
+`clks_per_bit` may be changed between bytes (fpga_top's baud rate
+negotiation) and may be fractional: a host running at exactly 3 Mbaud sends
+a bit every 50e6 / 3e6 = 16.67 clocks of the 50 MHz board clock, while the
+RTL counts clks_per_bit(3_000_000) = 17.
+"""
+import os
+import struct
+
+import cocotb
+from cocotb.triggers import ClockCycles, Event, FallingEdge
+
+CLKS_PER_BIT = int(os.environ.get("CLKS_PER_BIT", "8"))
+FPGA_CLOCK_HZ = 50_000_000
+# Rates common USB-serial adapters support above 115200
+HIGH_BAUD_RATES = (1_000_000, 2_000_000, 3_000_000)
+
+
+def clks_per_bit(baud, clock_hz=FPGA_CLOCK_HZ):
+    """The RTL's clocks per bit for `baud` (rounded; the host's rate is then off by up to 2% at 3 Mbaud)."""
+    return round(clock_hz / baud)
+
+
+def _bit_clocks(clks_per_bit, offset, count):
+    """Clocks from the start bit's edge to offset bits, then between the next `count` bits (fractional bit times)."""
+    points = [int((offset + i) * clks_per_bit) for i in range(count + 1)]
+    return [points[0]] + [b - a for a, b in zip(points, points[1:])]
+
+
+class UartSink:
+    """Decodes the bytes a DUT sends on `line`; `data` keeps every byte received so far."""
+
+    def __init__(self, clk, line, clks_per_bit=CLKS_PER_BIT):
+        self.clk = clk
+        self.line = line
+        self.clks_per_bit = clks_per_bit
+        self.data = bytearray()
+        self._received = Event()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def clear(self):
+        self.data.clear()
+
+    async def _run(self):
+        while True:
+            await FallingEdge(self.line)
+            # Sample in the middle of every bit, as uart_rx does
+            clocks = _bit_clocks(self.clks_per_bit, 0.5, 9)
+            await ClockCycles(self.clk, clocks[0])
+            if self.line.value != 0:
+                continue  # glitch, not a start bit
+            byte = 0
+            for bit in range(8):
+                await ClockCycles(self.clk, clocks[bit + 1])
+                byte |= int(self.line.value) << bit
+            await ClockCycles(self.clk, clocks[9])
+            self.data.append(byte)
+            self._received.set()
+
+    async def wait_bytes(self, count):
+        """Wait until at least `count` bytes have been received."""
+        while len(self.data) < count:
+            self._received.clear()
+            await self._received.wait()
+
+    def words(self, start=0):
+        """The received bytes from offset `start` as little-endian 32-bit words (whole words only)."""
+        end = start + (len(self.data) - start) // 4 * 4
+        return list(struct.unpack(f"<{(end - start) // 4}I", bytes(self.data[start:end])))
+
+    async def read_words(self, count, start=0):
+        await self.wait_bytes(start + 4 * count)
+        return self.words(start)[:count]
+
+
+class UartSource:
+    """Sends bytes to a DUT's receive `line`, 8N1 LSB first; the line idles high."""
+
+    def __init__(self, clk, line, clks_per_bit=CLKS_PER_BIT):
+        self.clk = clk
+        self.line = line
+        self.clks_per_bit = clks_per_bit
+        line.value = 1
+
+    async def write(self, data):
+        """Send `data` (bytes or a list of byte values); returns after the last stop bit."""
+        for byte in data:
+            bits = [0, *((byte >> i) & 1 for i in range(8)), 1]
+            for bit, clocks in zip(bits, _bit_clocks(self.clks_per_bit, 0, 10)[1:]):
+                self.line.value = bit
+                await ClockCycles(self.clk, clocks)
@@ -0,0 +1,179 @@
+"""
+Failure-only waveform capture.
+
+Regressions run untraced. When a test fails, this re-runs just that test
+with the same RANDOM_SEED against a second, trace-enabled build
+(``make WAVES_TRACE=1 SIM_BUILD=sim_build_waves``, so the fast untraced
+model is left alone and the traced one is reused across failures). The
+Makefiles append the trace flags to their own EXTRA_ARGS, so the traced
+build is the same design with the same make arguments. Because the
+per-test seed only depends on RANDOM_SEED and the test name (see
+verif/seeding.py), the re-run replays the failing stimulus exactly.
+
+cocotb's Verilator main opens the dump at time 0 and Verilator ignores
+$dumpon/$dumpoff, so the traced run records everything; the dump is then
+cut down to a window around the failure time reported in results.xml
+(the test ends at the failing assertion) and converted to FST with
+``vcd2fst`` when GTKWave's tools are installed. Without vcd2fst the
+trimmed VCD is kept.
+
+    python -m verif.waves --dir RISC_Processor-cocotb-passed --module test_RISC_Processor \\
+        --toplevel RISC_Processor --testcase test_risc_processor_full --seed 1234
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from verif import sweep
+
+WAVES_SIM_BUILD = "sim_build_waves"
+# Appends the trace flags in the Makefiles, so their own EXTRA_ARGS (--timing,
+# -Wno-fatal, the fpga_top parameters) still apply to the traced build
+WAVES_MAKE_ARGS = ["WAVES_TRACE=1"]
+WINDOW_BEFORE_NS = float(os.environ.get("WAVES_WINDOW_BEFORE_NS", 2000))
+WINDOW_AFTER_NS = float(os.environ.get("WAVES_WINDOW_AFTER_NS", 100))
+
+_TIMESCALE_UNITS = {"s": 1e9, "ms": 1e6, "us": 1e3, "ns": 1.0, "ps": 1e-3, "fs": 1e-6}
+
+
+def _timescale_ns(header):
+    """Length of one VCD time unit in ns, from the $timescale header section."""
+    match = re.search(r"\$timescale\s*(\d+)\s*([munpf]?s)\s*\$end", header)
+    if not match:
+        return 1e-3  # Verilator's default 1ps precision
+    return int(match.group(1)) * _TIMESCALE_UNITS[match.group(2)]
+
+
+def trim_vcd(src, dst, start_ns, end_ns):
+    """
+    Copy the part of VCD file `src` between `start_ns` and `end_ns` to `dst`.
+
+    The value of every signal at `start_ns` is written as a $dumpvars block,
+    so the trimmed file opens with a complete state. Returns the number of
+    value changes written.
+    """
+    with open(src) as f_in, open(dst, "w") as f_out:
+        header = []
+        for line in f_in:
+            header.append(line)
+            if "$enddefinitions" in line:
+                break
+        header_text = "".join(header)
+        f_out.write(header_text)
+        unit_ns = _timescale_ns(header_text)
+        start, end = int(start_ns / unit_ns), int(end_ns / unit_ns)
+
+        state = {}
+        in_window = False
+        written = 0
+        for line in f_in:
+            line = line.strip()
+            if not line or line.startswith("$"):
+                continue  # $dumpvars/$end markers of the original dump
+            if line[0] == "#":
+                time = int(line[1:])
+                if time > end:
+                    break
+                if not in_window and time >= start:
+                    in_window = True
+                    f_out.write(f"#{start}\n$dumpvars\n")
+                    f_out.writelines(value + "\n" for value in state.values())
+                    f_out.write("$end\n")
+                if in_window and time != start:
+                    f_out.write(line + "\n")
+                continue
+            # Scalar changes are "0!"; vectors/reals are "b1010 !" / "r1.5 !"
+            ident = line.split()[-1] if line[0] in "bBrR" else line[1:]
+            if in_window:
+                f_out.write(line + "\n")
+                written += 1
+            else:
+                state[ident] = line
+        if not in_window:
+            # The failure happened before anything changed inside the window
+            f_out.write(f"#{start}\n$dumpvars\n")
+            f_out.writelines(value + "\n" for value in state.values())
+            f_out.write("$end\n")
+    return written
+
+
+def to_fst(vcd_path):
+    """Convert `vcd_path` to FST if vcd2fst is available; return the path kept."""
+    vcd2fst = shutil.which("vcd2fst")
+    if vcd2fst is None:
+        return vcd_path
+    fst_path = os.path.splitext(vcd_path)[0] + ".fst"
+    if subprocess.run([vcd2fst, vcd_path, fst_path], stdout=subprocess.DEVNULL).returncode != 0:
+        return vcd_path
+    os.remove(vcd_path)
+    return fst_path
+
+
+def capture(workdir, module, toplevel, testcase, seed, outdir,
+            before_ns=WINDOW_BEFORE_NS, after_ns=WINDOW_AFTER_NS, extra=(), log=print):
+    """
+    Re-run `testcase` with RANDOM_SEED=`seed` on the traced build and keep a
+    waveform window around the failure. Returns the waveform path, or None
+    if the test passed on the re-run (i.e. the failure was not reproducible).
+    """
+    os.makedirs(outdir, exist_ok=True)
+    make_extra = [*WAVES_MAKE_ARGS, *extra]
+    sweep.build(workdir, module, toplevel, WAVES_SIM_BUILD, make_extra,
+                log_file=os.path.join(outdir, "build_waves.log"))
+    dump = os.path.join(workdir, "dump.vcd")
+    if os.path.exists(dump):
+        os.remove(dump)
+    result = sweep.run_seed(workdir, module, toplevel, seed, outdir, testcase,
+                            sim_build=WAVES_SIM_BUILD, extra=make_extra)
+    failed = [t for t in result.tests if not t.passed]
+    if not result.failures:
+        log(f"  {testcase} seed {seed}: passed on the traced re-run, no waveform kept")
+        return None
+    if not os.path.exists(dump):
+        log(f"  {testcase} seed {seed}: traced run wrote no dump.vcd (see {result.log_file})")
+        return None
+
+    fail_ns = failed[0].sim_time_ns if failed else 0.0
+    start_ns = max(0.0, fail_ns - before_ns)
+    trimmed = os.path.join(outdir, f"{testcase or module}_{seed}.vcd")
+    trim_vcd(dump, trimmed, start_ns, fail_ns + after_ns)
+    os.remove(dump)
+    path = to_fst(trimmed)
+    log(f"  {testcase} seed {seed}: failed at {fail_ns:.0f} ns, waveform "
+        f"[{start_ns:.0f}, {fail_ns + after_ns:.0f}] ns in {path}")
+    return path
+
+
+def capture_failures(results, workdir, module, toplevel, outdir, limit=None, extra=(), log=print):
+    """Capture waveforms for the failing tests of sweep results (serially: one dump.vcd per dir)."""
+    paths = []
+    failures = [(r.seed, test) for r in results for test in r.failures if not test.startswith("<")]
+    for seed, test in failures[:limit]:
+        path = capture(workdir, module, toplevel, test, seed, outdir, extra=extra, log=log)
+        if path:
+            paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run a failing test with tracing and keep a waveform window.")
+    parser.add_argument("--dir", default=".", help="Directory containing the cocotb Makefile")
+    parser.add_argument("--module", required=True)
+    parser.add_argument("--toplevel", required=True)
+    parser.add_argument("--testcase", required=True)
+    parser.add_argument("--seed", type=int, required=True, help="RANDOM_SEED of the failing run")
+    parser.add_argument("--outdir", default="waves")
+    parser.add_argument("--before-ns", type=float, default=WINDOW_BEFORE_NS,
+                        help="Waveform kept before the failure (default %(default)s ns)")
+    parser.add_argument("--after-ns", type=float, default=WINDOW_AFTER_NS)
+    args = parser.parse_args(argv)
+    path = capture(args.dir, args.module, args.toplevel, args.testcase, args.seed, args.outdir,
+                   args.before_ns, args.after_ns)
+    return 0 if path else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())